@@ -107,6 +107,8 @@ INSTALLED_APPS = [
     'apps.zona_geografica',
     'apps.comprobante',
     'apps.arqueo_caja',
+    'apps.secuencia',
+    'apps.generacion_pdf',
     'apps.dashboard',
 ]
 
@@ -121,6 +123,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.locale.LocaleMiddleware',
+    'apps.dashboard.perf.MonitorConsultasMiddleware',
 ]
 
 CORS_ALLOWED_ORIGINS = [
@@ -249,6 +252,16 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Monitoreo de consultas por request (apps/dashboard/perf.py). Se activa con
+# la variable de entorno PERF_MONITOREO_ACTIVO=true. Los tests de presupuesto
+# de consultas usan override_settings(PERF_PRESUPUESTO_ESTRICTO=True).
+PERF_MONITOREO_ACTIVO = os.environ.get('PERF_MONITOREO_ACTIVO', '').lower() in ('1', 'true')
+
+# PDFs de documentos (apps/generacion_pdf): por defecto se generan dentro del
+# request. Con la variable de entorno PDF_GENERACION_ASINCRONA=true se encolan
+# y los genera el worker `manage.py procesar_trabajos_pdf`, que debe estar corriendo.
+PDF_GENERACION_ASINCRONA = os.environ.get('PDF_GENERACION_ASINCRONA', '').lower() in ('1', 'true')
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
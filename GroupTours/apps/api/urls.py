@@ -27,5 +27,6 @@ urlpatterns = [
     path('', include('apps.comprobante.urls')),  # Comprobantes, distribuciones y vouchers
     path('arqueo-caja/', include('apps.arqueo_caja.urls')),  # Arqueo de caja
     path('dashboard/', include('apps.dashboard.urls')),  # Dashboard y reportes
+    path('documentos-pdf/', include('apps.generacion_pdf.urls')),  # Cola de generación de PDFs
     # Puedes seguir agregando aquí otras rutas
 ]
\ No newline at end of file
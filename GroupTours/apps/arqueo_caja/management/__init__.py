@@ -0,0 +1 @@
+# Management module for arqueo_caja app
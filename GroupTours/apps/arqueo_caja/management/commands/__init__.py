@@ -0,0 +1 @@
+# Commands module for arqueo_caja app
@@ -0,0 +1,108 @@
+"""
+Comando de Django para reconciliar los totales acumulados de las aperturas de caja
+(TotalAperturaCaja) contra la suma real de sus movimientos activos.
+
+Uso:
+    python manage.py reconciliar_totales_caja
+
+Opciones:
+    --dry-run : Solo reporta las diferencias sin corregirlas
+    --apertura CODIGO : Solo procesar una apertura
+    --solo-abiertas : Solo procesar aperturas abiertas
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.arqueo_caja.models import AperturaCaja
+
+
+class Command(BaseCommand):
+    help = 'Detecta y corrige diferencias entre los totales acumulados de caja y sus movimientos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo reporta las diferencias sin aplicar cambios a la base de datos',
+        )
+        parser.add_argument(
+            '--apertura',
+            type=str,
+            help='Código de apertura a procesar (ej: APR-2025-0001)',
+        )
+        parser.add_argument(
+            '--solo-abiertas',
+            action='store_true',
+            help='Procesar solo las aperturas que siguen abiertas',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        codigo_apertura = options.get('apertura')
+
+        # Banner
+        self.stdout.write(self.style.MIGRATE_HEADING('\n' + '='*70))
+        self.stdout.write(self.style.MIGRATE_HEADING('  RECONCILIACION DE TOTALES DE CAJA'))
+        self.stdout.write(self.style.MIGRATE_HEADING('='*70 + '\n'))
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('[!] MODO DRY-RUN: No se aplicaran cambios\n'))
+
+        queryset = AperturaCaja.objects.select_related('caja').order_by('id')
+        if codigo_apertura:
+            queryset = queryset.filter(codigo_apertura=codigo_apertura)
+            self.stdout.write(f'Filtrando por apertura: {codigo_apertura}\n')
+        if options['solo_abiertas']:
+            queryset = queryset.filter(esta_abierta=True)
+
+        total = queryset.count()
+        self.stdout.write(f'Total de aperturas a procesar: {total}\n')
+
+        if total == 0:
+            self.stdout.write(self.style.WARNING('No hay aperturas para procesar.'))
+            return
+
+        con_diferencias = 0
+
+        for apertura in queryset.iterator():
+            with transaction.atomic():
+                diferencias = apertura.reconciliar_totales(reparar=not dry_run)
+
+            if not diferencias:
+                continue
+
+            con_diferencias += 1
+            self.stdout.write(self.style.WARNING(
+                f'Apertura {apertura.codigo_apertura} (Caja {apertura.caja.nombre}):'
+            ))
+            for diferencia in diferencias:
+                self.stdout.write(
+                    f"    {diferencia['tipo_movimiento']}/{diferencia['metodo_pago']}: "
+                    f"{diferencia['acumulado']} -> {diferencia['real']}"
+                )
+
+        # Resumen final
+        self.stdout.write('\n' + '='*70)
+        self.stdout.write(self.style.MIGRATE_HEADING('  RESUMEN'))
+        self.stdout.write('='*70 + '\n')
+
+        self.stdout.write(f'Total procesadas: {total}')
+        if con_diferencias:
+            self.stdout.write(self.style.ERROR(f'[DRIFT] Con diferencias: {con_diferencias}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('[OK] Sin diferencias'))
+
+        if dry_run and con_diferencias:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'\n[!] {con_diferencias} apertura(s) necesitan correccion. '
+                    'Ejecuta sin --dry-run para aplicar los cambios.'
+                )
+            )
+        elif con_diferencias:
+            self.stdout.write(
+                self.style.SUCCESS(f'\n[OK] {con_diferencias} apertura(s) reconciliadas correctamente.')
+            )
+
+        self.stdout.write('')
@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-17 10:15
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def poblar_totales(apps, schema_editor):
+    """Inicializa los totales acumulados desde los movimientos activos existentes"""
+    MovimientoCaja = apps.get_model('arqueo_caja', 'MovimientoCaja')
+    TotalAperturaCaja = apps.get_model('arqueo_caja', 'TotalAperturaCaja')
+
+    filas = (
+        MovimientoCaja.objects.filter(activo=True)
+        .values('apertura_caja_id', 'tipo_movimiento', 'metodo_pago')
+        .annotate(total=Sum('monto'), cantidad=Count('id'))
+        .order_by()
+    )
+    TotalAperturaCaja.objects.bulk_create([
+        TotalAperturaCaja(
+            apertura_caja_id=fila['apertura_caja_id'],
+            tipo_movimiento=fila['tipo_movimiento'],
+            metodo_pago=fila['metodo_pago'],
+            monto_total=fila['total'] or 0,
+            cantidad_movimientos=fila['cantidad'],
+        )
+        for fila in filas
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('arqueo_caja', '0006_alter_cierrecaja_diferencia_porcentaje'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TotalAperturaCaja',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_movimiento', models.CharField(choices=[('ingreso', 'Débito'), ('egreso', 'Crédito')], help_text='Ingreso o Egreso', max_length=20)),
+                ('metodo_pago', models.CharField(choices=[('efectivo', 'Efectivo'), ('tarjeta_debito', 'Tarjeta de Débito'), ('tarjeta_credito', 'Tarjeta de Crédito'), ('transferencia', 'Transferencia Bancaria'), ('cheque', 'Cheque'), ('qr', 'Pago QR'), ('otro', 'Otro')], help_text='Método de pago', max_length=20)),
+                ('monto_total', models.DecimalField(decimal_places=2, default=0, help_text='Suma de los movimientos activos', max_digits=15)),
+                ('cantidad_movimientos', models.PositiveIntegerField(default=0, help_text='Cantidad de movimientos activos')),
+                ('fecha_modificacion', models.DateTimeField(auto_now=True)),
+                ('apertura_caja', models.ForeignKey(help_text='Apertura a la que pertenecen los totales', on_delete=django.db.models.deletion.CASCADE, related_name='totales', to='arqueo_caja.aperturacaja')),
+            ],
+            options={
+                'verbose_name': 'Total de Apertura de Caja',
+                'verbose_name_plural': 'Totales de Apertura de Caja',
+                'db_table': 'TotalAperturaCaja',
+                'unique_together': {('apertura_caja', 'tipo_movimiento', 'metodo_pago')},
+            },
+        ),
+        migrations.RunPython(poblar_totales, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-17 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('arqueo_caja', '0007_totalaperturacaja'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='movimientocaja',
+            name='MovimientoC_fecha_h_dbaca6_idx',
+        ),
+        migrations.AddIndex(
+            model_name='movimientocaja',
+            index=models.Index(fields=['fecha_hora_movimiento', 'id'], name='mov_caja_fecha_id_idx'),
+        ),
+    ]
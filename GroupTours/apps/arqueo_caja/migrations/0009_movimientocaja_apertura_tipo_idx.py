@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-17 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('arqueo_caja', '0008_movimientocaja_fecha_id_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='movimientocaja',
+            name='MovimientoC_apertur_53e9b5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='movimientocaja',
+            index=models.Index(fields=['apertura_caja', 'tipo_movimiento', 'activo'], name='mov_caja_apertura_tipo_idx'),
+        ),
+    ]
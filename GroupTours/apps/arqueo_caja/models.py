@@ -1,5 +1,5 @@
 # apps/arqueo_caja/models.py
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 from django.utils.timezone import now
 from decimal import Decimal, InvalidOperation
@@ -197,20 +197,91 @@ class AperturaCaja(models.Model):
     def save(self, *args, **kwargs):
         # Auto-generar código de apertura
         if not self.codigo_apertura:
-            year = now().year
-            last_id = AperturaCaja.objects.filter(
-                fecha_hora_apertura__year=year
-            ).count() + 1
-            self.codigo_apertura = f"APR-{year}-{last_id:04d}"
+            from apps.secuencia.services import generar_codigo
+            self.codigo_apertura = generar_codigo('APR')
 
         super().save(*args, **kwargs)
 
-        # Actualizar estado de la caja
+        # Actualizar estado de la caja (saldo = monto inicial + movimientos acumulados)
         if self.esta_abierta:
+            from .services import resumir_movimientos_caja
+            saldo = resumir_movimientos_caja(
+                self.obtener_totales(), _to_decimal(self.monto_inicial)
+            )['saldo_total']
             self.caja.estado_actual = 'abierta'
-            self.caja.saldo_actual = self.monto_inicial
+            self.caja.saldo_actual = saldo
             self.caja.save(update_fields=['estado_actual', 'saldo_actual'])
 
+    def obtener_totales(self):
+        """
+        Totales acumulados de la apertura por (tipo_movimiento, metodo_pago).
+
+        Returns:
+            dict: {(tipo_movimiento, metodo_pago): {'total': Decimal, 'cantidad': int}}
+        """
+        return {
+            (tipo, metodo): {'total': _to_decimal(monto), 'cantidad': cantidad}
+            for tipo, metodo, monto, cantidad in self.totales.values_list(
+                'tipo_movimiento', 'metodo_pago', 'monto_total', 'cantidad_movimientos'
+            )
+        }
+
+    def reconciliar_totales(self, reparar=True):
+        """
+        Compara los totales acumulados con la suma real de los movimientos activos
+        y, si reparar=True, corrige las diferencias (incluido el saldo de la caja
+        si la apertura sigue abierta).
+
+        Args:
+            reparar: Si es False solo reporta las diferencias
+
+        Returns:
+            list[dict]: Diferencias encontradas
+                        [{'tipo_movimiento', 'metodo_pago', 'acumulado', 'real'}]
+        """
+        from .services import agregar_movimientos_caja, resumir_movimientos_caja
+
+        buckets = agregar_movimientos_caja(self.movimientos.filter(activo=True))
+        reales = {}
+        for (tipo, metodo, _), valores in buckets.items():
+            monto, cantidad = reales.get((tipo, metodo), (Decimal('0'), 0))
+            reales[(tipo, metodo)] = (monto + _to_decimal(valores['total']), cantidad + valores['cantidad'])
+        acumulados = {
+            (t.tipo_movimiento, t.metodo_pago): t
+            for t in self.totales.all()
+        }
+
+        diferencias = []
+        for clave in set(reales) | set(acumulados):
+            monto_real, cantidad_real = reales.get(clave, (Decimal('0'), 0))
+            total = acumulados.get(clave)
+            monto_acumulado = _to_decimal(total.monto_total) if total else Decimal('0')
+            cantidad_acumulada = total.cantidad_movimientos if total else 0
+
+            if monto_real == monto_acumulado and cantidad_real == cantidad_acumulada:
+                continue
+
+            diferencias.append({
+                'tipo_movimiento': clave[0],
+                'metodo_pago': clave[1],
+                'acumulado': monto_acumulado,
+                'real': monto_real,
+            })
+
+            if reparar:
+                TotalAperturaCaja.objects.update_or_create(
+                    apertura_caja=self,
+                    tipo_movimiento=clave[0],
+                    metodo_pago=clave[1],
+                    defaults={'monto_total': monto_real, 'cantidad_movimientos': cantidad_real}
+                )
+
+        if reparar and self.esta_abierta:
+            saldo = resumir_movimientos_caja(buckets, _to_decimal(self.monto_inicial))['saldo_total']
+            Caja.objects.filter(pk=self.caja_id).exclude(saldo_actual=saldo).update(saldo_actual=saldo)
+
+        return diferencias
+
     def clean(self):
         """Validaciones de negocio"""
         # No puede haber más de una apertura activa por caja
@@ -584,8 +655,10 @@ class MovimientoCaja(models.Model):
         verbose_name_plural = "Movimientos de Caja"
         ordering = ['-fecha_hora_movimiento']
         indexes = [
-            models.Index(fields=['apertura_caja', 'tipo_movimiento']),
-            models.Index(fields=['fecha_hora_movimiento']),
+            # Totales de una apertura: apertura_caja + tipo_movimiento + activo
+            models.Index(fields=['apertura_caja', 'tipo_movimiento', 'activo'], name='mov_caja_apertura_tipo_idx'),
+            # Ordenamiento y paginación por cursor (fecha_hora_movimiento, id)
+            models.Index(fields=['fecha_hora_movimiento', 'id'], name='mov_caja_fecha_id_idx'),
             models.Index(fields=['comprobante']),
         ]
 
@@ -595,16 +668,47 @@ class MovimientoCaja(models.Model):
     def save(self, *args, **kwargs):
         # Auto-generar número de movimiento
         if not self.numero_movimiento:
-            year = now().year
-            last_id = MovimientoCaja.objects.filter(
-                fecha_hora_movimiento__year=year
-            ).count() + 1
-            self.numero_movimiento = f"MOV-{year}-{last_id:04d}"
-
-        super().save(*args, **kwargs)
-
-        # Actualizar saldo de la caja
-        self.actualizar_saldo_caja()
+            from apps.secuencia.services import generar_codigo
+            self.numero_movimiento = generar_codigo('MOV')
+
+        # Estado anterior (para revertir su efecto en los totales si cambió)
+        anterior = None
+        if not self._state.adding and self.pk:
+            anterior = MovimientoCaja.objects.filter(pk=self.pk).values(
+                'apertura_caja_id', 'tipo_movimiento', 'metodo_pago', 'monto', 'activo'
+            ).first()
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            actual = {
+                'apertura_caja_id': self.apertura_caja_id,
+                'tipo_movimiento': self.tipo_movimiento,
+                'metodo_pago': self.metodo_pago,
+                'monto': _to_decimal(self.monto),
+                'activo': self.activo,
+            }
+            if anterior != actual:
+                # Actualizar totales de la apertura y saldo de la caja con deltas F()
+                if anterior and anterior['activo']:
+                    TotalAperturaCaja.aplicar_movimiento(
+                        anterior['apertura_caja_id'], anterior['tipo_movimiento'],
+                        anterior['metodo_pago'], anterior['monto'], signo=-1
+                    )
+                if self.activo:
+                    TotalAperturaCaja.aplicar_movimiento(
+                        self.apertura_caja_id, self.tipo_movimiento,
+                        self.metodo_pago, self.monto, signo=1
+                    )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            if self.activo:
+                TotalAperturaCaja.aplicar_movimiento(
+                    self.apertura_caja_id, self.tipo_movimiento,
+                    self.metodo_pago, self.monto, signo=-1
+                )
+            return super().delete(*args, **kwargs)
 
     def clean(self):
         """Validaciones de negocio"""
@@ -630,35 +734,117 @@ class MovimientoCaja(models.Model):
     def actualizar_saldo_caja(self):
         """
         Recalcula el saldo de la caja desde cero basándose en todos los movimientos activos.
-        Esto asegura que el saldo sea correcto incluso después de anulaciones.
+
+        NOTA: save() ya no la invoca; el saldo se mantiene con deltas en
+        TotalAperturaCaja.aplicar_movimiento(). Se conserva para recálculos manuales.
         """
-        from django.db.models import Sum
+        from .services import calcular_saldo_actual_caja
 
         caja = self.apertura_caja.caja
 
-        # Obtener el monto inicial de la apertura
-        monto_inicial = _to_decimal(self.apertura_caja.monto_inicial)
+        # Saldo actual = monto_inicial + ingresos - egresos (una sola consulta agrupada)
+        caja.saldo_actual = _to_decimal(calcular_saldo_actual_caja(self.apertura_caja)['saldo_actual'])
+
+        caja.save(update_fields=['saldo_actual'])
 
-        # Sumar todos los ingresos activos
-        total_ingresos = MovimientoCaja.objects.filter(
-            apertura_caja=self.apertura_caja,
-            tipo_movimiento='ingreso',
-            activo=True
-        ).aggregate(total=Sum('monto'))['total']
-        total_ingresos = _to_decimal(total_ingresos)
 
-        # Sumar todos los egresos activos
-        total_egresos = MovimientoCaja.objects.filter(
-            apertura_caja=self.apertura_caja,
-            tipo_movimiento='egreso',
-            activo=True
-        ).aggregate(total=Sum('monto'))['total']
-        total_egresos = _to_decimal(total_egresos)
+class TotalAperturaCaja(models.Model):
+    """
+    Totales acumulados de una apertura por tipo de movimiento y método de pago.
 
-        # Calcular saldo actual = monto_inicial + ingresos - egresos
-        caja.saldo_actual = monto_inicial + total_ingresos - total_egresos
+    Se actualizan con deltas F() al registrar, modificar o anular un
+    MovimientoCaja, evitando re-sumar todos los movimientos del turno en cada
+    alta. CierreCaja lee estos totales directamente.
+    AperturaCaja.reconciliar_totales() detecta y corrige diferencias.
+    """
 
-        caja.save(update_fields=['saldo_actual'])
+    apertura_caja = models.ForeignKey(
+        AperturaCaja,
+        on_delete=models.CASCADE,
+        related_name='totales',
+        help_text="Apertura a la que pertenecen los totales"
+    )
+
+    tipo_movimiento = models.CharField(
+        max_length=20,
+        choices=MovimientoCaja.TIPOS_MOVIMIENTO,
+        help_text="Ingreso o Egreso"
+    )
+
+    metodo_pago = models.CharField(
+        max_length=20,
+        choices=MovimientoCaja.METODOS_PAGO,
+        help_text="Método de pago"
+    )
+
+    monto_total = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=0,
+        help_text="Suma de los movimientos activos"
+    )
+
+    cantidad_movimientos = models.PositiveIntegerField(
+        default=0,
+        help_text="Cantidad de movimientos activos"
+    )
+
+    fecha_modificacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "TotalAperturaCaja"
+        verbose_name = "Total de Apertura de Caja"
+        verbose_name_plural = "Totales de Apertura de Caja"
+        unique_together = ("apertura_caja", "tipo_movimiento", "metodo_pago")
+
+    def __str__(self):
+        return f"{self.apertura_caja_id} - {self.tipo_movimiento}/{self.metodo_pago}: {self.monto_total}"
+
+    @classmethod
+    def aplicar_movimiento(cls, apertura_caja_id, tipo_movimiento, metodo_pago, monto, signo=1):
+        """
+        Suma (signo=1) o resta (signo=-1) un movimiento en los totales de la apertura
+        y en el saldo de la caja (si la apertura sigue abierta).
+
+        Args:
+            apertura_caja_id: ID de la apertura
+            tipo_movimiento: 'ingreso' o 'egreso'
+            metodo_pago: Método de pago del movimiento
+            monto: Monto del movimiento (positivo)
+            signo: 1 para aplicar, -1 para revertir
+        """
+        from django.db.models import F
+
+        monto = _to_decimal(monto) * signo
+
+        with transaction.atomic():
+            actualizados = cls.objects.filter(
+                apertura_caja_id=apertura_caja_id,
+                tipo_movimiento=tipo_movimiento,
+                metodo_pago=metodo_pago
+            ).update(
+                monto_total=F('monto_total') + monto,
+                cantidad_movimientos=F('cantidad_movimientos') + signo
+            )
+            if not actualizados:
+                total, creado = cls.objects.get_or_create(
+                    apertura_caja_id=apertura_caja_id,
+                    tipo_movimiento=tipo_movimiento,
+                    metodo_pago=metodo_pago,
+                    defaults={'monto_total': monto, 'cantidad_movimientos': max(signo, 0)}
+                )
+                if not creado:
+                    cls.objects.filter(pk=total.pk).update(
+                        monto_total=F('monto_total') + monto,
+                        cantidad_movimientos=F('cantidad_movimientos') + signo
+                    )
+
+            # Saldo de la caja = monto_inicial + ingresos - egresos de la apertura abierta
+            delta_saldo = monto if tipo_movimiento == 'ingreso' else -monto
+            Caja.objects.filter(
+                aperturas__id=apertura_caja_id,
+                aperturas__esta_abierta=True
+            ).update(saldo_actual=F('saldo_actual') + delta_saldo)
 
 
 class CierreCaja(models.Model):
@@ -846,11 +1032,8 @@ class CierreCaja(models.Model):
     def save(self, *args, **kwargs):
         # Auto-generar código de cierre
         if not self.codigo_cierre:
-            year = now().year
-            last_id = CierreCaja.objects.filter(
-                fecha_hora_cierre__year=year
-            ).count() + 1
-            self.codigo_cierre = f"CIE-{year}-{last_id:04d}"
+            from apps.secuencia.services import generar_codigo
+            self.codigo_cierre = generar_codigo('CIE')
 
         # Calcular diferencia si se tiene saldo real
         if self.saldo_real_efectivo is not None and self.saldo_teorico_efectivo is not None:
@@ -881,63 +1064,29 @@ class CierreCaja(models.Model):
     def calcular_totales_desde_movimientos(self):
         """
         Calcula los totales de ingresos/egresos basado en los movimientos registrados.
+        Lee los totales acumulados de la apertura (TotalAperturaCaja) en una sola consulta.
         """
-        from django.db.models import Sum
+        from .services import resumir_movimientos_caja
 
-        movimientos = self.apertura_caja.movimientos.filter(activo=True)
-
-        # Ingresos por método de pago
-        ingresos = movimientos.filter(tipo_movimiento='ingreso')
-
-        self.total_efectivo = _to_decimal(
-            ingresos.filter(metodo_pago='efectivo')
-            .aggregate(total=Sum('monto'))['total']
-        )
-
-        self.total_tarjetas = _to_decimal(
-            ingresos.filter(metodo_pago__in=['tarjeta_debito', 'tarjeta_credito'])
-            .aggregate(total=Sum('monto'))['total']
+        resumen = resumir_movimientos_caja(
+            self.apertura_caja.obtener_totales(),
+            _to_decimal(self.apertura_caja.monto_inicial)
         )
+        ingresos = resumen['ingresos_por_metodo']
 
-        self.total_transferencias = _to_decimal(
-            ingresos.filter(metodo_pago='transferencia')
-            .aggregate(total=Sum('monto'))['total']
-        )
-
-        self.total_cheques = _to_decimal(
-            ingresos.filter(metodo_pago='cheque')
-            .aggregate(total=Sum('monto'))['total']
-        )
-
-        self.total_otros_ingresos = _to_decimal(
-            ingresos.filter(metodo_pago__in=['qr', 'otro'])
-            .aggregate(total=Sum('monto'))['total']
-        )
+        # Ingresos por método de pago
+        self.total_efectivo = ingresos['efectivo']
+        self.total_tarjetas = ingresos['tarjetas']
+        self.total_transferencias = ingresos['transferencias']
+        self.total_cheques = ingresos['cheques']
+        self.total_otros_ingresos = ingresos['otros']
 
         # Egresos
-        self.total_egresos = _to_decimal(
-            movimientos.filter(tipo_movimiento='egreso')
-            .aggregate(total=Sum('monto'))['total']
-        )
+        self.total_egresos = resumen['total_egresos']
 
         # Calcular saldos teóricos
-        monto_inicial = _to_decimal(self.apertura_caja.monto_inicial)
-
-        self.saldo_teorico_efectivo = (
-            monto_inicial +
-            self.total_efectivo -
-            self.total_egresos
-        )
-
-        self.saldo_teorico_total = (
-            monto_inicial +
-            self.total_efectivo +
-            self.total_tarjetas +
-            self.total_transferencias +
-            self.total_cheques +
-            self.total_otros_ingresos -
-            self.total_egresos
-        )
+        self.saldo_teorico_efectivo = resumen['saldo_esperado_efectivo']
+        self.saldo_teorico_total = resumen['saldo_total']
 
         self.save()
 
@@ -1285,12 +1434,12 @@ class CierreCaja(models.Model):
         y -= 20
 
         # Obtener movimientos del responsable en esta apertura
-        movimientos = self.apertura_caja.movimientos.filter(
+        movimientos = list(self.apertura_caja.movimientos.filter(
             activo=True,
             usuario_registro=self.apertura_caja.responsable
-        ).order_by('fecha_hora_movimiento')
+        ).order_by('fecha_hora_movimiento'))
 
-        if movimientos.exists():
+        if movimientos:
             # Encabezados de la tabla de movimientos
             data_movimientos = [
                 ['#', 'Fecha/Hora', 'Tipo', 'Concepto', 'Método', 'Monto']
@@ -2,8 +2,10 @@
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from apps.dashboard.paginacion import PaginacionCursorMixin
 
-class CustomPageNumberPagination(PageNumberPagination):
+
+class CustomPageNumberPagination(PaginacionCursorMixin, PageNumberPagination):
     """
     Paginación personalizada que retorna metadatos adicionales:
     - pageSize: tamaño de página
@@ -12,12 +14,17 @@ class CustomPageNumberPagination(PageNumberPagination):
     - totalItems: cantidad total de items
     - totalPages: cantidad total de páginas
     - currentPage: página actual
+
+    Con ?cursor= pagina por keyset si la vista define cursor_ordering
+    (ver apps/dashboard/paginacion.py).
     """
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
 
     def get_paginated_response(self, data):
+        if self.modo_cursor:
+            return self.get_respuesta_cursor(data)
         return Response({
             'results': data,
             'pageSize': self.page.paginator.per_page,
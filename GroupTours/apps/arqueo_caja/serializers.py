@@ -370,11 +370,12 @@ class MovimientoCajaListSerializer(serializers.ModelSerializer):
         La conversión es: monto_pyg / cotizacion_usd
         """
         from apps.moneda.models import Moneda, CotizacionMoneda
+        from apps.moneda.services import obtener_moneda
         from decimal import Decimal
         
         try:
             # El monto siempre está en PYG, convertir a USD para referencia
-            moneda_usd = Moneda.objects.get(codigo='USD')
+            moneda_usd = obtener_moneda('USD')
             fecha_movimiento = obj.fecha_hora_movimiento.date()
             cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd, fecha_movimiento)
             
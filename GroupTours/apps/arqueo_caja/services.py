@@ -4,7 +4,7 @@ Servicios y funciones utilitarias para el módulo de arqueo de caja.
 Incluye integración con ComprobantePago y otras funcionalidades reutilizables.
 """
 from decimal import Decimal
-from django.db.models import Sum
+from django.db.models import Count, Sum
 from .models import AperturaCaja, MovimientoCaja
 
 
@@ -153,33 +153,112 @@ def registrar_movimiento_desde_comprobante(comprobante):
     return movimiento
 
 
-def calcular_saldo_actual_caja(apertura_caja):
+# Agrupación de métodos de pago usada en cierres, resúmenes y PDFs
+GRUPOS_METODO_PAGO = {
+    'efectivo': ('efectivo',),
+    'tarjetas': ('tarjeta_debito', 'tarjeta_credito'),
+    'transferencias': ('transferencia',),
+    'cheques': ('cheque',),
+    'otros': ('qr', 'otro'),
+}
+
+
+def agregar_movimientos_caja(movimientos):
     """
-    Calcula el saldo actual de una caja basado en sus movimientos.
+    Agrupa movimientos de caja en una sola consulta GROUP BY
+    por (tipo_movimiento, metodo_pago, concepto).
 
     Args:
-        apertura_caja: Instancia de AperturaCaja
+        movimientos: QuerySet de MovimientoCaja (ya filtrado, ej: activo=True)
 
     Returns:
-        dict: Diccionario con los totales calculados
+        dict: {(tipo_movimiento, metodo_pago, concepto): {'total': Decimal, 'cantidad': int}}
     """
-    movimientos = apertura_caja.movimientos.filter(activo=True)
+    filas = movimientos.order_by().values(
+        'tipo_movimiento', 'metodo_pago', 'concepto'
+    ).annotate(total=Sum('monto'), cantidad=Count('id'))
 
-    total_ingresos = movimientos.filter(
-        tipo_movimiento='ingreso'
-    ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
+    return {
+        (fila['tipo_movimiento'], fila['metodo_pago'], fila['concepto']): {
+            'total': fila['total'] or Decimal('0'),
+            'cantidad': fila['cantidad'],
+        }
+        for fila in filas
+    }
 
-    total_egresos = movimientos.filter(
-        tipo_movimiento='egreso'
-    ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
 
-    saldo = apertura_caja.monto_inicial + total_ingresos - total_egresos
+def resumir_movimientos_caja(buckets, monto_inicial=Decimal('0')):
+    """
+    Calcula los totales de caja (ingresos por método, egresos y saldos esperados)
+    a partir de los buckets agregados, sin consultar la base de datos.
+
+    Args:
+        buckets: dict cuyas claves empiezan con (tipo_movimiento, metodo_pago, ...)
+                 y cuyos valores son {'total': Decimal, 'cantidad': int}.
+                 Acepta el resultado de agregar_movimientos_caja() y de
+                 AperturaCaja.obtener_totales().
+        monto_inicial: Monto inicial de la apertura
+
+    Returns:
+        dict: Totales por método y por tipo, cantidad de movimientos y saldos
+    """
+    monto_inicial = monto_inicial or Decimal('0')
+    ingresos_por_metodo_pago = {metodo: Decimal('0') for metodo, _ in MovimientoCaja.METODOS_PAGO}
+    total_ingresos = Decimal('0')
+    total_egresos = Decimal('0')
+    cantidad_movimientos = 0
+
+    for clave, valores in buckets.items():
+        tipo_movimiento, metodo_pago = clave[0], clave[1]
+        cantidad_movimientos += valores['cantidad']
+
+        if tipo_movimiento == 'ingreso':
+            total_ingresos += valores['total']
+            ingresos_por_metodo_pago[metodo_pago] = (
+                ingresos_por_metodo_pago.get(metodo_pago, Decimal('0')) + valores['total']
+            )
+        else:
+            total_egresos += valores['total']
+
+    ingresos_por_metodo = {
+        grupo: sum((ingresos_por_metodo_pago.get(m, Decimal('0')) for m in metodos), Decimal('0'))
+        for grupo, metodos in GRUPOS_METODO_PAGO.items()
+    }
 
     return {
-        'monto_inicial': apertura_caja.monto_inicial,
+        'monto_inicial': monto_inicial,
+        'ingresos_por_metodo': ingresos_por_metodo,
+        'ingresos_por_metodo_pago': ingresos_por_metodo_pago,
         'total_ingresos': total_ingresos,
         'total_egresos': total_egresos,
-        'saldo_actual': saldo,
+        'cantidad_movimientos': cantidad_movimientos,
+        # Saldo esperado en EFECTIVO (lo que se debe contar físicamente)
+        'saldo_esperado_efectivo': monto_inicial + ingresos_por_metodo['efectivo'] - total_egresos,
+        # Saldo total (incluyendo todos los métodos de pago)
+        'saldo_total': monto_inicial + total_ingresos - total_egresos,
+    }
+
+
+def calcular_saldo_actual_caja(apertura_caja):
+    """
+    Calcula el saldo actual de una caja basado en sus movimientos.
+
+    Args:
+        apertura_caja: Instancia de AperturaCaja
+
+    Returns:
+        dict: Diccionario con los totales calculados
+    """
+    resumen = resumir_movimientos_caja(
+        agregar_movimientos_caja(apertura_caja.movimientos.filter(activo=True)),
+        apertura_caja.monto_inicial
+    )
+
+    return {
+        'monto_inicial': apertura_caja.monto_inicial,
+        'total_ingresos': resumen['total_ingresos'],
+        'total_egresos': resumen['total_egresos'],
+        'saldo_actual': resumen['saldo_total'],
     }
 
 
@@ -193,24 +272,17 @@ def obtener_movimientos_por_metodo_pago(apertura_caja):
     Returns:
         dict: Diccionario con totales por método de pago
     """
-    movimientos = apertura_caja.movimientos.filter(
-        activo=True,
-        tipo_movimiento='ingreso'
+    resumen = resumir_movimientos_caja(
+        agregar_movimientos_caja(apertura_caja.movimientos.filter(activo=True, tipo_movimiento='ingreso'))
     )
 
-    resultado = {}
-
-    for metodo, nombre in MovimientoCaja.METODOS_PAGO:
-        total = movimientos.filter(
-            metodo_pago=metodo
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        resultado[metodo] = {
+    return {
+        metodo: {
             'nombre': nombre,
-            'total': total
+            'total': resumen['ingresos_por_metodo_pago'][metodo]
         }
-
-    return resultado
+        for metodo, nombre in MovimientoCaja.METODOS_PAGO
+    }
 
 
 def validar_puede_cerrar_caja(apertura_caja):
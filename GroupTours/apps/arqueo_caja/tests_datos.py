@@ -0,0 +1,73 @@
+"""
+Datos de prueba compartidos por los tests de arqueo de caja: una caja con
+su punto de expedición, un cajero y una apertura abierta.
+
+Uso:
+    from apps.arqueo_caja.tests_datos import DatosCajaMixin
+
+    class MiTestCase(DatosCajaMixin, TestCase):
+        MONTO_INICIAL = Decimal('0')
+"""
+
+from decimal import Decimal
+
+from apps.arqueo_caja.models import AperturaCaja, Caja, MovimientoCaja
+from apps.empleado.models import Empleado
+from apps.facturacion.models import Empresa, Establecimiento, PuntoExpedicion
+from apps.nacionalidad.models import Nacionalidad
+from apps.persona.models import PersonaFisica
+from apps.puesto.models import Puesto
+from apps.tipo_documento.models import TipoDocumento
+from apps.tipo_remuneracion.models import TipoRemuneracion
+
+
+# Concepto por defecto de cada tipo de movimiento
+CONCEPTO_POR_TIPO = {
+    'ingreso': 'venta_efectivo',
+    'egreso': 'gasto_operativo',
+}
+
+
+class DatosCajaMixin:
+    """Caja abierta (self.apertura) con MONTO_INICIAL y un cajero (self.empleado)"""
+
+    MONTO_INICIAL = Decimal('100000')
+
+    def setUp(self):
+        empresa = Empresa.objects.create(ruc='80000000-1', nombre='Test Tours SA')
+        establecimiento = Establecimiento.objects.create(empresa=empresa, codigo='001', nombre='Central')
+        punto_expedicion = PuntoExpedicion.objects.create(
+            establecimiento=establecimiento, codigo='001', nombre='Caja 1'
+        )
+        persona = PersonaFisica.objects.create(
+            tipo_documento=TipoDocumento.objects.create(nombre='CI'),
+            documento='1000',
+            email='cajero@test.com',
+            telefono='0981000000',
+            nombre='Cajero',
+            apellido='Test',
+            nacionalidad=Nacionalidad.objects.create(nombre='Paraguay', codigo_alpha2='PY')
+        )
+        self.empleado = Empleado.objects.create(
+            persona=persona,
+            puesto=Puesto.objects.create(nombre='Cajero'),
+            tipo_remuneracion=TipoRemuneracion.objects.create(nombre='Fijo'),
+            salario=1
+        )
+        self.caja = Caja.objects.create(punto_expedicion=punto_expedicion, nombre='Caja Principal')
+        self.apertura = AperturaCaja.objects.create(
+            caja=self.caja, responsable=self.empleado, monto_inicial=self.MONTO_INICIAL
+        )
+
+    def _movimiento(self, tipo, metodo_pago, monto, **datos):
+        """Movimiento de la apertura de prueba (concepto según el tipo)"""
+        valores = {
+            'apertura_caja': self.apertura,
+            'tipo_movimiento': tipo,
+            'concepto': CONCEPTO_POR_TIPO[tipo],
+            'metodo_pago': metodo_pago,
+            'monto': Decimal(monto),
+            'usuario_registro': self.empleado,
+        }
+        valores.update(datos)
+        return MovimientoCaja.objects.create(**valores)
@@ -0,0 +1,120 @@
+"""
+Tests de los resúmenes de caja calculados con una sola agregación
+(agregar_movimientos_caja + resumir_movimientos_caja): deben coincidir con
+los totales que antes se obtenían con un filter().aggregate(Sum) por resumen.
+
+Ejecutar tests:
+    python manage.py test apps.arqueo_caja.tests_resumen
+"""
+
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.test import TestCase
+
+from apps.arqueo_caja.models import MovimientoCaja
+from apps.arqueo_caja.services import (
+    GRUPOS_METODO_PAGO,
+    agregar_movimientos_caja,
+    calcular_saldo_actual_caja,
+    obtener_movimientos_por_metodo_pago,
+    resumir_movimientos_caja,
+)
+from apps.arqueo_caja.tests_datos import DatosCajaMixin
+
+
+class ResumenCajaTestCase(DatosCajaMixin, TestCase):
+    """Los resúmenes agregados coinciden con un aggregate por resumen"""
+
+    def setUp(self):
+        super().setUp()
+        self._movimiento('ingreso', 'efectivo', '50000')
+        self._movimiento('ingreso', 'efectivo', '25000', concepto='cobro_cuenta')
+        self._movimiento('ingreso', 'tarjeta_debito', '12000', concepto='venta_tarjeta')
+        self._movimiento('ingreso', 'tarjeta_credito', '18000', concepto='venta_tarjeta')
+        self._movimiento('ingreso', 'transferencia', '300000', concepto='transferencia_recibida')
+        self._movimiento('ingreso', 'cheque', '40000', concepto='deposito')
+        self._movimiento('ingreso', 'qr', '7000')
+        self._movimiento('egreso', 'efectivo', '10000')
+        self._movimiento('egreso', 'transferencia', '60000', concepto='pago_proveedor')
+        # Los movimientos anulados no cuentan
+        self._movimiento('ingreso', 'efectivo', '999000', activo=False)
+        self._movimiento('egreso', 'efectivo', '888000', activo=False)
+
+    def _suma(self, movimientos, **filtros):
+        """Cálculo anterior: un aggregate por cada total"""
+        return movimientos.filter(**filtros).aggregate(total=Sum('monto'))['total'] or Decimal('0')
+
+    def test_calcular_saldo_actual_caja(self):
+        movimientos = self.apertura.movimientos.filter(activo=True)
+        total_ingresos = self._suma(movimientos, tipo_movimiento='ingreso')
+        total_egresos = self._suma(movimientos, tipo_movimiento='egreso')
+
+        self.assertEqual(calcular_saldo_actual_caja(self.apertura), {
+            'monto_inicial': self.MONTO_INICIAL,
+            'total_ingresos': total_ingresos,
+            'total_egresos': total_egresos,
+            'saldo_actual': self.MONTO_INICIAL + total_ingresos - total_egresos,
+        })
+
+    def test_obtener_movimientos_por_metodo_pago(self):
+        ingresos = self.apertura.movimientos.filter(activo=True, tipo_movimiento='ingreso')
+
+        self.assertEqual(obtener_movimientos_por_metodo_pago(self.apertura), {
+            metodo: {'nombre': nombre, 'total': self._suma(ingresos, metodo_pago=metodo)}
+            for metodo, nombre in MovimientoCaja.METODOS_PAGO
+        })
+
+    def test_resumir_movimientos_caja(self):
+        movimientos = self.apertura.movimientos.filter(activo=True)
+        ingresos = movimientos.filter(tipo_movimiento='ingreso')
+        total_ingresos = self._suma(movimientos, tipo_movimiento='ingreso')
+        total_egresos = self._suma(movimientos, tipo_movimiento='egreso')
+        ingresos_por_metodo = {
+            grupo: self._suma(ingresos, metodo_pago__in=metodos)
+            for grupo, metodos in GRUPOS_METODO_PAGO.items()
+        }
+
+        # Desde la agregación de los movimientos y desde los totales acumulados
+        for buckets in (agregar_movimientos_caja(movimientos), self.apertura.obtener_totales()):
+            resumen = resumir_movimientos_caja(buckets, self.apertura.monto_inicial)
+
+            self.assertEqual(resumen['ingresos_por_metodo'], ingresos_por_metodo)
+            self.assertEqual(resumen['total_ingresos'], total_ingresos)
+            self.assertEqual(resumen['total_egresos'], total_egresos)
+            self.assertEqual(resumen['cantidad_movimientos'], movimientos.count())
+            self.assertEqual(
+                resumen['saldo_esperado_efectivo'],
+                self.MONTO_INICIAL + ingresos_por_metodo['efectivo'] - total_egresos
+            )
+            self.assertEqual(resumen['saldo_total'], self.MONTO_INICIAL + total_ingresos - total_egresos)
+
+    def test_agregacion_en_una_consulta(self):
+        movimientos = self.apertura.movimientos.filter(activo=True)
+
+        with self.assertNumQueries(1):
+            buckets = agregar_movimientos_caja(movimientos)
+
+        # Un bucket por concepto dentro de cada (tipo, método)
+        self.assertEqual(buckets[('ingreso', 'efectivo', 'venta_efectivo')], {
+            'total': Decimal('50000'), 'cantidad': 1
+        })
+        self.assertEqual(buckets[('ingreso', 'efectivo', 'cobro_cuenta')], {
+            'total': Decimal('25000'), 'cantidad': 1
+        })
+
+    def test_apertura_sin_movimientos(self):
+        self.apertura.movimientos.all().delete()
+
+        resumen = resumir_movimientos_caja(
+            agregar_movimientos_caja(self.apertura.movimientos.filter(activo=True)),
+            self.apertura.monto_inicial
+        )
+
+        self.assertEqual(resumen['total_ingresos'], Decimal('0'))
+        self.assertEqual(resumen['total_egresos'], Decimal('0'))
+        self.assertEqual(resumen['cantidad_movimientos'], 0)
+        self.assertEqual(resumen['saldo_total'], self.MONTO_INICIAL)
+        self.assertEqual(
+            calcular_saldo_actual_caja(self.apertura)['saldo_actual'], self.MONTO_INICIAL
+        )
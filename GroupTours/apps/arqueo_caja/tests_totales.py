@@ -0,0 +1,183 @@
+"""
+Tests de los totales acumulados de una apertura de caja (TotalAperturaCaja):
+- Alta, edición, anulación y borrado de movimientos mantienen los totales
+  iguales a una agregación nueva de los movimientos activos
+- AperturaCaja.reconciliar_totales() y el comando reconciliar_totales_caja
+
+Ejecutar tests:
+    python manage.py test apps.arqueo_caja.tests_totales
+"""
+
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from django.test import TestCase
+
+from apps.arqueo_caja.models import Caja, CierreCaja, MovimientoCaja, TotalAperturaCaja
+from apps.arqueo_caja.tests_datos import DatosCajaMixin
+
+
+class TotalesAperturaTestCase(DatosCajaMixin, TestCase):
+    """Los totales acumulados coinciden siempre con la suma de los movimientos activos"""
+
+    def _agregado(self):
+        """Totales calculados desde cero: {(tipo, metodo): (monto, cantidad)}"""
+        filas = MovimientoCaja.objects.filter(
+            apertura_caja=self.apertura, activo=True
+        ).values('tipo_movimiento', 'metodo_pago').annotate(monto=Sum('monto'), cantidad=Count('id'))
+        return {
+            (fila['tipo_movimiento'], fila['metodo_pago']): (fila['monto'], fila['cantidad'])
+            for fila in filas
+        }
+
+    def _acumulado(self):
+        """Totales de TotalAperturaCaja, sin buckets vacíos"""
+        return {
+            clave: (valores['total'], valores['cantidad'])
+            for clave, valores in self.apertura.obtener_totales().items()
+            if valores['cantidad']
+        }
+
+    def _assert_totales_al_dia(self):
+        self.assertEqual(self._acumulado(), self._agregado())
+        self.assertEqual(self.apertura.reconciliar_totales(reparar=False), [])
+
+        ingresos = sum((m for (tipo, _), (m, _) in self._agregado().items() if tipo == 'ingreso'), Decimal('0'))
+        egresos = sum((m for (tipo, _), (m, _) in self._agregado().items() if tipo == 'egreso'), Decimal('0'))
+        self.caja.refresh_from_db()
+        self.assertEqual(self.caja.saldo_actual, self.MONTO_INICIAL + ingresos - egresos)
+
+    def test_alta(self):
+        self._movimiento('ingreso', 'efectivo', '50000')
+        self._movimiento('ingreso', 'efectivo', '25000')
+        self._movimiento('ingreso', 'transferencia', '300000')
+        self._movimiento('egreso', 'efectivo', '10000')
+
+        self._assert_totales_al_dia()
+        self.assertEqual(self._acumulado()[('ingreso', 'efectivo')], (Decimal('75000'), 2))
+
+    def test_edicion(self):
+        movimiento = self._movimiento('ingreso', 'efectivo', '50000')
+        self._movimiento('ingreso', 'tarjeta_credito', '20000')
+
+        # Cambio de monto
+        movimiento.monto = Decimal('70000')
+        movimiento.save()
+        self._assert_totales_al_dia()
+
+        # Cambio de método de pago: pasa de un bucket a otro
+        movimiento.metodo_pago = 'tarjeta_credito'
+        movimiento.concepto = 'venta_tarjeta'
+        movimiento.save()
+        self._assert_totales_al_dia()
+        self.assertEqual(self._acumulado()[('ingreso', 'tarjeta_credito')], (Decimal('90000'), 2))
+
+        # Cambio de tipo
+        movimiento.tipo_movimiento = 'egreso'
+        movimiento.concepto = 'retiro_efectivo'
+        movimiento.save()
+        self._assert_totales_al_dia()
+
+        # Guardar sin cambios no vuelve a aplicar el movimiento
+        movimiento.save()
+        self._assert_totales_al_dia()
+
+    def test_anulacion_y_reactivacion(self):
+        movimiento = self._movimiento('ingreso', 'efectivo', '50000')
+        self._movimiento('egreso', 'efectivo', '5000')
+
+        movimiento.activo = False
+        movimiento.save()
+        self._assert_totales_al_dia()
+        self.assertNotIn(('ingreso', 'efectivo'), self._acumulado())
+
+        # Un movimiento anulado que se edita no vuelve a los totales
+        movimiento.monto = Decimal('60000')
+        movimiento.save()
+        self._assert_totales_al_dia()
+
+        movimiento.activo = True
+        movimiento.save()
+        self._assert_totales_al_dia()
+        self.assertEqual(self._acumulado()[('ingreso', 'efectivo')], (Decimal('60000'), 1))
+
+    def test_borrado(self):
+        activo = self._movimiento('ingreso', 'efectivo', '50000')
+        anulado = self._movimiento('ingreso', 'efectivo', '10000')
+        anulado.activo = False
+        anulado.save()
+
+        activo.delete()
+        self._assert_totales_al_dia()
+
+        anulado.delete()
+        self._assert_totales_al_dia()
+        self.assertEqual(self._acumulado(), {})
+
+    def test_cierre_usa_los_totales(self):
+        self._movimiento('ingreso', 'efectivo', '50000')
+        self._movimiento('ingreso', 'tarjeta_debito', '20000')
+        self._movimiento('egreso', 'efectivo', '5000')
+
+        cierre = CierreCaja.objects.create(apertura_caja=self.apertura, saldo_real_efectivo=Decimal('145000'))
+        cierre.calcular_totales_desde_movimientos()
+
+        self.assertEqual(cierre.total_efectivo, Decimal('50000'))
+        self.assertEqual(cierre.total_tarjetas, Decimal('20000'))
+        self.assertEqual(cierre.total_egresos, Decimal('5000'))
+        self.assertEqual(cierre.saldo_teorico_efectivo, Decimal('145000'))
+        self.assertEqual(cierre.saldo_teorico_total, Decimal('165000'))
+
+
+class ReconciliarTotalesTestCase(DatosCajaMixin, TestCase):
+    """reconciliar_totales() detecta y corrige totales desfasados"""
+
+    def setUp(self):
+        super().setUp()
+        self._movimiento('ingreso', 'efectivo', '50000')
+        self._movimiento('egreso', 'efectivo', '5000')
+        # bulk_create no pasa por save(): los totales quedan desfasados
+        MovimientoCaja.objects.bulk_create([
+            MovimientoCaja(
+                apertura_caja=self.apertura, numero_movimiento='MOV-TEST-0001',
+                tipo_movimiento='ingreso', concepto='transferencia_recibida',
+                metodo_pago='transferencia', monto=Decimal('30000'), usuario_registro=self.empleado
+            )
+        ])
+        TotalAperturaCaja.objects.filter(
+            apertura_caja=self.apertura, tipo_movimiento='egreso'
+        ).update(monto_total=Decimal('9999'))
+        Caja.objects.filter(pk=self.caja.pk).update(saldo_actual=Decimal('0'))
+
+    def test_solo_reporta(self):
+        diferencias = self.apertura.reconciliar_totales(reparar=False)
+
+        self.assertEqual(
+            sorted((d['tipo_movimiento'], d['metodo_pago'], d['acumulado'], d['real']) for d in diferencias),
+            [
+                ('egreso', 'efectivo', Decimal('9999'), Decimal('5000')),
+                ('ingreso', 'transferencia', Decimal('0'), Decimal('30000')),
+            ]
+        )
+        self.assertEqual(self.apertura.reconciliar_totales(reparar=False), diferencias)
+        self.caja.refresh_from_db()
+        self.assertEqual(self.caja.saldo_actual, Decimal('0'))
+
+    def test_repara(self):
+        self.assertEqual(len(self.apertura.reconciliar_totales()), 2)
+
+        self.assertEqual(self.apertura.reconciliar_totales(reparar=False), [])
+        totales = self.apertura.obtener_totales()
+        self.assertEqual(totales[('ingreso', 'transferencia')], {'total': Decimal('30000'), 'cantidad': 1})
+        self.assertEqual(totales[('egreso', 'efectivo')], {'total': Decimal('5000'), 'cantidad': 1})
+        self.caja.refresh_from_db()
+        self.assertEqual(self.caja.saldo_actual, Decimal('175000'))
+
+    def test_comando(self):
+        call_command('reconciliar_totales_caja', '--dry-run', stdout=StringIO())
+        self.assertEqual(len(self.apertura.reconciliar_totales(reparar=False)), 2)
+
+        call_command('reconciliar_totales_caja', '--apertura', self.apertura.codigo_apertura, stdout=StringIO())
+        self.assertEqual(self.apertura.reconciliar_totales(reparar=False), [])
@@ -319,46 +319,14 @@ class AperturaCajaViewSet(viewsets.ModelViewSet):
             'usuario_registro', 'usuario_registro__persona', 'comprobante'
         ).order_by('-fecha_hora_movimiento')
 
-        # Calcular totales
-        from decimal import Decimal
-        from django.db.models import Sum
-
-        # Ingresos por método de pago
-        ingresos = movimientos.filter(tipo_movimiento='ingreso')
-
-        total_efectivo = ingresos.filter(
-            metodo_pago='efectivo'
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        total_tarjetas = ingresos.filter(
-            metodo_pago__in=['tarjeta_debito', 'tarjeta_credito']
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        total_transferencias = ingresos.filter(
-            metodo_pago='transferencia'
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        total_cheques = ingresos.filter(
-            metodo_pago='cheque'
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        total_otros = ingresos.filter(
-            metodo_pago__in=['qr', 'otro']
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        # Total de todos los ingresos (para información)
-        total_ingresos = total_efectivo + total_tarjetas + total_transferencias + total_cheques + total_otros
-
-        # Egresos
-        total_egresos = movimientos.filter(
-            tipo_movimiento='egreso'
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
+        # Calcular totales (una sola consulta agrupada por tipo/método/concepto)
+        from .services import agregar_movimientos_caja, resumir_movimientos_caja
 
-        # Saldo esperado en EFECTIVO (para arqueo de caja)
-        saldo_esperado_efectivo = apertura.monto_inicial + total_efectivo - total_egresos
-
-        # Saldo total (incluyendo todos los métodos de pago - solo informativo)
-        saldo_total = apertura.monto_inicial + total_ingresos - total_egresos
+        resumen = resumir_movimientos_caja(
+            agregar_movimientos_caja(movimientos),
+            apertura.monto_inicial
+        )
+        ingresos_por_metodo = resumen['ingresos_por_metodo']
 
         data = {
             'apertura': AperturaCajaDetailSerializer(apertura).data,
@@ -368,23 +336,23 @@ class AperturaCajaViewSet(viewsets.ModelViewSet):
 
                 # Desglose de ingresos por método
                 'ingresos_por_metodo': {
-                    'efectivo': total_efectivo,
-                    'tarjetas': total_tarjetas,
-                    'transferencias': total_transferencias,
-                    'cheques': total_cheques,
-                    'otros': total_otros,
-                    'total': total_ingresos
+                    'efectivo': ingresos_por_metodo['efectivo'],
+                    'tarjetas': ingresos_por_metodo['tarjetas'],
+                    'transferencias': ingresos_por_metodo['transferencias'],
+                    'cheques': ingresos_por_metodo['cheques'],
+                    'otros': ingresos_por_metodo['otros'],
+                    'total': resumen['total_ingresos']
                 },
 
-                'total_egresos': total_egresos,
+                'total_egresos': resumen['total_egresos'],
 
                 # Saldo esperado en EFECTIVO (lo que se debe contar físicamente)
-                'saldo_esperado_efectivo': saldo_esperado_efectivo,
+                'saldo_esperado_efectivo': resumen['saldo_esperado_efectivo'],
 
                 # Saldo total (incluyendo todos los métodos - solo informativo)
-                'saldo_total': saldo_total,
+                'saldo_total': resumen['saldo_total'],
 
-                'cantidad_movimientos': movimientos.count()
+                'cantidad_movimientos': resumen['cantidad_movimientos']
             }
         }
 
@@ -425,17 +393,30 @@ class AperturaCajaViewSet(viewsets.ModelViewSet):
         """Resumen estadístico de aperturas"""
         from decimal import Decimal
 
-        total = AperturaCaja.objects.count()
-        activas = AperturaCaja.objects.filter(activo=True).count()
-        inactivas = AperturaCaja.objects.filter(activo=False).count()
-        abiertas = AperturaCaja.objects.filter(esta_abierta=True, activo=True).count()
-        cerradas = AperturaCaja.objects.filter(esta_abierta=False, activo=True).count()
+        ultimos_30_dias = timezone.now() - timedelta(days=30)
+        hoy = timezone.now().date()
 
-        # Monto total inicial en aperturas abiertas
-        monto_total_inicial = AperturaCaja.objects.filter(
-            esta_abierta=True,
-            activo=True
-        ).aggregate(total=Sum('monto_inicial'))['total'] or Decimal('0')
+        # Todos los contadores en una sola consulta (agregación condicional)
+        abiertas_q = Q(esta_abierta=True, activo=True)
+        conteos = AperturaCaja.objects.aggregate(
+            total=Count('id'),
+            activas=Count('id', filter=Q(activo=True)),
+            inactivas=Count('id', filter=Q(activo=False)),
+            abiertas=Count('id', filter=abiertas_q),
+            cerradas=Count('id', filter=Q(esta_abierta=False, activo=True)),
+            # Monto total inicial en aperturas abiertas
+            monto_total_inicial=Sum('monto_inicial', filter=abiertas_q),
+            nuevas=Count('id', filter=Q(fecha_hora_apertura__gte=ultimos_30_dias)),
+            aperturas_hoy=Count('id', filter=Q(fecha_hora_apertura__date=hoy)),
+        )
+        total = conteos['total']
+        activas = conteos['activas']
+        inactivas = conteos['inactivas']
+        abiertas = conteos['abiertas']
+        cerradas = conteos['cerradas']
+        monto_total_inicial = conteos['monto_total_inicial'] or Decimal('0')
+        nuevas = conteos['nuevas']
+        aperturas_hoy = conteos['aperturas_hoy']
 
         # Total de movimientos en aperturas activas
         total_movimientos = MovimientoCaja.objects.filter(
@@ -444,15 +425,6 @@ class AperturaCajaViewSet(viewsets.ModelViewSet):
             activo=True
         ).count()
 
-        ultimos_30_dias = timezone.now() - timedelta(days=30)
-        nuevas = AperturaCaja.objects.filter(fecha_hora_apertura__gte=ultimos_30_dias).count()
-
-        # Hoy
-        hoy = timezone.now().date()
-        aperturas_hoy = AperturaCaja.objects.filter(
-            fecha_hora_apertura__date=hoy
-        ).count()
-
         data = [
             {'texto': 'Total Aperturas', 'valor': str(total)},
             {'texto': 'Activas', 'valor': str(activas)},
@@ -487,9 +459,10 @@ class AperturaCajaViewSet(viewsets.ModelViewSet):
             - cantidad_movimientos: Cantidad de movimientos registrados
             - notificacion: Mensaje informativo sobre el estado de la caja
         """
-        from .services import obtener_caja_abierta_por_usuario
+        from .services import (
+            obtener_caja_abierta_por_usuario, agregar_movimientos_caja, resumir_movimientos_caja
+        )
         from decimal import Decimal
-        from django.db.models import Sum
 
         try:
             empleado = request.user.empleado
@@ -502,18 +475,13 @@ class AperturaCajaViewSet(viewsets.ModelViewSet):
         apertura = obtener_caja_abierta_por_usuario(empleado)
 
         if apertura:
-            # Calcular totales de movimientos
-            movimientos_activos = apertura.movimientos.filter(activo=True)
-
-            total_ingresos = movimientos_activos.filter(
-                tipo_movimiento='ingreso'
-            ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-            total_egresos = movimientos_activos.filter(
-                tipo_movimiento='egreso'
-            ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-            cantidad_movimientos = movimientos_activos.count()
+            # Calcular totales de movimientos (una sola consulta agrupada)
+            resumen = resumir_movimientos_caja(
+                agregar_movimientos_caja(apertura.movimientos.filter(activo=True))
+            )
+            total_ingresos = resumen['total_ingresos']
+            total_egresos = resumen['total_egresos']
+            cantidad_movimientos = resumen['cantidad_movimientos']
 
             # Obtener saldo actual de la caja
             saldo_actual = apertura.caja.saldo_actual
@@ -613,6 +581,8 @@ class MovimientoCajaViewSet(viewsets.ModelViewSet):
         'usuario_registro', 'comprobante', 'activo'
     ]
     pagination_class = CustomPageNumberPagination
+    # Clave del modo ?cursor= (índice mov_caja_fecha_id_idx)
+    cursor_ordering = ('-fecha_hora_movimiento', '-id')
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -691,93 +661,64 @@ class MovimientoCajaViewSet(viewsets.ModelViewSet):
         """
         from decimal import Decimal
 
-        # Contadores generales
-        total = MovimientoCaja.objects.filter(activo=True).count()
-        inactivos = MovimientoCaja.objects.filter(activo=False).count()
-        ingresos_count = MovimientoCaja.objects.filter(
-            tipo_movimiento='ingreso',
-            activo=True
-        ).count()
-        egresos_count = MovimientoCaja.objects.filter(
-            tipo_movimiento='egreso',
-            activo=True
-        ).count()
+        hoy = timezone.now().date()
+        ultimos_30_dias = timezone.now() - timedelta(days=30)
 
-        # Montos totales
-        total_ingresos = MovimientoCaja.objects.filter(
-            tipo_movimiento='ingreso',
-            activo=True
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
+        # Todos los contadores y montos en una sola consulta (agregación condicional)
+        activo_q = Q(activo=True)
+        ingreso_q = activo_q & Q(tipo_movimiento='ingreso')
+        egreso_q = activo_q & Q(tipo_movimiento='egreso')
+        hoy_q = Q(fecha_hora_movimiento__date=hoy)
+        ultimos_30_q = Q(fecha_hora_movimiento__gte=ultimos_30_dias)
+
+        totales = MovimientoCaja.objects.aggregate(
+            # Contadores generales
+            total=Count('id', filter=activo_q),
+            inactivos=Count('id', filter=Q(activo=False)),
+            ingresos_count=Count('id', filter=ingreso_q),
+            egresos_count=Count('id', filter=egreso_q),
+            # Montos totales
+            total_ingresos=Sum('monto', filter=ingreso_q),
+            total_egresos=Sum('monto', filter=egreso_q),
+            # Por método de pago (ingresos)
+            efectivo=Sum('monto', filter=ingreso_q & Q(metodo_pago='efectivo')),
+            tarjetas=Sum('monto', filter=ingreso_q & Q(metodo_pago__in=['tarjeta_debito', 'tarjeta_credito'])),
+            transferencias=Sum('monto', filter=ingreso_q & Q(metodo_pago='transferencia')),
+            # Movimientos con comprobante asociado
+            con_comprobante=Count('id', filter=activo_q & Q(comprobante__isnull=False)),
+            sin_comprobante=Count('id', filter=activo_q & Q(comprobante__isnull=True)),
+            # Movimientos de hoy
+            movimientos_hoy=Count('id', filter=activo_q & hoy_q),
+            ingresos_hoy=Sum('monto', filter=ingreso_q & hoy_q),
+            egresos_hoy=Sum('monto', filter=egreso_q & hoy_q),
+            # Últimos 30 días
+            nuevos_30_dias=Count('id', filter=activo_q & ultimos_30_q),
+            ingresos_30_dias=Sum('monto', filter=ingreso_q & ultimos_30_q),
+        )
+        for campo in ('total_ingresos', 'total_egresos', 'efectivo', 'tarjetas', 'transferencias',
+                      'ingresos_hoy', 'egresos_hoy', 'ingresos_30_dias'):
+            totales[campo] = totales[campo] or Decimal('0')
 
-        total_egresos = MovimientoCaja.objects.filter(
-            tipo_movimiento='egreso',
-            activo=True
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
+        total = totales['total']
+        inactivos = totales['inactivos']
+        ingresos_count = totales['ingresos_count']
+        egresos_count = totales['egresos_count']
+        total_ingresos = totales['total_ingresos']
+        total_egresos = totales['total_egresos']
 
         # Balance neto
         balance_neto = total_ingresos - total_egresos
 
-        # Por método de pago (ingresos)
-        efectivo = MovimientoCaja.objects.filter(
-            metodo_pago='efectivo',
-            tipo_movimiento='ingreso',
-            activo=True
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        tarjetas = MovimientoCaja.objects.filter(
-            metodo_pago__in=['tarjeta_debito', 'tarjeta_credito'],
-            tipo_movimiento='ingreso',
-            activo=True
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        transferencias = MovimientoCaja.objects.filter(
-            metodo_pago='transferencia',
-            tipo_movimiento='ingreso',
-            activo=True
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        # Movimientos con comprobante asociado
-        con_comprobante = MovimientoCaja.objects.filter(
-            comprobante__isnull=False,
-            activo=True
-        ).count()
-
-        sin_comprobante = MovimientoCaja.objects.filter(
-            comprobante__isnull=True,
-            activo=True
-        ).count()
-
-        # Movimientos de hoy
-        hoy = timezone.now().date()
-        movimientos_hoy = MovimientoCaja.objects.filter(
-            fecha_hora_movimiento__date=hoy,
-            activo=True
-        ).count()
-
-        ingresos_hoy = MovimientoCaja.objects.filter(
-            fecha_hora_movimiento__date=hoy,
-            tipo_movimiento='ingreso',
-            activo=True
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        egresos_hoy = MovimientoCaja.objects.filter(
-            fecha_hora_movimiento__date=hoy,
-            tipo_movimiento='egreso',
-            activo=True
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
-
-        # Últimos 30 días
-        ultimos_30_dias = timezone.now() - timedelta(days=30)
-        nuevos_30_dias = MovimientoCaja.objects.filter(
-            fecha_hora_movimiento__gte=ultimos_30_dias,
-            activo=True
-        ).count()
-
-        ingresos_30_dias = MovimientoCaja.objects.filter(
-            fecha_hora_movimiento__gte=ultimos_30_dias,
-            tipo_movimiento='ingreso',
-            activo=True
-        ).aggregate(total=Sum('monto'))['total'] or Decimal('0')
+        efectivo = totales['efectivo']
+        tarjetas = totales['tarjetas']
+        transferencias = totales['transferencias']
+        con_comprobante = totales['con_comprobante']
+        sin_comprobante = totales['sin_comprobante']
+        movimientos_hoy = totales['movimientos_hoy']
+        ingresos_hoy = totales['ingresos_hoy']
+        egresos_hoy = totales['egresos_hoy']
+        nuevos_30_dias = totales['nuevos_30_dias']
+        ingresos_30_dias = totales['ingresos_30_dias']
 
         data = [
             {'texto': 'Total Movimientos', 'valor': str(total)},
@@ -1060,21 +1001,25 @@ class CierreCajaViewSet(viewsets.ModelViewSet):
 
         GET /api/arqueo-caja/cierres/{id}/pdf/
 
+        Query params:
+            - regenerar: true/false (default: false) - Fuerza la regeneración del PDF
+
         Returns:
-            PDF file con los datos completos del cierre de caja
+            PDF file con los datos completos del cierre de caja, o 202 con
+            poll_url mientras se genera en segundo plano (ver apps/generacion_pdf)
         """
-        from django.http import HttpResponse
+        from apps.generacion_pdf.views import respuesta_pdf
 
         cierre = self.get_object()
-
-        # Generar PDF
-        pdf_buffer = cierre.generar_pdf()
-
-        # Crear respuesta HTTP con el PDF
-        response = HttpResponse(pdf_buffer.read(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="cierre_{cierre.codigo_cierre}.pdf"'
-
-        return response
+        regenerar = request.query_params.get('regenerar', 'false').lower() == 'true'
+
+        return respuesta_pdf(
+            request,
+            'cierre_caja',
+            cierre,
+            f'cierre_{cierre.codigo_cierre}.pdf',
+            regenerar=regenerar
+        )
 
     @action(detail=False, methods=['post'], url_path='cerrar-cajas-abiertas')
     def cerrar_cajas_abiertas(self, request):
@@ -0,0 +1,149 @@
+"""
+Comando de Django para generar en bloque los vouchers de los pasajeros que ya
+cumplen las condiciones (datos reales cargados y pago completo) y sincronizar
+Pasajero.voucher_codigo con los vouchers activos.
+
+Reemplaza a los scripts generar_vouchers_existentes.py y
+sincronizar_vouchers_pasajeros.py. Los pasajeros se procesan por lotes con
+generar_vouchers_pasajeros(); los QR y PDF quedan encolados para el worker
+(python manage.py procesar_trabajos_pdf).
+
+Uso:
+    python manage.py generar_vouchers_pasajeros
+
+Opciones:
+    --dry-run : Solo reporta los vouchers a generar sin aplicar cambios
+    --reserva CODIGO : Solo procesar los pasajeros de una reserva
+    --batch-size N : Cantidad de pasajeros por lote (default 500)
+    --sin-pdf : No encolar la generación de los PDF
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+
+from apps.comprobante.models import Voucher
+from apps.comprobante.signals import generar_vouchers_pasajeros
+from apps.reserva.models import Pasajero, PasajeroLedger
+from apps.reserva.services import construir_ledgers_desde_origen
+
+
+class Command(BaseCommand):
+    help = 'Genera en bloque los vouchers faltantes y sincroniza Pasajero.voucher_codigo'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo reporta los vouchers a generar sin aplicar cambios a la base de datos',
+        )
+        parser.add_argument(
+            '--reserva',
+            type=str,
+            help='Código de reserva a procesar (ej: RSV-2025-0001)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Cantidad de pasajeros a procesar por lote',
+        )
+        parser.add_argument(
+            '--sin-pdf',
+            action='store_true',
+            help='No encolar la generación de los PDF de los vouchers creados',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        codigo_reserva = options.get('reserva')
+        batch_size = options['batch_size']
+
+        # Banner
+        self.stdout.write(self.style.MIGRATE_HEADING('\n' + '='*70))
+        self.stdout.write(self.style.MIGRATE_HEADING('  GENERAR VOUCHERS DE PASAJEROS'))
+        self.stdout.write(self.style.MIGRATE_HEADING('='*70 + '\n'))
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('[!] MODO DRY-RUN: No se aplicaran cambios\n'))
+
+        pasajeros = Pasajero.objects.all()
+        if codigo_reserva:
+            pasajeros = pasajeros.filter(reserva__codigo=codigo_reserva)
+            self.stdout.write(f'Filtrando por reserva: {codigo_reserva}\n')
+
+        # 1. Sincronizar voucher_codigo de los pasajeros que ya tienen voucher activo
+        desincronizados = pasajeros.filter(voucher__activo=True).exclude(
+            voucher_codigo=F('voucher__codigo_voucher')
+        )
+        total_desincronizados = desincronizados.count()
+        if not dry_run and total_desincronizados:
+            Pasajero.objects.filter(pk__in=desincronizados.values('pk')).update(
+                voucher_codigo=Subquery(
+                    Voucher.objects.filter(pasajero=OuterRef('pk')).values('codigo_voucher')[:1]
+                )
+            )
+        self.stdout.write(f'Pasajeros con voucher_codigo desactualizado: {total_desincronizados}')
+
+        # 2. Generar los vouchers faltantes, por lotes
+        candidatos = list(
+            pasajeros.filter(por_asignar=False, voucher__isnull=True)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        total = len(candidatos)
+        self.stdout.write(f'Pasajeros con datos reales y sin voucher: {total}\n')
+
+        generados = 0
+        for inicio in range(0, total, batch_size):
+            ids_lote = candidatos[inicio:inicio + batch_size]
+            if dry_run:
+                cantidad = self._contar_pagados(ids_lote)
+            else:
+                with transaction.atomic():
+                    cantidad = len(generar_vouchers_pasajeros(ids_lote, encolar_pdf=not options['sin_pdf']))
+            generados += cantidad
+            self.stdout.write(f'  Lote {inicio // batch_size + 1}: {len(ids_lote)} pasajeros, {cantidad} con pago completo')
+
+        # Resumen final
+        self.stdout.write('\n' + '='*70)
+        self.stdout.write(self.style.MIGRATE_HEADING('  RESUMEN'))
+        self.stdout.write('='*70 + '\n')
+
+        self.stdout.write(f'Pasajeros con datos reales y sin voucher: {total}')
+        self.stdout.write(f'  Con pago completo: {generados}')
+        self.stdout.write(f'  Sin pago completo: {total - generados}')
+        self.stdout.write(f'voucher_codigo desactualizados: {total_desincronizados}')
+
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'\n[!] {generados} voucher(s) y {total_desincronizados} voucher_codigo pendiente(s). '
+                    'Ejecuta sin --dry-run para aplicar los cambios.'
+                )
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'\n[OK] {generados} voucher(s) generados y {total_desincronizados} pasajero(s) sincronizados.'
+                )
+            )
+            if generados and not options['sin_pdf']:
+                self.stdout.write('Los PDF quedaron encolados: python manage.py procesar_trabajos_pdf')
+
+        self.stdout.write('')
+
+    def _contar_pagados(self, pasajero_ids):
+        """Cuenta los pasajeros con pago completo sin crear ledgers (modo dry-run)."""
+        pasajeros = list(Pasajero.objects.filter(pk__in=pasajero_ids).select_related('ledger'))
+        sin_ledger = []
+        for pasajero in pasajeros:
+            try:
+                pasajero.ledger
+            except PasajeroLedger.DoesNotExist:
+                sin_ledger.append(pasajero)
+        # Solo en memoria: esta_totalmente_pagado lee pasajero.ledger
+        ledgers = construir_ledgers_desde_origen(sin_ledger)
+        for pasajero in sin_ledger:
+            pasajero.ledger = ledgers[pasajero.pk]
+        return sum(1 for pasajero in pasajeros if pasajero.esta_totalmente_pagado)
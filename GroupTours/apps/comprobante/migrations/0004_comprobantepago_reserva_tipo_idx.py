@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-17 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comprobante', '0003_migrar_vouchers_a_pasajeros'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comprobantepago',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['reserva', 'tipo'], name='comprobante_reserva_tipo_idx'),
+        ),
+    ]
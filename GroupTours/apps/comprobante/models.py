@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 from django.utils.timezone import now
 from decimal import Decimal
@@ -105,6 +105,14 @@ class ComprobantePago(models.Model):
         verbose_name_plural = "Comprobantes de Pago"
         db_table = "ComprobantePago"
         ordering = ["-fecha_pago"]
+        indexes = [
+            # Pagos vigentes de una reserva por tipo (reserva + activo=True + tipo)
+            models.Index(
+                fields=["reserva", "tipo"],
+                name="comprobante_reserva_tipo_idx",
+                condition=models.Q(activo=True),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.numero_comprobante} - {self.reserva.codigo} - ${self.monto}"
@@ -114,11 +122,8 @@ class ComprobantePago(models.Model):
 
         # Generar número único de comprobante
         if not self.numero_comprobante:
-            year = now().year
-            last_id = ComprobantePago.objects.filter(
-                fecha_pago__year=year
-            ).count() + 1
-            self.numero_comprobante = f"CPG-{year}-{last_id:04d}"
+            from apps.secuencia.services import generar_codigo
+            self.numero_comprobante = generar_codigo('CPG')
 
         # Extraer usuario_registro si fue pasado como kwarg
         usuario_registro = kwargs.pop('usuario_registro', None)
@@ -129,6 +134,11 @@ class ComprobantePago(models.Model):
         if es_nuevo and self.activo:
             self._generar_movimiento_caja(usuario_registro=usuario_registro)
 
+        # Una devolución asociada a una NC deja de descontar esa NC en el ledger
+        if self.tipo == 'devolucion' and (self.referencia or '').startswith('NC:'):
+            from apps.reserva.services import recalcular_creditos_ledger_reserva
+            recalcular_creditos_ledger_reserva(self.reserva_id)
+
     def validar_distribuciones(self):
         """
         Valida que la suma de distribuciones sea igual al monto total del comprobante.
@@ -414,6 +424,11 @@ class ComprobantePago(models.Model):
             self.observaciones = f"ANULADO: {motivo}\n{self.observaciones or ''}"
         self.save()
 
+        # Revertir las distribuciones en el ledger de cada pasajero
+        from apps.reserva.services import aplicar_distribucion_en_ledger
+        for distribucion in self.distribuciones.all():
+            aplicar_distribucion_en_ledger(distribucion, signo=-1)
+
         # Anular movimiento de caja asociado si existe
         self._anular_movimiento_caja(motivo)
 
@@ -445,7 +460,7 @@ class ComprobantePago(models.Model):
             movimiento.save()
 
             # Recalcular saldo de la caja
-            # El método actualizar_saldo_caja se ejecuta en el save del MovimientoCaja
+            # El saldo de la caja se actualiza con deltas en el save del MovimientoCaja
 
     def generar_pdf(self):
         """
@@ -784,6 +799,41 @@ class ComprobantePagoDistribucion(models.Model):
     def __str__(self):
         return f"{self.comprobante.numero_comprobante} → {self.pasajero.persona} (${self.monto})"
 
+    def save(self, *args, **kwargs):
+        es_nueva = self._state.adding
+        pasajero_anterior_id = None
+        if not es_nueva:
+            pasajero_anterior_id = ComprobantePagoDistribucion.objects.filter(
+                pk=self.pk
+            ).values_list('pasajero_id', flat=True).first()
+
+        from apps.reserva.models import Pasajero
+        from apps.reserva.services import aplicar_distribucion_en_ledger, recalcular_ledger_pasajero
+
+        # Atómico: la revisión del voucher (post_save, ver signals.py) se ejecuta
+        # al confirmar, cuando el ledger ya refleja esta distribución
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            # Mantener el ledger del pasajero (apps.reserva.PasajeroLedger)
+            if es_nueva:
+                if self.comprobante.activo:
+                    aplicar_distribucion_en_ledger(self)
+            else:
+                # Edición: se desconoce el monto anterior, se recalcula desde el origen
+                for pasajero_id in {self.pasajero_id, pasajero_anterior_id} - {None}:
+                    recalcular_ledger_pasajero(Pasajero.objects.get(pk=pasajero_id))
+
+    def delete(self, *args, **kwargs):
+        activa = self.comprobante.activo
+        resultado = super().delete(*args, **kwargs)
+
+        if activa:
+            from apps.reserva.services import aplicar_distribucion_en_ledger
+            aplicar_distribucion_en_ledger(self, signo=-1)
+
+        return resultado
+
     def clean(self):
         """
         Validaciones de negocio para la distribución.
@@ -910,15 +960,23 @@ class Voucher(models.Model):
         if not self.codigo_voucher:
             # NUEVO: Voucher por pasajero
             if self.pasajero:
-                reserva_codigo = self.pasajero.reserva.codigo
-                pasajero_id = self.pasajero.id
-                self.codigo_voucher = f"{reserva_codigo}-PAX-{pasajero_id:03d}-VOUCHER"
+                self.codigo_voucher = self.codigo_para_pasajero(self.pasajero)
             # LEGACY: Voucher por reserva (para compatibilidad durante migración)
             elif self.reserva:
                 self.codigo_voucher = f"{self.reserva.codigo}-VOUCHER"
 
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def codigo_para_pasajero(pasajero):
+        """
+        Código del voucher de un pasajero (ej: RSV-2025-0001-PAX-003-VOUCHER).
+
+        Usado por save() y por la creación en bloque de vouchers
+        (apps.comprobante.signals.generar_vouchers_pasajeros), que no pasa por save().
+        """
+        return f"{pasajero.reserva.codigo}-PAX-{pasajero.id:03d}-VOUCHER"
+
     def generar_qr(self):
         """
         Genera el código QR con la información del voucher.
@@ -981,6 +1039,15 @@ class Voucher(models.Model):
         if not self.pasajero:
             raise ValidationError("No se puede generar PDF para vouchers legacy sin pasajero")
 
+        # El QR se renderiza junto con el PDF (en el worker de apps.generacion_pdf),
+        # no al crear el voucher. Se guarda solo el archivo, sin disparar save().
+        if not self.qr_code:
+            try:
+                self.generar_qr()
+                Voucher.objects.filter(pk=self.pk).update(qr_code=self.qr_code.name)
+            except Exception as qr_error:
+                print(f"[WARN] PDF de voucher {self.codigo_voucher} sin QR: {qr_error}")
+
         # Crear buffer para el PDF
         buffer = BytesIO()
 
@@ -1,55 +1,133 @@
+import logging
+import weakref
+from functools import partial
+
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from apps.reserva.models import Pasajero
 from .models import Voucher, ComprobantePagoDistribucion
 
+logger = logging.getLogger(__name__)
 
-def generar_voucher_si_cumple_condiciones(pasajero):
+
+def generar_vouchers_pasajeros(pasajero_ids, encolar_pdf=True):
     """
-    Función auxiliar que verifica si un pasajero cumple las condiciones para tener voucher
-    y lo genera si corresponde.
+    Genera en bloque los vouchers de los pasajeros que cumplen las condiciones.
 
     Condiciones:
     1. Tiene datos reales cargados (por_asignar=False)
     2. Ha pagado el 100% de su precio asignado (esta_totalmente_pagado=True)
+    3. Todavía no tiene voucher
+
+    Los pasajeros se cargan en una sola consulta (con su ledger), los vouchers se
+    crean con bulk_create y Pasajero.voucher_codigo se actualiza con bulk_update.
+    El QR y el PDF no se renderizan aquí: el PDF se encola en apps.generacion_pdf
+    y el worker genera el QR al renderizarlo (Voucher.generar_pdf).
+
+    Args:
+        pasajero_ids (iterable[int]): IDs de los pasajeros a revisar
+        encolar_pdf (bool): Encolar el PDF de cada voucher creado
 
     Returns:
-        Voucher si se creó, None si no se creó o ya existía
+        list[Voucher]: Vouchers creados
     """
-    # Verificar si el pasajero cumple las condiciones para tener voucher
-    if not pasajero.por_asignar and pasajero.esta_totalmente_pagado:
-        # Verificar si ya existe un voucher para este pasajero
-        try:
-            # Intentar obtener el voucher existente
-            if hasattr(pasajero, 'voucher') and pasajero.voucher:
-                print(f"[INFO] Voucher ya existe para pasajero {pasajero.id}: {pasajero.voucher.codigo_voucher}")
-                return None
-        except Voucher.DoesNotExist:
-            pass
-
-        # No existe voucher, crearlo
-        try:
-            voucher = Voucher.objects.create(pasajero=pasajero)
-
-            # Actualizar el campo voucher_codigo en el pasajero INMEDIATAMENTE después de crear el voucher
-            # Esto garantiza que el campo se actualice incluso si falla la generación del QR
-            Pasajero.objects.filter(pk=pasajero.pk).update(voucher_codigo=voucher.codigo_voucher)
-
-            # Generar código QR automáticamente
+    from apps.generacion_pdf.services import solicitar_pdf
+
+    pasajero_ids = set(pasajero_ids)
+    if not pasajero_ids:
+        return []
+
+    candidatos = Pasajero.objects.filter(
+        pk__in=pasajero_ids,
+        por_asignar=False,
+        voucher__isnull=True
+    ).select_related('reserva', 'ledger').order_by('pk')
+    pagados = [pasajero for pasajero in candidatos if pasajero.esta_totalmente_pagado]
+    if not pagados:
+        return []
+
+    # ignore_conflicts: otra transacción pudo crear el voucher de alguno de estos pasajeros
+    Voucher.objects.bulk_create(
+        [
+            Voucher(pasajero=pasajero, codigo_voucher=Voucher.codigo_para_pasajero(pasajero))
+            for pasajero in pagados
+        ],
+        ignore_conflicts=True
+    )
+    vouchers = list(
+        Voucher.objects.filter(pasajero__in=pagados).select_related('pasajero').order_by('pasajero_id')
+    )
+
+    # Referencia rápida en el pasajero (bulk_update no dispara las señales de Pasajero)
+    for voucher in vouchers:
+        voucher.pasajero.voucher_codigo = voucher.codigo_voucher
+    Pasajero.objects.bulk_update([voucher.pasajero for voucher in vouchers], ['voucher_codigo'])
+
+    logger.debug("Vouchers generados: %s", [voucher.codigo_voucher for voucher in vouchers])
+
+    if encolar_pdf:
+        for voucher in vouchers:
             try:
-                voucher.generar_qr()
-                voucher.save()
-                print(f"[OK] Voucher generado: {voucher.codigo_voucher} para pasajero {pasajero.persona} (con QR)")
-            except Exception as qr_error:
-                # Si falla el QR, el voucher igual se crea (sin QR)
-                print(f"[WARN] Voucher creado sin QR: {voucher.codigo_voucher} - Error: {qr_error}")
+                # Solo se encola: el QR y el PDF los renderiza el worker o la descarga
+                solicitar_pdf('voucher', voucher, solo_encolar=True)
+            except Exception as e:
+                # El voucher ya existe; el PDF se puede generar luego desde descargar-pdf
+                logger.warning("PDF del voucher %s no encolado: %s", voucher.codigo_voucher, e)
+
+    return vouchers
+
+
+def generar_voucher_si_cumple_condiciones(pasajero):
+    """
+    Función auxiliar que verifica si un pasajero cumple las condiciones para tener voucher
+    y lo genera si corresponde (ver generar_vouchers_pasajeros).
+
+    Returns:
+        Voucher si se creó, None si no se creó o ya existía
+    """
+    vouchers = generar_vouchers_pasajeros([pasajero.pk])
+    return vouchers[0] if vouchers else None
+
+
+# Pasajeros a revisar al confirmar la transacción en curso, por conexión
+_revisiones_pendientes = weakref.WeakKeyDictionary()
+
+
+def _revisar_pendientes(connection):
+    """
+    Callback de transaction.on_commit: revisa en un solo lote los pasajeros
+    acumulados en la conexión. Los callbacks siguientes de la misma transacción
+    encuentran el conjunto vacío y no hacen nada.
+    """
+    pasajero_ids = _revisiones_pendientes.pop(connection, None)
+    if pasajero_ids:
+        generar_vouchers_pasajeros(pasajero_ids)
+
 
-            return voucher
-        except Exception as e:
-            print(f"[ERROR] Error generando voucher para pasajero {pasajero.id}: {e}")
-            return None
+def programar_revision_voucher(pasajero_id, using=None):
+    """
+    Programa la revisión del voucher de un pasajero al confirmar la transacción actual.
+
+    Los IDs se acumulan por conexión, por lo que cada pasajero se revisa una
+    única vez al confirmar aunque se hayan guardado varias distribuciones suyas.
+    Si la transacción (o un savepoint) se revierte, Django descarta sus
+    callbacks; los IDs que queden acumulados se revisan en el próximo commit,
+    lo que es inocuo porque la revisión parte del estado de la base de datos.
+
+    Fuera de una transacción (autocommit) la revisión se ejecuta inmediatamente.
+
+    Args:
+        pasajero_id (int): ID del pasajero
+        using (str): Alias de la base de datos (opcional)
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        generar_vouchers_pasajeros([pasajero_id])
+        return
 
-    return None
+    _revisiones_pendientes.setdefault(connection, set()).add(pasajero_id)
+    transaction.on_commit(partial(_revisar_pendientes, connection), using=using)
 
 
 @receiver(post_save, sender=Pasajero)
@@ -61,13 +139,17 @@ def crear_voucher_para_pasajero_al_guardar(sender, instance, created, **kwargs):
     - Se crea un pasajero nuevo con datos completos y pago total
     - Se actualiza un pasajero (ej: cambiar de por_asignar=True a False)
 
-    Genera el voucher automáticamente si cumple las condiciones.
+    La verificación se difiere al commit de la transacción (programar_revision_voucher).
     """
     # Evitar ejecutar si estamos en una transacción de raw SQL o fixtures
     if kwargs.get('raw', False):
         return
 
-    generar_voucher_si_cumple_condiciones(instance)
+    # Sin datos reales no corresponde voucher; no hace falta revisar el pago
+    if instance.por_asignar:
+        return
+
+    programar_revision_voucher(instance.pk, using=kwargs.get('using'))
 
 
 @receiver(post_save, sender=ComprobantePagoDistribucion)
@@ -76,7 +158,8 @@ def crear_voucher_para_pasajero_al_pagar(sender, instance, created, **kwargs):
     Signal que se dispara cuando se crea o actualiza una ComprobantePagoDistribucion.
 
     Esto captura cuando se registra un pago (parcial o total) para un pasajero.
-    Verifica si con este pago el pasajero ahora cumple las condiciones para tener voucher.
+    Las distribuciones de un mismo comprobante se acumulan y cada pasajero se
+    verifica una sola vez al confirmar la transacción (programar_revision_voucher).
 
     Se ejecuta automáticamente en los endpoints:
     - POST /api/reservas/{id}/registrar-senia/
@@ -88,6 +171,4 @@ def crear_voucher_para_pasajero_al_pagar(sender, instance, created, **kwargs):
 
     # Solo verificar si el comprobante está activo (no anulado)
     if instance.comprobante.activo:
-        pasajero = instance.pasajero
-        print(f"[INFO] Pago registrado para pasajero {pasajero.id}. Verificando condiciones para voucher...")
-        generar_voucher_si_cumple_condiciones(pasajero)
+        programar_revision_voucher(instance.pasajero_id, using=kwargs.get('using'))
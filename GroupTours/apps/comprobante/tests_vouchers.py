@@ -0,0 +1,137 @@
+"""
+Tests de la generación de vouchers por pasajero (apps/comprobante/signals.py y
+comando generar_vouchers_pasajeros).
+
+Ejecutar tests:
+    python manage.py test apps.comprobante.tests_vouchers
+"""
+
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+
+from apps.comprobante import signals
+from apps.comprobante.models import ComprobantePago, ComprobantePagoDistribucion, Voucher
+from apps.empleado.models import Empleado
+from apps.generacion_pdf.models import TrabajoPDF
+from apps.paquete.tests_datos import DatosSalidaMixin
+from apps.puesto.models import Puesto
+from apps.reserva.models import Pasajero
+from apps.tipo_remuneracion.models import TipoRemuneracion
+
+
+class VouchersPasajerosTestCase(DatosSalidaMixin, TestCase):
+    """Los vouchers se revisan una vez por transacción y se generan en bloque"""
+
+    COSTO_BASE = Decimal('500')
+    SENIA = Decimal('100')
+    CUPO_ASIENTOS = 10
+
+    def setUp(self):
+        super().setUp()
+        self.reserva = self._crear_reserva(2)
+        # La revisión que programan estos saves se ejecuta aquí (sin pagos: no hay vouchers)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pasajeros = [
+                Pasajero.objects.create(
+                    reserva=self.reserva, persona=persona, es_titular=es_titular, precio_asignado=Decimal('500')
+                )
+                for persona, es_titular in ((self.titular, True), (self._persona('2000'), False))
+            ]
+        self.empleado = Empleado.objects.create(
+            persona=self._persona('3000'),
+            puesto=Puesto.objects.create(nombre='Cajero'),
+            tipo_remuneracion=TipoRemuneracion.objects.create(nombre='Fijo'),
+            salario=1
+        )
+
+    def _comprobantes(self, cantidad):
+        # bulk_create: sin caja abierta ni movimientos, solo interesan las distribuciones
+        return ComprobantePago.objects.bulk_create([
+            ComprobantePago(
+                reserva=self.reserva, tipo='pago_parcial', monto=Decimal('500'), metodo_pago='transferencia',
+                numero_comprobante=f'CPG-TEST-{numero}', empleado=self.empleado
+            )
+            for numero in range(cantidad)
+        ])
+
+    def _pagar(self, comprobantes, monto):
+        for comprobante in comprobantes:
+            for pasajero in self.pasajeros:
+                ComprobantePagoDistribucion.objects.create(
+                    comprobante=comprobante, pasajero=pasajero, monto=Decimal(monto)
+                )
+
+    def test_una_revision_por_transaccion(self):
+        revisar = mock.patch.object(
+            signals, 'generar_vouchers_pasajeros', wraps=signals.generar_vouchers_pasajeros
+        )
+        # Con la configuración por defecto (PDF_GENERACION_ASINCRONA=False) tampoco se renderiza
+        procesar = mock.patch('apps.generacion_pdf.services.procesar_trabajo')
+        with revisar as generar_vouchers, procesar as procesar_trabajo:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._pagar(self._comprobantes(2), '250')
+                # Antes del commit todavía no se generó ningún voucher
+                self.assertFalse(Voucher.objects.exists())
+
+        generar_vouchers.assert_called_once_with({p.pk for p in self.pasajeros})
+        procesar_trabajo.assert_not_called()
+        vouchers = Voucher.objects.order_by('pasajero_id')
+        self.assertEqual([v.pasajero_id for v in vouchers], [p.pk for p in self.pasajeros])
+        for voucher in vouchers:
+            self.assertEqual(voucher.codigo_voucher, Voucher.codigo_para_pasajero(voucher.pasajero))
+            self.assertEqual(voucher.pasajero.voucher_codigo, voucher.codigo_voucher)
+            # El QR y el PDF quedan para el worker de apps.generacion_pdf
+            self.assertFalse(voucher.qr_code)
+        self.assertEqual(
+            TrabajoPDF.objects.filter(tipo_documento='voucher', estado='pendiente').count(), 2
+        )
+
+    def test_savepoint_revertido(self):
+        """Los pagos revertidos no generan vouchers y no bloquean la revisión siguiente"""
+        primero, segundo = self._comprobantes(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._pagar([primero, segundo], '250')
+                    raise RuntimeError('revertir')
+            except RuntimeError:
+                pass
+        self.assertFalse(Voucher.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._pagar([primero, segundo], '250')
+        self.assertEqual(Voucher.objects.count(), 2)
+
+    def test_pago_parcial_no_genera_voucher(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ComprobantePagoDistribucion.objects.create(
+                comprobante=self._comprobantes(1)[0], pasajero=self.pasajeros[0], monto=Decimal('499')
+            )
+        self.assertFalse(Voucher.objects.exists())
+
+    def test_comando_genera_y_sincroniza(self):
+        # Pagos cargados sin señales (ej: datos previos al signal); el ledger se reconstruye aparte
+        comprobante = self._comprobantes(1)[0]
+        ComprobantePagoDistribucion.objects.bulk_create([
+            ComprobantePagoDistribucion(comprobante=comprobante, pasajero=pasajero, monto=Decimal('500'))
+            for pasajero in self.pasajeros
+        ])
+        call_command('recalcular_ledger_pasajeros', stdout=StringIO())
+
+        call_command('generar_vouchers_pasajeros', '--dry-run', stdout=StringIO())
+        self.assertFalse(Voucher.objects.exists())
+
+        call_command('generar_vouchers_pasajeros', '--batch-size', '1', '--sin-pdf', stdout=StringIO())
+        self.assertEqual(Voucher.objects.count(), 2)
+        self.assertFalse(TrabajoPDF.objects.exists())
+
+        Pasajero.objects.filter(pk=self.pasajeros[0].pk).update(voucher_codigo=None)
+        call_command('generar_vouchers_pasajeros', stdout=StringIO())
+        self.pasajeros[0].refresh_from_db()
+        self.assertEqual(self.pasajeros[0].voucher_codigo, self.pasajeros[0].voucher.codigo_voucher)
+        self.assertEqual(Voucher.objects.count(), 2)
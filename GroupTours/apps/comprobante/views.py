@@ -99,7 +99,8 @@ class ComprobantePagoViewSet(viewsets.ModelViewSet):
         Genera y descarga el PDF del comprobante de pago.
 
         Si el PDF ya fue generado previamente, retorna el archivo existente.
-        Si no existe, lo genera automáticamente.
+        Si no existe (o cambiaron sus datos) lo encola para generarlo en segundo plano
+        y responde 202 con poll_url (ver apps/generacion_pdf).
 
         Query params opcionales:
         - regenerar=true : Fuerza la regeneración del PDF incluso si ya existe
@@ -108,58 +109,18 @@ class ComprobantePagoViewSet(viewsets.ModelViewSet):
         - Content-Type: application/pdf
         - Content-Disposition: attachment; filename="comprobante_CPG-2025-0001.pdf"
         """
-        from django.http import FileResponse, HttpResponse
-        import os
+        from apps.generacion_pdf.views import respuesta_pdf
 
         comprobante = self.get_object()
         regenerar = request.query_params.get('regenerar', 'false').lower() == 'true'
 
-        # Si no existe PDF o se solicita regenerar
-        if not comprobante.pdf_generado or regenerar:
-            try:
-                comprobante.generar_pdf()
-                comprobante.save()
-            except Exception as e:
-                return Response(
-                    {'error': f'Error al generar PDF: {str(e)}'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-
-        # Verificar que el archivo existe
-        if not comprobante.pdf_generado:
-            return Response(
-                {'error': 'No se pudo generar el PDF'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-        # Verificar que el archivo físico existe
-        pdf_path = comprobante.pdf_generado.path
-        if not os.path.exists(pdf_path):
-            # Intentar regenerar si el archivo fue eliminado
-            try:
-                comprobante.generar_pdf()
-                comprobante.save()
-                pdf_path = comprobante.pdf_generado.path
-            except Exception as e:
-                return Response(
-                    {'error': f'El archivo PDF no existe y no se pudo regenerar: {str(e)}'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-
-        # Retornar el archivo PDF
-        try:
-            response = FileResponse(
-                open(pdf_path, 'rb'),
-                content_type='application/pdf'
-            )
-            filename = f'comprobante_{comprobante.numero_comprobante}.pdf'
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
-        except Exception as e:
-            return Response(
-                {'error': f'Error al leer el archivo PDF: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return respuesta_pdf(
+            request,
+            'comprobante',
+            comprobante,
+            f'comprobante_{comprobante.numero_comprobante}.pdf',
+            regenerar=regenerar
+        )
 
 
 class ComprobantePagoDistribucionViewSet(viewsets.ModelViewSet):
@@ -287,7 +248,8 @@ class VoucherViewSet(viewsets.ReadOnlyModelViewSet):
         reserva, paquete, salida, hotel y servicios incluidos.
 
         Si el PDF ya fue generado previamente, retorna el archivo existente.
-        Si no existe, lo genera automáticamente.
+        Si no existe (o cambiaron sus datos) lo encola para generarlo en segundo plano
+        y responde 202 con poll_url (ver apps/generacion_pdf).
 
         Query params opcionales:
         - regenerar=true : Fuerza la regeneración del PDF incluso si ya existe
@@ -296,58 +258,18 @@ class VoucherViewSet(viewsets.ReadOnlyModelViewSet):
         - Content-Type: application/pdf
         - Content-Disposition: attachment; filename="voucher_RSV-2025-0001-PAX-003-VOUCHER.pdf"
         """
-        from django.http import FileResponse
-        import os
+        from apps.generacion_pdf.views import respuesta_pdf
 
         voucher = self.get_object()
         regenerar = request.query_params.get('regenerar', 'false').lower() == 'true'
 
-        # Si no existe PDF o se solicita regenerar
-        if not voucher.pdf_generado or regenerar:
-            try:
-                voucher.generar_pdf()
-                voucher.save()
-            except Exception as e:
-                return Response(
-                    {'error': f'Error al generar PDF: {str(e)}'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-
-        # Verificar que el archivo existe
-        if not voucher.pdf_generado:
-            return Response(
-                {'error': 'No se pudo generar el PDF'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-        # Verificar que el archivo físico existe
-        pdf_path = voucher.pdf_generado.path
-        if not os.path.exists(pdf_path):
-            # Intentar regenerar si el archivo fue eliminado
-            try:
-                voucher.generar_pdf()
-                voucher.save()
-                pdf_path = voucher.pdf_generado.path
-            except Exception as e:
-                return Response(
-                    {'error': f'El archivo PDF no existe y no se pudo regenerar: {str(e)}'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-
-        # Retornar el archivo PDF
-        try:
-            response = FileResponse(
-                open(pdf_path, 'rb'),
-                content_type='application/pdf'
-            )
-            filename = f'voucher_{voucher.codigo_voucher}.pdf'
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
-        except Exception as e:
-            return Response(
-                {'error': f'Error al leer el archivo PDF: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return respuesta_pdf(
+            request,
+            'voucher',
+            voucher,
+            f'voucher_{voucher.codigo_voucher}.pdf',
+            regenerar=regenerar
+        )
 
 
 # ViewSet anidado: Comprobantes de una reserva específica
@@ -0,0 +1,135 @@
+"""
+Exportación de reportes del dashboard en streaming.
+
+Todos los reportes exportables aceptan el mismo contrato:
+
+    GET /api/dashboard/reportes/<reporte>/exportar/?formato=csv|xlsx|pdf
+
+- csv: StreamingHttpResponse. Cada fila se envía apenas se genera.
+- xlsx: workbook write-only de openpyxl escrito a un archivo temporal
+  (SpooledTemporaryFile: en memoria hasta MAX_XLSX_EN_MEMORIA, después en
+  disco) y servido con FileResponse.
+- pdf: reportlab arma el documento completo en memoria, por lo que cada
+  reporte mantiene su límite de filas.
+
+En csv y xlsx el queryset se recorre con .iterator(chunk_size=CHUNK_SIZE):
+en PostgreSQL es un cursor del lado del servidor, así la memoria usada no
+crece con el rango de fechas exportado.
+"""
+import csv
+import tempfile
+from datetime import datetime
+
+from django.http import FileResponse, StreamingHttpResponse
+
+
+FORMATOS_EXPORTACION = ('csv', 'xlsx', 'pdf')
+
+# Filas leídas de la base por vuelta del cursor
+CHUNK_SIZE = 2000
+
+# Tamaño a partir del cual el Excel temporal pasa de memoria a disco
+MAX_XLSX_EN_MEMORIA = 5 * 1024 * 1024
+
+CONTENT_TYPE_XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class _Eco:
+    """Pseudo-archivo para csv.writer: devuelve la línea en lugar de escribirla."""
+
+    def write(self, valor):
+        return valor
+
+
+def obtener_formato(request, default='xlsx'):
+    """
+    Lee el parámetro `formato` del request.
+
+    Args:
+        request: Request de DRF
+        default (str): Formato si no se envía el parámetro
+
+    Returns:
+        str: 'csv', 'xlsx' o 'pdf'
+
+    Raises:
+        ValueError: Si el formato no es soportado
+    """
+    formato = (request.query_params.get('formato') or default).lower()
+    if formato not in FORMATOS_EXPORTACION:
+        raise ValueError(
+            f"Formato '{formato}' no soportado. Opciones: {', '.join(FORMATOS_EXPORTACION)}"
+        )
+    return formato
+
+
+def nombre_archivo(prefijo, formato):
+    """Nombre del archivo exportado: <prefijo>_<YYYYmmdd_HHMMSS>.<formato>"""
+    return f"{prefijo}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato}"
+
+
+def iterar_serializado(queryset, serializer_class, chunk_size=CHUNK_SIZE):
+    """
+    Recorre el queryset por chunks y serializa un registro a la vez.
+
+    Los prefetch_related del queryset se resuelven por chunk.
+
+    Args:
+        queryset: QuerySet a exportar (ya filtrado y ordenado)
+        serializer_class: Serializer de reporte a aplicar a cada registro
+        chunk_size (int): Registros por vuelta del cursor
+
+    Yields:
+        dict: Datos serializados de cada registro
+    """
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        yield serializer_class(obj).data
+
+
+def respuesta_csv(encabezados, filas, filename):
+    """
+    Respuesta CSV en streaming.
+
+    Incluye BOM UTF-8 para que Excel abra correctamente los acentos.
+
+    Args:
+        encabezados (list): Primera fila del CSV
+        filas: Iterable (idealmente un generador) de listas de valores
+        filename (str): Nombre del archivo descargado
+
+    Returns:
+        StreamingHttpResponse
+    """
+    writer = csv.writer(_Eco())
+
+    def contenido():
+        yield '\ufeff'
+        yield writer.writerow(encabezados)
+        for fila in filas:
+            yield writer.writerow(fila)
+
+    response = StreamingHttpResponse(contenido(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def respuesta_xlsx(generar, filename):
+    """
+    Genera un Excel en un archivo temporal y lo sirve con FileResponse.
+
+    Args:
+        generar: Callable que recibe el archivo destino y escribe el Excel
+                 (ej: lambda destino: generar_excel_reservas(data, filtros, resumen, destino))
+        filename (str): Nombre del archivo descargado
+
+    Returns:
+        FileResponse (cierra el archivo temporal al terminar de enviarlo)
+    """
+    archivo = tempfile.SpooledTemporaryFile(max_size=MAX_XLSX_EN_MEMORIA, suffix='.xlsx')
+    try:
+        generar(archivo)
+    except Exception:
+        archivo.close()
+        raise
+    archivo.seek(0)
+    return FileResponse(archivo, as_attachment=True, filename=filename, content_type=CONTENT_TYPE_XLSX)
@@ -0,0 +1,265 @@
+"""
+Comando de Django para medir el efecto de los índices de los filtros más
+usados (migraciones reserva 0023/0024, arqueo_caja 0008/0009,
+comprobante 0004 y facturacion 0022/0023).
+
+Para cada consulta ejecuta EXPLAIN ANALYZE sin los índices ("antes") y con
+ellos ("después") e imprime la mediana del tiempo de ejecución y el plan.
+Todo corre dentro de una transacción que se revierte al final: ni los datos
+sembrados ni la eliminación de índices quedan aplicados.
+
+IMPORTANTE: DROP INDEX toma un lock exclusivo sobre cada tabla hasta el
+final de la transacción. Ejecutar sobre una copia de la base (staging), no
+en producción. Solo PostgreSQL.
+
+Uso:
+    python manage.py benchmark_indices
+
+Opciones:
+    --multiplicar N : Siembra N copias de cada reserva, movimiento de caja,
+                      comprobante y factura existentes antes de medir (default: 0)
+    --repeticiones N : Ejecuciones por consulta, se informa la mediana (default: 3)
+    --busqueda TEXTO : Texto de las búsquedas icontains (default: ana)
+"""
+
+import json
+import statistics
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.arqueo_caja.models import MovimientoCaja
+from apps.comprobante.models import ComprobantePago
+from apps.facturacion.filters import FacturaElectronicaFilter
+from apps.facturacion.models import FacturaElectronica
+from apps.moneda.models import CotizacionMoneda
+from apps.reserva.filters import ReservaFilter
+from apps.reserva.models import Reserva
+
+
+# Índices del pack (btree/parciales declarados en los modelos + GIN de trigramas de las migraciones)
+INDICES = [
+    'reserva_fecha_id_idx',
+    'reserva_activa_estado_idx',
+    'reserva_salida_activa_idx',
+    'mov_caja_fecha_id_idx',
+    'mov_caja_apertura_tipo_idx',
+    'comprobante_reserva_tipo_idx',
+    'fact_elec_emision_id_idx',
+    'fact_elec_reserva_pax_idx',
+    'reserva_codigo_trgm',
+    'reserva_observacion_trgm',
+    'persona_documento_trgm',
+    'personafisica_nombre_trgm',
+    'personafisica_apellido_trgm',
+    'paquete_nombre_trgm',
+    'facturacion_facturaelectronica_numero_factura_trgm',
+    'facturacion_facturaelectronica_cliente_nombre_trgm',
+    'facturacion_facturaelectronica_cliente_numero_documento_trgm',
+    'nota_credito_electronica_numero_nota_credito_trgm',
+]
+
+# Modelos a sembrar con --multiplicar: (modelo, campo único a regenerar, campo de fecha a dispersar)
+MODELOS_SEMBRADO = [
+    (Reserva, 'codigo', 'fecha_reserva'),
+    (MovimientoCaja, 'numero_movimiento', 'fecha_hora_movimiento'),
+    (ComprobantePago, 'numero_comprobante', 'fecha_pago'),
+    (FacturaElectronica, 'numero_factura', 'fecha_emision'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Mide con EXPLAIN ANALYZE las consultas de los filtros más usados, sin y con sus índices'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--multiplicar',
+            type=int,
+            default=0,
+            help='Copias de cada registro existente a sembrar antes de medir (default: 0)',
+        )
+        parser.add_argument(
+            '--repeticiones',
+            type=int,
+            default=3,
+            help='Ejecuciones por consulta; se informa la mediana (default: 3)',
+        )
+        parser.add_argument(
+            '--busqueda',
+            type=str,
+            default='ana',
+            help='Texto de las búsquedas icontains (default: ana)',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('benchmark_indices requiere PostgreSQL (EXPLAIN ANALYZE)')
+
+        multiplicar = options['multiplicar']
+        repeticiones = max(options['repeticiones'], 1)
+        busqueda = options['busqueda']
+
+        # Banner
+        self.stdout.write(self.style.MIGRATE_HEADING('\n' + '='*70))
+        self.stdout.write(self.style.MIGRATE_HEADING('  BENCHMARK DE INDICES DE FILTROS'))
+        self.stdout.write(self.style.MIGRATE_HEADING('='*70 + '\n'))
+        self.stdout.write(self.style.WARNING(
+            '[!] Los cambios se revierten al final, pero DROP INDEX bloquea las tablas mientras corre.\n'
+        ))
+
+        with transaction.atomic():
+            if multiplicar:
+                self._sembrar(multiplicar)
+            with connection.cursor() as cursor:
+                for modelo, _, _ in MODELOS_SEMBRADO:
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(modelo._meta.db_table)}')
+
+            consultas = self._consultas(busqueda)
+
+            # "Antes": sin los índices del pack (se restauran con el rollback del savepoint)
+            savepoint = transaction.savepoint()
+            existentes = self._eliminar_indices()
+            antes = {nombre: self._medir(queryset, repeticiones) for nombre, queryset in consultas}
+            transaction.savepoint_rollback(savepoint)
+
+            despues = {nombre: self._medir(queryset, repeticiones) for nombre, queryset in consultas}
+
+            transaction.set_rollback(True)
+
+        # Resumen final
+        self.stdout.write('\n' + '='*70)
+        self.stdout.write(self.style.MIGRATE_HEADING('  RESUMEN'))
+        self.stdout.write('='*70 + '\n')
+
+        self.stdout.write(f'Indices del pack presentes: {existentes}/{len(INDICES)}')
+        self.stdout.write(f'Repeticiones por consulta: {repeticiones} (mediana)\n')
+        self.stdout.write(f"{'Consulta':<42} {'Antes ms':>10} {'Despues ms':>11}  Plan (despues)")
+        self.stdout.write('-'*100)
+        for nombre, _ in consultas:
+            ms_antes, _ = antes[nombre]
+            ms_despues, plan = despues[nombre]
+            estilo = self.style.SUCCESS if ms_despues < ms_antes else self.style.WARNING
+            self.stdout.write(estilo(f'{nombre:<42} {ms_antes:>10.3f} {ms_despues:>11.3f}  {plan}'))
+
+        self.stdout.write('')
+
+    def _sembrar(self, multiplicar):
+        """Copia cada registro existente N veces (bulk_create, sin señales) y dispersa sus fechas en 3 años."""
+        self.stdout.write(f'Sembrando x{multiplicar}...')
+        for modelo, campo_unico, campo_fecha in MODELOS_SEMBRADO:
+            originales = list(modelo.objects.all())
+            if not originales:
+                self.stdout.write(self.style.WARNING(f'  {modelo.__name__}: sin registros para copiar'))
+                continue
+
+            ultimo_id = modelo.objects.order_by('-pk').values_list('pk', flat=True).first()
+            copias = []
+            for _ in range(multiplicar):
+                for original in originales:
+                    copia = modelo(**{
+                        campo.attname: getattr(original, campo.attname)
+                        for campo in modelo._meta.concrete_fields if not campo.primary_key
+                    })
+                    # FacturaElectronica: NULL no choca con el unique_together del número
+                    valor = None if modelo is FacturaElectronica else f'BM{len(copias):012d}'
+                    setattr(copia, campo_unico, valor)
+                    copias.append(copia)
+            modelo.objects.bulk_create(copias, batch_size=2000)
+
+            tabla = connection.ops.quote_name(modelo._meta.db_table)
+            columna = connection.ops.quote_name(modelo._meta.get_field(campo_fecha).column)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {tabla} SET {columna} = NOW() - random() * INTERVAL '1095 days' "
+                    f"WHERE id > %s AND {columna} IS NOT NULL",
+                    [ultimo_id]
+                )
+            self.stdout.write(f'  {modelo.__name__}: {len(copias)} copias')
+
+    def _consultas(self, busqueda):
+        """Consultas de los filtros más usados, con parámetros tomados de los datos existentes."""
+        consultas = [
+            ('Reserva activo + estado por fecha',
+             Reserva.objects.filter(activo=True, estado='confirmada').order_by('-fecha_reserva', '-id')[:20]),
+            ('Reserva busqueda icontains',
+             ReservaFilter().filter_busqueda(Reserva.objects.all(), 'busqueda', busqueda)[:20]),
+            ('MovimientoCaja ultimos 30 dias',
+             MovimientoCaja.objects.filter(
+                 fecha_hora_movimiento__gte=timezone.now() - timedelta(days=30)
+             ).order_by('-fecha_hora_movimiento', '-id')[:20]),
+            ('FacturaElectronica busqueda icontains',
+             FacturaElectronicaFilter().filter_busqueda(FacturaElectronica.objects.all(), 'busqueda', busqueda)[:20]),
+        ]
+
+        salida_id = Reserva.objects.exclude(salida=None).values_list('salida_id', flat=True).last()
+        if salida_id:
+            consultas.append(('Reserva salida + activo + estado', Reserva.objects.filter(
+                salida_id=salida_id, activo=True
+            ).exclude(estado='cancelada').values('salida').annotate(ocupados=Sum('cantidad_pasajeros'))))
+
+        apertura_id = MovimientoCaja.objects.values_list('apertura_caja_id', flat=True).last()
+        if apertura_id:
+            consultas.append(('MovimientoCaja apertura + tipo + activo', MovimientoCaja.objects.filter(
+                apertura_caja_id=apertura_id, tipo_movimiento='ingreso', activo=True
+            ).values('apertura_caja').annotate(total=Sum('monto'))))
+
+        reserva_id = ComprobantePago.objects.values_list('reserva_id', flat=True).last()
+        if reserva_id:
+            consultas.append(('ComprobantePago reserva + activo + tipo', ComprobantePago.objects.filter(
+                reserva_id=reserva_id, activo=True, tipo='sena'
+            )))
+
+        factura = FacturaElectronica.objects.exclude(reserva=None).values('reserva_id', 'pasajero_id').last()
+        if factura:
+            consultas.append(('FacturaElectronica reserva + pasajero + activo', FacturaElectronica.objects.filter(
+                reserva_id=factura['reserva_id'], pasajero_id=factura['pasajero_id'], activo=True
+            )))
+
+        moneda_id = CotizacionMoneda.objects.values_list('moneda_id', flat=True).last()
+        if moneda_id:
+            consultas.append(('CotizacionMoneda vigente', CotizacionMoneda.objects.filter(
+                moneda_id=moneda_id, fecha_vigencia__lte=timezone.now().date()
+            ).order_by('-fecha_vigencia')[:1]))
+
+        return consultas
+
+    def _eliminar_indices(self):
+        """Elimina los índices del pack que existan. Returns: cantidad eliminada."""
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT indexname FROM pg_indexes WHERE indexname = ANY(%s)', [INDICES])
+            existentes = [fila[0] for fila in cursor.fetchall()]
+            for nombre in existentes:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(nombre)}')
+        return len(existentes)
+
+    def _medir(self, queryset, repeticiones):
+        """
+        Ejecuta EXPLAIN ANALYZE del queryset.
+
+        Returns:
+            tuple: (mediana del Execution Time en ms, resumen del plan)
+        """
+        sql, params = queryset.query.sql_with_params()
+        tiempos = []
+        with connection.cursor() as cursor:
+            for _ in range(repeticiones):
+                cursor.execute(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                tiempos.append(plan[0]['Execution Time'])
+        return statistics.median(tiempos), self._resumir_plan(plan[0]['Plan'])
+
+    def _resumir_plan(self, nodo):
+        """Nodos de acceso a tablas del plan (ej: 'Index Scan reserva_activa_estado_idx')."""
+        accesos = []
+        pendientes = [nodo]
+        while pendientes:
+            actual = pendientes.pop(0)
+            if 'Relation Name' in actual or 'Index Name' in actual:
+                accesos.append(f"{actual['Node Type']} {actual.get('Index Name') or actual.get('Relation Name')}")
+            pendientes.extend(actual.get('Plans', []))
+        return ', '.join(accesos)
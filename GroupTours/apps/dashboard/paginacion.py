@@ -0,0 +1,251 @@
+# apps/dashboard/paginacion.py
+"""
+Paginación por cursor (keyset) para listados de alto volumen.
+
+La paginación por páginas (?page=N) hace OFFSET + COUNT(*) en cada request:
+ambos crecen con la profundidad de la página. En modo cursor la página se
+obtiene con un WHERE sobre la clave de ordenamiento (fecha, id) del último
+registro entregado, que se resuelve con el índice compuesto de esa clave:
+la página 1000 cuesta lo mismo que la primera.
+
+Es opt-in: se activa enviando el parámetro `cursor` (vacío para la primera
+página) y en cada respuesta viene `nextCursor` para pedir la siguiente.
+
+    GET /api/.../?cursor=&page_size=50
+    GET /api/.../?cursor=<nextCursor>&page_size=50
+
+El total de registros es opcional (?conteo=):
+    - ninguno (default): no se cuenta, totalItems = null
+    - aproximado: estimación del planificador de PostgreSQL (EXPLAIN), sin
+      recorrer la tabla. En otros motores se cuenta exacto.
+    - exacto: COUNT(*)
+
+- paginar_por_cursor(): para vistas función (reportes del dashboard).
+- PaginacionCursorMixin: para las clases de paginación de DRF. La vista
+  declara su clave con el atributo `cursor_ordering`
+  (ej: ('-fecha_hora_movimiento', '-id')); sin él se pagina por páginas.
+"""
+import base64
+import json
+
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+CURSOR_QUERY_PARAM = 'cursor'
+CONTEO_QUERY_PARAM = 'conteo'
+MODOS_CONTEO = ('ninguno', 'aproximado', 'exacto')
+
+
+class ParametroPaginacionInvalido(ValueError):
+    """El cursor no se puede decodificar o el modo de conteo no existe."""
+
+
+def codificar_cursor(valores):
+    """
+    Codifica los valores de la clave de ordenamiento del último registro.
+
+    Args:
+        valores (list): Valores de la clave (ej: [fecha, id])
+
+    Returns:
+        str: Cursor opaco (base64 url-safe)
+    """
+    crudo = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in valores])
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor, queryset, ordenamiento):
+    """
+    Decodifica un cursor y convierte sus valores al tipo de cada campo.
+
+    Args:
+        cursor (str): Cursor recibido
+        queryset: QuerySet a paginar (para resolver los campos del modelo)
+        ordenamiento (tuple): Campos de la clave (ej: ('-fecha_reserva', '-id'))
+
+    Returns:
+        list: Valores de la clave en el mismo orden que `ordenamiento`
+
+    Raises:
+        ParametroPaginacionInvalido: Si el cursor está mal formado
+    """
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno).decode())
+        if not isinstance(valores, list) or len(valores) != len(ordenamiento):
+            raise ValueError
+        return [
+            queryset.model._meta.get_field(campo.lstrip('-')).to_python(valor)
+            for campo, valor in zip(ordenamiento, valores)
+        ]
+    except Exception:
+        raise ParametroPaginacionInvalido('Cursor inválido')
+
+
+def _filtro_despues_de(ordenamiento, valores):
+    """
+    Condición "registro posterior al cursor" para una clave compuesta.
+
+    Para ('-fecha', '-id') es: fecha < f OR (fecha = f AND id < i)
+    """
+    condicion = Q()
+    for indice, campo in enumerate(ordenamiento):
+        nombre = campo.lstrip('-')
+        operador = 'lt' if campo.startswith('-') else 'gt'
+        termino = Q(**{f'{nombre}__{operador}': valores[indice]})
+        for previo, valor in zip(ordenamiento[:indice], valores[:indice]):
+            termino &= Q(**{previo.lstrip('-'): valor})
+        condicion |= termino
+    return condicion
+
+
+def contar_aproximado(queryset):
+    """
+    Cantidad estimada de registros del queryset.
+
+    En PostgreSQL usa la estimación del planificador (EXPLAIN): no recorre la
+    tabla, por lo que el costo no depende del volumen. Puede desviarse de la
+    cantidad real según la antigüedad de las estadísticas (ANALYZE).
+    En otros motores hace un COUNT(*).
+
+    Args:
+        queryset: QuerySet filtrado
+
+    Returns:
+        int: Cantidad estimada
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def contar(queryset, modo):
+    """
+    Total de registros según el modo de conteo pedido.
+
+    Args:
+        queryset: QuerySet filtrado
+        modo (str): 'ninguno', 'aproximado' o 'exacto'
+
+    Returns:
+        int o None: None en modo 'ninguno'
+
+    Raises:
+        ParametroPaginacionInvalido: Si el modo no es válido
+    """
+    if modo not in MODOS_CONTEO:
+        raise ParametroPaginacionInvalido(f"Conteo '{modo}' no soportado. Opciones: {', '.join(MODOS_CONTEO)}")
+    if modo == 'aproximado':
+        return contar_aproximado(queryset)
+    if modo == 'exacto':
+        return queryset.count()
+    return None
+
+
+def paginar_por_cursor(queryset, ordenamiento, cursor, page_size, conteo='ninguno'):
+    """
+    Obtiene una página por keyset sobre `ordenamiento`.
+
+    El último campo de `ordenamiento` debe ser único (el id) para que el
+    orden sea total. Los registros con la fecha en NULL quedan fuera.
+
+    Args:
+        queryset: QuerySet filtrado (se reemplaza su ordenamiento)
+        ordenamiento (tuple): Clave de ordenamiento (ej: ('-fecha_reserva', '-id'))
+        cursor (str): Cursor de la página ('' o None = primera página)
+        page_size (int): Registros por página
+        conteo (str): Modo de conteo del total (ver contar())
+
+    Returns:
+        dict: {
+            'results': list de instancias,
+            'pageSize': int,
+            'nextCursor': str o None si es la última página,
+            'totalItems': int o None,
+            'conteo': modo de conteo usado
+        }
+
+    Raises:
+        ParametroPaginacionInvalido: Si el cursor o el modo de conteo no son válidos
+    """
+    queryset = queryset.filter(**{
+        f"{campo.lstrip('-')}__isnull": False for campo in ordenamiento[:-1]
+    })
+    total_items = contar(queryset, conteo)
+
+    pagina = queryset.order_by(*ordenamiento)
+    if cursor:
+        valores = decodificar_cursor(cursor, queryset, ordenamiento)
+        pagina = pagina.filter(_filtro_despues_de(ordenamiento, valores))
+
+    # Un registro extra para saber si hay página siguiente
+    results = list(pagina[:page_size + 1])
+    next_cursor = None
+    if len(results) > page_size:
+        results = results[:page_size]
+        ultimo = results[-1]
+        next_cursor = codificar_cursor([getattr(ultimo, campo.lstrip('-')) for campo in ordenamiento])
+
+    return {
+        'results': results,
+        'pageSize': page_size,
+        'nextCursor': next_cursor,
+        'totalItems': total_items,
+        'conteo': conteo,
+    }
+
+
+class PaginacionCursorMixin:
+    """
+    Agrega el modo cursor a una clase de paginación por páginas de DRF.
+
+    Si el request trae `cursor` y la vista define `cursor_ordering`, pagina
+    con paginar_por_cursor(); si no, delega en la paginación por páginas.
+    La clase que lo usa debe devolver get_respuesta_cursor() desde su
+    get_paginated_response() cuando `self.modo_cursor` es True.
+    """
+    modo_cursor = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordenamiento = getattr(view, 'cursor_ordering', None)
+        self.modo_cursor = bool(ordenamiento) and CURSOR_QUERY_PARAM in request.query_params
+        if not self.modo_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        try:
+            self.pagina_cursor = paginar_por_cursor(
+                queryset,
+                ordenamiento,
+                request.query_params.get(CURSOR_QUERY_PARAM),
+                self.get_page_size(request),
+                request.query_params.get(CONTEO_QUERY_PARAM, 'ninguno'),
+            )
+        except ParametroPaginacionInvalido as e:
+            raise ValidationError(str(e))
+        return self.pagina_cursor['results']
+
+    def get_respuesta_cursor(self, data):
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        next_cursor = self.pagina_cursor['nextCursor']
+        return Response({
+            'totalItems': self.pagina_cursor['totalItems'],
+            'conteo': self.pagina_cursor['conteo'],
+            'pageSize': self.pagina_cursor['pageSize'],
+            'nextCursor': next_cursor,
+            'next': replace_query_param(url, CURSOR_QUERY_PARAM, next_cursor) if next_cursor else None,
+            'previous': None,
+            'results': data,
+        })
@@ -0,0 +1,269 @@
+# apps/dashboard/perf.py
+"""
+Medición de consultas SQL por request.
+
+- MonitorConsultasMiddleware: registra por request la cantidad de consultas,
+  el tiempo total en base de datos y las consultas duplicadas (mismo SQL
+  normalizado ejecutado más de una vez, típico de N+1). En DEBUG expone las
+  cifras como headers X-DB-*.
+- MonitorConsultasMixin: mixin para ViewSets que además mide el tiempo de
+  serialización y valida un presupuesto de consultas por acción
+  (query_budget). Con PERF_PRESUPUESTO_ESTRICTO=True (tests, vía
+  override_settings) exceder el presupuesto lanza PresupuestoConsultasExcedido.
+  Con el monitoreo apagado y sin modo estricto no mide nada.
+- obtener_resumen_rutas(): agregado en memoria (por proceso) con p50/p95 por
+  ruta, expuesto en GET /api/dashboard/perf/.
+
+Settings opcionales:
+    PERF_MONITOREO_ACTIVO (bool, default False; variable de entorno en settings.py)
+    PERF_PRESUPUESTO_ESTRICTO (bool, default False)
+    PERF_MUESTRAS_POR_RUTA (int, default 500)
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+_medicion_actual = ContextVar('medicion_consultas', default=None)
+
+_lock = threading.Lock()
+_muestras_por_ruta = defaultdict(deque)   # ruta -> deque[(consultas, db_ms, serializer_ms, total_ms)]
+
+# Normalización de SQL para agrupar consultas equivalentes
+_RE_LISTA_IN = re.compile(r'IN \((?:%s, )*%s\)')
+_RE_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+class PresupuestoConsultasExcedido(AssertionError):
+    """Se lanza cuando una acción de un ViewSet supera su presupuesto de consultas."""
+
+
+def huella_sql(sql):
+    """
+    Normaliza un SQL para detectar consultas repetidas con distintos parámetros.
+
+    Args:
+        sql: Sentencia SQL (con placeholders %s)
+
+    Returns:
+        str: SQL normalizado
+    """
+    sql = _RE_LISTA_IN.sub('IN (...)', sql)
+    return _RE_LITERAL.sub('?', sql)
+
+
+class MedicionConsultas:
+    """Acumula las consultas ejecutadas durante un request."""
+
+    def __init__(self):
+        self.cantidad = 0
+        self.tiempo_db = 0.0
+        self.tiempo_serializer = 0.0
+        self.huellas = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tiempo_db += time.perf_counter() - inicio
+            self.cantidad += 1
+            self.huellas[huella_sql(sql)] += 1
+
+    @property
+    def duplicadas(self):
+        """Consultas (normalizadas) ejecutadas más de una vez, con su cantidad."""
+        return {sql: veces for sql, veces in self.huellas.items() if veces > 1}
+
+
+def monitoreo_activo():
+    """True si hay que medir consultas (monitoreo activo o presupuesto estricto)."""
+    return (
+        getattr(settings, 'PERF_MONITOREO_ACTIVO', False)
+        or getattr(settings, 'PERF_PRESUPUESTO_ESTRICTO', False)
+    )
+
+
+def obtener_medicion_actual():
+    """Medición del request en curso (o None fuera de un request monitoreado)."""
+    return _medicion_actual.get()
+
+
+@contextmanager
+def medir_consultas():
+    """
+    Context manager que mide las consultas ejecutadas en su bloque (en todas
+    las conexiones) y deja la medición disponible en obtener_medicion_actual().
+
+    Yields:
+        MedicionConsultas
+    """
+    medicion = MedicionConsultas()
+    token = _medicion_actual.set(medicion)
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(medicion))
+            yield medicion
+    finally:
+        _medicion_actual.reset(token)
+
+
+def registrar_muestra(ruta, medicion, tiempo_total):
+    """Agrega la medición de un request al agregado en memoria de su ruta."""
+    maximo = getattr(settings, 'PERF_MUESTRAS_POR_RUTA', 500)
+    with _lock:
+        muestras = _muestras_por_ruta[ruta]
+        muestras.append((
+            medicion.cantidad,
+            medicion.tiempo_db * 1000,
+            medicion.tiempo_serializer * 1000,
+            tiempo_total * 1000,
+        ))
+        while len(muestras) > maximo:
+            muestras.popleft()
+
+
+def _percentil(valores, percentil):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(percentil / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def obtener_resumen_rutas():
+    """
+    Resumen por ruta de las muestras registradas en este proceso.
+
+    Returns:
+        list[dict]: [{'ruta', 'requests', 'consultas_p50', 'consultas_p95',
+                      'db_ms_p50', 'db_ms_p95', 'serializer_ms_p50',
+                      'serializer_ms_p95', 'total_ms_p50', 'total_ms_p95'}]
+                    ordenado por total_ms_p95 descendente
+    """
+    with _lock:
+        copia = {ruta: list(muestras) for ruta, muestras in _muestras_por_ruta.items()}
+
+    resumen = []
+    for ruta, muestras in copia.items():
+        if not muestras:
+            continue
+        columnas = list(zip(*muestras))
+        fila = {'ruta': ruta, 'requests': len(muestras)}
+        for nombre, valores in zip(('consultas', 'db_ms', 'serializer_ms', 'total_ms'), columnas):
+            fila[f'{nombre}_p50'] = round(_percentil(valores, 50), 2)
+            fila[f'{nombre}_p95'] = round(_percentil(valores, 95), 2)
+        resumen.append(fila)
+
+    return sorted(resumen, key=lambda f: f['total_ms_p95'], reverse=True)
+
+
+def reiniciar_muestras():
+    """Descarta todas las muestras registradas."""
+    with _lock:
+        _muestras_por_ruta.clear()
+
+
+def _ruta_request(request):
+    match = getattr(request, 'resolver_match', None)
+    ruta = match.route if match and match.route else request.path
+    return f"{request.method} /{ruta.lstrip('/')}"
+
+
+class MonitorConsultasMiddleware:
+    """Mide consultas y tiempos de cada request (ver docstring del módulo)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'PERF_MONITOREO_ACTIVO', False):
+            return self.get_response(request)
+
+        inicio = time.perf_counter()
+        with medir_consultas() as medicion:
+            response = self.get_response(request)
+
+        tiempo_total = time.perf_counter() - inicio
+        registrar_muestra(_ruta_request(request), medicion, tiempo_total)
+
+        if settings.DEBUG:
+            response['X-DB-Query-Count'] = str(medicion.cantidad)
+            response['X-DB-Time-ms'] = f'{medicion.tiempo_db * 1000:.1f}'
+            response['X-Serializer-Time-ms'] = f'{medicion.tiempo_serializer * 1000:.1f}'
+            response['X-DB-Duplicate-Queries'] = str(sum(medicion.duplicadas.values()))
+
+        return response
+
+
+class MonitorConsultasMixin:
+    """
+    Mixin para ViewSets de DRF: mide el tiempo de serialización y valida el
+    presupuesto de consultas por acción.
+
+    Uso:
+        class ReservaViewSet(MonitorConsultasMixin, viewsets.ModelViewSet):
+            query_budget = {'list': 30, 'retrieve': 40}   # o un int para todas
+    """
+
+    query_budget = None
+
+    def dispatch(self, request, *args, **kwargs):
+        # Sin el middleware activo, medir solo la vista
+        if obtener_medicion_actual() is not None or not monitoreo_activo():
+            return super().dispatch(request, *args, **kwargs)
+        with medir_consultas():
+            return super().dispatch(request, *args, **kwargs)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        medicion = obtener_medicion_actual()
+        if medicion is None:
+            return serializer
+
+        to_representation = serializer.to_representation
+
+        def to_representation_medido(*a, **kw):
+            inicio = time.perf_counter()
+            try:
+                return to_representation(*a, **kw)
+            finally:
+                medicion.tiempo_serializer += time.perf_counter() - inicio
+
+        serializer.to_representation = to_representation_medido
+        return serializer
+
+    def obtener_presupuesto_consultas(self):
+        """Presupuesto de consultas para la acción actual (o None si no hay)."""
+        if isinstance(self.query_budget, dict):
+            return self.query_budget.get(self.action)
+        return self.query_budget
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        medicion = obtener_medicion_actual()
+        presupuesto = self.obtener_presupuesto_consultas()
+
+        if medicion is None or presupuesto is None or medicion.cantidad <= presupuesto:
+            return response
+
+        mensaje = (
+            f"{self.__class__.__name__}.{self.action} ejecutó {medicion.cantidad} consultas "
+            f"(presupuesto: {presupuesto})."
+        )
+        duplicadas = sorted(medicion.duplicadas.items(), key=lambda d: d[1], reverse=True)[:5]
+        if duplicadas:
+            mensaje += " Duplicadas: " + "; ".join(f"{veces}x {sql[:120]}" for sql, veces in duplicadas)
+
+        if getattr(settings, 'PERF_PRESUPUESTO_ESTRICTO', False):
+            raise PresupuestoConsultasExcedido(mensaje)
+        logger.warning(mensaje)
+        return response
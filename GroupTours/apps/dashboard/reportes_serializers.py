@@ -116,6 +116,7 @@ class MovimientoCajaReporteSerializer(serializers.ModelSerializer):
         Detecta la moneda real del movimiento desde comprobante → reserva → paquete.
         """
         from apps.moneda.models import Moneda, CotizacionMoneda
+        from apps.moneda.services import obtener_moneda
         
         try:
             # Intentar obtener la moneda del comprobante asociado
@@ -130,7 +131,7 @@ class MovimientoCajaReporteSerializer(serializers.ModelSerializer):
                 return float(obj.monto)
             
             # Si está en Gs o sin moneda, convertir a USD
-            moneda_usd = Moneda.objects.get(codigo='USD')
+            moneda_usd = obtener_moneda('USD')
             fecha_movimiento = obj.fecha_hora_movimiento.date()
             cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd, fecha_movimiento)
             
@@ -346,12 +347,7 @@ class PaqueteReporteSerializer(serializers.ModelSerializer):
         
         proxima_salida = obj.salidas.filter(activo=True).order_by('fecha_salida').first()
         if proxima_salida:
-            from apps.reserva.models import Reserva
-            reservas = Reserva.objects.filter(
-                salida=proxima_salida,
-                activo=True
-            ).exclude(estado='cancelada')
-            return sum(r.cantidad_pasajeros or 0 for r in reservas)
+            return proxima_salida.cupos_ocupados
         return 0
     
     def get_cupos_disponibles(self, obj):
@@ -410,6 +406,7 @@ class PaqueteReporteSerializer(serializers.ModelSerializer):
     def get_precio_usd(self, obj):
         """Precio en dólares"""
         from apps.moneda.models import Moneda, CotizacionMoneda
+        from apps.moneda.services import obtener_moneda
         
         proxima_salida = obj.salidas.filter(activo=True).order_by('fecha_salida').first()
         if not proxima_salida:
@@ -424,7 +421,7 @@ class PaqueteReporteSerializer(serializers.ModelSerializer):
         # Si está en Gs, convertir a USD
         if obj.moneda and obj.moneda.codigo == 'PYG':
             try:
-                moneda_usd = Moneda.objects.get(codigo='USD')
+                moneda_usd = obtener_moneda('USD')
                 cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd)
                 
                 if cotizacion and cotizacion.valor_en_guaranies > 0:
@@ -462,6 +459,7 @@ class PaqueteReporteSerializer(serializers.ModelSerializer):
     def get_sena_usd(self, obj):
         """Seña en dólares"""
         from apps.moneda.models import Moneda, CotizacionMoneda
+        from apps.moneda.services import obtener_moneda
         
         proxima_salida = obj.salidas.filter(activo=True).order_by('fecha_salida').first()
         if not proxima_salida or not proxima_salida.senia:
@@ -476,7 +474,7 @@ class PaqueteReporteSerializer(serializers.ModelSerializer):
         # Si está en Gs, convertir a USD
         if obj.moneda and obj.moneda.codigo == 'PYG':
             try:
-                moneda_usd = Moneda.objects.get(codigo='USD')
+                moneda_usd = obtener_moneda('USD')
                 cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd)
                 
                 if cotizacion and cotizacion.valor_en_guaranies > 0:
@@ -652,27 +650,41 @@ class ReservaReporteSerializer(serializers.ModelSerializer):
             return str(obj.precio_unitario * obj.cantidad_pasajeros)
         return "0.00"
     
+    def _monto_pagado(self, obj):
+        """
+        Monto pagado de la reserva: usa la anotación de
+        anotar_estado_pago_reservas() si el queryset la trae, si no la property.
+        """
+        monto_pagado = getattr(obj, '_monto_pagado', None)
+        if monto_pagado is None:
+            monto_pagado = obj.monto_pagado
+        return monto_pagado or Decimal('0')
+    
     def get_monto_pagado(self, obj):
-        """Obtener monto pagado de la property"""
-        return str(obj.monto_pagado)
+        """Obtener monto pagado (anotado o de la property)"""
+        return str(self._monto_pagado(obj))
     
     def get_saldo_pendiente(self, obj):
         """Saldo pendiente = monto_total - monto_pagado"""
         monto_total = Decimal(self.get_monto_total(obj))
-        monto_pagado = obj.monto_pagado or Decimal('0')
+        monto_pagado = self._monto_pagado(obj)
         return str(monto_total - monto_pagado)
     
     def get_porcentaje_pagado(self, obj):
         """Porcentaje pagado"""
         monto_total = Decimal(self.get_monto_total(obj))
         if monto_total > 0:
-            monto_pagado = obj.monto_pagado or Decimal('0')
+            monto_pagado = self._monto_pagado(obj)
             return round((monto_pagado / monto_total) * 100, 2)
         return 0
     
     def get_estado_pago(self, obj):
-        """Calcular estado de pago"""
-        monto_pagado = obj.monto_pagado or Decimal('0')
+        """Calcular estado de pago (o leerlo de la anotación _estado_pago)"""
+        estado_pago = getattr(obj, '_estado_pago', None)
+        if estado_pago:
+            return estado_pago
+        
+        monto_pagado = self._monto_pagado(obj)
         monto_total = Decimal(self.get_monto_total(obj))
         
         if monto_pagado == 0:
@@ -736,6 +748,7 @@ class ReservaReporteSerializer(serializers.ModelSerializer):
     def get_precio_unitario_usd(self, obj):
         """Precio unitario en dólares"""
         from apps.moneda.models import Moneda, CotizacionMoneda
+        from apps.moneda.services import obtener_moneda
         
         if not obj.precio_unitario:
             return None
@@ -747,7 +760,7 @@ class ReservaReporteSerializer(serializers.ModelSerializer):
         # Si está en Gs, convertir a USD
         if obj.paquete and obj.paquete.moneda and obj.paquete.moneda.codigo == 'PYG':
             try:
-                moneda_usd = Moneda.objects.get(codigo='USD')
+                moneda_usd = obtener_moneda('USD')
                 cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd)
                 
                 if cotizacion and cotizacion.valor_en_guaranies > 0:
@@ -776,42 +789,45 @@ class ReservaReporteSerializer(serializers.ModelSerializer):
         """Monto pagado en guaraníes"""
         from apps.moneda.models import CotizacionMoneda
         
-        if not obj.monto_pagado:
+        monto_pagado = self._monto_pagado(obj)
+        if not monto_pagado:
             return 0.0
         
         # Si el paquete está en Gs, retornar directamente
         if obj.paquete and obj.paquete.moneda and obj.paquete.moneda.codigo == 'PYG':
-            return float(obj.monto_pagado)
+            return float(monto_pagado)
         
         # Si está en otra moneda, convertir a Gs
         if obj.paquete and obj.paquete.moneda:
             try:
-                monto_gs = CotizacionMoneda.convertir_a_guaranies(obj.monto_pagado, obj.paquete.moneda)
+                monto_gs = CotizacionMoneda.convertir_a_guaranies(monto_pagado, obj.paquete.moneda)
                 return float(monto_gs)
             except Exception:
                 return None
         
-        return float(obj.monto_pagado)
+        return float(monto_pagado)
     
     def get_monto_pagado_usd(self, obj):
         """Monto pagado en dólares"""
         from apps.moneda.models import Moneda, CotizacionMoneda
+        from apps.moneda.services import obtener_moneda
         
-        if not obj.monto_pagado:
+        monto_pagado = self._monto_pagado(obj)
+        if not monto_pagado:
             return 0.0
         
         # Si el paquete está en USD, retornar directamente
         if obj.paquete and obj.paquete.moneda and obj.paquete.moneda.codigo == 'USD':
-            return float(obj.monto_pagado)
+            return float(monto_pagado)
         
         # Si está en Gs, convertir a USD
         if obj.paquete and obj.paquete.moneda and obj.paquete.moneda.codigo == 'PYG':
             try:
-                moneda_usd = Moneda.objects.get(codigo='USD')
+                moneda_usd = obtener_moneda('USD')
                 cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd)
                 
                 if cotizacion and cotizacion.valor_en_guaranies > 0:
-                    monto_usd = Decimal(str(obj.monto_pagado)) / Decimal(str(cotizacion.valor_en_guaranies))
+                    monto_usd = Decimal(str(monto_pagado)) / Decimal(str(cotizacion.valor_en_guaranies))
                     return float(round(monto_usd, 2))
             except Exception:
                 return None
@@ -1,5 +1,5 @@
 """
-Utilidades para exportación de reportes a PDF y Excel.
+Utilidades para exportación de reportes a PDF, Excel y CSV.
 """
 from io import BytesIO
 from datetime import datetime
@@ -13,7 +13,9 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.utils import get_column_letter
 
 
 # ============================================================================
@@ -362,78 +364,53 @@ def generar_pdf_reservas(data, filtros, resumen):
 # ============================================================================
 # EXPORTACIÓN EXCEL
 # ============================================================================
+#
+# Los Excel se generan con workbooks write-only de openpyxl: las filas de la
+# hoja "Datos" se escriben a medida que se recorre `data` (puede ser un
+# generador que itera el queryset por chunks) sin mantener la hoja completa
+# en memoria. Por eso los anchos de columna son fijos en lugar de calcularse
+# desde el contenido.
+#
+# Las columnas de cada reporte se definen como (título, ancho, formato):
+# formato es el number_format de la celda o None para texto.
 
-def generar_excel_movimientos_cajas(data, filtros, resumen):
-    """
-    Genera Excel del reporte de movimientos de cajas.
-    
-    Returns:
-        BytesIO con el archivo Excel
-    """
-    buffer = BytesIO()
-    wb = Workbook()
-    
-    # ===== HOJA 1: RESUMEN =====
-    ws_resumen = wb.active
-    ws_resumen.title = "Resumen"
-    
-    # Título
-    ws_resumen['A1'] = "REPORTE DE MOVIMIENTOS DE CAJAS"
-    ws_resumen['A1'].font = Font(size=16, bold=True)
-    ws_resumen.merge_cells('A1:D1')
-    
-    # Filtros
-    ws_resumen['A3'] = "Período:"
-    ws_resumen['B3'] = f"{filtros['fecha_desde']} a {filtros['fecha_hasta']}"
-    
-    # Resumen
-    ws_resumen['A5'] = "Total Débitos (PYG):"
-    ws_resumen['B5'] = float(resumen['total_ingresos'])
-    ws_resumen['B5'].number_format = '#,##0.00'
+FORMATO_MONTO = '#,##0.00'
 
-    ws_resumen['A6'] = "Total Débitos (USD):"
-    ws_resumen['B6'] = float(resumen.get('total_ingresos_usd') or 0)
-    ws_resumen['B6'].number_format = '#,##0.00'
+COLUMNAS_MOVIMIENTOS_CAJAS = [
+    ('N°', 7, None), ('Fecha/Hora', 17, None), ('Caja', 22, None), ('Tipo', 12, None),
+    ('Concepto', 24, None), ('Descripción', 40, None), ('Monto (₲)', 16, FORMATO_MONTO),
+    ('Monto (USD)', 14, FORMATO_MONTO), ('Método Pago', 16, None), ('Referencia', 20, None),
+    ('Usuario', 26, None),
+]
 
-    ws_resumen['A7'] = "Total Créditos (PYG):"
-    ws_resumen['B7'] = float(resumen['total_egresos'])
-    ws_resumen['B7'].number_format = '#,##0.00'
+COLUMNAS_PAQUETES = [
+    ('Código', 14, None), ('Nombre', 36, None), ('Tipo', 16, None), ('Destino', 20, None),
+    ('País', 16, None), ('Distribuidora', 22, None), ('Precio (₲)', 16, FORMATO_MONTO),
+    ('Precio (USD)', 14, FORMATO_MONTO), ('Seña (₲)', 16, FORMATO_MONTO),
+    ('Seña (USD)', 14, FORMATO_MONTO), ('Moneda Orig.', 13, None), ('Fecha Inicio', 13, None),
+    ('Duración (días)', 15, None), ('Cupos Disponibles', 18, None), ('Cupos Ocupados', 16, None),
+    ('Reservas', 10, None), ('Personalizado', 14, None), ('Propio', 8, None), ('Estado', 10, None),
+]
 
-    ws_resumen['A8'] = "Total Créditos (USD):"
-    ws_resumen['B8'] = float(resumen.get('total_egresos_usd') or 0)
-    ws_resumen['B8'].number_format = '#,##0.00'
-    
-    ws_resumen['A9'] = "Balance (PYG):"
-    ws_resumen['B9'] = float(resumen['balance'])
-    ws_resumen['B9'].number_format = '#,##0.00'
-    ws_resumen['B9'].font = Font(bold=True)
-    
-    ws_resumen['A10'] = "Balance (USD):"
-    ws_resumen['B10'] = float(resumen.get('balance_usd') or 0)
-    ws_resumen['B10'].number_format = '#,##0.00'
-    ws_resumen['B10'].font = Font(bold=True)
-    
-    # ===== HOJA 2: DATOS =====
-    ws_datos = wb.create_sheet("Datos")
-    
-    # Headers
-    headers = ['N°', 'Fecha/Hora', 'Caja', 'Tipo', 'Concepto', 'Descripción', 
-               'Monto (₲)', 'Monto (USD)', 'Método Pago', 'Referencia', 'Usuario']
-    ws_datos.append(headers)
-    
-    # Estilo header
-    header_fill = PatternFill(start_color="3498db", end_color="3498db", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    
-    for cell in ws_datos[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Datos
+COLUMNAS_RESERVAS = [
+    ('Código', 16, None), ('Fecha Reserva', 14, None), ('Titular', 28, None),
+    ('Documento', 14, None), ('Email', 28, None), ('Teléfono', 14, None), ('Paquete', 32, None),
+    ('Destino', 24, None), ('Fecha Salida', 13, None), ('Fecha Retorno', 14, None),
+    ('Pasajeros', 10, None),
+    ('Precio Unit. (₲)', 16, FORMATO_MONTO), ('Precio Unit. (USD)', 17, FORMATO_MONTO),
+    ('Monto Total (₲)', 16, FORMATO_MONTO), ('Monto Total (USD)', 17, FORMATO_MONTO),
+    ('Monto Pagado (₲)', 17, FORMATO_MONTO), ('Monto Pagado (USD)', 18, FORMATO_MONTO),
+    ('Saldo Pend. (₲)', 16, FORMATO_MONTO), ('Saldo Pend. (USD)', 17, FORMATO_MONTO),
+    ('% Pagado', 10, '0.00'), ('Estado', 14, None), ('Estado Pago', 16, None),
+    ('Modalidad Fact.', 16, None),
+]
+
+
+def filas_movimientos_cajas(data):
+    """Filas de la hoja "Datos" del reporte de movimientos (ver COLUMNAS_MOVIMIENTOS_CAJAS)."""
     for idx, mov in enumerate(data, 1):
         monto_usd = mov.get('monto_usd', 0) or 0
-        ws_datos.append([
+        yield [
             idx,
             format_datetime(mov['fecha_hora']),
             mov['caja_nombre'],
@@ -445,98 +422,22 @@ def generar_excel_movimientos_cajas(data, filtros, resumen):
             mov['metodo_pago_display'],
             mov.get('referencia', '') or '',
             mov['usuario_registro']
-        ])
-    
-    # Formato columnas de montos
-    for row in range(2, len(data) + 2):
-        ws_datos[f'G{row}'].number_format = '#,##0.00'  # Monto PYG
-        ws_datos[f'H{row}'].number_format = '#,##0.00'  # Monto USD
-    
-    # Auto-ajustar columnas
-    for column in ws_datos.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(cell.value)
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws_datos.column_dimensions[column_letter].width = adjusted_width
-    
-    # Filtros en Excel
-    ws_datos.auto_filter.ref = ws_datos.dimensions
-    
-    # Guardar
-    wb.save(buffer)
-    buffer.seek(0)
-    return buffer
+        ]
 
 
-def generar_excel_paquetes(data, filtros, resumen):
-    """Genera Excel del reporte de paquetes."""
-    buffer = BytesIO()
-    wb = Workbook()
-    
-    # ===== HOJA 1: RESUMEN =====
-    ws_resumen = wb.active
-    ws_resumen.title = "Resumen"
-    
-    # Título
-    ws_resumen['A1'] = "REPORTE DE PAQUETES TURÍSTICOS"
-    ws_resumen['A1'].font = Font(size=16, bold=True)
-    ws_resumen.merge_cells('A1:D1')
-    
-    # Resumen
-    ws_resumen['A3'] = "Total Paquetes:"
-    ws_resumen['B3'] = resumen['total_registros']
-    
-    ws_resumen['A4'] = "Paquetes Activos:"
-    ws_resumen['B4'] = resumen['paquetes_activos']
-    
-    ws_resumen['A5'] = "Paquetes Inactivos:"
-    ws_resumen['B5'] = resumen['paquetes_inactivos']
-    
-    ws_resumen['A7'] = "Precio Promedio (PYG):"
-    ws_resumen['B7'] = float(resumen.get('precio_promedio_pyg') or 0)
-    ws_resumen['B7'].number_format = '#,##0.00'
-    
-    ws_resumen['A8'] = "Precio Promedio (USD):"
-    ws_resumen['B8'] = float(resumen.get('precio_promedio_usd') or 0)
-    ws_resumen['B8'].number_format = '#,##0.00'
-    
-    # ===== HOJA 2: DATOS =====
-    ws_datos = wb.create_sheet("Datos")
-    
-    # Headers
-    headers = ['Código', 'Nombre', 'Tipo', 'Destino', 'País', 'Distribuidora', 
-               'Precio (₲)', 'Precio (USD)', 'Seña (₲)', 'Seña (USD)', 'Moneda Orig.', 
-               'Fecha Inicio', 'Duración (días)', 'Cupos Disponibles', 'Cupos Ocupados', 
-               'Reservas', 'Personalizado', 'Propio', 'Estado']
-    ws_datos.append(headers)
-    
-    # Estilo header
-    header_fill = PatternFill(start_color="3498db", end_color="3498db", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    
-    for cell in ws_datos[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Datos
+def filas_paquetes(data):
+    """Filas de la hoja "Datos" del reporte de paquetes (ver COLUMNAS_PAQUETES)."""
     for paq in data:
         precio_gs = paq.get('precio_gs', 0) or 0
         precio_usd = paq.get('precio_usd', 0) or 0
         sena_gs = paq.get('sena_gs', 0) or 0
         sena_usd = paq.get('sena_usd', 0) or 0
-        
+
         # Si el paquete NO es propio, mostrar "N/A" en cupos (sujeto a disponibilidad)
         cupos_disp = 'N/A' if not paq.get('propio') else (paq.get('cupos_disponibles', 0) or 0)
         cupos_ocup = 'N/A' if not paq.get('propio') else (paq.get('cupos_ocupados', 0) or 0)
-        
-        ws_datos.append([
+
+        yield [
             paq['codigo'],
             paq['nombre'],
             paq['tipo_paquete'],
@@ -556,123 +457,18 @@ def generar_excel_paquetes(data, filtros, resumen):
             'Sí' if paq['personalizado'] else 'No',
             'Sí' if paq['propio'] else 'No',
             'Activo' if paq['activo'] else 'Inactivo'
-        ])
-    
-    # Formato columnas
-    for row in range(2, len(data) + 2):
-        ws_datos[f'G{row}'].number_format = '#,##0.00'  # Precio PYG
-        ws_datos[f'H{row}'].number_format = '#,##0.00'  # Precio USD
-        ws_datos[f'I{row}'].number_format = '#,##0.00'  # Seña PYG
-        ws_datos[f'J{row}'].number_format = '#,##0.00'  # Seña USD
-    
-    # Auto-ajustar columnas
-    for column in ws_datos.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(cell.value)
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws_datos.column_dimensions[column_letter].width = adjusted_width
-    
-    # Filtros en Excel
-    ws_datos.auto_filter.ref = ws_datos.dimensions
-    
-    # Guardar
-    wb.save(buffer)
-    buffer.seek(0)
-    return buffer
+        ]
 
 
-def generar_excel_reservas(data, filtros, resumen):
-    """Genera Excel del reporte de reservas."""
-    buffer = BytesIO()
-    wb = Workbook()
-    
-    # ===== HOJA 1: RESUMEN =====
-    ws_resumen = wb.active
-    ws_resumen.title = "Resumen"
-    
-    # Título
-    ws_resumen['A1'] = "REPORTE DE RESERVAS"
-    ws_resumen['A1'].font = Font(size=16, bold=True)
-    ws_resumen.merge_cells('A1:D1')
-    
-    # Resumen
-    ws_resumen['A3'] = "Total Reservas:"
-    ws_resumen['B3'] = resumen['total_registros']
-    
-    ws_resumen['A4'] = "Reservas Pendientes:"
-    ws_resumen['B4'] = resumen['reservas_pendientes']
-    
-    ws_resumen['A5'] = "Reservas Confirmadas:"
-    ws_resumen['B5'] = resumen['reservas_confirmadas']
-    
-    ws_resumen['A6'] = "Reservas Finalizadas:"
-    ws_resumen['B6'] = resumen['reservas_finalizadas']
-    
-    ws_resumen['A7'] = "Reservas Canceladas:"
-    ws_resumen['B7'] = resumen['reservas_canceladas']
-    
-    ws_resumen['A9'] = "Monto Total (PYG):"
-    ws_resumen['B9'] = float(resumen['monto_total'])
-    ws_resumen['B9'].number_format = '#,##0.00'
-    
-    ws_resumen['A10'] = "Monto Total (USD):"
-    ws_resumen['B10'] = float(resumen.get('monto_total_usd') or 0)
-    ws_resumen['B10'].number_format = '#,##0.00'
-    
-    ws_resumen['A11'] = "Monto Pagado (PYG):"
-    ws_resumen['B11'] = float(resumen['monto_pagado'])
-    ws_resumen['B11'].number_format = '#,##0.00'
-    
-    ws_resumen['A12'] = "Monto Pagado (USD):"
-    ws_resumen['B12'] = float(resumen.get('monto_pagado_usd') or 0)
-    ws_resumen['B12'].number_format = '#,##0.00'
-    
-    ws_resumen['A13'] = "Saldo Pendiente (PYG):"
-    ws_resumen['B13'] = float(resumen['saldo_pendiente'])
-    ws_resumen['B13'].number_format = '#,##0.00'
-    ws_resumen['B13'].font = Font(bold=True)
-    
-    ws_resumen['A14'] = "Saldo Pendiente (USD):"
-    ws_resumen['B14'] = float(resumen.get('saldo_pendiente_usd') or 0)
-    ws_resumen['B14'].number_format = '#,##0.00'
-    ws_resumen['B14'].font = Font(bold=True)
-    
-    # ===== HOJA 2: DATOS =====
-    ws_datos = wb.create_sheet("Datos")
-    
-    # Headers
-    headers = ['Código', 'Fecha Reserva', 'Titular', 'Documento', 'Email', 'Teléfono', 'Paquete', 
-               'Destino', 'Fecha Salida', 'Fecha Retorno', 'Pasajeros', 
-               'Precio Unit. (₲)', 'Precio Unit. (USD)', 
-               'Monto Total (₲)', 'Monto Total (USD)', 
-               'Monto Pagado (₲)', 'Monto Pagado (USD)', 
-               'Saldo Pend. (₲)', 'Saldo Pend. (USD)', 
-               '% Pagado', 'Estado', 'Estado Pago', 'Modalidad Fact.']
-    ws_datos.append(headers)
-    
-    # Estilo header
-    header_fill = PatternFill(start_color="3498db", end_color="3498db", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    
-    for cell in ws_datos[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Datos
+def filas_reservas(data):
+    """Filas de la hoja "Datos" del reporte de reservas (ver COLUMNAS_RESERVAS)."""
     for res in data:
         precio_usd = res.get('precio_unitario_usd', 0) or 0
         monto_total_usd = res.get('monto_total_usd', 0) or 0
         monto_pagado_usd = res.get('monto_pagado_usd', 0) or 0
         saldo_usd = res.get('saldo_pendiente_usd', 0) or 0
-        
-        ws_datos.append([
+
+        yield [
             res['codigo'],
             res['fecha_reserva'][:10] if res.get('fecha_reserva') else '',
             res['titular_nombre'],
@@ -696,40 +492,190 @@ def generar_excel_reservas(data, filtros, resumen):
             res['estado_display'],
             res['estado_pago_display'],
             res['modalidad_facturacion_display']
+        ]
+
+
+def _hoja_resumen(wb, titulo, lineas):
+    """
+    Escribe la hoja "Resumen" de un workbook write-only.
+
+    Args:
+        wb: Workbook(write_only=True)
+        titulo: Título de la hoja (fila 1, combinada A1:D1)
+        lineas: Lista de tuplas (etiqueta, valor, formato, negrita) a partir de
+                la fila 3. None deja una fila vacía.
+    """
+    ws = wb.create_sheet("Resumen")
+    ws.column_dimensions['A'].width = 26
+    ws.column_dimensions['B'].width = 26
+
+    ws.append([_celda(ws, titulo, font=Font(size=16, bold=True))])
+    ws.merged_cells.add('A1:D1')
+    ws.append([])
+
+    for linea in lineas:
+        if linea is None:
+            ws.append([])
+            continue
+        etiqueta, valor, formato, negrita = linea
+        estilos = {}
+        if formato:
+            estilos['number_format'] = formato
+        if negrita:
+            estilos['font'] = Font(bold=True)
+        ws.append([etiqueta, _celda(ws, valor, **estilos)])
+
+
+def _hoja_datos(wb, columnas, filas):
+    """
+    Escribe la hoja "Datos" de un workbook write-only fila por fila.
+
+    Args:
+        wb: Workbook(write_only=True)
+        columnas: Lista de (título, ancho, formato) del reporte
+        filas: Iterable de listas de valores (una por registro)
+    """
+    ws = wb.create_sheet("Datos")
+
+    # El ancho debe definirse antes de escribir filas
+    for numero, (_, ancho, _) in enumerate(columnas, 1):
+        ws.column_dimensions[get_column_letter(numero)].width = ancho
+
+    header_fill = PatternFill(start_color="3498db", end_color="3498db", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True)
+    header_alignment = Alignment(horizontal='center', vertical='center')
+    ws.append([
+        _celda(ws, titulo, fill=header_fill, font=header_font, alignment=header_alignment)
+        for titulo, _, _ in columnas
+    ])
+
+    formatos = [formato for _, _, formato in columnas]
+    total_filas = 0
+    for fila in filas:
+        ws.append([
+            _celda(ws, valor, number_format=formato) if formato and isinstance(valor, (int, float)) else valor
+            for valor, formato in zip(fila, formatos)
         ])
-    
-    # Formato columnas
-    for row in range(2, len(data) + 2):
-        ws_datos[f'L{row}'].number_format = '#,##0.00'  # Precio Unit PYG
-        ws_datos[f'M{row}'].number_format = '#,##0.00'  # Precio Unit USD
-        ws_datos[f'N{row}'].number_format = '#,##0.00'  # Monto Total PYG
-        ws_datos[f'O{row}'].number_format = '#,##0.00'  # Monto Total USD
-        ws_datos[f'P{row}'].number_format = '#,##0.00'  # Monto Pagado PYG
-        ws_datos[f'Q{row}'].number_format = '#,##0.00'  # Monto Pagado USD
-        ws_datos[f'R{row}'].number_format = '#,##0.00'  # Saldo Pend PYG
-        ws_datos[f'S{row}'].number_format = '#,##0.00'  # Saldo Pend USD
-        ws_datos[f'T{row}'].number_format = '0.00'      # % Pagado
-    
-    # Auto-ajustar columnas
-    for column in ws_datos.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(cell.value)
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws_datos.column_dimensions[column_letter].width = adjusted_width
-    
+        total_filas += 1
+
     # Filtros en Excel
-    ws_datos.auto_filter.ref = ws_datos.dimensions
-    
-    # Guardar
-    wb.save(buffer)
-    buffer.seek(0)
-    return buffer
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(columnas))}{total_filas + 1}"
+
+
+def _celda(ws, valor, **estilos):
+    """Celda con estilos para una hoja write-only."""
+    celda = WriteOnlyCell(ws, value=valor)
+    for atributo, estilo in estilos.items():
+        setattr(celda, atributo, estilo)
+    return celda
+
+
+def _guardar_excel(wb, destino):
+    """Guarda el workbook en `destino` (o en un BytesIO) y lo deja posicionado al inicio."""
+    if destino is None:
+        destino = BytesIO()
+    wb.save(destino)
+    destino.seek(0)
+    return destino
+
+
+def generar_excel_movimientos_cajas(data, filtros, resumen, destino=None):
+    """
+    Genera Excel del reporte de movimientos de cajas.
+
+    Args:
+        data: Iterable de movimientos serializados (MovimientoCajaReporteSerializer)
+        filtros: Filtros aplicados (fecha_desde, fecha_hasta, ...)
+        resumen: Totales del reporte
+        destino: Archivo donde escribir el Excel (default: BytesIO)
+
+    Returns:
+        El archivo destino (o BytesIO) con el Excel, posicionado al inicio
+    """
+    wb = Workbook(write_only=True)
+
+    _hoja_resumen(wb, "REPORTE DE MOVIMIENTOS DE CAJAS", [
+        ("Período:", f"{filtros['fecha_desde']} a {filtros['fecha_hasta']}", None, False),
+        None,
+        ("Total Débitos (PYG):", float(resumen['total_ingresos']), FORMATO_MONTO, False),
+        ("Total Débitos (USD):", float(resumen.get('total_ingresos_usd') or 0), FORMATO_MONTO, False),
+        ("Total Créditos (PYG):", float(resumen['total_egresos']), FORMATO_MONTO, False),
+        ("Total Créditos (USD):", float(resumen.get('total_egresos_usd') or 0), FORMATO_MONTO, False),
+        ("Balance (PYG):", float(resumen['balance']), FORMATO_MONTO, True),
+        ("Balance (USD):", float(resumen.get('balance_usd') or 0), FORMATO_MONTO, True),
+    ])
+    _hoja_datos(wb, COLUMNAS_MOVIMIENTOS_CAJAS, filas_movimientos_cajas(data))
+
+    return _guardar_excel(wb, destino)
+
+
+def generar_excel_paquetes(data, filtros, resumen, destino=None):
+    """Genera Excel del reporte de paquetes (ver generar_excel_movimientos_cajas)."""
+    wb = Workbook(write_only=True)
+
+    _hoja_resumen(wb, "REPORTE DE PAQUETES TURÍSTICOS", [
+        ("Total Paquetes:", resumen['total_registros'], None, False),
+        ("Paquetes Activos:", resumen['paquetes_activos'], None, False),
+        ("Paquetes Inactivos:", resumen['paquetes_inactivos'], None, False),
+        None,
+        ("Precio Promedio (PYG):", float(resumen.get('precio_promedio_pyg') or 0), FORMATO_MONTO, False),
+        ("Precio Promedio (USD):", float(resumen.get('precio_promedio_usd') or 0), FORMATO_MONTO, False),
+    ])
+    _hoja_datos(wb, COLUMNAS_PAQUETES, filas_paquetes(data))
+
+    return _guardar_excel(wb, destino)
+
+
+def generar_excel_reservas(data, filtros, resumen, destino=None):
+    """Genera Excel del reporte de reservas (ver generar_excel_movimientos_cajas)."""
+    wb = Workbook(write_only=True)
+
+    _hoja_resumen(wb, "REPORTE DE RESERVAS", [
+        ("Total Reservas:", resumen['total_registros'], None, False),
+        ("Reservas Pendientes:", resumen['reservas_pendientes'], None, False),
+        ("Reservas Confirmadas:", resumen['reservas_confirmadas'], None, False),
+        ("Reservas Finalizadas:", resumen['reservas_finalizadas'], None, False),
+        ("Reservas Canceladas:", resumen['reservas_canceladas'], None, False),
+        None,
+        ("Monto Total (PYG):", float(resumen['monto_total']), FORMATO_MONTO, False),
+        ("Monto Total (USD):", float(resumen.get('monto_total_usd') or 0), FORMATO_MONTO, False),
+        ("Monto Pagado (PYG):", float(resumen['monto_pagado']), FORMATO_MONTO, False),
+        ("Monto Pagado (USD):", float(resumen.get('monto_pagado_usd') or 0), FORMATO_MONTO, False),
+        ("Saldo Pendiente (PYG):", float(resumen['saldo_pendiente']), FORMATO_MONTO, True),
+        ("Saldo Pendiente (USD):", float(resumen.get('saldo_pendiente_usd') or 0), FORMATO_MONTO, True),
+    ])
+    _hoja_datos(wb, COLUMNAS_RESERVAS, filas_reservas(data))
+
+    return _guardar_excel(wb, destino)
+
+
+# ============================================================================
+# EXPORTACIÓN CSV
+# ============================================================================
+
+ENCABEZADOS_CSV_MOVIMIENTOS_CAJAS = [
+    'Número Movimiento', 'Fecha/Hora', 'Caja', 'Número Caja', 'Tipo Movimiento', 'Concepto',
+    'Descripción', 'Monto', 'Método Pago', 'Referencia', 'Usuario Registro', 'Comprobante'
+]
+
+
+def filas_csv_movimientos_cajas(data):
+    """Filas del CSV de movimientos de cajas (ver ENCABEZADOS_CSV_MOVIMIENTOS_CAJAS)."""
+    for mov in data:
+        yield [
+            mov['numero_movimiento'] or 'N/A',
+            format_datetime(mov['fecha_hora']) if mov.get('fecha_hora') else 'N/A',
+            mov.get('caja_nombre') or 'N/A',
+            mov.get('caja_numero') or 'N/A',
+            mov['tipo_movimiento_display'],
+            mov['concepto_display'],
+            mov.get('descripcion') or '',
+            f"{float(mov['monto'] or 0):,.2f}",
+            mov['metodo_pago_display'],
+            mov.get('referencia') or '',
+            mov['usuario_registro'],
+            mov.get('comprobante_numero') or 'N/A'
+        ]
 
 
 # ============================================================================
@@ -6,12 +6,11 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Q, Sum, Count, Avg
+from django.db.models import Q, Sum, Count, Avg, Value
 from django.utils import timezone
 from django.http import HttpResponse
 from datetime import datetime, timedelta
 from decimal import Decimal
-import csv
 
 from apps.arqueo_caja.models import MovimientoCaja
 from apps.reserva.models import Reserva
@@ -27,7 +26,26 @@ from .reportes_utils import (
     generar_pdf_paquetes,
     generar_excel_paquetes,
     generar_pdf_reservas,
-    generar_excel_reservas
+    generar_excel_reservas,
+    COLUMNAS_PAQUETES,
+    COLUMNAS_RESERVAS,
+    ENCABEZADOS_CSV_MOVIMIENTOS_CAJAS,
+    filas_csv_movimientos_cajas,
+    filas_paquetes,
+    filas_reservas
+)
+from .exportacion import (
+    iterar_serializado,
+    nombre_archivo,
+    obtener_formato,
+    respuesta_csv,
+    respuesta_xlsx
+)
+from .paginacion import (
+    CONTEO_QUERY_PARAM,
+    CURSOR_QUERY_PARAM,
+    ParametroPaginacionInvalido,
+    paginar_por_cursor
 )
 
 
@@ -48,13 +66,7 @@ def paginar_resultados(queryset, page, page_size):
             'results': list
         }
     """
-    # Validar page_size
-    try:
-        page_size = int(page_size)
-        if page_size not in [10, 20, 50, 100]:
-            page_size = 20  # default
-    except (ValueError, TypeError):
-        page_size = 20
+    page_size = validar_page_size(page_size)
     
     # Validar page
     try:
@@ -88,6 +100,53 @@ def paginar_resultados(queryset, page, page_size):
     }
 
 
+def validar_page_size(page_size):
+    """Tamaño de página de los reportes: 10, 20, 50 o 100 (default: 20)"""
+    try:
+        page_size = int(page_size)
+        if page_size not in [10, 20, 50, 100]:
+            page_size = 20  # default
+    except (ValueError, TypeError):
+        page_size = 20
+    return page_size
+
+
+def paginar_reporte(request, queryset, ordenamiento_cursor=None):
+    """
+    Pagina un reporte por páginas (?page=) o, si el request trae `cursor` y el
+    reporte admite keyset, por cursor sobre `ordenamiento_cursor`
+    (ver apps/dashboard/paginacion.py).
+
+    Args:
+        request: Request de DRF
+        queryset: QuerySet filtrado y ordenado
+        ordenamiento_cursor (tuple): Clave del modo cursor (ej: ('-fecha_reserva', '-id')).
+                                     None si el ordenamiento pedido no la admite.
+
+    Returns:
+        dict: Estructura de paginar_resultados() o de paginar_por_cursor()
+
+    Raises:
+        ParametroPaginacionInvalido: Cursor o conteo inválidos, o cursor con un
+                                     ordenamiento que no lo admite
+    """
+    page_size = request.query_params.get('page_size', 20)
+
+    if CURSOR_QUERY_PARAM not in request.query_params:
+        return paginar_resultados(queryset, request.query_params.get('page', 1), page_size)
+
+    if not ordenamiento_cursor:
+        raise ParametroPaginacionInvalido('La paginación por cursor solo admite ordenar por fecha')
+
+    return paginar_por_cursor(
+        queryset,
+        ordenamiento_cursor,
+        request.query_params.get(CURSOR_QUERY_PARAM),
+        validar_page_size(page_size),
+        request.query_params.get(CONTEO_QUERY_PARAM, 'ninguno'),
+    )
+
+
 def parsear_fecha(fecha_str, default=None):
     """
     Parsea una fecha en formato YYYY-MM-DD.
@@ -180,11 +239,18 @@ def calcular_precio_promedio_usd(salidas_o_paquetes, es_queryset_paquetes=False)
         float: Precio promedio en USD o None si no hay datos
     """
     from apps.moneda.models import Moneda, CotizacionMoneda
+    from apps.moneda.services import obtener_moneda
     from apps.paquete.models import SalidaPaquete
     
     try:
         total_usd = Decimal('0')
         count = 0
+
+        # Cotización USD vigente: se obtiene una sola vez, no en cada iteración
+        try:
+            cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(obtener_moneda('USD'))
+        except Moneda.DoesNotExist:
+            cotizacion = None
         
         # Si recibimos paquetes, obtener solo la próxima salida de cada uno
         if es_queryset_paquetes:
@@ -202,8 +268,6 @@ def calcular_precio_promedio_usd(salidas_o_paquetes, es_queryset_paquetes=False)
                     total_usd += precio
                     count += 1
                 elif paquete.moneda and paquete.moneda.codigo == 'PYG':
-                    moneda_usd = Moneda.objects.get(codigo='USD')
-                    cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd)
                     if cotizacion and cotizacion.valor_en_guaranies > 0:
                         precio_usd = precio / cotizacion.valor_en_guaranies
                         total_usd += precio_usd
@@ -212,8 +276,6 @@ def calcular_precio_promedio_usd(salidas_o_paquetes, es_queryset_paquetes=False)
                     if paquete.moneda:
                         try:
                             precio_gs = CotizacionMoneda.convertir_a_guaranies(precio, paquete.moneda)
-                            moneda_usd = Moneda.objects.get(codigo='USD')
-                            cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd)
                             if cotizacion and cotizacion.valor_en_guaranies > 0:
                                 precio_usd = precio_gs / cotizacion.valor_en_guaranies
                                 total_usd += precio_usd
@@ -239,8 +301,6 @@ def calcular_precio_promedio_usd(salidas_o_paquetes, es_queryset_paquetes=False)
                     count += 1
                 # Si está en PYG, convertir a USD
                 elif paquete.moneda and paquete.moneda.codigo == 'PYG':
-                    moneda_usd = Moneda.objects.get(codigo='USD')
-                    cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd)
                     if cotizacion and cotizacion.valor_en_guaranies > 0:
                         precio_usd = precio / cotizacion.valor_en_guaranies
                         total_usd += precio_usd
@@ -250,8 +310,6 @@ def calcular_precio_promedio_usd(salidas_o_paquetes, es_queryset_paquetes=False)
                     if paquete.moneda:
                         try:
                             precio_gs = CotizacionMoneda.convertir_a_guaranies(precio, paquete.moneda)
-                            moneda_usd = Moneda.objects.get(codigo='USD')
-                            cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd)
                             if cotizacion and cotizacion.valor_en_guaranies > 0:
                                 precio_usd = precio_gs / cotizacion.valor_en_guaranies
                                 total_usd += precio_usd
@@ -343,6 +401,193 @@ def calcular_precio_promedio_pyg(salidas_o_paquetes, es_queryset_paquetes=False)
         return None
 
 
+def anotar_estado_pago_reservas(queryset):
+    """
+    Anota los montos y el estado de pago de cada reserva como expresiones SQL,
+    para filtrar, ordenar y paginar por ellos en la base de datos.
+
+    Anotaciones agregadas (mismo criterio que ReservaReporteSerializer):
+        _monto_total: precio_unitario × cantidad_pasajeros (0 si falta alguno)
+        _monto_pagado: suma del monto neto (PasajeroLedger) de los pasajeros
+        _estado_pago: 'sin_pagar' (nada pagado), 'pago_parcial' (pagado menor
+                      al total) o 'pago_completo'
+
+    Los montos se leen de PasajeroLedger, que se crea junto con cada pasajero.
+    Si el queryset ya está anotado se devuelve sin cambios.
+
+    Args:
+        queryset: QuerySet de Reserva
+
+    Returns:
+        QuerySet[Reserva]: Queryset anotado
+    """
+    from django.db.models import (
+        Case, CharField, DecimalField, ExpressionWrapper, F, OuterRef, Subquery, When
+    )
+    from django.db.models.functions import Coalesce, Greatest
+    from apps.reserva.models import Pasajero
+
+    if '_estado_pago' in queryset.query.annotations:
+        return queryset
+
+    decimal_field = DecimalField(max_digits=14, decimal_places=2)
+    cero = Value(Decimal('0'), output_field=decimal_field)
+
+    monto_pagado = Pasajero.objects.filter(reserva=OuterRef('pk')).order_by().values('reserva').annotate(
+        total=Sum(Greatest(
+            ExpressionWrapper(
+                Coalesce(F('ledger__monto_pagado'), cero)
+                - Coalesce(F('ledger__monto_reembolsado'), cero)
+                - Coalesce(F('ledger__monto_acreditado'), cero),
+                output_field=decimal_field
+            ),
+            cero,
+            output_field=decimal_field
+        ))
+    ).values('total')
+
+    return queryset.annotate(
+        _monto_total=Case(
+            When(
+                precio_unitario__gt=0,
+                cantidad_pasajeros__gt=0,
+                then=ExpressionWrapper(F('precio_unitario') * F('cantidad_pasajeros'), output_field=decimal_field)
+            ),
+            default=cero,
+            output_field=decimal_field
+        ),
+        _monto_pagado=Coalesce(Subquery(monto_pagado, output_field=decimal_field), cero),
+    ).annotate(
+        _estado_pago=Case(
+            When(_monto_pagado=0, then=Value('sin_pagar')),
+            When(_monto_pagado__lt=F('_monto_total'), then=Value('pago_parcial')),
+            default=Value('pago_completo'),
+            output_field=CharField()
+        )
+    )
+
+
+def filtrar_estado_pago_reservas(queryset, estado_pago):
+    """
+    Filtra las reservas por el estado de pago anotado por anotar_estado_pago_reservas().
+
+    Args:
+        queryset: QuerySet de Reserva
+        estado_pago (str): sin_pagar, pago_parcial, pago_completo, todas o None
+
+    Returns:
+        QuerySet[Reserva]: Queryset anotado y filtrado
+    """
+    queryset = anotar_estado_pago_reservas(queryset)
+    if estado_pago and estado_pago != 'todas':
+        queryset = queryset.filter(_estado_pago=estado_pago)
+    return queryset
+
+
+def calcular_resumen_reservas(queryset):
+    """
+    Resumen del reporte de reservas: cantidades por estado, pasajeros y montos
+    en guaraníes y dólares.
+
+    Se resuelve con una sola consulta agrupada por moneda del paquete
+    (agregación condicional sobre las anotaciones de
+    anotar_estado_pago_reservas()); no recorre reservas en Python. Después solo se
+    convierten los totales de cada moneda.
+
+    Igual que antes, pasajeros y montos excluyen las reservas canceladas, y
+    los montos solo consideran reservas con precio_unitario y cantidad de
+    pasajeros. El reporte y las exportaciones lo calculan antes de aplicar el
+    filtro estado_pago, como lo hacía el reporte original.
+
+    Args:
+        queryset: QuerySet de Reserva ya filtrado
+
+    Returns:
+        dict: total_registros, reservas_<estado>, total_pasajeros y
+              monto_total/monto_pagado/saldo_pendiente en _gs y _usd
+              (los _usd son None si no hay cotización vigente del dólar)
+    """
+    from apps.moneda.models import CotizacionMoneda, Moneda
+    from apps.moneda.services import obtener_moneda
+
+    no_cancelada = ~Q(estado='cancelada')
+    con_monto = no_cancelada & Q(precio_unitario__gt=0, cantidad_pasajeros__gt=0)
+
+    por_moneda = anotar_estado_pago_reservas(
+        queryset.order_by().prefetch_related(None)
+    ).values('paquete__moneda_id', 'paquete__moneda__codigo').annotate(
+        total=Count('id'),
+        pendientes=Count('id', filter=Q(estado='pendiente')),
+        confirmadas=Count('id', filter=Q(estado='confirmada')),
+        finalizadas=Count('id', filter=Q(estado='finalizada')),
+        canceladas=Count('id', filter=Q(estado='cancelada')),
+        pasajeros=Sum('cantidad_pasajeros', filter=no_cancelada),
+        monto_total=Sum('_monto_total', filter=con_monto),
+        monto_pagado=Sum('_monto_pagado', filter=con_monto),
+    )
+
+    try:
+        cotizacion_usd = CotizacionMoneda.obtener_cotizacion_vigente(obtener_moneda('USD'))
+    except Moneda.DoesNotExist:
+        cotizacion_usd = None
+    valor_usd = cotizacion_usd.valor_en_guaranies if cotizacion_usd else None
+    tiene_cotizacion_usd = bool(valor_usd)
+
+    conteos = {'total': 0, 'pendientes': 0, 'confirmadas': 0, 'finalizadas': 0, 'canceladas': 0, 'pasajeros': 0}
+    monto_total_gs = monto_pagado_gs = Decimal('0')
+    monto_total_usd = monto_pagado_usd = Decimal('0')
+
+    for fila in por_moneda:
+        for clave in conteos:
+            conteos[clave] += fila[clave] or 0
+
+        total = fila['monto_total'] or Decimal('0')
+        pagado = fila['monto_pagado'] or Decimal('0')
+        codigo = fila['paquete__moneda__codigo']
+
+        if codigo == 'USD':
+            # Ya está en USD
+            monto_total_usd += total
+            monto_pagado_usd += pagado
+            if tiene_cotizacion_usd:
+                monto_total_gs += total * valor_usd
+                monto_pagado_gs += pagado * valor_usd
+            continue
+
+        if codigo and codigo != 'PYG':
+            # Otra moneda: convertir a Gs
+            try:
+                moneda = Moneda.objects.get(pk=fila['paquete__moneda_id'])
+                total = CotizacionMoneda.convertir_a_guaranies(total, moneda)
+                pagado = CotizacionMoneda.convertir_a_guaranies(pagado, moneda)
+            except Exception:
+                continue
+
+        # En Gs (o sin moneda definida): convertir a USD
+        monto_total_gs += total
+        monto_pagado_gs += pagado
+        if tiene_cotizacion_usd:
+            monto_total_usd += total / valor_usd
+            monto_pagado_usd += pagado / valor_usd
+
+    saldo_pendiente_usd = monto_total_usd - monto_pagado_usd
+
+    return {
+        "total_registros": conteos['total'],
+        "reservas_pendientes": conteos['pendientes'],
+        "reservas_confirmadas": conteos['confirmadas'],
+        "reservas_finalizadas": conteos['finalizadas'],
+        "reservas_canceladas": conteos['canceladas'],
+        "monto_total_gs": float(monto_total_gs),
+        "monto_pagado_gs": float(monto_pagado_gs),
+        "saldo_pendiente_gs": float(monto_total_gs - monto_pagado_gs),
+        "monto_total_usd": float(round(monto_total_usd, 2)) if tiene_cotizacion_usd else None,
+        "monto_pagado_usd": float(round(monto_pagado_usd, 2)) if tiene_cotizacion_usd else None,
+        "saldo_pendiente_usd": float(round(saldo_pendiente_usd, 2)) if tiene_cotizacion_usd else None,
+        "total_pasajeros": conteos['pasajeros']
+    }
+
+
 # ============================================================================
 # 1. REPORTE DE MOVIMIENTOS DE CAJAS
 # ============================================================================
@@ -365,6 +610,9 @@ def reporte_movimientos_cajas(request):
     - busqueda: texto libre en descripción/referencia
     - page: número de página (default: 1)
     - page_size: registros por página (default: 20, opciones: 10,20,50,100)
+    - cursor: pagina por (fecha_hora_movimiento, id) en lugar de page
+              (vacío = primera página, luego data.nextCursor)
+    - conteo: con cursor, ninguno (default), aproximado o exacto
     """
     try:
         # ===== VALIDAR FECHAS REQUERIDAS =====
@@ -415,7 +663,7 @@ def reporte_movimientos_cajas(request):
             'usuario_registro',
             'usuario_registro__persona',
             'comprobante'
-        ).order_by('-fecha_hora_movimiento')
+        ).order_by('-fecha_hora_movimiento', '-id')
         
         # ===== APLICAR FILTROS =====
         caja_id = request.query_params.get('caja_id')
@@ -487,10 +735,7 @@ def reporte_movimientos_cajas(request):
         }
         
         # ===== PAGINAR =====
-        page = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 20)
-        
-        paginacion = paginar_resultados(queryset, page, page_size)
+        paginacion = paginar_reporte(request, queryset, ('-fecha_hora_movimiento', '-id'))
         
         # ===== SERIALIZAR =====
         serializer = MovimientoCajaReporteSerializer(paginacion['results'], many=True)
@@ -509,6 +754,15 @@ def reporte_movimientos_cajas(request):
             "data": paginacion
         }, status=status.HTTP_200_OK)
         
+    except ParametroPaginacionInvalido as e:
+        return Response(
+            {
+                "success": False,
+                "message": "Parámetros de paginación inválidos",
+                "errors": [str(e)]
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
     except Exception as e:
         return Response(
             {
@@ -800,6 +1054,9 @@ def reporte_reservas(request):
     - ordenar_por: fecha, monto, estado
     - page: número de página
     - page_size: registros por página
+    - cursor: pagina por (fecha_reserva, id) en lugar de page; solo con
+              ordenar_por=fecha (vacío = primera página, luego data.nextCursor)
+    - conteo: con cursor, ninguno (default), aproximado o exacto
     """
     try:
         # ===== CONSTRUIR QUERY BASE =====
@@ -851,10 +1108,6 @@ def reporte_reservas(request):
         if estado and estado != 'todas':
             queryset = queryset.filter(estado=estado)
         
-        # ===== FILTRO POR ESTADO DE PAGO =====
-        # Este filtro se aplicará después de serializar porque es calculado
-        estado_pago_filtro = request.query_params.get('estado_pago')
-        
         # ===== OTROS FILTROS =====
         paquete_id = request.query_params.get('paquete_id')
         if paquete_id:
@@ -880,131 +1133,34 @@ def reporte_reservas(request):
                 Q(titular__apellidos__icontains=busqueda)
             )
         
+        # ===== CALCULAR RESUMEN (antes de filtrar por estado de pago y de paginar) =====
+        resumen = calcular_resumen_reservas(queryset)
+        
+        # ===== FILTRO POR ESTADO DE PAGO =====
+        # Estado de pago y montos anotados en SQL: se filtra, ordena y pagina en la base
+        estado_pago_filtro = request.query_params.get('estado_pago')
+        queryset = filtrar_estado_pago_reservas(queryset, estado_pago_filtro)
+        
         # ===== ORDENAMIENTO =====
         ordenar_por = request.query_params.get('ordenar_por', 'fecha')
         if ordenar_por == 'fecha':
-            queryset = queryset.order_by('-fecha_reserva')
+            queryset = queryset.order_by('-fecha_reserva', '-id')
         elif ordenar_por == 'monto':
-            queryset = queryset.order_by('-precio_unitario')
+            queryset = queryset.order_by('-_monto_total', '-id')
         elif ordenar_por == 'estado':
-            queryset = queryset.order_by('estado')
+            queryset = queryset.order_by('estado', '-id')
         else:
-            queryset = queryset.order_by('-fecha_reserva')
-        
-        # ===== CALCULAR RESUMEN (antes de paginar) =====
-        reservas_por_estado = {
-            'pendiente': queryset.filter(estado='pendiente').count(),
-            'confirmada': queryset.filter(estado='confirmada').count(),
-            'finalizada': queryset.filter(estado='finalizada').count(),
-            'cancelada': queryset.filter(estado='cancelada').count()
-        }
-        
-        # Calcular totales (excluyendo canceladas)
-        reservas_activas = queryset.exclude(estado='cancelada')
-        
-        total_pasajeros = sum(r.cantidad_pasajeros or 0 for r in reservas_activas)
-        
-        # Calcular montos
-        monto_total_gs = Decimal('0')
-        monto_pagado_total_gs = Decimal('0')
-        monto_total_usd = Decimal('0')
-        monto_pagado_total_usd = Decimal('0')
-        
-        # Flag para saber si tenemos datos en USD
-        tiene_cotizacion_usd = False
-        
-        try:
-            from apps.moneda.models import Moneda, CotizacionMoneda
-            moneda_usd = Moneda.objects.get(codigo='USD')
-            cotizacion_usd = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd)
-            tiene_cotizacion_usd = cotizacion_usd is not None
-        except Exception:
-            pass
-        
-        for reserva in reservas_activas:
-            if reserva.precio_unitario and reserva.cantidad_pasajeros:
-                monto_reserva = reserva.precio_unitario * reserva.cantidad_pasajeros
-                monto_pagado_reserva = reserva.monto_pagado or Decimal('0')
-                
-                # Sumar en moneda original o convertir
-                if reserva.paquete and reserva.paquete.moneda:
-                    if reserva.paquete.moneda.codigo == 'PYG':
-                        # Ya está en Gs
-                        monto_total_gs += monto_reserva
-                        monto_pagado_total_gs += monto_pagado_reserva
-                        
-                        # Convertir a USD
-                        if tiene_cotizacion_usd and cotizacion_usd.valor_en_guaranies > 0:
-                            monto_total_usd += monto_reserva / cotizacion_usd.valor_en_guaranies
-                            monto_pagado_total_usd += monto_pagado_reserva / cotizacion_usd.valor_en_guaranies
-                    
-                    elif reserva.paquete.moneda.codigo == 'USD':
-                        # Ya está en USD
-                        monto_total_usd += monto_reserva
-                        monto_pagado_total_usd += monto_pagado_reserva
-                        
-                        # Convertir a Gs
-                        if tiene_cotizacion_usd:
-                            monto_total_gs += monto_reserva * cotizacion_usd.valor_en_guaranies
-                            monto_pagado_total_gs += monto_pagado_reserva * cotizacion_usd.valor_en_guaranies
-                    
-                    else:
-                        # Otra moneda: convertir a Gs y luego a USD
-                        try:
-                            from apps.moneda.models import CotizacionMoneda
-                            monto_gs = CotizacionMoneda.convertir_a_guaranies(monto_reserva, reserva.paquete.moneda)
-                            pagado_gs = CotizacionMoneda.convertir_a_guaranies(monto_pagado_reserva, reserva.paquete.moneda)
-                            
-                            monto_total_gs += monto_gs
-                            monto_pagado_total_gs += pagado_gs
-                            
-                            if tiene_cotizacion_usd and cotizacion_usd.valor_en_guaranies > 0:
-                                monto_total_usd += monto_gs / cotizacion_usd.valor_en_guaranies
-                                monto_pagado_total_usd += pagado_gs / cotizacion_usd.valor_en_guaranies
-                        except Exception:
-                            pass
-                else:
-                    # Sin moneda definida, asumir Gs
-                    monto_total_gs += monto_reserva
-                    monto_pagado_total_gs += monto_pagado_reserva
-        
-        saldo_pendiente_gs = monto_total_gs - monto_pagado_total_gs
-        saldo_pendiente_usd = monto_total_usd - monto_pagado_total_usd if tiene_cotizacion_usd else None
-        
-        resumen = {
-            "total_registros": queryset.count(),
-            "reservas_pendientes": reservas_por_estado['pendiente'],
-            "reservas_confirmadas": reservas_por_estado['confirmada'],
-            "reservas_finalizadas": reservas_por_estado['finalizada'],
-            "reservas_canceladas": reservas_por_estado['cancelada'],
-            "monto_total_gs": float(monto_total_gs),
-            "monto_pagado_gs": float(monto_pagado_total_gs),
-            "saldo_pendiente_gs": float(saldo_pendiente_gs),
-            "monto_total_usd": float(round(monto_total_usd, 2)) if tiene_cotizacion_usd else None,
-            "monto_pagado_usd": float(round(monto_pagado_total_usd, 2)) if tiene_cotizacion_usd else None,
-            "saldo_pendiente_usd": float(round(saldo_pendiente_usd, 2)) if saldo_pendiente_usd is not None else None,
-            "total_pasajeros": total_pasajeros
-        }
+            queryset = queryset.order_by('-fecha_reserva', '-id')
         
         # ===== PAGINAR =====
-        page = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 20)
-        
-        paginacion = paginar_resultados(queryset, page, page_size)
+        paginacion = paginar_reporte(
+            request, queryset, ('-fecha_reserva', '-id') if ordenar_por not in ('monto', 'estado') else None
+        )
         
         # ===== SERIALIZAR =====
         serializer = ReservaReporteSerializer(paginacion['results'], many=True)
         paginacion['results'] = serializer.data
         
-        # ===== FILTRAR POR ESTADO DE PAGO (post-serialización) =====
-        if estado_pago_filtro and estado_pago_filtro != 'todas':
-            paginacion['results'] = [
-                r for r in paginacion['results']
-                if r['estado_pago'] == estado_pago_filtro
-            ]
-            # Recalcular totalItems
-            paginacion['totalItems'] = len(paginacion['results'])
-        
         # ===== RESPUESTA =====
         return Response({
             "success": True,
@@ -1018,6 +1174,15 @@ def reporte_reservas(request):
             "data": paginacion
         }, status=status.HTTP_200_OK)
         
+    except ParametroPaginacionInvalido as e:
+        return Response(
+            {
+                "success": False,
+                "message": "Parámetros de paginación inválidos",
+                "errors": [str(e)]
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
     except Exception as e:
         return Response(
             {
@@ -1030,1117 +1195,597 @@ def reporte_reservas(request):
 
 
 # ============================================================================
-# EXPORTACIÓN PDF - MOVIMIENTOS CAJAS
+# EXPORTACIÓN - FILTROS Y RESÚMENES COMPARTIDOS
 # ============================================================================
+#
+# Todos los formatos (csv, xlsx, pdf) de un reporte usan el mismo queryset
+# filtrado y el mismo resumen. Ver apps/dashboard/exportacion.py.
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def exportar_movimientos_pdf(request):
+# reportlab arma el PDF completo en memoria: se limita la cantidad de filas
+LIMITE_FILAS_PDF = 1000
+
+
+def _filtrar_movimientos_exportacion(request):
     """
-    GET /api/dashboard/reportes/movimientos-cajas/exportar-pdf/
-    
-    Exporta reporte de movimientos de cajas a PDF.
-    Acepta los mismos filtros que el endpoint JSON.
+    Queryset de movimientos de cajas para exportar.
+
+    Acepta los mismos filtros que el endpoint JSON; fecha_desde y fecha_hasta
+    son obligatorias.
+
+    Returns:
+        tuple: (queryset, filtros aplicados)
+
+    Raises:
+        ValueError: Si faltan las fechas o son inválidas
     """
-    try:
-        # ===== VALIDAR FECHAS (OBLIGATORIAS) =====
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-        
-        if not fecha_desde_str or not fecha_hasta_str:
-            return Response(
-                {
-                    "success": False,
-                    "message": "Los parámetros fecha_desde y fecha_hasta son obligatorios",
-                    "errors": ["Formato esperado: YYYY-MM-DD"]
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
+    # ===== VALIDAR FECHAS (OBLIGATORIAS) =====
+    fecha_desde_str = request.query_params.get('fecha_desde')
+    fecha_hasta_str = request.query_params.get('fecha_hasta')
+
+    if not fecha_desde_str or not fecha_hasta_str:
+        raise ValueError("Los parámetros fecha_desde y fecha_hasta son obligatorios (formato YYYY-MM-DD)")
+
+    fecha_desde = parsear_fecha(fecha_desde_str)
+    fecha_hasta = parsear_fecha(fecha_hasta_str)
+
+    if not fecha_desde or not fecha_hasta:
+        raise ValueError("Formato de fecha inválido. Use formato YYYY-MM-DD")
+
+    if fecha_desde > fecha_hasta:
+        raise ValueError("La fecha_desde no puede ser mayor que fecha_hasta")
+
+    # ===== CONSTRUIR QUERY =====
+    # comprobante__reserva__paquete__moneda: lo usa el serializer para detectar
+    # la moneda de cada movimiento
+    queryset = MovimientoCaja.objects.filter(
+        activo=True,
+        fecha_hora_movimiento__date__gte=fecha_desde,
+        fecha_hora_movimiento__date__lte=fecha_hasta
+    ).select_related(
+        'apertura_caja',
+        'apertura_caja__caja',
+        'usuario_registro',
+        'usuario_registro__persona',
+        'comprobante',
+        'comprobante__reserva__paquete__moneda'
+    ).order_by('-fecha_hora_movimiento', '-id')
+
+    # ===== APLICAR FILTROS =====
+    caja_id = request.query_params.get('caja_id')
+    if caja_id:
+        queryset = queryset.filter(apertura_caja__caja_id=caja_id)
+
+    tipo_movimiento = request.query_params.get('tipo_movimiento')
+    if tipo_movimiento and tipo_movimiento != 'todas':
+        queryset = queryset.filter(tipo_movimiento=tipo_movimiento)
+
+    metodo_pago = request.query_params.get('metodo_pago')
+    if metodo_pago:
+        queryset = queryset.filter(metodo_pago=metodo_pago)
+
+    concepto = request.query_params.get('concepto')
+    if concepto:
+        queryset = queryset.filter(concepto=concepto)
+
+    busqueda = request.query_params.get('busqueda')
+    if busqueda:
+        queryset = queryset.filter(
+            Q(descripcion__icontains=busqueda) |
+            Q(referencia__icontains=busqueda) |
+            Q(numero_movimiento__icontains=busqueda)
+        )
+
+    filtros = {
+        "fecha_desde": fecha_desde_str,
+        "fecha_hasta": fecha_hasta_str,
+        "caja_id": caja_id,
+        "tipo_movimiento": tipo_movimiento or "todas"
+    }
+    return queryset, filtros
+
+
+def _resumen_movimientos(queryset):
+    """Totales del reporte de movimientos de cajas (una consulta)."""
+    resumen_data = queryset.aggregate(
+        total_registros=Count('id'),
+        total_ingresos=Sum('monto', filter=Q(tipo_movimiento='ingreso')),
+        total_egresos=Sum('monto', filter=Q(tipo_movimiento='egreso')),
+        ingresos_count=Count('id', filter=Q(tipo_movimiento='ingreso')),
+        egresos_count=Count('id', filter=Q(tipo_movimiento='egreso'))
+    )
+
+    total_ingresos = resumen_data['total_ingresos'] or Decimal('0')
+    total_egresos = resumen_data['total_egresos'] or Decimal('0')
+    balance = total_ingresos - total_egresos
+
+    return {
+        "total_registros": resumen_data['total_registros'],
+        "total_ingresos": str(total_ingresos),
+        "total_egresos": str(total_egresos),
+        "balance": str(balance),
+        "ingresos_count": resumen_data['ingresos_count'],
+        "egresos_count": resumen_data['egresos_count']
+    }
+
+
+def _filtrar_paquetes_exportacion(request):
+    """
+    Queryset de paquetes para exportar (mismos filtros que el endpoint JSON).
+
+    Returns:
+        tuple: (queryset, filtros aplicados)
+    """
+    # ===== CONSTRUIR QUERY BASE =====
+    queryset = Paquete.objects.all().select_related(
+        'tipo_paquete',
+        'destino',
+        'destino__ciudad',
+        'destino__ciudad__pais',
+        'distribuidora',
+        'moneda'
+    ).prefetch_related(
+        'salidas',
+        'reservas',
+        'paquete_servicios__servicio'
+    )
+    
+    # ===== FILTRO POR ESTADO =====
+    estado = request.query_params.get('estado', 'activo')
+    if estado == 'activo':
+        queryset = queryset.filter(activo=True)
+    elif estado == 'inactivo':
+        queryset = queryset.filter(activo=False)
+    
+    # ===== FILTRO POR FECHAS DE CREACIÓN =====
+    fecha_desde_str = request.query_params.get('fecha_desde')
+    fecha_hasta_str = request.query_params.get('fecha_hasta')
+    
+    if fecha_desde_str:
         fecha_desde = parsear_fecha(fecha_desde_str)
+        if fecha_desde:
+            queryset = queryset.filter(fecha_creacion__date__gte=fecha_desde)
+    
+    if fecha_hasta_str:
         fecha_hasta = parsear_fecha(fecha_hasta_str)
+        if fecha_hasta:
+            queryset = queryset.filter(fecha_creacion__date__lte=fecha_hasta)
+    
+    # ===== FILTRO POR FECHAS DE SALIDA =====
+    fecha_salida_desde_str = request.query_params.get('fecha_salida_desde')
+    fecha_salida_hasta_str = request.query_params.get('fecha_salida_hasta')
+    
+    if fecha_salida_desde_str or fecha_salida_hasta_str:
+        from apps.paquete.models import SalidaPaquete
+        salidas_ids = SalidaPaquete.objects.filter(activo=True)
         
-        if not fecha_desde or not fecha_hasta:
-            return Response(
-                {
-                    "success": False,
-                    "message": "Formato de fecha inválido",
-                    "errors": ["Use formato YYYY-MM-DD"]
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        if fecha_desde > fecha_hasta:
-            return Response(
-                {
-                    "success": False,
-                    "message": "La fecha_desde no puede ser mayor que fecha_hasta"
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # ===== CONSTRUIR QUERY =====
-        queryset = MovimientoCaja.objects.filter(
-            activo=True,
-            fecha_hora_movimiento__date__gte=fecha_desde,
-            fecha_hora_movimiento__date__lte=fecha_hasta
-        ).select_related(
-            'apertura_caja',
-            'apertura_caja__caja',
-            'usuario_registro',
-            'usuario_registro__persona',
-            'comprobante'
-        ).order_by('-fecha_hora_movimiento')
-        
-        # ===== APLICAR FILTROS =====
-        caja_id = request.query_params.get('caja_id')
-        if caja_id:
-            queryset = queryset.filter(apertura_caja__caja_id=caja_id)
-        
-        tipo_movimiento = request.query_params.get('tipo_movimiento')
-        if tipo_movimiento and tipo_movimiento != 'todas':
-            queryset = queryset.filter(tipo_movimiento=tipo_movimiento)
+        if fecha_salida_desde_str:
+            fecha = parsear_fecha(fecha_salida_desde_str)
+            if fecha:
+                salidas_ids = salidas_ids.filter(fecha_salida__gte=fecha)
         
-        metodo_pago = request.query_params.get('metodo_pago')
-        if metodo_pago:
-            queryset = queryset.filter(metodo_pago=metodo_pago)
+        if fecha_salida_hasta_str:
+            fecha = parsear_fecha(fecha_salida_hasta_str)
+            if fecha:
+                salidas_ids = salidas_ids.filter(fecha_salida__lte=fecha)
         
-        concepto = request.query_params.get('concepto')
-        if concepto:
-            queryset = queryset.filter(concepto=concepto)
+        paquetes_ids = salidas_ids.values_list('paquete_id', flat=True).distinct()
+        queryset = queryset.filter(id__in=paquetes_ids)
+    
+    # ===== OTROS FILTROS =====
+    destino_id = request.query_params.get('destino_id')
+    if destino_id:
+        queryset = queryset.filter(destino_id=destino_id)
+    
+    zona_geografica_id = request.query_params.get('zona_geografica_id')
+    if zona_geografica_id:
+        queryset = queryset.filter(destino__ciudad__pais__zona_geografica_id=zona_geografica_id)
+    
+    pais_id = request.query_params.get('pais_id')
+    if pais_id:
+        queryset = queryset.filter(destino__ciudad__pais_id=pais_id)
+    
+    tipo_paquete_id = request.query_params.get('tipo_paquete_id')
+    if tipo_paquete_id:
+        queryset = queryset.filter(tipo_paquete_id=tipo_paquete_id)
+    
+    personalizado = request.query_params.get('personalizado')
+    if personalizado is not None:
+        queryset = queryset.filter(personalizado=(personalizado.lower() == 'true'))
+    
+    propio = request.query_params.get('propio')
+    if propio is not None:
+        queryset = queryset.filter(propio=(propio.lower() == 'true'))
+    
+    distribuidora_id = request.query_params.get('distribuidora_id')
+    if distribuidora_id:
+        queryset = queryset.filter(distribuidora_id=distribuidora_id)
+    
+    busqueda = request.query_params.get('busqueda')
+    if busqueda:
+        # Intentar extraer el ID del código si viene en formato PAQ-2024-XXXX o PAQ-XXXX
+        paquete_id = None
+        busqueda_upper = busqueda.upper().strip()
+        
+        if busqueda_upper.startswith('PAQ'):
+            # Formato: PAQ-2024-0142, PAQ-2024-142, PAQ-142
+            parts = busqueda_upper.replace('PAQ-', '').replace('PAQ', '').strip('-').split('-')
+            # Tomar el último número (puede ser solo uno si es PAQ-142)
+            try:
+                paquete_id = int(parts[-1])
+            except (ValueError, IndexError):
+                pass
+        elif busqueda.isdigit():
+            # Si es solo un número, usarlo como ID directamente
+            paquete_id = int(busqueda)
         
-        busqueda = request.query_params.get('busqueda')
-        if busqueda:
+        # Filtrar por ID o por nombre
+        if paquete_id:
             queryset = queryset.filter(
-                Q(descripcion__icontains=busqueda) |
-                Q(referencia__icontains=busqueda) |
-                Q(numero_movimiento__icontains=busqueda)
+                Q(id=paquete_id) | Q(nombre__icontains=busqueda)
             )
-        
-        # ===== CALCULAR RESUMEN =====
-        resumen_data = queryset.aggregate(
-            total_ingresos=Sum('monto', filter=Q(tipo_movimiento='ingreso')),
-            total_egresos=Sum('monto', filter=Q(tipo_movimiento='egreso')),
-            ingresos_count=Count('id', filter=Q(tipo_movimiento='ingreso')),
-            egresos_count=Count('id', filter=Q(tipo_movimiento='egreso'))
+        else:
+            queryset = queryset.filter(nombre__icontains=busqueda)
+    
+    # ===== FILTRO: FECHA SALIDA PRÓXIMA =====
+    fecha_salida_proxima = request.query_params.get('fecha_salida_proxima')
+    if fecha_salida_proxima:
+        try:
+            dias = int(fecha_salida_proxima)
+            from apps.paquete.models import SalidaPaquete
+            fecha_limite = timezone.now().date() + timedelta(days=dias)
+            salidas_proximas = SalidaPaquete.objects.filter(
+                activo=True,
+                fecha_salida__lte=fecha_limite,
+                fecha_salida__gte=timezone.now().date()
+            )
+            paquetes_ids = salidas_proximas.values_list('paquete_id', flat=True).distinct()
+            queryset = queryset.filter(id__in=paquetes_ids)
+        except (ValueError, TypeError):
+            pass
+    
+    # ===== FILTRO: SOLO CON CUPOS DISPONIBLES =====
+    tiene_cupos_disponibles = request.query_params.get('tiene_cupos_disponibles')
+    if tiene_cupos_disponibles is not None:
+        queryset = filtrar_paquetes_por_cupos(queryset, tiene_cupos_disponibles)
+
+    filtros = {
+        "estado": estado,
+        "fecha_desde": fecha_desde_str,
+        "fecha_hasta": fecha_hasta_str
+    }
+    return queryset, filtros
+
+
+def _resumen_paquetes(queryset):
+    """Totales del reporte de paquetes."""
+    # ===== CALCULAR RESUMEN =====
+    total = queryset.count()
+    activos = queryset.filter(activo=True).count()
+    inactivos = queryset.filter(activo=False).count()
+    personalizados = queryset.filter(personalizado=True).count()
+    
+    # Calcular precios (de salidas, no del paquete directamente)
+    from apps.paquete.models import SalidaPaquete
+    salidas = SalidaPaquete.objects.filter(
+        paquete__in=queryset,
+        activo=True
+    )
+    
+    if salidas.exists():
+        precio_stats = salidas.aggregate(
+            promedio=Avg('costo_base_desde')
+        )
+        salida_minima = salidas.order_by('costo_base_desde').first()
+        salida_maxima = salidas.order_by('-costo_base_desde').first()
+        
+        precio_promedio = precio_stats['promedio'] or Decimal('0')
+        precio_minimo = salida_minima.costo_base_desde if salida_minima else Decimal('0')
+        precio_maximo = salida_maxima.costo_base_desde if salida_maxima else Decimal('0')
+        
+        # Calcular promedios en ambas monedas (usando solo la próxima salida de cada paquete)
+        precio_promedio_pyg = calcular_precio_promedio_pyg(queryset, es_queryset_paquetes=True)
+        precio_promedio_usd = calcular_precio_promedio_usd(queryset, es_queryset_paquetes=True)
+    else:
+        precio_promedio = Decimal('0')
+        precio_minimo = Decimal('0')
+        precio_maximo = Decimal('0')
+        precio_promedio_pyg = None
+        precio_promedio_usd = None
+    
+    return {
+        "total_registros": total,
+        "paquetes_activos": activos,
+        "paquetes_inactivos": inactivos,
+        "paquetes_personalizados": personalizados,
+        "precio_promedio": str(precio_promedio),
+        "precio_promedio_pyg": precio_promedio_pyg,
+        "precio_promedio_usd": precio_promedio_usd,
+        "precio_minimo": str(precio_minimo),
+        "precio_maximo": str(precio_maximo)
+    }
+
+
+def _filtrar_reservas_exportacion(request):
+    """
+    Queryset de reservas activas para exportar.
+
+    No aplica el filtro estado_pago (ver filtrar_estado_pago_reservas), para
+    calcular el resumen sobre el mismo conjunto que el reporte.
+
+    Returns:
+        tuple: (queryset, filtros aplicados)
+    """
+    queryset = Reserva.objects.filter(
+        activo=True
+    ).select_related(
+        'titular',
+        'paquete',
+        'paquete__destino',
+        'paquete__destino__ciudad',
+        'paquete__destino__ciudad__pais',
+        'paquete__moneda',
+        'salida',
+        'habitacion',
+        'habitacion__hotel',
+        'habitacion__tipo_habitacion'
+    ).prefetch_related('pasajeros')
+
+    fecha_desde_str = request.query_params.get('fecha_desde')
+    fecha_hasta_str = request.query_params.get('fecha_hasta')
+
+    if fecha_desde_str:
+        fecha_desde = parsear_fecha(fecha_desde_str)
+        if fecha_desde:
+            queryset = queryset.filter(fecha_reserva__date__gte=fecha_desde)
+
+    if fecha_hasta_str:
+        fecha_hasta = parsear_fecha(fecha_hasta_str)
+        if fecha_hasta:
+            queryset = queryset.filter(fecha_reserva__date__lte=fecha_hasta)
+
+    estado = request.query_params.get('estado')
+    if estado and estado != 'todas':
+        queryset = queryset.filter(estado=estado)
+
+    estado_pago = request.query_params.get('estado_pago')
+    filtros = {
+        "fecha_desde": fecha_desde_str,
+        "fecha_hasta": fecha_hasta_str,
+        "estado": estado or "todas",
+        "estado_pago": estado_pago or "todas"
+    }
+    return queryset, filtros
+
+
+def _resumen_reservas(queryset):
+    """Totales del reporte de reservas con las claves en Gs que usan los generadores PDF/Excel."""
+    resumen = calcular_resumen_reservas(queryset)
+    resumen.update(
+        monto_total=resumen['monto_total_gs'],
+        monto_pagado=resumen['monto_pagado_gs'],
+        saldo_pendiente=resumen['saldo_pendiente_gs']
+    )
+    return resumen
+
+
+def _respuesta_pdf(pdf_buffer, filename):
+    response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _exportar_movimientos(request, formato):
+    queryset, filtros = _filtrar_movimientos_exportacion(request)
+    filename = nombre_archivo('movimientos_cajas', formato)
+
+    if formato == 'csv':
+        data = iterar_serializado(queryset, MovimientoCajaReporteSerializer)
+        return respuesta_csv(ENCABEZADOS_CSV_MOVIMIENTOS_CAJAS, filas_csv_movimientos_cajas(data), filename)
+
+    resumen = _resumen_movimientos(queryset)
+    if formato == 'xlsx':
+        data = iterar_serializado(queryset, MovimientoCajaReporteSerializer)
+        return respuesta_xlsx(
+            lambda destino: generar_excel_movimientos_cajas(data, filtros, resumen, destino),
+            filename
+        )
+
+    data = MovimientoCajaReporteSerializer(queryset[:LIMITE_FILAS_PDF], many=True).data
+    return _respuesta_pdf(generar_pdf_movimientos_cajas(data, filtros, resumen), filename)
+
+
+def _exportar_paquetes(request, formato):
+    queryset, filtros = _filtrar_paquetes_exportacion(request)
+    filename = nombre_archivo('paquetes', formato)
+
+    if formato == 'csv':
+        data = iterar_serializado(queryset, PaqueteReporteSerializer)
+        return respuesta_csv([columna[0] for columna in COLUMNAS_PAQUETES], filas_paquetes(data), filename)
+
+    resumen = _resumen_paquetes(queryset)
+    if formato == 'xlsx':
+        data = iterar_serializado(queryset, PaqueteReporteSerializer)
+        return respuesta_xlsx(
+            lambda destino: generar_excel_paquetes(data, filtros, resumen, destino),
+            filename
+        )
+
+    data = PaqueteReporteSerializer(queryset[:LIMITE_FILAS_PDF], many=True).data
+    return _respuesta_pdf(generar_pdf_paquetes(data, filtros, resumen), filename)
+
+
+def _exportar_reservas(request, formato):
+    queryset, filtros = _filtrar_reservas_exportacion(request)
+    filename = nombre_archivo('reservas', formato)
+    filtradas = filtrar_estado_pago_reservas(queryset, filtros['estado_pago'])
+
+    if formato == 'csv':
+        data = iterar_serializado(filtradas, ReservaReporteSerializer)
+        return respuesta_csv([columna[0] for columna in COLUMNAS_RESERVAS], filas_reservas(data), filename)
+
+    # Igual que el reporte, el resumen no aplica el filtro estado_pago
+    resumen = _resumen_reservas(queryset)
+    if formato == 'xlsx':
+        data = iterar_serializado(filtradas, ReservaReporteSerializer)
+        return respuesta_xlsx(
+            lambda destino: generar_excel_reservas(data, filtros, resumen, destino),
+            filename
+        )
+
+    data = ReservaReporteSerializer(filtradas[:LIMITE_FILAS_PDF], many=True).data
+    return _respuesta_pdf(generar_pdf_reservas(data, filtros, resumen), filename)
+
+
+def _exportar(exportador, request, formato, mensaje_error):
+    """
+    Ejecuta un exportador y traduce los errores a respuestas JSON.
+
+    Args:
+        exportador: _exportar_movimientos, _exportar_paquetes o _exportar_reservas
+        request: Request de DRF
+        formato (str): 'csv', 'xlsx', 'pdf' o None para leer ?formato=
+        mensaje_error (str): Mensaje ante errores inesperados
+    """
+    try:
+        return exportador(request, formato or obtener_formato(request))
+    except ValueError as e:
+        return Response(
+            {
+                "success": False,
+                "message": str(e)
+            },
+            status=status.HTTP_400_BAD_REQUEST
         )
-        
-        total_ingresos = resumen_data['total_ingresos'] or Decimal('0')
-        total_egresos = resumen_data['total_egresos'] or Decimal('0')
-        balance = total_ingresos - total_egresos
-        
-        resumen = {
-            "total_registros": queryset.count(),
-            "total_ingresos": str(total_ingresos),
-            "total_egresos": str(total_egresos),
-            "balance": str(balance),
-            "ingresos_count": resumen_data['ingresos_count'],
-            "egresos_count": resumen_data['egresos_count']
-        }
-        
-        # ===== SERIALIZAR TODOS LOS DATOS (sin paginar para PDF) =====
-        serializer = MovimientoCajaReporteSerializer(queryset[:1000], many=True)  # Limitar a 1000 registros para PDF
-        data = serializer.data
-        
-        # ===== FILTROS APLICADOS =====
-        filtros = {
-            "fecha_desde": fecha_desde_str,
-            "fecha_hasta": fecha_hasta_str,
-            "caja_id": caja_id,
-            "tipo_movimiento": tipo_movimiento or "todas"
-        }
-        
-        # ===== GENERAR PDF =====
-        pdf_buffer = generar_pdf_movimientos_cajas(data, filtros, resumen)
-        
-        # ===== NOMBRE DEL ARCHIVO =====
-        fecha_actual = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"movimientos_cajas_{fecha_actual}.pdf"
-        
-        # ===== RESPUESTA =====
-        response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
-        
     except Exception as e:
         return Response(
             {
                 "success": False,
-                "message": "Error al exportar PDF",
+                "message": mensaje_error,
                 "errors": [str(e)]
             },
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
 
+# ============================================================================
+# EXPORTACIÓN - MOVIMIENTOS CAJAS
+# ============================================================================
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exportar_movimientos(request):
+    """
+    GET /api/dashboard/reportes/movimientos-cajas/exportar/?formato=csv|xlsx|pdf
+
+    Exporta reporte de movimientos de cajas (default: xlsx).
+    Acepta los mismos filtros que el endpoint JSON.
+    """
+    return _exportar(_exportar_movimientos, request, None, "Error al exportar movimientos de cajas")
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exportar_movimientos_pdf(request):
+    """
+    GET /api/dashboard/reportes/movimientos-cajas/exportar-pdf/
+
+    Exporta reporte de movimientos de cajas a PDF (máximo LIMITE_FILAS_PDF movimientos).
+    """
+    return _exportar(_exportar_movimientos, request, 'pdf', "Error al exportar PDF")
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def exportar_movimientos_excel(request):
     """
     GET /api/dashboard/reportes/movimientos-cajas/exportar-excel/
-    
+
     Exporta reporte de movimientos de cajas a Excel.
     """
-    try:
-        # ===== VALIDAR FECHAS (OBLIGATORIAS) =====
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-        
-        if not fecha_desde_str or not fecha_hasta_str:
-            return Response(
-                {
-                    "success": False,
-                    "message": "Los parámetros fecha_desde y fecha_hasta son obligatorios"
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        fecha_desde = parsear_fecha(fecha_desde_str)
-        fecha_hasta = parsear_fecha(fecha_hasta_str)
-        
-        if not fecha_desde or not fecha_hasta:
-            return Response(
-                {
-                    "success": False,
-                    "message": "Formato de fecha inválido"
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # ===== CONSTRUIR QUERY (igual que PDF) =====
-        queryset = MovimientoCaja.objects.filter(
-            activo=True,
-            fecha_hora_movimiento__date__gte=fecha_desde,
-            fecha_hora_movimiento__date__lte=fecha_hasta
-        ).select_related(
-            'apertura_caja',
-            'apertura_caja__caja',
-            'usuario_registro',
-            'usuario_registro__persona',
-            'comprobante'
-        ).order_by('-fecha_hora_movimiento')
-        
-        # ===== APLICAR FILTROS =====
-        caja_id = request.query_params.get('caja_id')
-        if caja_id:
-            queryset = queryset.filter(apertura_caja__caja_id=caja_id)
-        
-        tipo_movimiento = request.query_params.get('tipo_movimiento')
-        if tipo_movimiento and tipo_movimiento != 'todas':
-            queryset = queryset.filter(tipo_movimiento=tipo_movimiento)
-        
-        metodo_pago = request.query_params.get('metodo_pago')
-        if metodo_pago:
-            queryset = queryset.filter(metodo_pago=metodo_pago)
-        
-        concepto = request.query_params.get('concepto')
-        if concepto:
-            queryset = queryset.filter(concepto=concepto)
-        
-        busqueda = request.query_params.get('busqueda')
-        if busqueda:
-            queryset = queryset.filter(
-                Q(descripcion__icontains=busqueda) |
-                Q(referencia__icontains=busqueda) |
-                Q(numero_movimiento__icontains=busqueda)
-            )
-        
-        # ===== CALCULAR RESUMEN =====
-        resumen_data = queryset.aggregate(
-            total_ingresos=Sum('monto', filter=Q(tipo_movimiento='ingreso')),
-            total_egresos=Sum('monto', filter=Q(tipo_movimiento='egreso')),
-            ingresos_count=Count('id', filter=Q(tipo_movimiento='ingreso')),
-            egresos_count=Count('id', filter=Q(tipo_movimiento='egreso'))
-        )
-        
-        total_ingresos = resumen_data['total_ingresos'] or Decimal('0')
-        total_egresos = resumen_data['total_egresos'] or Decimal('0')
-        balance = total_ingresos - total_egresos
-        
-        resumen = {
-            "total_registros": queryset.count(),
-            "total_ingresos": str(total_ingresos),
-            "total_egresos": str(total_egresos),
-            "balance": str(balance),
-            "ingresos_count": resumen_data['ingresos_count'],
-            "egresos_count": resumen_data['egresos_count']
-        }
-        
-        # ===== VERIFICAR SI HAY DATOS =====
-        total_count = queryset.count()
-        print(f"[DEBUG] Total de movimientos encontrados: {total_count}")
-        print(f"[DEBUG] Rango de fechas: {fecha_desde_str} a {fecha_hasta_str}")
-        
-        # ===== SERIALIZAR =====
-        serializer = MovimientoCajaReporteSerializer(queryset, many=True)
-        data = serializer.data
-        
-        print(f"[DEBUG] Registros serializados: {len(data)}")
-        
-        # ===== FILTROS APLICADOS =====
-        filtros = {
-            "fecha_desde": fecha_desde_str,
-            "fecha_hasta": fecha_hasta_str,
-            "caja_id": caja_id,
-            "tipo_movimiento": tipo_movimiento or "todas",
-            "total_encontrados": total_count  # Agregar para debug
-        }
-        
-        # ===== GENERAR EXCEL =====
-        excel_buffer = generar_excel_movimientos_cajas(data, filtros, resumen)
-        
-        # ===== NOMBRE DEL ARCHIVO =====
-        fecha_actual = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"movimientos_cajas_{fecha_actual}.xlsx"
-        
-        # ===== RESPUESTA =====
-        response = HttpResponse(
-            excel_buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
-        
-    except Exception as e:
-        return Response(
-            {
-                "success": False,
-                "message": "Error al exportar Excel",
-                "errors": [str(e)]
-            },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    return _exportar(_exportar_movimientos, request, 'xlsx', "Error al exportar Excel")
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exportar_movimientos_csv(request):
+    """
+    GET /api/dashboard/reportes/movimientos-cajas/exportar-csv/
+
+    Exporta reporte de movimientos de cajas a CSV.
+    Formato simple y liviano, compatible con Excel y Google Sheets.
+    """
+    return _exportar(_exportar_movimientos, request, 'csv', "Error al exportar CSV")
 
 
 # ============================================================================
-# EXPORTACIÓN PDF - PAQUETES
+# EXPORTACIÓN - PAQUETES
 # ============================================================================
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exportar_paquetes(request):
+    """
+    GET /api/dashboard/reportes/paquetes/exportar/?formato=csv|xlsx|pdf
+
+    Exporta reporte de paquetes (default: xlsx).
+    """
+    return _exportar(_exportar_paquetes, request, None, "Error al exportar paquetes")
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def exportar_paquetes_pdf(request):
     """
     GET /api/dashboard/reportes/paquetes/exportar-pdf/
-    
+
     Exporta reporte de paquetes a PDF.
     """
-    try:
-        # ===== CONSTRUIR QUERY BASE =====
-        queryset = Paquete.objects.all().select_related(
-            'tipo_paquete',
-            'destino',
-            'destino__ciudad',
-            'destino__ciudad__pais',
-            'distribuidora',
-            'moneda'
-        ).prefetch_related(
-            'salidas',
-            'reservas',
-            'paquete_servicios__servicio'
-        )
-        
-        # ===== FILTRO POR ESTADO =====
-        estado = request.query_params.get('estado', 'activo')
-        if estado == 'activo':
-            queryset = queryset.filter(activo=True)
-        elif estado == 'inactivo':
-            queryset = queryset.filter(activo=False)
-        
-        # ===== FILTRO POR FECHAS DE CREACIÓN =====
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-        
-        if fecha_desde_str:
-            fecha_desde = parsear_fecha(fecha_desde_str)
-            if fecha_desde:
-                queryset = queryset.filter(fecha_creacion__date__gte=fecha_desde)
-        
-        if fecha_hasta_str:
-            fecha_hasta = parsear_fecha(fecha_hasta_str)
-            if fecha_hasta:
-                queryset = queryset.filter(fecha_creacion__date__lte=fecha_hasta)
-        
-        # ===== FILTRO POR FECHAS DE SALIDA =====
-        fecha_salida_desde_str = request.query_params.get('fecha_salida_desde')
-        fecha_salida_hasta_str = request.query_params.get('fecha_salida_hasta')
-        
-        if fecha_salida_desde_str or fecha_salida_hasta_str:
-            from apps.paquete.models import SalidaPaquete
-            salidas_ids = SalidaPaquete.objects.filter(activo=True)
-            
-            if fecha_salida_desde_str:
-                fecha = parsear_fecha(fecha_salida_desde_str)
-                if fecha:
-                    salidas_ids = salidas_ids.filter(fecha_salida__gte=fecha)
-            
-            if fecha_salida_hasta_str:
-                fecha = parsear_fecha(fecha_salida_hasta_str)
-                if fecha:
-                    salidas_ids = salidas_ids.filter(fecha_salida__lte=fecha)
-            
-            paquetes_ids = salidas_ids.values_list('paquete_id', flat=True).distinct()
-            queryset = queryset.filter(id__in=paquetes_ids)
-        
-        # ===== OTROS FILTROS =====
-        destino_id = request.query_params.get('destino_id')
-        if destino_id:
-            queryset = queryset.filter(destino_id=destino_id)
-        
-        zona_geografica_id = request.query_params.get('zona_geografica_id')
-        if zona_geografica_id:
-            queryset = queryset.filter(destino__ciudad__pais__zona_geografica_id=zona_geografica_id)
-        
-        pais_id = request.query_params.get('pais_id')
-        if pais_id:
-            queryset = queryset.filter(destino__ciudad__pais_id=pais_id)
-        
-        tipo_paquete_id = request.query_params.get('tipo_paquete_id')
-        if tipo_paquete_id:
-            queryset = queryset.filter(tipo_paquete_id=tipo_paquete_id)
-        
-        personalizado = request.query_params.get('personalizado')
-        if personalizado is not None:
-            queryset = queryset.filter(personalizado=(personalizado.lower() == 'true'))
-        
-        propio = request.query_params.get('propio')
-        if propio is not None:
-            queryset = queryset.filter(propio=(propio.lower() == 'true'))
-        
-        distribuidora_id = request.query_params.get('distribuidora_id')
-        if distribuidora_id:
-            queryset = queryset.filter(distribuidora_id=distribuidora_id)
-        
-        busqueda = request.query_params.get('busqueda')
-        if busqueda:
-            # Intentar extraer el ID del código si viene en formato PAQ-2024-XXXX o PAQ-XXXX
-            paquete_id = None
-            busqueda_upper = busqueda.upper().strip()
-            
-            if busqueda_upper.startswith('PAQ'):
-                # Formato: PAQ-2024-0142, PAQ-2024-142, PAQ-142
-                parts = busqueda_upper.replace('PAQ-', '').replace('PAQ', '').strip('-').split('-')
-                # Tomar el último número (puede ser solo uno si es PAQ-142)
-                try:
-                    paquete_id = int(parts[-1])
-                except (ValueError, IndexError):
-                    pass
-            elif busqueda.isdigit():
-                # Si es solo un número, usarlo como ID directamente
-                paquete_id = int(busqueda)
-            
-            # Filtrar por ID o por nombre
-            if paquete_id:
-                queryset = queryset.filter(
-                    Q(id=paquete_id) | Q(nombre__icontains=busqueda)
-                )
-            else:
-                queryset = queryset.filter(nombre__icontains=busqueda)
-        
-        # ===== FILTRO: FECHA SALIDA PRÓXIMA =====
-        fecha_salida_proxima = request.query_params.get('fecha_salida_proxima')
-        if fecha_salida_proxima:
-            try:
-                dias = int(fecha_salida_proxima)
-                from apps.paquete.models import SalidaPaquete
-                fecha_limite = timezone.now().date() + timedelta(days=dias)
-                salidas_proximas = SalidaPaquete.objects.filter(
-                    activo=True,
-                    fecha_salida__lte=fecha_limite,
-                    fecha_salida__gte=timezone.now().date()
-                )
-                paquetes_ids = salidas_proximas.values_list('paquete_id', flat=True).distinct()
-                queryset = queryset.filter(id__in=paquetes_ids)
-            except (ValueError, TypeError):
-                pass
-        
-        # ===== FILTRO: SOLO CON CUPOS DISPONIBLES =====
-        tiene_cupos_disponibles = request.query_params.get('tiene_cupos_disponibles')
-        if tiene_cupos_disponibles is not None:
-            queryset = filtrar_paquetes_por_cupos(queryset, tiene_cupos_disponibles)
-        
-        # ===== CALCULAR RESUMEN =====
-        total = queryset.count()
-        activos = queryset.filter(activo=True).count()
-        inactivos = queryset.filter(activo=False).count()
-        personalizados = queryset.filter(personalizado=True).count()
-        
-        # Calcular precios (de salidas, no del paquete directamente)
-        from apps.paquete.models import SalidaPaquete
-        salidas = SalidaPaquete.objects.filter(
-            paquete__in=queryset,
-            activo=True
-        )
-        
-        if salidas.exists():
-            precio_stats = salidas.aggregate(
-                promedio=Avg('costo_base_desde')
-            )
-            salida_minima = salidas.order_by('costo_base_desde').first()
-            salida_maxima = salidas.order_by('-costo_base_desde').first()
-            
-            precio_promedio = precio_stats['promedio'] or Decimal('0')
-            precio_minimo = salida_minima.costo_base_desde if salida_minima else Decimal('0')
-            precio_maximo = salida_maxima.costo_base_desde if salida_maxima else Decimal('0')
-            
-            # Calcular promedios en ambas monedas (usando solo la próxima salida de cada paquete)
-            precio_promedio_pyg = calcular_precio_promedio_pyg(queryset, es_queryset_paquetes=True)
-            precio_promedio_usd = calcular_precio_promedio_usd(queryset, es_queryset_paquetes=True)
-        else:
-            precio_promedio = Decimal('0')
-            precio_minimo = Decimal('0')
-            precio_maximo = Decimal('0')
-            precio_promedio_pyg = None
-            precio_promedio_usd = None
-        
-        resumen = {
-            "total_registros": total,
-            "paquetes_activos": activos,
-            "paquetes_inactivos": inactivos,
-            "paquetes_personalizados": personalizados,
-            "precio_promedio": str(precio_promedio),
-            "precio_promedio_pyg": precio_promedio_pyg,
-            "precio_promedio_usd": precio_promedio_usd,
-            "precio_minimo": str(precio_minimo),
-            "precio_maximo": str(precio_maximo)
-        }
-        
-        # ===== SERIALIZAR =====
-        serializer = PaqueteReporteSerializer(queryset[:1000], many=True)
-        data = serializer.data
-        
-        # ===== FILTROS =====
-        filtros = {
-            "estado": estado,
-            "fecha_desde": fecha_desde_str,
-            "fecha_hasta": fecha_hasta_str
-        }
-        
-        # ===== GENERAR PDF =====
-        pdf_buffer = generar_pdf_paquetes(data, filtros, resumen)
-        
-        # ===== RESPUESTA =====
-        fecha_actual = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"paquetes_{fecha_actual}.pdf"
-        
-        response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
-        
-    except Exception as e:
-        return Response(
-            {
-                "success": False,
-                "message": "Error al exportar PDF de paquetes",
-                "errors": [str(e)]
-            },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
-
-
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def exportar_paquetes_excel(request):
-    """
-    GET /api/dashboard/reportes/paquetes/exportar-excel/
-    
-    Exporta reporte de paquetes a Excel.
-    """
-    try:
-        # ===== CONSTRUIR QUERY BASE =====
-        queryset = Paquete.objects.all().select_related(
-            'tipo_paquete',
-            'destino',
-            'destino__ciudad',
-            'destino__ciudad__pais',
-            'distribuidora',
-            'moneda'
-        ).prefetch_related(
-            'salidas',
-            'reservas',
-            'paquete_servicios__servicio'
-        )
-        
-        # ===== FILTRO POR ESTADO =====
-        estado = request.query_params.get('estado', 'activo')
-        if estado == 'activo':
-            queryset = queryset.filter(activo=True)
-        elif estado == 'inactivo':
-            queryset = queryset.filter(activo=False)
-        
-        # ===== FILTRO POR FECHAS DE CREACIÓN =====
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-        
-        if fecha_desde_str:
-            fecha_desde = parsear_fecha(fecha_desde_str)
-            if fecha_desde:
-                queryset = queryset.filter(fecha_creacion__date__gte=fecha_desde)
-        
-        if fecha_hasta_str:
-            fecha_hasta = parsear_fecha(fecha_hasta_str)
-            if fecha_hasta:
-                queryset = queryset.filter(fecha_creacion__date__lte=fecha_hasta)
-        
-        # ===== FILTRO POR FECHAS DE SALIDA =====
-        fecha_salida_desde_str = request.query_params.get('fecha_salida_desde')
-        fecha_salida_hasta_str = request.query_params.get('fecha_salida_hasta')
-        
-        if fecha_salida_desde_str or fecha_salida_hasta_str:
-            from apps.paquete.models import SalidaPaquete
-            salidas_ids = SalidaPaquete.objects.filter(activo=True)
-            
-            if fecha_salida_desde_str:
-                fecha = parsear_fecha(fecha_salida_desde_str)
-                if fecha:
-                    salidas_ids = salidas_ids.filter(fecha_salida__gte=fecha)
-            
-            if fecha_salida_hasta_str:
-                fecha = parsear_fecha(fecha_salida_hasta_str)
-                if fecha:
-                    salidas_ids = salidas_ids.filter(fecha_salida__lte=fecha)
-            
-            paquetes_ids = salidas_ids.values_list('paquete_id', flat=True).distinct()
-            queryset = queryset.filter(id__in=paquetes_ids)
-        
-        # ===== OTROS FILTROS =====
-        destino_id = request.query_params.get('destino_id')
-        if destino_id:
-            queryset = queryset.filter(destino_id=destino_id)
-        
-        zona_geografica_id = request.query_params.get('zona_geografica_id')
-        if zona_geografica_id:
-            queryset = queryset.filter(destino__ciudad__pais__zona_geografica_id=zona_geografica_id)
-        
-        pais_id = request.query_params.get('pais_id')
-        if pais_id:
-            queryset = queryset.filter(destino__ciudad__pais_id=pais_id)
-        
-        tipo_paquete_id = request.query_params.get('tipo_paquete_id')
-        if tipo_paquete_id:
-            queryset = queryset.filter(tipo_paquete_id=tipo_paquete_id)
-        
-        personalizado = request.query_params.get('personalizado')
-        if personalizado is not None:
-            queryset = queryset.filter(personalizado=(personalizado.lower() == 'true'))
-        
-        propio = request.query_params.get('propio')
-        if propio is not None:
-            queryset = queryset.filter(propio=(propio.lower() == 'true'))
-        
-        distribuidora_id = request.query_params.get('distribuidora_id')
-        if distribuidora_id:
-            queryset = queryset.filter(distribuidora_id=distribuidora_id)
-        
-        busqueda = request.query_params.get('busqueda')
-        if busqueda:
-            # Intentar extraer el ID del código si viene en formato PAQ-2024-XXXX o PAQ-XXXX
-            paquete_id = None
-            busqueda_upper = busqueda.upper().strip()
-            
-            if busqueda_upper.startswith('PAQ'):
-                # Formato: PAQ-2024-0142, PAQ-2024-142, PAQ-142
-                parts = busqueda_upper.replace('PAQ-', '').replace('PAQ', '').strip('-').split('-')
-                # Tomar el último número (puede ser solo uno si es PAQ-142)
-                try:
-                    paquete_id = int(parts[-1])
-                except (ValueError, IndexError):
-                    pass
-            elif busqueda.isdigit():
-                # Si es solo un número, usarlo como ID directamente
-                paquete_id = int(busqueda)
-            
-            # Filtrar por ID o por nombre
-            if paquete_id:
-                queryset = queryset.filter(
-                    Q(id=paquete_id) | Q(nombre__icontains=busqueda)
-                )
-            else:
-                queryset = queryset.filter(nombre__icontains=busqueda)
-        
-        # ===== FILTRO: FECHA SALIDA PRÓXIMA =====
-        fecha_salida_proxima = request.query_params.get('fecha_salida_proxima')
-        if fecha_salida_proxima:
-            try:
-                dias = int(fecha_salida_proxima)
-                from apps.paquete.models import SalidaPaquete
-                fecha_limite = timezone.now().date() + timedelta(days=dias)
-                salidas_proximas = SalidaPaquete.objects.filter(
-                    activo=True,
-                    fecha_salida__lte=fecha_limite,
-                    fecha_salida__gte=timezone.now().date()
-                )
-                paquetes_ids = salidas_proximas.values_list('paquete_id', flat=True).distinct()
-                queryset = queryset.filter(id__in=paquetes_ids)
-            except (ValueError, TypeError):
-                pass
-        
-        # ===== FILTRO: SOLO CON CUPOS DISPONIBLES =====
-        tiene_cupos_disponibles = request.query_params.get('tiene_cupos_disponibles')
-        if tiene_cupos_disponibles is not None:
-            queryset = filtrar_paquetes_por_cupos(queryset, tiene_cupos_disponibles)
-        
-        # ===== CALCULAR RESUMEN =====
-        total = queryset.count()
-        activos = queryset.filter(activo=True).count()
-        inactivos = queryset.filter(activo=False).count()
-        personalizados = queryset.filter(personalizado=True).count()
-        
-        # Calcular precios (de salidas, no del paquete directamente)
-        from apps.paquete.models import SalidaPaquete
-        salidas = SalidaPaquete.objects.filter(
-            paquete__in=queryset,
-            activo=True
-        )
-        
-        if salidas.exists():
-            precio_stats = salidas.aggregate(
-                promedio=Avg('costo_base_desde')
-            )
-            salida_minima = salidas.order_by('costo_base_desde').first()
-            salida_maxima = salidas.order_by('-costo_base_desde').first()
-            
-            precio_promedio = precio_stats['promedio'] or Decimal('0')
-            precio_minimo = salida_minima.costo_base_desde if salida_minima else Decimal('0')
-            precio_maximo = salida_maxima.costo_base_desde if salida_maxima else Decimal('0')
-            
-            # Calcular promedios en ambas monedas (usando solo la próxima salida de cada paquete)
-            precio_promedio_pyg = calcular_precio_promedio_pyg(queryset, es_queryset_paquetes=True)
-            precio_promedio_usd = calcular_precio_promedio_usd(queryset, es_queryset_paquetes=True)
-        else:
-            precio_promedio = Decimal('0')
-            precio_minimo = Decimal('0')
-            precio_maximo = Decimal('0')
-            precio_promedio_pyg = None
-            precio_promedio_usd = None
-        
-        resumen = {
-            "total_registros": total,
-            "paquetes_activos": activos,
-            "paquetes_inactivos": inactivos,
-            "paquetes_personalizados": personalizados,
-            "precio_promedio": str(precio_promedio),
-            "precio_promedio_pyg": precio_promedio_pyg,
-            "precio_promedio_usd": precio_promedio_usd,
-            "precio_minimo": str(precio_minimo),
-            "precio_maximo": str(precio_maximo)
-        }
-        
-        serializer = PaqueteReporteSerializer(queryset, many=True)
-        data = serializer.data
-        
-        filtros = {
-            "estado": estado,
-            "fecha_desde": request.query_params.get('fecha_desde'),
-            "fecha_hasta": request.query_params.get('fecha_hasta')
-        }
-        
-        excel_buffer = generar_excel_paquetes(data, filtros, resumen)
-        
-        fecha_actual = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"paquetes_{fecha_actual}.xlsx"
-        
-        response = HttpResponse(
-            excel_buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
-        
-    except Exception as e:
-        return Response(
-            {
-                "success": False,
-                "message": "Error al exportar Excel de paquetes",
-                "errors": [str(e)]
-            },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    return _exportar(_exportar_paquetes, request, 'pdf', "Error al exportar PDF de paquetes")
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exportar_paquetes_excel(request):
+    """
+    GET /api/dashboard/reportes/paquetes/exportar-excel/
+
+    Exporta reporte de paquetes a Excel.
+    """
+    return _exportar(_exportar_paquetes, request, 'xlsx', "Error al exportar Excel de paquetes")
 
 
 # ============================================================================
-# EXPORTACIÓN PDF - RESERVAS
+# EXPORTACIÓN - RESERVAS
 # ============================================================================
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def exportar_reservas_pdf(request):
+def exportar_reservas(request):
     """
-    GET /api/dashboard/reportes/reservas/exportar-pdf/
-    
-    Exporta reporte de reservas a PDF.
+    GET /api/dashboard/reportes/reservas/exportar/?formato=csv|xlsx|pdf
+
+    Exporta reporte de reservas (default: xlsx).
     """
-    try:
-        # ===== CONSTRUIR QUERY BASE =====
-        queryset = Reserva.objects.filter(
-            activo=True
-        ).select_related(
-            'titular',
-            'paquete',
-            'paquete__destino',
-            'paquete__destino__ciudad',
-            'paquete__destino__ciudad__pais',
-            'paquete__moneda',
-            'salida',
-            'habitacion',
-            'habitacion__hotel',
-            'habitacion__tipo_habitacion'
-        ).prefetch_related('pasajeros')
-        
-        # ===== FILTROS =====
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-        
-        if fecha_desde_str:
-            fecha_desde = parsear_fecha(fecha_desde_str)
-            if fecha_desde:
-                queryset = queryset.filter(fecha_reserva__date__gte=fecha_desde)
-        
-        if fecha_hasta_str:
-            fecha_hasta = parsear_fecha(fecha_hasta_str)
-            if fecha_hasta:
-                queryset = queryset.filter(fecha_reserva__date__lte=fecha_hasta)
-        
-        estado = request.query_params.get('estado')
-        if estado and estado != 'todas':
-            queryset = queryset.filter(estado=estado)
-        
-        # ===== CALCULAR RESUMEN =====
-        reservas_por_estado = {
-            'pendiente': queryset.filter(estado='pendiente').count(),
-            'confirmada': queryset.filter(estado='confirmada').count(),
-            'finalizada': queryset.filter(estado='finalizada').count(),
-            'cancelada': queryset.filter(estado='cancelada').count()
-        }
-        
-        reservas_activas = queryset.exclude(estado='cancelada')
-        total_pasajeros = sum(r.cantidad_pasajeros or 0 for r in reservas_activas)
-        
-        monto_total = Decimal('0')
-        monto_pagado_total = Decimal('0')
-        
-        for reserva in reservas_activas:
-            if reserva.precio_unitario and reserva.cantidad_pasajeros:
-                monto_reserva = reserva.precio_unitario * reserva.cantidad_pasajeros
-                monto_total += monto_reserva
-                monto_pagado_total += (reserva.monto_pagado or Decimal('0'))
-        
-        saldo_pendiente = monto_total - monto_pagado_total
-        
-        resumen = {
-            "total_registros": queryset.count(),
-            "reservas_pendientes": reservas_por_estado['pendiente'],
-            "reservas_confirmadas": reservas_por_estado['confirmada'],
-            "reservas_finalizadas": reservas_por_estado['finalizada'],
-            "reservas_canceladas": reservas_por_estado['cancelada'],
-            "monto_total": str(monto_total),
-            "monto_pagado": str(monto_pagado_total),
-            "saldo_pendiente": str(saldo_pendiente),
-            "total_pasajeros": total_pasajeros
-        }
-        
-        # ===== SERIALIZAR =====
-        serializer = ReservaReporteSerializer(queryset[:1000], many=True)
-        data = serializer.data
-        
-        filtros = {
-            "fecha_desde": fecha_desde_str,
-            "fecha_hasta": fecha_hasta_str,
-            "estado": estado or "todas"
-        }
-        
-        # ===== GENERAR PDF =====
-        pdf_buffer = generar_pdf_reservas(data, filtros, resumen)
-        
-        fecha_actual = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"reservas_{fecha_actual}.pdf"
-        
-        response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
-        
-    except Exception as e:
-        return Response(
-            {
-                "success": False,
-                "message": "Error al exportar PDF de reservas",
-                "errors": [str(e)]
-            },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    return _exportar(_exportar_reservas, request, None, "Error al exportar reservas")
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def exportar_reservas_excel(request):
-    """
-    GET /api/dashboard/reportes/reservas/exportar-excel/
-    
-    Exporta reporte de reservas a Excel.
+def exportar_reservas_pdf(request):
     """
-    try:
-        # Reutilizar lógica del PDF
-        queryset = Reserva.objects.filter(
-            activo=True
-        ).select_related(
-            'titular',
-            'paquete',
-            'paquete__destino',
-            'paquete__destino__ciudad',
-            'paquete__destino__ciudad__pais',
-            'paquete__moneda',
-            'salida',
-            'habitacion',
-            'habitacion__hotel',
-            'habitacion__tipo_habitacion'
-        ).prefetch_related('pasajeros')
-        
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-        
-        if fecha_desde_str:
-            fecha_desde = parsear_fecha(fecha_desde_str)
-            if fecha_desde:
-                queryset = queryset.filter(fecha_reserva__date__gte=fecha_desde)
-        
-        if fecha_hasta_str:
-            fecha_hasta = parsear_fecha(fecha_hasta_str)
-            if fecha_hasta:
-                queryset = queryset.filter(fecha_reserva__date__lte=fecha_hasta)
-        
-        estado = request.query_params.get('estado')
-        if estado and estado != 'todas':
-            queryset = queryset.filter(estado=estado)
-        
-        # Calcular resumen
-        reservas_por_estado = {
-            'pendiente': queryset.filter(estado='pendiente').count(),
-            'confirmada': queryset.filter(estado='confirmada').count(),
-            'finalizada': queryset.filter(estado='finalizada').count(),
-            'cancelada': queryset.filter(estado='cancelada').count()
-        }
-        
-        reservas_activas = queryset.exclude(estado='cancelada')
-        total_pasajeros = sum(r.cantidad_pasajeros or 0 for r in reservas_activas)
-        
-        monto_total = Decimal('0')
-        monto_pagado_total = Decimal('0')
-        
-        for reserva in reservas_activas:
-            if reserva.precio_unitario and reserva.cantidad_pasajeros:
-                monto_reserva = reserva.precio_unitario * reserva.cantidad_pasajeros
-                monto_total += monto_reserva
-                monto_pagado_total += (reserva.monto_pagado or Decimal('0'))
-        
-        saldo_pendiente = monto_total - monto_pagado_total
-        
-        resumen = {
-            "total_registros": queryset.count(),
-            "reservas_pendientes": reservas_por_estado['pendiente'],
-            "reservas_confirmadas": reservas_por_estado['confirmada'],
-            "reservas_finalizadas": reservas_por_estado['finalizada'],
-            "reservas_canceladas": reservas_por_estado['cancelada'],
-            "monto_total": str(monto_total),
-            "monto_pagado": str(monto_pagado_total),
-            "saldo_pendiente": str(saldo_pendiente),
-            "total_pasajeros": total_pasajeros
-        }
-        
-        serializer = ReservaReporteSerializer(queryset, many=True)
-        data = serializer.data
-        
-        filtros = {
-            "fecha_desde": fecha_desde_str,
-            "fecha_hasta": fecha_hasta_str,
-            "estado": estado or "todas"
-        }
-        
-        excel_buffer = generar_excel_reservas(data, filtros, resumen)
-        
-        fecha_actual = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"reservas_{fecha_actual}.xlsx"
-        
-        response = HttpResponse(
-            excel_buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
-        
-    except Exception as e:
-        return Response(
-            {
-                "success": False,
-                "message": "Error al exportar Excel de reservas",
-                "errors": [str(e)]
-            },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    GET /api/dashboard/reportes/reservas/exportar-pdf/
 
+    Exporta reporte de reservas a PDF.
+    """
+    return _exportar(_exportar_reservas, request, 'pdf', "Error al exportar PDF de reservas")
 
-# ============================================================================
-# EXPORTACIÓN CSV - MOVIMIENTOS CAJAS
-# ============================================================================
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def exportar_movimientos_csv(request):
-    """
-    GET /api/dashboard/reportes/movimientos-cajas/exportar-csv/
-    
-    Exporta reporte de movimientos de cajas a CSV.
-    Formato simple y liviano, compatible con Excel y Google Sheets.
+def exportar_reservas_excel(request):
     """
-    try:
-        # ===== VALIDAR FECHAS (OBLIGATORIAS) =====
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-        
-        if not fecha_desde_str or not fecha_hasta_str:
-            return Response(
-                {
-                    "success": False,
-                    "message": "Los parámetros fecha_desde y fecha_hasta son obligatorios"
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        fecha_desde = parsear_fecha(fecha_desde_str)
-        fecha_hasta = parsear_fecha(fecha_hasta_str)
-        
-        if not fecha_desde or not fecha_hasta:
-            return Response(
-                {
-                    "success": False,
-                    "message": "Formato de fecha inválido"
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # ===== CONSTRUIR QUERY =====
-        queryset = MovimientoCaja.objects.filter(
-            activo=True,
-            fecha_hora_movimiento__date__gte=fecha_desde,
-            fecha_hora_movimiento__date__lte=fecha_hasta
-        ).select_related(
-            'apertura_caja',
-            'apertura_caja__caja',
-            'usuario_registro',
-            'usuario_registro__persona',
-            'comprobante'
-        ).order_by('-fecha_hora_movimiento')
-        
-        # ===== APLICAR FILTROS =====
-        caja_id = request.query_params.get('caja_id')
-        if caja_id:
-            queryset = queryset.filter(apertura_caja__caja_id=caja_id)
-        
-        tipo_movimiento = request.query_params.get('tipo_movimiento')
-        if tipo_movimiento and tipo_movimiento != 'todas':
-            queryset = queryset.filter(tipo_movimiento=tipo_movimiento)
-        
-        metodo_pago = request.query_params.get('metodo_pago')
-        if metodo_pago:
-            queryset = queryset.filter(metodo_pago=metodo_pago)
-        
-        concepto = request.query_params.get('concepto')
-        if concepto:
-            queryset = queryset.filter(concepto=concepto)
-        
-        busqueda = request.query_params.get('busqueda')
-        if busqueda:
-            queryset = queryset.filter(
-                Q(descripcion__icontains=busqueda) |
-                Q(referencia__icontains=busqueda) |
-                Q(numero_movimiento__icontains=busqueda)
-            )
-        
-        # ===== VERIFICAR SI HAY DATOS =====
-        total_count = queryset.count()
-        print(f"[CSV DEBUG] Total de movimientos encontrados: {total_count}")
-        
-        # ===== CREAR CSV =====
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        fecha_actual = datetime.now().strftime('%Y%m%d_%H%M%S')
-        response['Content-Disposition'] = f'attachment; filename="movimientos_cajas_{fecha_actual}.csv"'
-        
-        # BOM para UTF-8 (para que Excel lo abra correctamente)
-        response.write('\ufeff')
-        
-        writer = csv.writer(response)
-        
-        # ===== HEADERS =====
-        writer.writerow([
-            'Número Movimiento',
-            'Fecha/Hora',
-            'Caja',
-            'Número Caja',
-            'Tipo Movimiento',
-            'Concepto',
-            'Descripción',
-            'Monto',
-            'Método Pago',
-            'Referencia',
-            'Usuario Registro',
-            'Comprobante'
-        ])
-        
-        # ===== DATOS =====
-        for mov in queryset:
-            # Obtener nombre de la caja
-            caja_nombre = 'N/A'
-            caja_numero = 'N/A'
-            if mov.apertura_caja and mov.apertura_caja.caja:
-                caja_nombre = mov.apertura_caja.caja.nombre
-                caja_numero = mov.apertura_caja.caja.numero
-            
-            # Obtener nombre del usuario
-            usuario_nombre = 'N/A'
-            if mov.usuario_registro:
-                if hasattr(mov.usuario_registro, 'persona') and mov.usuario_registro.persona:
-                    usuario_nombre = f"{mov.usuario_registro.persona.nombres} {mov.usuario_registro.persona.apellidos}"
-                else:
-                    usuario_nombre = mov.usuario_registro.username
-            
-            # Obtener concepto display
-            concepto_display = mov.get_concepto_display() if hasattr(mov, 'get_concepto_display') else mov.concepto
-            
-            # Obtener tipo display
-            tipo_display = mov.get_tipo_movimiento_display() if hasattr(mov, 'get_tipo_movimiento_display') else mov.tipo_movimiento
-            
-            # Obtener método display
-            metodo_display = mov.get_metodo_pago_display() if hasattr(mov, 'get_metodo_pago_display') else mov.metodo_pago
-            
-            # Comprobante
-            comprobante_num = mov.comprobante.numero if mov.comprobante else 'N/A'
-            
-            writer.writerow([
-                mov.numero_movimiento or 'N/A',
-                mov.fecha_hora_movimiento.strftime('%d/%m/%Y %H:%M') if mov.fecha_hora_movimiento else 'N/A',
-                caja_nombre,
-                caja_numero,
-                tipo_display,
-                concepto_display,
-                mov.descripcion or '',
-                f"{mov.monto:,.2f}" if mov.monto else '0.00',
-                metodo_display,
-                mov.referencia or '',
-                usuario_nombre,
-                comprobante_num
-            ])
-        
-        print(f"[CSV DEBUG] CSV generado exitosamente con {total_count} registros")
-        return response
-        
-    except Exception as e:
-        print(f"[CSV ERROR] {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return Response(
-            {
-                "success": False,
-                "message": "Error al exportar CSV",
-                "errors": [str(e)]
-            },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    GET /api/dashboard/reportes/reservas/exportar-excel/
 
+    Exporta reporte de reservas a Excel.
+    """
+    return _exportar(_exportar_reservas, request, 'xlsx', "Error al exportar Excel de reservas")
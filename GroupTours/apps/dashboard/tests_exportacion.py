@@ -0,0 +1,114 @@
+"""
+Tests de la exportación en streaming de reportes (apps/dashboard/exportacion.py)
+
+Ejecutar tests:
+    python manage.py test apps.dashboard.tests_exportacion
+"""
+
+from decimal import Decimal
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.http import FileResponse, StreamingHttpResponse
+from django.test import TestCase
+from django.utils import timezone
+from openpyxl import load_workbook
+from rest_framework.test import APIClient
+
+from apps.arqueo_caja.models import AperturaCaja, Caja, MovimientoCaja
+from apps.empleado.models import Empleado
+from apps.facturacion.models import Empresa, Establecimiento, PuntoExpedicion
+from apps.nacionalidad.models import Nacionalidad
+from apps.persona.models import PersonaFisica
+from apps.puesto.models import Puesto
+from apps.tipo_documento.models import TipoDocumento
+from apps.tipo_remuneracion.models import TipoRemuneracion
+
+
+class ExportacionMovimientosTestCase(TestCase):
+    """Exportación de movimientos de cajas en csv, xlsx y pdf"""
+
+    CANTIDAD_MOVIMIENTOS = 5
+
+    def setUp(self):
+        empresa = Empresa.objects.create(ruc='80000000-1', nombre='Test Tours SA')
+        establecimiento = Establecimiento.objects.create(empresa=empresa, codigo='001', nombre='Central')
+        punto_expedicion = PuntoExpedicion.objects.create(
+            establecimiento=establecimiento, codigo='001', nombre='Caja 1'
+        )
+        persona = PersonaFisica.objects.create(
+            tipo_documento=TipoDocumento.objects.create(nombre='CI'),
+            documento='1000',
+            email='cajero@test.com',
+            telefono='0981000000',
+            nombre='Cajero',
+            apellido='Test',
+            nacionalidad=Nacionalidad.objects.create(nombre='Paraguay', codigo_alpha2='PY')
+        )
+        empleado = Empleado.objects.create(
+            persona=persona,
+            puesto=Puesto.objects.create(nombre='Cajero'),
+            tipo_remuneracion=TipoRemuneracion.objects.create(nombre='Fijo'),
+            salario=1
+        )
+        caja = Caja.objects.create(punto_expedicion=punto_expedicion, nombre='Caja Principal')
+        apertura = AperturaCaja.objects.create(caja=caja, responsable=empleado, monto_inicial=Decimal('0'))
+
+        for numero in range(1, self.CANTIDAD_MOVIMIENTOS + 1):
+            MovimientoCaja.objects.create(
+                apertura_caja=apertura,
+                tipo_movimiento='ingreso',
+                concepto='venta_efectivo',
+                monto=Decimal('1000') * numero,
+                metodo_pago='efectivo',
+                descripcion=f'Cobro {numero}',
+                usuario_registro=empleado
+            )
+
+        hoy = timezone.localdate().isoformat()
+        self.filtros = f'fecha_desde={hoy}&fecha_hasta={hoy}'
+
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='exportacion'))
+
+    def test_csv_en_streaming(self):
+        response = self.client.get(f'/api/dashboard/reportes/movimientos-cajas/exportar-csv/?{self.filtros}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        lineas = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lineas), self.CANTIDAD_MOVIMIENTOS + 1)
+        self.assertTrue(lineas[0].startswith('Número Movimiento,Fecha/Hora,Caja'))
+        self.assertIn('Caja Principal,', lineas[1])
+
+    def test_xlsx_write_only(self):
+        response = self.client.get(
+            f'/api/dashboard/reportes/movimientos-cajas/exportar/?formato=xlsx&{self.filtros}'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, FileResponse)
+        self.assertIn('.xlsx', response['Content-Disposition'])
+
+        wb = load_workbook(BytesIO(b''.join(response.streaming_content)))
+        datos = list(wb['Datos'].values)
+        self.assertEqual(len(datos), self.CANTIDAD_MOVIMIENTOS + 1)
+        self.assertEqual(sum(fila[6] for fila in datos[1:]), 15000)
+        self.assertEqual(wb['Resumen']['B9'].value, 15000)
+
+    def test_pdf(self):
+        response = self.client.get(
+            f'/api/dashboard/reportes/movimientos-cajas/exportar/?formato=pdf&{self.filtros}'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+    def test_parametros_invalidos(self):
+        response = self.client.get(
+            f'/api/dashboard/reportes/movimientos-cajas/exportar/?formato=docx&{self.filtros}'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get('/api/dashboard/reportes/movimientos-cajas/exportar/?formato=csv')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,115 @@
+"""
+Tests de la paginación por cursor (apps/dashboard/paginacion.py)
+
+Ejecutar tests:
+    python manage.py test apps.dashboard.tests_paginacion
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.arqueo_caja.models import AperturaCaja, Caja, MovimientoCaja
+from apps.empleado.models import Empleado
+from apps.facturacion.models import Empresa, Establecimiento, PuntoExpedicion
+from apps.nacionalidad.models import Nacionalidad
+from apps.persona.models import PersonaFisica
+from apps.puesto.models import Puesto
+from apps.tipo_documento.models import TipoDocumento
+from apps.tipo_remuneracion.models import TipoRemuneracion
+
+
+class PaginacionCursorTestCase(TestCase):
+    """Modo ?cursor= de los movimientos de caja (ViewSet y reporte)"""
+
+    CANTIDAD_MOVIMIENTOS = 7
+
+    def setUp(self):
+        empresa = Empresa.objects.create(ruc='80000000-1', nombre='Test Tours SA')
+        establecimiento = Establecimiento.objects.create(empresa=empresa, codigo='001', nombre='Central')
+        punto_expedicion = PuntoExpedicion.objects.create(
+            establecimiento=establecimiento, codigo='001', nombre='Caja 1'
+        )
+        persona = PersonaFisica.objects.create(
+            tipo_documento=TipoDocumento.objects.create(nombre='CI'),
+            documento='1000',
+            email='cajero@test.com',
+            telefono='0981000000',
+            nombre='Cajero',
+            apellido='Test',
+            nacionalidad=Nacionalidad.objects.create(nombre='Paraguay', codigo_alpha2='PY')
+        )
+        empleado = Empleado.objects.create(
+            persona=persona,
+            puesto=Puesto.objects.create(nombre='Cajero'),
+            tipo_remuneracion=TipoRemuneracion.objects.create(nombre='Fijo'),
+            salario=1
+        )
+        caja = Caja.objects.create(punto_expedicion=punto_expedicion, nombre='Caja Principal')
+        apertura = AperturaCaja.objects.create(caja=caja, responsable=empleado, monto_inicial=Decimal('0'))
+
+        for numero in range(1, self.CANTIDAD_MOVIMIENTOS + 1):
+            MovimientoCaja.objects.create(
+                apertura_caja=apertura,
+                tipo_movimiento='ingreso',
+                concepto='venta_efectivo',
+                monto=Decimal('1000') * numero,
+                metodo_pago='efectivo',
+                descripcion=f'Cobro {numero}',
+                usuario_registro=empleado
+            )
+        # Misma fecha para todos: el id desempata
+        MovimientoCaja.objects.update(fecha_hora_movimiento=timezone.now())
+
+        hoy = timezone.localdate().isoformat()
+        self.filtros = f'fecha_desde={hoy}&fecha_hasta={hoy}'
+
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='paginacion'))
+
+    def _recorrer(self, url, clave_datos=None):
+        ids, cursor, paginas = [], '', 0
+        while cursor is not None:
+            response = self.client.get(f'{url}&cursor={cursor}')
+            self.assertEqual(response.status_code, 200)
+            datos = response.data[clave_datos] if clave_datos else response.data
+            ids.extend(item['id'] for item in datos['results'])
+            cursor = datos['nextCursor']
+            paginas += 1
+        return ids, paginas
+
+    def test_viewset_recorre_todo_sin_repetir(self):
+        ids, paginas = self._recorrer('/api/arqueo-caja/movimientos/?page_size=3')
+
+        esperados = list(MovimientoCaja.objects.order_by('-fecha_hora_movimiento', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, esperados)
+        self.assertEqual(paginas, 3)
+
+    def test_conteo_opcional(self):
+        response = self.client.get('/api/arqueo-caja/movimientos/?cursor=&page_size=3')
+        self.assertIsNone(response.data['totalItems'])
+
+        response = self.client.get('/api/arqueo-caja/movimientos/?cursor=&page_size=3&conteo=aproximado')
+        self.assertEqual(response.data['totalItems'], self.CANTIDAD_MOVIMIENTOS)
+
+        response = self.client.get('/api/arqueo-caja/movimientos/?cursor=&conteo=todos')
+        self.assertEqual(response.status_code, 400)
+
+    def test_reporte_por_cursor(self):
+        ids, paginas = self._recorrer(
+            f'/api/dashboard/reportes/movimientos-cajas/?{self.filtros}&page_size=10', 'data'
+        )
+        self.assertEqual(len(set(ids)), self.CANTIDAD_MOVIMIENTOS)
+        self.assertEqual(paginas, 1)
+
+        response = self.client.get(f'/api/dashboard/reportes/movimientos-cajas/?{self.filtros}&cursor=xyz')
+        self.assertEqual(response.status_code, 400)
+
+    def test_sin_cursor_pagina_por_paginas(self):
+        response = self.client.get('/api/arqueo-caja/movimientos/?page=2&page_size=3')
+
+        self.assertEqual(response.data['currentPage'], 2)
+        self.assertEqual(response.data['totalItems'], self.CANTIDAD_MOVIMIENTOS)
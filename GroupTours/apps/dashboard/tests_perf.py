@@ -0,0 +1,122 @@
+"""
+Tests del monitoreo de consultas (apps/dashboard/perf.py) y de las consultas
+del reporte de reservas.
+
+Ejecutar tests:
+    python manage.py test apps.dashboard.tests_perf
+
+Los presupuestos de consultas de cada ViewSet se prueban en el tests_perf.py
+de su app (apps.reserva.tests_perf, apps.paquete.tests_perf).
+"""
+
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from apps.dashboard.perf import (
+    PresupuestoConsultasExcedido,
+    huella_sql,
+    obtener_resumen_rutas,
+    reiniciar_muestras,
+)
+from apps.dashboard.reportes_views import calcular_resumen_reservas
+from apps.paquete.tests_datos import DatosReservasMixin
+from apps.paquete.views import PaqueteViewSet
+from apps.reserva.models import PasajeroLedger, Reserva
+
+
+@override_settings(PERF_MONITOREO_ACTIVO=True)
+class MonitorConsultasTestCase(DatosReservasMixin, TestCase):
+    """Medición por request, resumen por ruta y validación del presupuesto"""
+
+    def setUp(self):
+        super().setUp()
+        reiniciar_muestras()
+
+    @override_settings(PERF_PRESUPUESTO_ESTRICTO=True)
+    def test_exceder_presupuesto_falla(self):
+        with self.assertRaises(PresupuestoConsultasExcedido):
+            with mock.patch.object(PaqueteViewSet, 'query_budget', {'list': 1}):
+                self.client.get('/api/paquete/')
+
+    def test_exceder_presupuesto_sin_modo_estricto_registra_warning(self):
+        with self.assertLogs('apps.dashboard.perf', level='WARNING') as logs:
+            with mock.patch.object(PaqueteViewSet, 'query_budget', {'list': 1}):
+                self._get('/api/paquete/')
+        self.assertIn('PaqueteViewSet.list', logs.output[0])
+
+    def test_resumen_por_ruta(self):
+        self._get('/api/paquete/')
+        self._get('/api/paquete/')
+
+        rutas = self._get('/api/dashboard/perf/?ruta=paquete').data['rutas']
+
+        self.assertEqual(len(rutas), 1)
+        self.assertEqual(rutas[0]['ruta'], 'GET /api/paquete/')
+        self.assertEqual(rutas[0]['requests'], 2)
+        self.assertGreater(rutas[0]['consultas_p50'], 0)
+        self.assertIn('total_ms_p95', rutas[0])
+        self.assertEqual(len(obtener_resumen_rutas()), 2)
+
+    @override_settings(PERF_MONITOREO_ACTIVO=False)
+    def test_monitoreo_apagado_no_registra(self):
+        self._get('/api/paquete/')
+
+        self.assertEqual(obtener_resumen_rutas(), [])
+
+    @override_settings(DEBUG=True)
+    def test_headers_en_debug(self):
+        response = self._get('/api/paquete/')
+
+        self.assertGreater(int(response['X-DB-Query-Count']), 0)
+        self.assertIn('X-DB-Time-ms', response)
+        self.assertIn('X-Serializer-Time-ms', response)
+        self.assertIn('X-DB-Duplicate-Queries', response)
+
+    def test_huella_sql_agrupa_parametros(self):
+        self.assertEqual(
+            huella_sql('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21'),
+            huella_sql('SELECT * FROM "t" WHERE "id" IN (%s) LIMIT 21'),
+        )
+
+
+class ReporteReservasConsultasTestCase(DatosReservasMixin, TestCase):
+    """El reporte de reservas resuelve resumen, filtros y orden en SQL"""
+
+    def test_resumen_reporte_reservas_en_una_consulta(self):
+        """El resumen del reporte de reservas no recorre reservas en Python"""
+        queryset = Reserva.objects.filter(activo=True)
+        calcular_resumen_reservas(queryset)   # carga cotizaciones
+
+        # Solo la agregación por moneda
+        with self.assertNumQueries(1):
+            resumen = calcular_resumen_reservas(queryset)
+
+        self.assertEqual(resumen['reservas_pendientes'], len(self.CANTIDAD_PASAJEROS))
+        self.assertEqual(resumen['total_pasajeros'], sum(self.CANTIDAD_PASAJEROS))
+        self.assertEqual(resumen['monto_total_usd'], 1000.0 * sum(self.CANTIDAD_PASAJEROS))
+        self.assertEqual(resumen['monto_total_gs'], 7300000.0 * sum(self.CANTIDAD_PASAJEROS))
+        self.assertEqual(resumen['monto_pagado_gs'], 0)
+
+    def test_reporte_reservas_filtra_y_ordena_por_pago_en_sql(self):
+        """estado_pago y ordenar_por=monto se resuelven en la consulta, antes de paginar"""
+        pasajero = self.reserva.pasajeros.first()
+        PasajeroLedger.objects.filter(pasajero=pasajero).update(monto_pagado=Decimal('1000'))
+
+        respuesta = self._get('/api/dashboard/reportes/reservas/?estado_pago=pago_parcial').data
+        data = respuesta['data']
+        self.assertEqual(data['totalItems'], 1)
+        # El resumen no aplica el filtro estado_pago
+        self.assertEqual(respuesta['resumen']['total_registros'], len(self.CANTIDAD_PASAJEROS))
+        self.assertEqual(data['results'][0]['codigo'], self.reserva.codigo)
+        self.assertEqual(data['results'][0]['estado_pago'], 'pago_parcial')
+
+        data = self._get('/api/dashboard/reportes/reservas/?estado_pago=sin_pagar&page_size=10').data['data']
+        self.assertEqual(data['totalItems'], len(self.CANTIDAD_PASAJEROS) - 1)
+
+        data = self._get('/api/dashboard/reportes/reservas/?ordenar_por=monto&page_size=10').data['data']
+        self.assertEqual(
+            [Decimal(r['monto_total']) for r in data['results']],
+            [Decimal('1000') * cantidad for cantidad in sorted(self.CANTIDAD_PASAJEROS, reverse=True)]
+        )
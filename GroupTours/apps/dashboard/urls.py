@@ -11,12 +11,18 @@ urlpatterns = [
     path('alertas/', views.alertas, name='dashboard-alertas'),
     path('metricas-ventas/', views.metricas_ventas, name='dashboard-metricas-ventas'),
     path('top-destinos/', views.top_destinos, name='dashboard-top-destinos'),
+    path('perf/', views.perf, name='dashboard-perf'),
     
     # Reportes detallados JSON
     path('reportes/movimientos-cajas/', reportes_views.reporte_movimientos_cajas, name='reporte-movimientos-cajas'),
     path('reportes/paquetes/', reportes_views.reporte_paquetes, name='reporte-paquetes'),
     path('reportes/reservas/', reportes_views.reporte_reservas, name='reporte-reservas'),
     
+    # Exportación con formato a elección (?formato=csv|xlsx|pdf)
+    path('reportes/movimientos-cajas/exportar/', reportes_views.exportar_movimientos, name='exportar-movimientos'),
+    path('reportes/paquetes/exportar/', reportes_views.exportar_paquetes, name='exportar-paquetes'),
+    path('reportes/reservas/exportar/', reportes_views.exportar_reservas, name='exportar-reservas'),
+    
     # Exportación PDF
     path('reportes/movimientos-cajas/exportar-pdf/', reportes_views.exportar_movimientos_pdf, name='exportar-movimientos-pdf'),
     path('reportes/paquetes/exportar-pdf/', reportes_views.exportar_paquetes_pdf, name='exportar-paquetes-pdf'),
@@ -104,28 +104,17 @@ def resumen_general(request):
         ).exclude(estado='cancelada').count()
         
         # NUEVO: Cálculo de ocupación (%)
-        # Obtener todas las salidas futuras activas
-        salidas_futuras = SalidaPaquete.objects.filter(
+        # Una sola consulta sobre las salidas futuras activas: cupos ocupados
+        # sale del contador mantenido por Reserva (SalidaPaquete.cupos_ocupados)
+        ocupacion = SalidaPaquete.objects.filter(
             fecha_salida__gte=ahora.date(),
             activo=True
+        ).aggregate(
+            cupos_totales=Sum('cupo'),
+            cupos_ocupados=Sum('cupos_ocupados'),
         )
-        
-        cupos_totales = 0
-        cupos_ocupados = 0
-        
-        for salida in salidas_futuras:
-            # Cupos totales de esta salida (campo 'cupo' singular)
-            cupos_salida = salida.cupo or 0
-            cupos_totales += cupos_salida
-            
-            # Cupos ocupados (contar pasajeros de reservas activas no canceladas)
-            reservas_salida = Reserva.objects.filter(
-                salida=salida,
-                activo=True
-            ).exclude(estado='cancelada')
-            
-            for reserva in reservas_salida:
-                cupos_ocupados += reserva.cantidad_pasajeros or 0
+        cupos_totales = ocupacion['cupos_totales'] or 0
+        cupos_ocupados = ocupacion['cupos_ocupados'] or 0
         
         # Calcular porcentaje de ocupación
         if cupos_totales > 0:
@@ -376,16 +365,7 @@ def alertas(request):
             
             paquetes_con_cupos = []
             for salida in salidas_proximas:
-                # Contar cupos ocupados
-                reservas_salida = Reserva.objects.filter(
-                    salida=salida,
-                    activo=True
-                ).exclude(estado='cancelada')
-                
-                cupos_ocupados_salida = sum(
-                    r.cantidad_pasajeros or 0 for r in reservas_salida
-                )
-                cupos_disponibles_salida = (salida.cupo or 0) - cupos_ocupados_salida
+                cupos_disponibles_salida = (salida.cupo or 0) - salida.cupos_ocupados
                 
                 if cupos_disponibles_salida > 0:
                     dias_hasta_salida = (salida.fecha_salida - ahora.date()).days
@@ -631,3 +611,25 @@ def top_destinos(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def perf(request):
+    """
+    GET /api/dashboard/perf/
+
+    Métricas de rendimiento por ruta registradas por MonitorConsultasMiddleware
+    en este proceso: cantidad de consultas, tiempo de base de datos, tiempo de
+    serialización y tiempo total (p50/p95).
+
+    Parámetros opcionales:
+    - ruta: filtra las rutas que contengan el texto indicado
+    """
+    from .perf import obtener_resumen_rutas
+
+    rutas = obtener_resumen_rutas()
+    filtro = request.query_params.get('ruta')
+    if filtro:
+        rutas = [r for r in rutas if filtro in r['ruta']]
+
+    return Response({'rutas': rutas})
@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-17 10:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0020_alter_facturaelectronica_motivo_anulacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timbrado',
+            name='numero_desde',
+            field=models.PositiveIntegerField(default=1, help_text='Primer número correlativo autorizado por el timbrado'),
+        ),
+        migrations.AddField(
+            model_name='timbrado',
+            name='numero_hasta',
+            field=models.PositiveIntegerField(blank=True, help_text='Último número correlativo autorizado por el timbrado (vacío = sin límite)', null=True),
+        ),
+        migrations.CreateModel(
+            name='CorrelativoDocumento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_documento', models.CharField(choices=[('factura', 'Factura'), ('nota_credito', 'Nota de Crédito')], max_length=20)),
+                ('ultimo_numero', models.PositiveIntegerField(default=0, help_text='Último número correlativo emitido')),
+                ('fecha_modificacion', models.DateTimeField(auto_now=True)),
+                ('punto_expedicion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='correlativos', to='facturacion.puntoexpedicion')),
+                ('timbrado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='correlativos', to='facturacion.timbrado')),
+            ],
+            options={
+                'verbose_name': 'Correlativo de Documento',
+                'verbose_name_plural': 'Correlativos de Documentos',
+                'db_table': 'correlativo_documento',
+                'unique_together': {('tipo_documento', 'punto_expedicion', 'timbrado')},
+            },
+        ),
+    ]
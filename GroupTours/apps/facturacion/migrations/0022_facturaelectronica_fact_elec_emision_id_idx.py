@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-17 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0021_correlativodocumento'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='facturaelectronica',
+            index=models.Index(condition=models.Q(('es_configuracion', False)), fields=['fecha_emision', 'id'], name='fact_elec_emision_id_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-17 04:33
+
+from django.db import migrations, models
+
+
+# Búsquedas icontains (FacturaElectronicaFilter y NotaCreditoElectronicaFilter).
+# Django las traduce a UPPER(col::text) LIKE UPPER('%texto%'), que un btree no
+# puede resolver:
+# índices GIN de trigramas (pg_trgm) sobre esa misma expresión.
+INDICES_TRIGRAM = [
+    ("facturacion", "FacturaElectronica", "numero_factura"),
+    ("facturacion", "FacturaElectronica", "cliente_nombre"),
+    ("facturacion", "FacturaElectronica", "cliente_numero_documento"),
+    ("facturacion", "NotaCreditoElectronica", "numero_nota_credito"),
+]
+
+
+def _indices_trigram(apps):
+    for app_label, modelo, campo in INDICES_TRIGRAM:
+        model = apps.get_model(app_label, modelo)
+        tabla = model._meta.db_table
+        columna = model._meta.get_field(campo).column
+        yield f"{tabla}_{columna}_trgm".lower(), tabla, columna
+
+
+def crear_indices_trigram(apps, schema_editor):
+    # Solo PostgreSQL (en otros motores las búsquedas quedan como estaban)
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    q = schema_editor.quote_name
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for nombre, tabla, columna in _indices_trigram(apps):
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {q(nombre)} ON {q(tabla)} USING gin (UPPER({q(columna)}::text) gin_trgm_ops)"
+        )
+
+
+def eliminar_indices_trigram(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for nombre, _, _ in _indices_trigram(apps):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(nombre)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0022_facturaelectronica_fact_elec_emision_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='facturaelectronica',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['reserva', 'pasajero'], name='fact_elec_reserva_pax_idx'),
+        ),
+        migrations.RunPython(crear_indices_trigram, eliminar_indices_trigram),
+    ]
@@ -83,12 +83,150 @@ class Timbrado(models.Model):
     numero = models.CharField(max_length=20)
     inicio_vigencia = models.DateField()
     fin_vigencia = models.DateField(null=True, blank=True)
+    numero_desde = models.PositiveIntegerField(
+        default=1,
+        help_text="Primer número correlativo autorizado por el timbrado"
+    )
+    numero_hasta = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Último número correlativo autorizado por el timbrado (vacío = sin límite)"
+    )
     activo = models.BooleanField(default=True) 
 
     def __str__(self):
         return f"{self.numero} ({self.empresa.nombre})"
 
 
+# ---------- Correlativo de Documentos ----------
+class CorrelativoDocumento(models.Model):
+    """
+    Contador de numeración de documentos (facturas y notas de crédito)
+    por punto de expedición y timbrado.
+
+    Reemplaza la búsqueda del Max(numero) sobre la columna de texto: la fila se
+    bloquea con select_for_update() y se incrementa dentro de la misma
+    transacción que inserta el documento, por lo que no se repiten números
+    y, si la transacción falla, el número no se consume (numeración sin huecos).
+    """
+    TIPOS_DOCUMENTO = [
+        ('factura', 'Factura'),
+        ('nota_credito', 'Nota de Crédito'),
+    ]
+
+    tipo_documento = models.CharField(max_length=20, choices=TIPOS_DOCUMENTO)
+    punto_expedicion = models.ForeignKey(PuntoExpedicion, on_delete=models.CASCADE, related_name="correlativos")
+    timbrado = models.ForeignKey(Timbrado, on_delete=models.CASCADE, related_name="correlativos")
+    ultimo_numero = models.PositiveIntegerField(
+        default=0,
+        help_text="Último número correlativo emitido"
+    )
+    fecha_modificacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'correlativo_documento'
+        unique_together = ('tipo_documento', 'punto_expedicion', 'timbrado')
+        verbose_name = 'Correlativo de Documento'
+        verbose_name_plural = 'Correlativos de Documentos'
+
+    def __str__(self):
+        return f"{self.get_tipo_documento_display()} {self.punto_expedicion} - Timbrado {self.timbrado.numero}: {self.ultimo_numero}"
+
+
+def formatear_numero_documento(establecimiento_codigo, punto_expedicion_codigo, correlativo):
+    """
+    Formato: XXX-XXX-XXXXXXX (establecimiento-punto de expedición-correlativo)
+    """
+    return f"{establecimiento_codigo}-{punto_expedicion_codigo}-{str(correlativo).zfill(7)}"
+
+
+def _ultimo_correlativo_emitido(tipo_documento, punto_expedicion):
+    """
+    Mayor correlativo ya emitido en el punto de expedición (solo se usa al crear el contador).
+    """
+    if tipo_documento == 'factura':
+        ultimo = FacturaElectronica.objects.filter(
+            punto_expedicion=punto_expedicion,
+            es_configuracion=False
+        ).aggregate(max_num=Max('numero_factura'))['max_num']
+    else:
+        ultimo = NotaCreditoElectronica.objects.filter(
+            punto_expedicion=punto_expedicion
+        ).aggregate(max_num=Max('numero_nota_credito'))['max_num']
+
+    if not ultimo:
+        return 0
+    try:
+        return int(ultimo.split('-')[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+def reservar_correlativos(tipo_documento, punto_expedicion, timbrado, cantidad=1):
+    """
+    Reserva `cantidad` números correlativos consecutivos para el tipo de documento.
+
+    Debe invocarse dentro de la transacción que inserta los documentos: el
+    contador queda bloqueado hasta el commit y, si la transacción se revierte,
+    los números vuelven a estar disponibles.
+
+    Args:
+        tipo_documento: 'factura' o 'nota_credito'
+        punto_expedicion: PuntoExpedicion emisor
+        timbrado: Timbrado vigente (define el rango autorizado)
+        cantidad: Cantidad de números a reservar (para emisión en lote)
+
+    Returns:
+        range: Correlativos reservados
+
+    Raises:
+        ValidationError: Si el rango autorizado del timbrado se agotó
+    """
+    if cantidad < 1:
+        raise ValueError("La cantidad de correlativos a reservar debe ser mayor a cero")
+
+    with transaction.atomic():
+        if not CorrelativoDocumento.objects.filter(
+            tipo_documento=tipo_documento,
+            punto_expedicion=punto_expedicion,
+            timbrado=timbrado
+        ).exists():
+            # Continuar la numeración existente del punto de expedición
+            # (el número es único por establecimiento/punto de expedición)
+            ultimo_existente = max(
+                _ultimo_correlativo_emitido(tipo_documento, punto_expedicion),
+                (timbrado.numero_desde or 1) - 1
+            )
+            CorrelativoDocumento.objects.get_or_create(
+                tipo_documento=tipo_documento,
+                punto_expedicion=punto_expedicion,
+                timbrado=timbrado,
+                defaults={'ultimo_numero': ultimo_existente}
+            )
+
+        correlativo = CorrelativoDocumento.objects.select_for_update().get(
+            tipo_documento=tipo_documento,
+            punto_expedicion=punto_expedicion,
+            timbrado=timbrado
+        )
+
+        inicio = correlativo.ultimo_numero + 1
+        fin = correlativo.ultimo_numero + cantidad
+
+        if timbrado.numero_hasta and fin > timbrado.numero_hasta:
+            disponibles = max(timbrado.numero_hasta - correlativo.ultimo_numero, 0)
+            raise ValidationError(
+                f"El timbrado {timbrado.numero} agotó su rango autorizado para "
+                f"{correlativo.get_tipo_documento_display().lower()}s en el punto de expedición "
+                f"{punto_expedicion}. Disponibles: {disponibles}, solicitados: {cantidad}."
+            )
+
+        correlativo.ultimo_numero = fin
+        correlativo.save(update_fields=['ultimo_numero', 'fecha_modificacion'])
+
+    return range(inicio, fin + 1)
+
+
 # ---------- Cliente de Facturación ----------
 class ClienteFacturacion(models.Model):
     """
@@ -405,6 +543,20 @@ class FacturaElectronica(models.Model):
 
     class Meta:
         unique_together = ("establecimiento", "punto_expedicion", "numero_factura")
+        indexes = [
+            # Ordenamiento y paginación por cursor (fecha_emision, id) de las facturas reales
+            models.Index(
+                fields=["fecha_emision", "id"],
+                name="fact_elec_emision_id_idx",
+                condition=models.Q(es_configuracion=False),
+            ),
+            # Facturas vigentes de una reserva / pasajero (reserva + pasajero + activo=True)
+            models.Index(
+                fields=["reserva", "pasajero"],
+                name="fact_elec_reserva_pax_idx",
+                condition=models.Q(activo=True),
+            ),
+        ]
 
     def __str__(self):
         if self.es_configuracion:
@@ -517,16 +669,17 @@ class FacturaElectronica(models.Model):
         self.usuario_anulacion = usuario
         self.save()
 
-        # Regenerar PDF con marca de agua "ANULADO" si existe un PDF previo
+        # Encolar el PDF con marca de agua "ANULADO" si existe un PDF previo
         if self.pdf_generado:
             try:
-                self.generar_pdf()  # Regenera el PDF con la marca de agua "ANULADO"
+                from apps.generacion_pdf.services import solicitar_pdf
+                solicitar_pdf('factura', self)
             except Exception as e:
                 # Si falla la regeneración, no bloqueamos la anulación
                 # Solo registramos el error para debugging
                 import logging
                 logger = logging.getLogger(__name__)
-                logger.warning(f"No se pudo regenerar PDF al anular factura {self.id}: {str(e)}")
+                logger.warning(f"No se pudo encolar PDF al anular factura {self.id}: {str(e)}")
 
         return True, "Factura anulada exitosamente"
 
@@ -542,7 +695,12 @@ class FacturaElectronica(models.Model):
             if not self.punto_expedicion:
                 raise ValueError("El punto de expedición es obligatorio para facturas reales")
             if not self.numero_factura:
-                self.numero_factura = self.generar_numero_factura()
+                # El número se reserva en la misma transacción que el INSERT:
+                # si el guardado falla, el correlativo no se consume
+                with transaction.atomic():
+                    self.numero_factura = self.generar_numero_factura()
+                    super().save(*args, **kwargs)
+                return
 
         super().save(*args, **kwargs)
 
@@ -552,36 +710,34 @@ class FacturaElectronica(models.Model):
         Donde:
         - XXX = código del establecimiento
         - XXX = código del punto de expedición
-        - XXXXXXX = correlativo incremental
+        - XXXXXXX = correlativo incremental (CorrelativoDocumento del punto/timbrado)
         """
-        ultimo = FacturaElectronica.objects.filter(
-            establecimiento=self.establecimiento,
-            punto_expedicion=self.punto_expedicion,
-            es_configuracion=False
-        ).aggregate(max_num=Max('numero_factura'))['max_num']
-
-        if ultimo:
-            try:
-                correlativo = int(ultimo.split('-')[2]) + 1
-            except:
-                correlativo = 1
-        else:
-            correlativo = 1
-
-        correlativo_str = str(correlativo).zfill(7)
-        return f"{self.establecimiento.codigo}-{self.punto_expedicion.codigo}-{correlativo_str}"
+        correlativo = reservar_correlativos('factura', self.punto_expedicion, self.timbrado)[0]
+        return formatear_numero_documento(
+            self.establecimiento.codigo, self.punto_expedicion.codigo, correlativo
+        )
 
     def calcular_totales(self):
         """
         Calcula los totales de la factura basándose en sus detalles.
         """
+        self.asignar_totales(self.detalles.all())
+        self.save()
+
+    def asignar_totales(self, detalles):
+        """
+        Asigna los totales de la factura a partir de los detalles dados, sin guardar.
+
+        Usado por calcular_totales() y por la facturación en lote, que calcula los
+        totales antes de insertar la factura (generar_todas_facturas_pasajeros).
+        """
         from decimal import Decimal
 
         self.total_exenta = Decimal('0')
         self.total_gravada_5 = Decimal('0')
         self.total_gravada_10 = Decimal('0')
 
-        for detalle in self.detalles.all():
+        for detalle in detalles:
             self.total_exenta += detalle.monto_exenta
             self.total_gravada_5 += detalle.monto_gravada_5
             self.total_gravada_10 += detalle.monto_gravada_10
@@ -595,8 +751,6 @@ class FacturaElectronica(models.Model):
 
         self.total_general = self.total_exenta + self.total_gravada_5 + self.total_gravada_10
 
-        self.save()
-
     def generar_pdf(self):
         """
         Genera un PDF de la factura usando ReportLab siguiendo el formato oficial paraguayo.
@@ -1372,6 +1526,21 @@ def validar_factura_individual(reserva, pasajero):
     """
     Validaciones para emitir factura individual de un pasajero.
     """
+    _validar_factura_individual(
+        reserva,
+        pasajero,
+        existe_factura_global=reserva.facturas.filter(tipo_facturacion='total', activo=True).exists(),
+        pasajero_facturado=reserva.facturas.filter(
+            tipo_facturacion='por_pasajero', pasajero=pasajero, activo=True
+        ).exists()
+    )
+
+
+def _validar_factura_individual(reserva, pasajero, existe_factura_global, pasajero_facturado):
+    """
+    Validaciones de validar_factura_individual() con las facturas existentes ya
+    consultadas (la facturación en lote las consulta una sola vez por reserva).
+    """
     # --- Validaciones generales ---
     if reserva.modalidad_facturacion is None:
         raise ValidationError("Debe definir la modalidad de facturación primero.")
@@ -1390,10 +1559,10 @@ def validar_factura_individual(reserva, pasajero):
         raise ValidationError("El pasajero aún no está asignado, no puede generar factura.")
 
     # --- Validaciones de facturas existentes ---
-    if reserva.facturas.filter(tipo_facturacion='total', activo=True).exists():
+    if existe_factura_global:
         raise ValidationError("Ya existe una factura global, no se pueden emitir individuales.")
 
-    if reserva.facturas.filter(tipo_facturacion='por_pasajero', pasajero=pasajero, activo=True).exists():
+    if pasajero_facturado:
         raise ValidationError("El pasajero ya tiene una factura individual activa.")
 
 # ---------- Función auxiliar para conversión de moneda ----------
@@ -1975,6 +2144,122 @@ def generar_factura_global(
 
     return factura
 
+
+def _contexto_factura_individual(subtipo_impuesto_id=None, punto_expedicion_id=None):
+    """
+    Configuración de facturación, subtipo de impuesto y punto de expedición
+    (con caja abierta) para emitir facturas individuales.
+
+    Returns:
+        tuple: (configuracion, subtipo_impuesto, punto_expedicion)
+
+    Raises:
+        ValidationError: Si falta la configuración, el subtipo o no hay caja abierta
+    """
+    configuracion = FacturaElectronica.objects.filter(
+        es_configuracion=True,
+        activo=True
+    ).select_related('empresa', 'establecimiento', 'timbrado', 'tipo_impuesto', 'subtipo_impuesto').first()
+
+    if not configuracion:
+        raise ValidationError("No existe configuración de facturación en el sistema")
+
+    # Determinar subtipo de impuesto
+    if subtipo_impuesto_id:
+        subtipo_impuesto = SubtipoImpuesto.objects.get(id=subtipo_impuesto_id)
+    else:
+        subtipo_impuesto = configuracion.subtipo_impuesto
+
+    if not subtipo_impuesto:
+        raise ValidationError("Debe especificar un subtipo de impuesto")
+
+    # Obtener punto de expedición validando que haya caja abierta
+    punto_expedicion = obtener_punto_expedicion_caja_abierta(
+        punto_expedicion_id=punto_expedicion_id,
+        usuario=None  # Por ahora None, se puede pasar el usuario desde la view
+    )
+
+    return configuracion, subtipo_impuesto, punto_expedicion
+
+
+def _datos_cliente_persona(persona, es_juridica=None):
+    """
+    Datos del cliente de la factura tomados de la persona del pasajero.
+
+    Args:
+        persona: Persona del pasajero
+        es_juridica: Si ya se sabe si la persona es jurídica (evita la consulta)
+
+    Returns:
+        dict: Campos cliente_* de FacturaElectronica
+    """
+    if es_juridica is None:
+        es_juridica = hasattr(persona, 'personajuridica')
+
+    if es_juridica:
+        # Persona jurídica
+        cliente_nombre = persona.razon_social
+    else:
+        # Persona física
+        cliente_nombre = f"{getattr(persona, 'nombre', '')} {getattr(persona, 'apellido', '')}".strip()
+
+    return {
+        'cliente_nombre': cliente_nombre,
+        'cliente_tipo_documento': persona.tipo_documento.nombre,
+        'cliente_numero_documento': persona.documento,
+        'cliente_direccion': getattr(persona, 'direccion', ''),
+        'cliente_telefono': getattr(persona, 'telefono', ''),
+        'cliente_email': getattr(persona, 'email', ''),
+    }
+
+
+def _datos_detalle_factura_individual(reserva, subtipo_impuesto, datos_conversion):
+    """
+    Campos del único detalle (el paquete, un pasajero) de una factura individual.
+
+    El precio convertido se redondea a 2 decimales como lo guarda la columna
+    (numeric: mitad hacia arriba), para que los totales calculados en memoria
+    por la facturación en lote coincidan con los de calcular_totales().
+
+    Returns:
+        dict: Campos de DetalleFactura (sin factura)
+    """
+    from decimal import ROUND_HALF_UP
+
+    precio_unitario_original = reserva.precio_unitario or Decimal('0')
+
+    # NUEVO: Convertir precio unitario a guaraníes si es necesario
+    precio_unitario = convertir_monto_a_guaranies(precio_unitario_original, datos_conversion).quantize(
+        Decimal('0.01'), rounding=ROUND_HALF_UP
+    )
+    subtotal = precio_unitario
+    porcentaje_iva = subtipo_impuesto.porcentaje or Decimal('10')
+
+    if porcentaje_iva == Decimal('0'):
+        monto_exenta = subtotal
+        monto_gravada_5 = Decimal('0')
+        monto_gravada_10 = Decimal('0')
+    elif porcentaje_iva == Decimal('5'):
+        monto_exenta = Decimal('0')
+        monto_gravada_5 = subtotal
+        monto_gravada_10 = Decimal('0')
+    else:
+        monto_exenta = Decimal('0')
+        monto_gravada_5 = Decimal('0')
+        monto_gravada_10 = subtotal
+
+    return {
+        'numero_item': 1,
+        'descripcion': f"Paquete Turístico: {reserva.paquete.nombre}",
+        'cantidad': 1,  # ✅ Solo un pasajero
+        'precio_unitario': precio_unitario,
+        'monto_exenta': monto_exenta,
+        'monto_gravada_5': monto_gravada_5,
+        'monto_gravada_10': monto_gravada_10,
+        'subtotal': subtotal,
+    }
+
+
 @transaction.atomic
 def generar_factura_individual(
     reserva,
@@ -2014,27 +2299,8 @@ def generar_factura_individual(
 
     validar_factura_individual(reserva, pasajero)
 
-    configuracion = FacturaElectronica.objects.filter(
-        es_configuracion=True,
-        activo=True
-    ).first()
-
-    if not configuracion:
-        raise ValidationError("No existe configuración de facturación en el sistema")
-
-    # Determinar subtipo de impuesto
-    if subtipo_impuesto_id:
-        subtipo_impuesto = SubtipoImpuesto.objects.get(id=subtipo_impuesto_id)
-    else:
-        subtipo_impuesto = configuracion.subtipo_impuesto
-
-    if not subtipo_impuesto:
-        raise ValidationError("Debe especificar un subtipo de impuesto")
-
-    # Obtener punto de expedición validando que haya caja abierta
-    punto_expedicion = obtener_punto_expedicion_caja_abierta(
-        punto_expedicion_id=punto_expedicion_id,
-        usuario=None  # Por ahora None, se puede pasar el usuario desde la view
+    configuracion, subtipo_impuesto, punto_expedicion = _contexto_factura_individual(
+        subtipo_impuesto_id, punto_expedicion_id
     )
 
     # --- 🔹 Determinar cliente de facturación (tercero o pasajero) ---
@@ -2093,20 +2359,13 @@ def generar_factura_individual(
         cliente_email = cliente_facturacion.email or ''
     else:
         # Prioridad 3: Usar datos del pasajero sin modificaciones
-        if hasattr(persona, 'personajuridica'):
-            # Persona jurídica
-            cliente_nombre = persona.razon_social
-            cliente_tipo_documento = persona.tipo_documento.nombre
-            cliente_numero_documento = persona.documento
-        else:
-            # Persona física
-            cliente_nombre = f"{getattr(persona, 'nombre', '')} {getattr(persona, 'apellido', '')}".strip()
-            cliente_tipo_documento = persona.tipo_documento.nombre
-            cliente_numero_documento = persona.documento
-
-        cliente_direccion = getattr(persona, 'direccion', '')
-        cliente_telefono = getattr(persona, 'telefono', '')
-        cliente_email = getattr(persona, 'email', '')
+        datos_cliente = _datos_cliente_persona(persona)
+        cliente_nombre = datos_cliente['cliente_nombre']
+        cliente_tipo_documento = datos_cliente['cliente_tipo_documento']
+        cliente_numero_documento = datos_cliente['cliente_numero_documento']
+        cliente_direccion = datos_cliente['cliente_direccion']
+        cliente_telefono = datos_cliente['cliente_telefono']
+        cliente_email = datos_cliente['cliente_email']
 
     # NUEVO: Preparar datos de conversión de moneda
     datos_conversion = preparar_datos_factura_con_conversion(reserva)
@@ -2142,37 +2401,10 @@ def generar_factura_individual(
     )
 
     # --- 🔹 Detalle principal ---
-    paquete = reserva.paquete
     precio_unitario_original = reserva.precio_unitario or Decimal('0')
-
-    # NUEVO: Convertir precio unitario a guaraníes si es necesario
-    precio_unitario = convertir_monto_a_guaranies(precio_unitario_original, datos_conversion)
-    subtotal = precio_unitario
-    porcentaje_iva = subtipo_impuesto.porcentaje or Decimal('10')
-
-    if porcentaje_iva == Decimal('0'):
-        monto_exenta = subtotal
-        monto_gravada_5 = Decimal('0')
-        monto_gravada_10 = Decimal('0')
-    elif porcentaje_iva == Decimal('5'):
-        monto_exenta = Decimal('0')
-        monto_gravada_5 = subtotal
-        monto_gravada_10 = Decimal('0')
-    else:
-        monto_exenta = Decimal('0')
-        monto_gravada_5 = Decimal('0')
-        monto_gravada_10 = subtotal
-
     DetalleFactura.objects.create(
         factura=factura,
-        numero_item=1,
-        descripcion=f"Paquete Turístico: {paquete.nombre}",
-        cantidad=1,  # ✅ Solo un pasajero
-        precio_unitario=precio_unitario,
-        monto_exenta=monto_exenta,
-        monto_gravada_5=monto_gravada_5,
-        monto_gravada_10=monto_gravada_10,
-        subtotal=subtotal
+        **_datos_detalle_factura_individual(reserva, subtipo_impuesto, datos_conversion)
     )
 
     factura.calcular_totales()
@@ -2457,13 +2689,24 @@ def generar_factura_cancelacion(
 
 
 @transaction.atomic
-def generar_todas_facturas_pasajeros(reserva, subtipo_impuesto_id=None):
+def generar_todas_facturas_pasajeros(reserva, subtipo_impuesto_id=None, punto_expedicion_id=None):
     """
     Genera facturas individuales para todos los pasajeros que cumplan las condiciones.
 
+    Emisión en lote con el mismo resultado fiscal que generar_factura_individual()
+    (a nombre de cada pasajero):
+    - La configuración, el subtipo de impuesto, el punto de expedición y la
+      cotización se resuelven una sola vez.
+    - Las facturas existentes de la reserva se consultan una sola vez.
+    - Se reserva un bloque contiguo de números (reservar_correlativos).
+    - Facturas, detalles y conversiones se insertan con bulk_create, con los
+      totales ya calculados (FacturaElectronica.asignar_totales).
+    - Los PDFs se encolan al confirmar la transacción (apps.generacion_pdf).
+
     Args:
         reserva: Instancia de Reserva
         subtipo_impuesto_id: ID del subtipo de impuesto a aplicar (ej: IVA 10%)
+        punto_expedicion_id: ID del punto de expedición (de la caja abierta)
 
     Returns:
         dict: Diccionario con facturas generadas y pasajeros omitidos
@@ -2475,6 +2718,9 @@ def generar_todas_facturas_pasajeros(reserva, subtipo_impuesto_id=None):
     Raises:
         ValidationError: Si la reserva no está configurada para facturación individual
     """
+    from apps.generacion_pdf.services import solicitar_pdf
+    from apps.persona.models import PersonaJuridica
+
     # Verificar modalidad
     if reserva.modalidad_facturacion is None:
         raise ValidationError(
@@ -2490,24 +2736,143 @@ def generar_todas_facturas_pasajeros(reserva, subtipo_impuesto_id=None):
     facturas_generadas = []
     pasajeros_omitidos = []
 
-    # Iterar sobre todos los pasajeros
-    for pasajero in reserva.pasajeros.all():
+    def omitir(pasajero, error):
+        pasajeros_omitidos.append({
+            'pasajero_id': pasajero.id,
+            'pasajero_nombre': f"{pasajero.persona.nombre} {pasajero.persona.apellido}" if not pasajero.por_asignar else f"PENDIENTE_{pasajero.id}",
+            'razon': str(error)
+        })
+
+    pasajeros = list(
+        reserva.pasajeros.select_related('persona', 'persona__tipo_documento', 'ledger')
+    )
+
+    # --- Validaciones (facturas existentes consultadas una sola vez) ---
+    facturas_activas = reserva.facturas.filter(activo=True)
+    existe_factura_global = facturas_activas.filter(tipo_facturacion='total').exists()
+    pasajeros_facturados = set(
+        facturas_activas.filter(tipo_facturacion='por_pasajero').values_list('pasajero_id', flat=True)
+    )
+
+    a_facturar = []
+    for pasajero in pasajeros:
         try:
-            # Intentar generar factura
-            factura = generar_factura_individual(pasajero, subtipo_impuesto_id)
-            facturas_generadas.append({
-                'pasajero_id': pasajero.id,
-                'pasajero_nombre': f"{pasajero.persona.nombre} {pasajero.persona.apellido}",
-                'factura_numero': factura.numero_factura,
-                'monto': str(factura.total_general)
-            })
+            _validar_factura_individual(
+                reserva,
+                pasajero,
+                existe_factura_global=existe_factura_global,
+                pasajero_facturado=pasajero.id in pasajeros_facturados
+            )
         except ValidationError as e:
-            # Si falla, agregar a omitidos con la razón
-            pasajeros_omitidos.append({
-                'pasajero_id': pasajero.id,
-                'pasajero_nombre': f"{pasajero.persona.nombre} {pasajero.persona.apellido}" if not pasajero.por_asignar else f"PENDIENTE_{pasajero.id}",
-                'razon': str(e)
-            })
+            omitir(pasajero, e)
+        else:
+            a_facturar.append(pasajero)
+
+    if not a_facturar:
+        return {
+            'facturas_generadas': facturas_generadas,
+            'pasajeros_omitidos': pasajeros_omitidos
+        }
+
+    # --- Contexto compartido (una sola vez para todo el lote) ---
+    try:
+        configuracion, subtipo_impuesto, punto_expedicion = _contexto_factura_individual(
+            subtipo_impuesto_id, punto_expedicion_id
+        )
+        datos_conversion = preparar_datos_factura_con_conversion(reserva)
+    except ValidationError as e:
+        for pasajero in a_facturar:
+            omitir(pasajero, e)
+        return {
+            'facturas_generadas': facturas_generadas,
+            'pasajeros_omitidos': pasajeros_omitidos
+        }
+
+    # Todas las facturas individuales de la reserva tienen el mismo detalle
+    datos_detalle = _datos_detalle_factura_individual(reserva, subtipo_impuesto, datos_conversion)
+    requiere_conversion = datos_conversion['requiere_conversion']
+    precio_unitario_original = reserva.precio_unitario or Decimal('0')
+    personas_juridicas = set(
+        PersonaJuridica.objects.filter(
+            pk__in=[pasajero.persona_id for pasajero in a_facturar]
+        ).values_list('pk', flat=True)
+    )
+
+    # --- Bloque contiguo de números (el contador queda bloqueado hasta el commit) ---
+    correlativos = reservar_correlativos(
+        'factura', punto_expedicion, configuracion.timbrado, cantidad=len(a_facturar)
+    )
+    fecha_emision = timezone.now()
+
+    facturas = []
+    for pasajero, correlativo in zip(a_facturar, correlativos):
+        factura = FacturaElectronica(
+            empresa=configuracion.empresa,
+            establecimiento=configuracion.establecimiento,
+            punto_expedicion=punto_expedicion,
+            timbrado=configuracion.timbrado,
+            tipo_impuesto=configuracion.tipo_impuesto,
+            subtipo_impuesto=subtipo_impuesto,
+            reserva=reserva,
+            pasajero=pasajero,
+            tipo_facturacion='por_pasajero',
+            numero_factura=formatear_numero_documento(
+                configuracion.establecimiento.codigo, punto_expedicion.codigo, correlativo
+            ),
+            fecha_emision=fecha_emision,
+            es_configuracion=False,
+            condicion_venta='contado',
+            moneda=datos_conversion['moneda'],  # SIEMPRE PYG
+            moneda_original=datos_conversion['moneda_original'] if requiere_conversion else None,
+            tasa_conversion_aplicada=datos_conversion['tasa_conversion'] if requiere_conversion else None,
+            total_original=precio_unitario_original if requiere_conversion else None,
+            **_datos_cliente_persona(pasajero.persona, es_juridica=pasajero.persona_id in personas_juridicas)
+        )
+        # DetalleFactura.save() calcula el subtotal; bulk_create no pasa por save()
+        detalle = DetalleFactura(**datos_detalle)
+        detalle.subtotal = Decimal(str(detalle.cantidad)) * Decimal(str(detalle.precio_unitario))
+        factura.asignar_totales([detalle])
+        facturas.append((factura, detalle))
+
+    FacturaElectronica.objects.bulk_create([factura for factura, _ in facturas])
+    for factura, detalle in facturas:
+        detalle.factura = factura
+    DetalleFactura.objects.bulk_create([detalle for _, detalle in facturas])
+
+    if requiere_conversion:
+        # Registrar conversión en FacturaCotizacion para auditoría (registrar_conversion_factura)
+        FacturaCotizacion.objects.bulk_create([
+            FacturaCotizacion(
+                factura=factura,
+                cotizacion=datos_conversion['cotizacion'],
+                moneda_original=datos_conversion['moneda_original'],
+                monto_original=precio_unitario_original,
+                monto_convertido=convertir_monto_a_guaranies(precio_unitario_original, datos_conversion),
+                tasa_conversion=datos_conversion['tasa_conversion']
+            )
+            for factura, _ in facturas
+        ])
+
+    # Solo se encolan: renderizar una factura por pasajero retrasaría la respuesta
+    def encolar_pdfs():
+        for factura, _ in facturas:
+            try:
+                solicitar_pdf('factura', factura, solo_encolar=True)
+            except Exception as e:
+                # La factura ya está emitida; el PDF se genera al descargarla
+                import logging
+                logger = logging.getLogger(__name__)
+                logger.warning(f"No se pudo encolar PDF de la factura {factura.numero_factura}: {str(e)}")
+
+    transaction.on_commit(encolar_pdfs)
+
+    for factura, _ in facturas:
+        facturas_generadas.append({
+            'pasajero_id': factura.pasajero.id,
+            'pasajero_nombre': f"{factura.pasajero.persona.nombre} {factura.pasajero.persona.apellido}",
+            'factura_numero': factura.numero_factura,
+            'monto': str(factura.total_general)
+        })
 
     return {
         'facturas_generadas': facturas_generadas,
@@ -2675,33 +3040,25 @@ class NotaCreditoElectronica(models.Model):
 
     def save(self, *args, **kwargs):
         """Genera número de nota de crédito si no existe"""
-        if not self.pk and not self.numero_nota_credito:
-            self.numero_nota_credito = self.generar_numero_nota_credito()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if not self.pk and not self.numero_nota_credito:
+                self.numero_nota_credito = self.generar_numero_nota_credito()
+            super().save(*args, **kwargs)
+
+        # Las NC sobre facturas individuales descuentan del ledger del pasajero
+        if self.factura_afectada.pasajero_id:
+            from apps.reserva.services import recalcular_ledger_pasajero
+            recalcular_ledger_pasajero(self.factura_afectada.pasajero)
 
     def generar_numero_nota_credito(self):
         """
         Genera número correlativo INDEPENDIENTE de facturas: XXX-XXX-XXXXXXX
         Ej: 001-001-0000001 (primera NC del punto de expedición)
         """
-        ultima_nota = NotaCreditoElectronica.objects.filter(
-            establecimiento=self.establecimiento,
-            punto_expedicion=self.punto_expedicion
-        ).aggregate(max_num=Max('numero_nota_credito'))['max_num']
-
-        if ultima_nota:
-            try:
-                # Extraer el número correlativo (último segmento)
-                ultimo_numero = int(ultima_nota.split('-')[2])
-                nuevo_numero = ultimo_numero + 1
-            except:
-                nuevo_numero = 1
-        else:
-            nuevo_numero = 1
-
-        # Formato: XXX-XXX-XXXXXXX
-        correlativo_str = str(nuevo_numero).zfill(7)
-        return f"{self.establecimiento.codigo}-{self.punto_expedicion.codigo}-{correlativo_str}"
+        correlativo = reservar_correlativos('nota_credito', self.punto_expedicion, self.timbrado)[0]
+        return formatear_numero_documento(
+            self.establecimiento.codigo, self.punto_expedicion.codigo, correlativo
+        )
 
     def calcular_totales(self):
         """Calcula los totales sumando los detalles de la nota de crédito"""
@@ -3215,12 +3572,13 @@ def generar_nota_credito_total(factura_id, motivo, observaciones=''):
             detalle_factura_afectado=detalle_factura
         )
 
-    # Generar PDF
+    # Encolar PDF (lo genera el worker procesar_trabajos_pdf)
     try:
-        nota_credito.generar_pdf()
+        from apps.generacion_pdf.services import solicitar_pdf
+        solicitar_pdf('nota_credito', nota_credito)
     except Exception as e:
-        # No fallar si el PDF no se genera
-        print(f"Error generando PDF de NC: {e}")
+        # No fallar si el PDF no se encola
+        print(f"Error encolando PDF de NC: {e}")
 
     # ========================================
     # NUEVA FUNCIONALIDAD: Cancelar reserva y crear movimiento de caja
@@ -3446,11 +3804,12 @@ def generar_nota_credito_parcial(factura_id, items_a_acreditar, motivo, observac
     nota_credito.calcular_totales()
     nota_credito.save()
 
-    # Generar PDF
+    # Encolar PDF (lo genera el worker procesar_trabajos_pdf)
     try:
-        nota_credito.generar_pdf()
+        from apps.generacion_pdf.services import solicitar_pdf
+        solicitar_pdf('nota_credito', nota_credito)
     except Exception as e:
-        print(f"Error generando PDF de NC: {e}")
+        print(f"Error encolando PDF de NC: {e}")
 
     # ========================================
     # NUEVA FUNCIONALIDAD: Cancelar reserva y crear movimiento de caja
@@ -0,0 +1,153 @@
+"""
+Tests de la numeración correlativa de facturas (CorrelativoDocumento)
+
+Ejecutar tests:
+    python manage.py test apps.facturacion.tests_correlativos
+
+NOTA: El test de concurrencia requiere PostgreSQL (select_for_update real);
+en SQLite se omite automáticamente.
+"""
+
+import threading
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+
+from apps.facturacion.models import (
+    CorrelativoDocumento,
+    Empresa,
+    Establecimiento,
+    FacturaElectronica,
+    PuntoExpedicion,
+    Timbrado,
+    TipoImpuesto,
+    reservar_correlativos,
+)
+
+
+def crear_configuracion_facturacion(numero_hasta=None):
+    """Crea empresa, establecimiento, punto de expedición, timbrado e impuesto de prueba"""
+    empresa = Empresa.objects.create(ruc='80000000-1', nombre='Test Tours SA')
+    establecimiento = Establecimiento.objects.create(empresa=empresa, codigo='001', nombre='Central')
+    punto_expedicion = PuntoExpedicion.objects.create(
+        establecimiento=establecimiento, codigo='001', nombre='Caja 1'
+    )
+    timbrado = Timbrado.objects.create(
+        empresa=empresa,
+        numero='12345678',
+        inicio_vigencia=date(2025, 1, 1),
+        numero_hasta=numero_hasta
+    )
+    tipo_impuesto = TipoImpuesto.objects.create(nombre='IVA')
+    return empresa, establecimiento, punto_expedicion, timbrado, tipo_impuesto
+
+
+class CorrelativoFacturaTestCase(TestCase):
+    """Tests de numeración secuencial y rango del timbrado"""
+
+    def setUp(self):
+        (
+            self.empresa,
+            self.establecimiento,
+            self.punto_expedicion,
+            self.timbrado,
+            self.tipo_impuesto,
+        ) = crear_configuracion_facturacion(numero_hasta=3)
+
+    def _crear_factura(self):
+        return FacturaElectronica.objects.create(
+            empresa=self.empresa,
+            establecimiento=self.establecimiento,
+            punto_expedicion=self.punto_expedicion,
+            timbrado=self.timbrado,
+            tipo_impuesto=self.tipo_impuesto,
+        )
+
+    def test_numeracion_consecutiva(self):
+        """Las facturas reciben números consecutivos con formato XXX-XXX-XXXXXXX"""
+        numeros = [self._crear_factura().numero_factura for _ in range(3)]
+
+        self.assertEqual(numeros, ['001-001-0000001', '001-001-0000002', '001-001-0000003'])
+
+    def test_continua_numeracion_existente(self):
+        """El contador nuevo continúa desde el mayor número ya emitido"""
+        FacturaElectronica.objects.create(
+            empresa=self.empresa,
+            establecimiento=self.establecimiento,
+            punto_expedicion=self.punto_expedicion,
+            timbrado=self.timbrado,
+            tipo_impuesto=self.tipo_impuesto,
+            numero_factura='001-001-0000002',
+        )
+
+        self.assertEqual(self._crear_factura().numero_factura, '001-001-0000003')
+
+    def test_rango_timbrado_agotado(self):
+        """No se emiten números fuera del rango autorizado por el timbrado"""
+        for _ in range(3):
+            self._crear_factura()
+
+        with self.assertRaises(ValidationError):
+            self._crear_factura()
+
+        correlativo = CorrelativoDocumento.objects.get(tipo_documento='factura')
+        self.assertEqual(correlativo.ultimo_numero, 3)
+
+    def test_reserva_de_bloque(self):
+        """Un bloque reserva números contiguos y valida el rango completo"""
+        self.assertEqual(
+            list(reservar_correlativos('factura', self.punto_expedicion, self.timbrado, cantidad=2)),
+            [1, 2]
+        )
+        with self.assertRaises(ValidationError):
+            reservar_correlativos('factura', self.punto_expedicion, self.timbrado, cantidad=2)
+
+
+class CorrelativoFacturaConcurrenciaTestCase(TransactionTestCase):
+    """Stress test: emisión concurrente desde varios hilos sin duplicados ni huecos"""
+
+    HILOS = 8
+    FACTURAS_POR_HILO = 10
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_emision_concurrente_sin_duplicados_ni_huecos(self):
+        empresa, establecimiento, punto_expedicion, timbrado, tipo_impuesto = crear_configuracion_facturacion()
+        errores = []
+        barrera = threading.Barrier(self.HILOS)
+
+        def emitir():
+            try:
+                barrera.wait()
+                for _ in range(self.FACTURAS_POR_HILO):
+                    FacturaElectronica.objects.create(
+                        empresa=empresa,
+                        establecimiento=establecimiento,
+                        punto_expedicion=punto_expedicion,
+                        timbrado=timbrado,
+                        tipo_impuesto=tipo_impuesto,
+                    )
+            except Exception as e:
+                errores.append(e)
+            finally:
+                connections.close_all()
+
+        hilos = [threading.Thread(target=emitir) for _ in range(self.HILOS)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+
+        numeros = list(
+            FacturaElectronica.objects.filter(punto_expedicion=punto_expedicion)
+            .values_list('numero_factura', flat=True)
+        )
+        total = self.HILOS * self.FACTURAS_POR_HILO
+        correlativos = sorted(int(numero.split('-')[2]) for numero in numeros)
+
+        self.assertEqual(len(numeros), total)
+        self.assertEqual(len(set(numeros)), total)
+        self.assertEqual(correlativos, list(range(1, total + 1)))
@@ -0,0 +1,178 @@
+"""
+Tests de la facturación individual en lote (generar_todas_facturas_pasajeros).
+
+Test "golden": las facturas emitidas en lote deben ser fiscalmente idénticas a
+las que emite generar_factura_individual() pasajero por pasajero.
+
+Ejecutar tests:
+    python manage.py test apps.facturacion.tests_facturacion_lote
+"""
+
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.arqueo_caja.models import AperturaCaja, Caja
+from apps.empleado.models import Empleado
+from apps.facturacion.models import (
+    FacturaCotizacion,
+    FacturaElectronica,
+    SubtipoImpuesto,
+    generar_factura_individual,
+    generar_todas_facturas_pasajeros,
+    validar_factura_individual,
+)
+from apps.facturacion.tests_correlativos import crear_configuracion_facturacion
+from apps.generacion_pdf.models import TrabajoPDF
+from apps.moneda.models import CotizacionMoneda, Moneda
+from apps.paquete.tests_datos import DatosSalidaMixin
+from apps.puesto.models import Puesto
+from apps.reserva.models import Pasajero, PasajeroLedger, Reserva
+from apps.tipo_remuneracion.models import TipoRemuneracion
+
+
+CAMPOS_FACTURA = (
+    'empresa_id', 'establecimiento_id', 'punto_expedicion_id', 'timbrado_id',
+    'tipo_impuesto_id', 'subtipo_impuesto_id', 'tipo_facturacion', 'es_configuracion', 'activo',
+    'cliente_facturacion_id', 'cliente_tipo_documento', 'cliente_numero_documento', 'cliente_nombre',
+    'cliente_direccion', 'cliente_telefono', 'cliente_email', 'condicion_venta', 'fecha_vencimiento',
+    'moneda_id', 'moneda_original_id', 'total_original', 'tasa_conversion_aplicada',
+    'total_exenta', 'total_gravada_5', 'total_gravada_10', 'total_iva_5', 'total_iva_10',
+    'total_iva', 'total_general',
+)
+
+CAMPOS_DETALLE = (
+    'numero_item', 'descripcion', 'cantidad', 'precio_unitario',
+    'monto_exenta', 'monto_gravada_5', 'monto_gravada_10', 'subtotal',
+)
+
+CAMPOS_COTIZACION = ('cotizacion_id', 'moneda_original_id', 'monto_original', 'monto_convertido', 'tasa_conversion')
+
+
+class FacturacionLoteTestCase(DatosSalidaMixin, TestCase):
+    """La emisión en lote reproduce la emisión individual"""
+
+    COSTO_BASE = Decimal('1234.55')
+    SENIA = Decimal('100')
+    CUPO_ASIENTOS = 100
+    TIPO_HABITACION = ('Grupal', 10)
+    CUPO_HABITACIONES = 100
+
+    def setUp(self):
+        super().setUp()
+        empresa, establecimiento, self.punto_expedicion, timbrado, tipo_impuesto = crear_configuracion_facturacion()
+        subtipo = SubtipoImpuesto.objects.create(tipo_impuesto=tipo_impuesto, nombre='IVA 10%', porcentaje=Decimal('10'))
+        FacturaElectronica.objects.create(
+            empresa=empresa,
+            establecimiento=establecimiento,
+            timbrado=timbrado,
+            tipo_impuesto=tipo_impuesto,
+            subtipo_impuesto=subtipo,
+            es_configuracion=True
+        )
+        AperturaCaja.objects.create(
+            caja=Caja.objects.create(nombre='Caja Principal', punto_expedicion=self.punto_expedicion),
+            responsable=Empleado.objects.create(
+                persona=self._persona('9000'),
+                puesto=Puesto.objects.create(nombre='Cajero'),
+                tipo_remuneracion=TipoRemuneracion.objects.create(nombre='Fijo'),
+                salario=1
+            ),
+            monto_inicial=Decimal('0')
+        )
+
+        # Paquete en dólares: la factura se emite en guaraníes con conversión
+        Moneda.objects.create(nombre='Guaraní', codigo='PYG', simbolo='Gs')
+        CotizacionMoneda.objects.create(
+            moneda=self.moneda, valor_en_guaranies=Decimal('7312.37'), fecha_vigencia=timezone.now().date()
+        )
+        self.personas = [self.titular] + [self._persona(str(1000 + i)) for i in range(1, 4)]
+
+    def _reserva(self, pagados):
+        """Reserva confirmada con un pasajero por persona; los primeros `pagados` con pago completo"""
+        reserva = self._crear_reserva(len(self.personas))
+        Reserva.objects.filter(pk=reserva.pk).update(
+            estado='confirmada', modalidad_facturacion='individual', condicion_pago='contado'
+        )
+        reserva.refresh_from_db()
+        for i, persona in enumerate(self.personas):
+            pasajero = Pasajero.objects.create(
+                reserva=reserva, persona=persona, es_titular=i == 0, precio_asignado=Decimal('1234.55')
+            )
+            pagado = Decimal('1234.55') if i < pagados else Decimal('100')
+            PasajeroLedger.objects.update_or_create(
+                pasajero=pasajero,
+                defaults={'monto_pagado': pagado, 'saldo_pendiente': Decimal('1234.55') - pagado}
+            )
+        return reserva
+
+    def _salida_fiscal(self, reserva):
+        facturas = FacturaElectronica.objects.filter(reserva=reserva).order_by('numero_factura')
+        return [
+            {
+                'persona': factura.pasajero.persona_id,
+                'factura': {campo: getattr(factura, campo) for campo in CAMPOS_FACTURA},
+                'detalles': [
+                    {campo: getattr(detalle, campo) for campo in CAMPOS_DETALLE}
+                    for detalle in factura.detalles.all()
+                ],
+                'cotizacion': {
+                    campo: getattr(factura.conversion_moneda, campo) for campo in CAMPOS_COTIZACION
+                },
+            }
+            for factura in facturas
+        ]
+
+    def test_salida_fiscal_identica_a_la_emision_individual(self):
+        individual = self._reserva(pagados=3)
+        razones_individual = []
+        for pasajero in individual.pasajeros.order_by('id'):
+            try:
+                validar_factura_individual(individual, pasajero)
+            except Exception as e:
+                razones_individual.append(str(e))
+                continue
+            generar_factura_individual(individual, pasajero)
+
+        lote = self._reserva(pagados=3)
+        # Con la configuración por defecto (PDF_GENERACION_ASINCRONA=False) tampoco se renderiza
+        with mock.patch('apps.generacion_pdf.services.procesar_trabajo') as procesar_trabajo:
+            with self.captureOnCommitCallbacks(execute=True):
+                resultado = generar_todas_facturas_pasajeros(lote)
+        procesar_trabajo.assert_not_called()
+
+        self.assertEqual(self._salida_fiscal(lote), self._salida_fiscal(individual))
+        self.assertEqual(len(resultado['facturas_generadas']), 3)
+        self.assertEqual([p['razon'] for p in resultado['pasajeros_omitidos']], razones_individual)
+        self.assertEqual(FacturaCotizacion.objects.filter(factura__reserva=lote).count(), 3)
+
+        # Bloque contiguo a continuación de las facturas individuales
+        self.assertEqual(
+            [f['factura_numero'] for f in resultado['facturas_generadas']],
+            ['001-001-0000004', '001-001-0000005', '001-001-0000006']
+        )
+        # PDFs encolados al confirmar, sin renderizar en el request
+        self.assertEqual(TrabajoPDF.objects.filter(tipo_documento='factura', estado='pendiente').count(), 3)
+
+        # Una segunda emisión no duplica facturas
+        resultado = generar_todas_facturas_pasajeros(lote)
+        self.assertEqual(resultado['facturas_generadas'], [])
+        self.assertEqual(FacturaElectronica.objects.filter(reserva=lote).count(), 3)
+
+    def test_consultas_constantes(self):
+        self.personas += [self._persona(str(2000 + i)) for i in range(16)]
+        # La primera emisión crea el contador de correlativos y carga la cotización en caché
+        consultas = []
+        for cantidad in (1, 4, 20):
+            reserva = self._reserva(pagados=cantidad)
+            Pasajero.objects.filter(reserva=reserva, persona__in=self.personas[cantidad:]).delete()
+            with CaptureQueriesContext(connection) as contexto:
+                resultado = generar_todas_facturas_pasajeros(reserva)
+            self.assertEqual(len(resultado['facturas_generadas']), cantidad)
+            consultas.append(len(contexto))
+
+        self.assertEqual(consultas[1], consultas[2])
@@ -31,19 +31,23 @@ from .models import (
     generar_nota_credito_parcial
 )
 from apps.reserva.models import Reserva, Pasajero
+from apps.dashboard.paginacion import PaginacionCursorMixin
 from django.core.exceptions import ValidationError as DjangoValidationError
 
 
 # ---------- Paginación ----------
-class FacturacionPagination(PageNumberPagination):
+class FacturacionPagination(PaginacionCursorMixin, PageNumberPagination):
     """
     Paginación personalizada para el módulo de facturación.
+    Con ?cursor= pagina por keyset (ver apps/dashboard/paginacion.py).
     """
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
 
     def get_paginated_response(self, data):
+        if self.modo_cursor:
+            return self.get_respuesta_cursor(data)
         return Response({
             "totalItems": self.page.paginator.count,
             "pageSize": self.get_page_size(self.request),
@@ -142,6 +146,8 @@ class FacturaElectronicaViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend]
     filterset_class = FacturaElectronicaFilter
+    # Clave del modo ?cursor= (índice parcial fact_elec_emision_id_idx)
+    cursor_ordering = ('-fecha_emision', '-id')
 
     def get_serializer_class(self):
         """
@@ -225,57 +231,28 @@ class FacturaElectronicaViewSet(viewsets.ModelViewSet):
     def descargar_pdf(self, request, pk=None):
         """
         Descarga el PDF de una factura.
-        Si no existe, lo genera automáticamente.
+        Si no existe (o cambiaron sus datos) lo encola para generarlo en segundo plano
+        y responde 202 con poll_url (ver apps/generacion_pdf).
 
         GET /api/facturacion/facturas/{id}/descargar-pdf/
 
         Query params:
             - regenerar: true/false (default: false) - Fuerza la regeneración del PDF
         """
-        from django.http import FileResponse
-        import os
+        from apps.generacion_pdf.views import respuesta_pdf
 
         try:
             factura = self.get_object()
 
             regenerar = request.query_params.get('regenerar', 'false').lower() == 'true'
 
-            # Si no existe PDF o se solicita regenerar
-            if not factura.pdf_generado or regenerar:
-                try:
-                    print(f"Generando PDF para factura {factura.numero_factura}...")
-                    factura.generar_pdf()
-                    print(f"PDF generado exitosamente: {factura.pdf_generado.path}")
-                except Exception as e:
-                    return Response({
-                        "error": f"Error al generar PDF: {str(e)}"
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            # Verificar que el archivo físico existe
-            if not factura.pdf_generado:
-                return Response({
-                    "error": "No se pudo generar el PDF"
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            pdf_path = factura.pdf_generado.path
-            if not os.path.exists(pdf_path):
-                return Response({
-                    "error": "El archivo PDF no existe en el sistema de archivos"
-                }, status=status.HTTP_404_NOT_FOUND)
-
-            # Retornar el archivo PDF
-            try:
-                response = FileResponse(
-                    open(pdf_path, 'rb'),
-                    content_type='application/pdf'
-                )
-                filename = f'factura_{factura.numero_factura}.pdf'
-                response['Content-Disposition'] = f'attachment; filename="{filename}"'
-                return response
-            except Exception as e:
-                return Response({
-                    "error": f"Error al leer el archivo PDF: {str(e)}"
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return respuesta_pdf(
+                request,
+                'factura',
+                factura,
+                f'factura_{factura.numero_factura}.pdf',
+                regenerar=regenerar
+            )
 
         except Exception as e:
             return Response({
@@ -439,57 +416,28 @@ class NotaCreditoElectronicaViewSet(viewsets.ModelViewSet):
     def descargar_pdf(self, request, pk=None):
         """
         Descarga el PDF de una nota de crédito.
-        Si no existe, lo genera automáticamente.
+        Si no existe (o cambiaron sus datos) lo encola para generarlo en segundo plano
+        y responde 202 con poll_url (ver apps/generacion_pdf).
 
         GET /api/facturacion/notas-credito/{id}/descargar-pdf/
 
         Query params:
             - regenerar: true/false (default: false) - Fuerza la regeneración del PDF
         """
-        from django.http import FileResponse
-        import os
+        from apps.generacion_pdf.views import respuesta_pdf
 
         try:
             nota_credito = self.get_object()
 
             regenerar = request.query_params.get('regenerar', 'false').lower() == 'true'
 
-            # Si no existe PDF o se solicita regenerar
-            if not nota_credito.pdf_generado or regenerar:
-                try:
-                    print(f"Generando PDF para nota de crédito {nota_credito.numero_nota_credito}...")
-                    nota_credito.generar_pdf()
-                    print(f"PDF generado exitosamente: {nota_credito.pdf_generado.path}")
-                except Exception as e:
-                    return Response({
-                        "error": f"Error al generar PDF: {str(e)}"
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            # Verificar que el archivo físico existe
-            if not nota_credito.pdf_generado:
-                return Response({
-                    "error": "No se pudo generar el PDF"
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            pdf_path = nota_credito.pdf_generado.path
-            if not os.path.exists(pdf_path):
-                return Response({
-                    "error": "El archivo PDF no existe en el sistema de archivos"
-                }, status=status.HTTP_404_NOT_FOUND)
-
-            # Retornar el archivo PDF
-            try:
-                response = FileResponse(
-                    open(pdf_path, 'rb'),
-                    content_type='application/pdf'
-                )
-                filename = f'nota_credito_{nota_credito.numero_nota_credito}.pdf'
-                response['Content-Disposition'] = f'attachment; filename="{filename}"'
-                return response
-            except Exception as e:
-                return Response({
-                    "error": f"Error al leer el archivo PDF: {str(e)}"
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return respuesta_pdf(
+                request,
+                'nota_credito',
+                nota_credito,
+                f'nota_credito_{nota_credito.numero_nota_credito}.pdf',
+                regenerar=regenerar
+            )
 
         except Exception as e:
             return Response({
@@ -855,13 +803,19 @@ def generar_todas_facturas_pasajeros_view(request, reserva_id):
 
     Body (opcional):
         - subtipo_impuesto_id: ID del subtipo de impuesto a aplicar
+        - punto_expedicion_id: ID del punto de expedición (de la caja abierta)
     """
     try:
         reserva = get_object_or_404(Reserva, id=reserva_id, activo=True)
         subtipo_impuesto_id = request.data.get('subtipo_impuesto_id', None)
+        punto_expedicion_id = request.data.get('punto_expedicion_id', None)
 
-        # Generar todas las facturas posibles
-        resultado = generar_todas_facturas_pasajeros(reserva, subtipo_impuesto_id)
+        # Generar todas las facturas posibles (emisión en lote)
+        resultado = generar_todas_facturas_pasajeros(
+            reserva,
+            subtipo_impuesto_id,
+            punto_expedicion_id=punto_expedicion_id
+        )
 
         mensaje = f"Se generaron {len(resultado['facturas_generadas'])} facturas exitosamente"
         if resultado['pasajeros_omitidos']:
@@ -978,58 +932,28 @@ def facturas_pasajero(request, pasajero_id):
 def descargar_pdf_factura(request, factura_id):
     """
     Descarga el PDF de una factura.
-    Si no existe, lo genera automáticamente.
+    Si no existe (o cambiaron sus datos) lo encola para generarlo en segundo plano
+    y responde 202 con poll_url (ver apps/generacion_pdf).
 
     GET /api/facturacion/descargar-pdf/{factura_id}/
 
     Query params:
         - regenerar: true/false (default: false) - Fuerza la regeneración del PDF
     """
-    from django.http import FileResponse
-    import os
+    from apps.generacion_pdf.views import respuesta_pdf
 
     try:
         factura = get_object_or_404(FacturaElectronica, id=factura_id, es_configuracion=False)
 
         regenerar = request.query_params.get('regenerar', 'false').lower() == 'true'
 
-        # Si no existe PDF o se solicita regenerar
-        if not factura.pdf_generado or regenerar:
-            try:
-                print(f"Generando PDF para factura {factura.numero_factura}...")
-                factura.generar_pdf()
-                print(f"PDF generado exitosamente: {factura.pdf_generado.path}")
-
-            except Exception as e:
-                return Response({
-                    "error": f"Error al generar PDF: {str(e)}"
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # Verificar que el archivo físico existe
-        if not factura.pdf_generado:
-            return Response({
-                "error": "No se pudo generar el PDF"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        pdf_path = factura.pdf_generado.path
-        if not os.path.exists(pdf_path):
-            return Response({
-                "error": "El archivo PDF no existe en el sistema de archivos"
-            }, status=status.HTTP_404_NOT_FOUND)
-
-        # Retornar el archivo PDF
-        try:
-            response = FileResponse(
-                open(pdf_path, 'rb'),
-                content_type='application/pdf'
-            )
-            filename = f'factura_{factura.numero_factura}.pdf'
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
-        except Exception as e:
-            return Response({
-                "error": f"Error al leer el archivo PDF: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return respuesta_pdf(
+            request,
+            'factura',
+            factura,
+            f'factura_{factura.numero_factura}.pdf',
+            regenerar=regenerar
+        )
 
     except Exception as e:
         return Response({
@@ -1319,58 +1243,28 @@ def notas_credito_de_factura(request, factura_id):
 def descargar_pdf_nota_credito(request, nota_credito_id):
     """
     Descarga el PDF de una nota de crédito.
-    Si no existe, lo genera automáticamente.
+    Si no existe (o cambiaron sus datos) lo encola para generarlo en segundo plano
+    y responde 202 con poll_url (ver apps/generacion_pdf).
 
     GET /api/facturacion/descargar-pdf-nota-credito/{nota_credito_id}/
 
     Query params:
         - regenerar: true/false (default: false) - Fuerza la regeneración del PDF
     """
-    from django.http import FileResponse
-    import os
+    from apps.generacion_pdf.views import respuesta_pdf
 
     try:
         nota_credito = get_object_or_404(NotaCreditoElectronica, id=nota_credito_id, activo=True)
 
         regenerar = request.query_params.get('regenerar', 'false').lower() == 'true'
 
-        # Si no existe PDF o se solicita regenerar
-        if not nota_credito.pdf_generado or regenerar:
-            try:
-                print(f"Generando PDF para nota de crédito {nota_credito.numero_nota_credito}...")
-                nota_credito.generar_pdf()
-                print(f"PDF generado exitosamente: {nota_credito.pdf_generado.path}")
-
-            except Exception as e:
-                return Response({
-                    "error": f"Error al generar PDF: {str(e)}"
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # Verificar que el archivo físico existe
-        if not nota_credito.pdf_generado:
-            return Response({
-                "error": "No se pudo generar el PDF"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        pdf_path = nota_credito.pdf_generado.path
-        if not os.path.exists(pdf_path):
-            return Response({
-                "error": "El archivo PDF no existe en el sistema de archivos"
-            }, status=status.HTTP_404_NOT_FOUND)
-
-        # Retornar el archivo PDF
-        try:
-            response = FileResponse(
-                open(pdf_path, 'rb'),
-                content_type='application/pdf'
-            )
-            filename = f'nota_credito_{nota_credito.numero_nota_credito}.pdf'
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
-        except Exception as e:
-            return Response({
-                "error": f"Error al leer el archivo PDF: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return respuesta_pdf(
+            request,
+            'nota_credito',
+            nota_credito,
+            f'nota_credito_{nota_credito.numero_nota_credito}.pdf',
+            regenerar=regenerar
+        )
 
     except Exception as e:
         return Response({
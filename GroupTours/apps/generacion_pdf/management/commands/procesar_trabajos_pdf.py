@@ -0,0 +1,129 @@
+"""
+Worker de la cola de generación de PDFs (TrabajoPDF).
+
+Toma trabajos pendientes de la base de datos y los renderiza con un pool de
+hilos local. No requiere broker externo: se pueden correr varios workers en
+paralelo (los trabajos se reparten con select_for_update(skip_locked=True)).
+
+Uso:
+    python manage.py procesar_trabajos_pdf
+
+Opciones:
+    --hilos N : Cantidad de hilos de renderizado (default: 2)
+    --lote N : Trabajos tomados por vuelta (default: 10)
+    --intervalo S : Segundos de espera cuando la cola está vacía (default: 2)
+    --una-vez : Procesa los trabajos pendientes y termina
+"""
+
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.generacion_pdf.services import (
+    liberar_trabajos_colgados,
+    procesar_trabajo,
+    tomar_trabajos,
+)
+
+
+def _procesar_en_hilo(trabajo, worker):
+    try:
+        return procesar_trabajo(trabajo, worker=worker)
+    finally:
+        # Cada hilo abre su propia conexión: cerrarla al terminar el trabajo
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Procesa la cola de generación de PDFs (facturas, notas de crédito, comprobantes, vouchers y cierres)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hilos',
+            type=int,
+            default=2,
+            help='Cantidad de hilos de renderizado',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=10,
+            help='Cantidad de trabajos tomados por vuelta',
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=2,
+            help='Segundos de espera cuando no hay trabajos pendientes',
+        )
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help='Procesar los trabajos pendientes y terminar',
+        )
+
+    def handle(self, *args, **options):
+        hilos = max(1, options['hilos'])
+        lote = max(1, options['lote'])
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+
+        # Banner
+        self.stdout.write(self.style.MIGRATE_HEADING('\n' + '='*70))
+        self.stdout.write(self.style.MIGRATE_HEADING('  WORKER DE GENERACION DE PDFs'))
+        self.stdout.write(self.style.MIGRATE_HEADING('='*70 + '\n'))
+        self.stdout.write(f'Worker: {worker} | Hilos: {hilos} | Lote: {lote}\n')
+
+        completados = 0
+        con_error = 0
+
+        # Con un solo hilo se procesa en el hilo principal (sin pool)
+        pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='pdf') if hilos > 1 else None
+
+        try:
+            while True:
+                liberados = liberar_trabajos_colgados()
+                if liberados:
+                    self.stdout.write(self.style.WARNING(f'[!] {liberados} trabajo(s) colgados devueltos a la cola'))
+
+                trabajos = tomar_trabajos(lote, worker)
+                if not trabajos:
+                    if options['una_vez']:
+                        break
+                    time.sleep(options['intervalo'])
+                    continue
+
+                if pool:
+                    procesados = pool.map(lambda t: _procesar_en_hilo(t, worker), trabajos)
+                else:
+                    procesados = (procesar_trabajo(t, worker=worker) for t in trabajos)
+
+                for trabajo in procesados:
+                    descripcion = f'{trabajo.get_tipo_documento_display()} #{trabajo.objeto_id}'
+                    if trabajo.estado == 'completado':
+                        completados += 1
+                        self.stdout.write(self.style.SUCCESS(f'  [OK] {descripcion}'))
+                    else:
+                        con_error += 1
+                        self.stdout.write(self.style.ERROR(
+                            f'  [ERROR] {descripcion} (intento {trabajo.intentos}): {trabajo.error}'
+                        ))
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('\n[!] Worker detenido'))
+        finally:
+            if pool:
+                pool.shutdown(wait=True)
+
+        # Resumen final
+        self.stdout.write('\n' + '='*70)
+        self.stdout.write(self.style.MIGRATE_HEADING('  RESUMEN'))
+        self.stdout.write('='*70 + '\n')
+
+        self.stdout.write(self.style.SUCCESS(f'[OK] PDFs generados: {completados}'))
+        if con_error:
+            self.stdout.write(self.style.ERROR(f'[ERROR] Trabajos con error: {con_error}'))
+
+        self.stdout.write('')
@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrabajoPDF',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_documento', models.CharField(choices=[('factura', 'Factura Electrónica'), ('nota_credito', 'Nota de Crédito Electrónica'), ('comprobante', 'Comprobante de Pago'), ('voucher', 'Voucher'), ('cierre_caja', 'Cierre de Caja')], help_text='Tipo de documento a generar', max_length=20)),
+                ('objeto_id', models.PositiveIntegerField(help_text='ID del documento (factura, nota de crédito, comprobante, voucher o cierre)')),
+                ('huella', models.CharField(help_text='SHA-256 de los datos del documento al momento de solicitar el PDF', max_length=64)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('completado', 'Completado'), ('error', 'Error')], default='pendiente', help_text='Estado del trabajo en la cola', max_length=20)),
+                ('intentos', models.PositiveIntegerField(default=0, help_text='Cantidad de veces que un worker tomó este trabajo')),
+                ('archivo', models.FileField(blank=True, help_text='PDF generado, solo para documentos sin campo pdf_generado propio (ej: cierres de caja)', null=True, upload_to='pdf_cache/')),
+                ('error', models.TextField(blank=True, help_text='Último error al generar el PDF', null=True)),
+                ('worker', models.CharField(blank=True, help_text='Identificador del worker que procesó el trabajo', max_length=100, null=True)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Trabajo de PDF',
+                'verbose_name_plural': 'Trabajos de PDF',
+                'db_table': 'TrabajoPDF',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='trabajopdf',
+            index=models.Index(fields=['estado', 'fecha_creacion'], name='trabajopdf_estado_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='trabajopdf',
+            unique_together={('tipo_documento', 'objeto_id', 'huella')},
+        ),
+    ]
@@ -0,0 +1,82 @@
+from django.db import models
+
+
+class TrabajoPDF(models.Model):
+    """
+    Cola de generación de PDFs (facturas, notas de crédito, comprobantes,
+    vouchers y cierres de caja) procesada por el comando `procesar_trabajos_pdf`.
+
+    Cada trabajo se identifica por (tipo_documento, objeto_id, huella): la
+    huella es un hash de los datos del documento, de modo que un documento
+    que no cambió nunca se vuelve a renderizar. Ver services.py.
+    """
+
+    TIPOS_DOCUMENTO = [
+        ("factura", "Factura Electrónica"),
+        ("nota_credito", "Nota de Crédito Electrónica"),
+        ("comprobante", "Comprobante de Pago"),
+        ("voucher", "Voucher"),
+        ("cierre_caja", "Cierre de Caja"),
+    ]
+
+    ESTADOS = [
+        ("pendiente", "Pendiente"),
+        ("procesando", "Procesando"),
+        ("completado", "Completado"),
+        ("error", "Error"),
+    ]
+
+    tipo_documento = models.CharField(
+        max_length=20,
+        choices=TIPOS_DOCUMENTO,
+        help_text="Tipo de documento a generar"
+    )
+    objeto_id = models.PositiveIntegerField(
+        help_text="ID del documento (factura, nota de crédito, comprobante, voucher o cierre)"
+    )
+    huella = models.CharField(
+        max_length=64,
+        help_text="SHA-256 de los datos del documento al momento de solicitar el PDF"
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=ESTADOS,
+        default="pendiente",
+        help_text="Estado del trabajo en la cola"
+    )
+    intentos = models.PositiveIntegerField(
+        default=0,
+        help_text="Cantidad de veces que un worker tomó este trabajo"
+    )
+    archivo = models.FileField(
+        upload_to="pdf_cache/",
+        null=True,
+        blank=True,
+        help_text="PDF generado, solo para documentos sin campo pdf_generado propio (ej: cierres de caja)"
+    )
+    error = models.TextField(
+        null=True,
+        blank=True,
+        help_text="Último error al generar el PDF"
+    )
+    worker = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        help_text="Identificador del worker que procesó el trabajo"
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_inicio = models.DateTimeField(null=True, blank=True)
+    fecha_fin = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Trabajo de PDF"
+        verbose_name_plural = "Trabajos de PDF"
+        db_table = "TrabajoPDF"
+        unique_together = ("tipo_documento", "objeto_id", "huella")
+        indexes = [
+            models.Index(fields=["estado", "fecha_creacion"], name="trabajopdf_estado_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_documento_display()} #{self.objeto_id} ({self.estado})"
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from .models import TrabajoPDF
+
+
+class TrabajoPDFSerializer(serializers.ModelSerializer):
+    tipo_documento_display = serializers.CharField(source='get_tipo_documento_display', read_only=True)
+
+    class Meta:
+        model = TrabajoPDF
+        fields = [
+            'id',
+            'tipo_documento',
+            'tipo_documento_display',
+            'objeto_id',
+            'estado',
+            'intentos',
+            'error',
+            'fecha_creacion',
+            'fecha_inicio',
+            'fecha_fin',
+        ]
+        read_only_fields = fields
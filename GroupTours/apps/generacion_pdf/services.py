@@ -0,0 +1,312 @@
+# apps/generacion_pdf/services.py
+"""
+Generación asíncrona de PDFs con caché por contenido.
+
+- solicitar_pdf(): calcula la huella (SHA-256) de los datos del documento y
+  devuelve el TrabajoPDF correspondiente. Si ya existe un trabajo completado
+  con la misma huella y su archivo sigue disponible, el PDF no se vuelve a
+  renderizar; si no, el trabajo queda pendiente para el worker.
+  Los procesos en bloque (facturación por lote, vouchers) usan
+  solo_encolar=True: solo crean o reutilizan el TrabajoPDF y el PDF se
+  renderiza en el worker o, sin worker, al descargarlo (respuesta_pdf).
+- tomar_trabajos() / procesar_trabajo(): usados por el comando
+  `procesar_trabajos_pdf` (pool de hilos local, sin broker externo; la cola
+  es la tabla TrabajoPDF y se reparte con select_for_update(skip_locked=True)).
+
+Settings opcionales:
+    PDF_GENERACION_ASINCRONA (bool, default False): con True el PDF queda
+        pendiente para el worker; con False se renderiza dentro del request.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import TrabajoPDF
+
+
+logger = logging.getLogger(__name__)
+
+# Incrementar al modificar el diseño de algún PDF para invalidar la caché
+VERSION_PLANTILLAS = 1
+
+# Reintentos antes de dejar un trabajo en estado 'error'
+MAX_INTENTOS = 3
+
+# Un trabajo 'procesando' por más tiempo se considera abandonado (worker caído)
+MINUTOS_TRABAJO_COLGADO = 10
+
+# tipo_documento -> modelo, relaciones que alimentan el PDF y campo donde el
+# modelo guarda su PDF (None: el archivo se guarda en TrabajoPDF.archivo)
+DOCUMENTOS_PDF = {
+    'factura': {
+        'modelo': 'facturacion.FacturaElectronica',
+        'relaciones': ('detalles',),
+        'campo_pdf': 'pdf_generado',
+    },
+    'nota_credito': {
+        'modelo': 'facturacion.NotaCreditoElectronica',
+        'relaciones': ('detalles',),
+        'campo_pdf': 'pdf_generado',
+    },
+    'comprobante': {
+        'modelo': 'comprobante.ComprobantePago',
+        'relaciones': ('distribuciones',),
+        'campo_pdf': 'pdf_generado',
+    },
+    'voucher': {
+        'modelo': 'comprobante.Voucher',
+        'relaciones': (
+            'pasajero', 'pasajero.persona', 'pasajero.ledger',
+            'pasajero.reserva', 'pasajero.reserva.salida',
+        ),
+        'campo_pdf': 'pdf_generado',
+    },
+    'cierre_caja': {
+        'modelo': 'arqueo_caja.CierreCaja',
+        'relaciones': ('apertura_caja', 'apertura_caja.movimientos'),
+        'campo_pdf': None,
+    },
+}
+
+
+def _config(tipo_documento):
+    try:
+        return DOCUMENTOS_PDF[tipo_documento]
+    except KeyError:
+        raise ValueError(f"Tipo de documento PDF no soportado: {tipo_documento}")
+
+
+def _valores_instancia(instancia):
+    """Valores de los campos concretos de una instancia (sin archivos ni timestamps auto)."""
+    valores = {}
+    for campo in instancia._meta.concrete_fields:
+        if isinstance(campo, models.FileField):
+            continue
+        if getattr(campo, 'auto_now', False):
+            continue
+        valores[campo.attname] = campo.value_from_object(instancia)
+    return valores
+
+
+def _resolver_relacion(instancia, ruta):
+    """Sigue una ruta 'a.b.c'; retorna una instancia, una lista de instancias o None."""
+    objeto = instancia
+    for nombre in ruta.split('.'):
+        try:
+            objeto = getattr(objeto, nombre)
+        except models.ObjectDoesNotExist:
+            return None
+        if objeto is None:
+            return None
+    if isinstance(objeto, models.Manager):
+        return list(objeto.order_by('pk'))
+    return objeto
+
+
+def calcular_huella(tipo_documento, documento):
+    """
+    Huella de los datos que alimentan el PDF de un documento.
+
+    Args:
+        tipo_documento (str): Clave de DOCUMENTOS_PDF
+        documento: Instancia del documento
+
+    Returns:
+        str: SHA-256 hexadecimal
+    """
+    datos = {
+        'version': VERSION_PLANTILLAS,
+        'tipo': tipo_documento,
+        'documento': _valores_instancia(documento),
+    }
+    for ruta in _config(tipo_documento)['relaciones']:
+        relacionado = _resolver_relacion(documento, ruta)
+        if isinstance(relacionado, list):
+            datos[ruta] = [_valores_instancia(obj) for obj in relacionado]
+        elif relacionado is not None:
+            datos[ruta] = _valores_instancia(relacionado)
+
+    serializado = json.dumps(datos, cls=DjangoJSONEncoder, sort_keys=True, default=str)
+    return hashlib.sha256(serializado.encode('utf-8')).hexdigest()
+
+
+def obtener_documento(trabajo):
+    """Instancia del documento al que corresponde un trabajo."""
+    modelo = django_apps.get_model(_config(trabajo.tipo_documento)['modelo'])
+    return modelo.objects.get(pk=trabajo.objeto_id)
+
+
+def _archivo_disponible(archivo):
+    return bool(archivo) and archivo.storage.exists(archivo.name)
+
+
+def trabajo_listo(trabajo, documento):
+    """
+    Indica si el PDF de un trabajo completado puede servirse tal cual.
+
+    Para documentos con pdf_generado propio además verifica que el archivo
+    actual del documento sea el que generó este trabajo (el archivo se
+    sobrescribe al renderizar una versión posterior).
+    """
+    if trabajo.estado != 'completado' or not _archivo_disponible(trabajo.archivo):
+        return False
+    campo_pdf = _config(trabajo.tipo_documento)['campo_pdf']
+    if campo_pdf:
+        return getattr(documento, campo_pdf).name == trabajo.archivo.name
+    return True
+
+
+def solicitar_pdf(tipo_documento, documento, regenerar=False, solo_encolar=False):
+    """
+    Obtiene (o encola) el PDF de un documento.
+
+    Args:
+        tipo_documento (str): Clave de DOCUMENTOS_PDF
+        documento: Instancia del documento (se recarga desde la base de datos)
+        regenerar (bool): Fuerza un nuevo renderizado aunque la huella no haya cambiado
+        solo_encolar (bool): No renderizar en el proceso actual aunque
+            PDF_GENERACION_ASINCRONA sea False; el trabajo queda pendiente
+
+    Returns:
+        TrabajoPDF: Trabajo 'completado' (usar trabajo_listo() para servirlo),
+                    'pendiente'/'procesando' o 'error'
+    """
+    config = _config(tipo_documento)
+
+    # La huella se calcula con los valores guardados (los mismos que verá el worker)
+    documento.refresh_from_db()
+    huella = calcular_huella(tipo_documento, documento)
+
+    trabajo, creado = TrabajoPDF.objects.get_or_create(
+        tipo_documento=tipo_documento,
+        objeto_id=documento.pk,
+        huella=huella,
+    )
+
+    if creado and not regenerar and config['campo_pdf']:
+        # PDF generado antes de la cola: se adopta si es el único registro del documento
+        archivo = getattr(documento, config['campo_pdf'])
+        otros = TrabajoPDF.objects.filter(
+            tipo_documento=tipo_documento, objeto_id=documento.pk
+        ).exclude(pk=trabajo.pk)
+        if _archivo_disponible(archivo) and not otros.exists():
+            trabajo.archivo.name = archivo.name
+            trabajo.estado = 'completado'
+            trabajo.fecha_fin = timezone.now()
+            trabajo.save(update_fields=['archivo', 'estado', 'fecha_fin'])
+            return trabajo
+
+    if trabajo.estado == 'completado':
+        reencolar = regenerar or not trabajo_listo(trabajo, documento)
+    else:
+        reencolar = trabajo.estado == 'error' and regenerar
+    if reencolar:
+        trabajo.estado = 'pendiente'
+        trabajo.intentos = 0
+        trabajo.error = None
+        trabajo.save(update_fields=['estado', 'intentos', 'error'])
+
+    if (trabajo.estado == 'pendiente' and not solo_encolar
+            and not getattr(settings, 'PDF_GENERACION_ASINCRONA', False)):
+        procesar_trabajo(trabajo, worker='sincrono')
+        if config['campo_pdf']:
+            documento.refresh_from_db(fields=[config['campo_pdf']])
+
+    return trabajo
+
+
+def liberar_trabajos_colgados():
+    """
+    Devuelve a 'pendiente' los trabajos que quedaron 'procesando' por más de
+    MINUTOS_TRABAJO_COLGADO (worker interrumpido).
+
+    Returns:
+        int: Cantidad de trabajos liberados
+    """
+    limite = timezone.now() - timedelta(minutes=MINUTOS_TRABAJO_COLGADO)
+    return TrabajoPDF.objects.filter(
+        estado='procesando', fecha_inicio__lt=limite
+    ).update(estado='pendiente')
+
+
+def tomar_trabajos(cantidad, worker):
+    """
+    Reserva hasta `cantidad` trabajos pendientes para un worker.
+
+    Los trabajos se bloquean con skip_locked, por lo que varios workers
+    (procesos o servidores) pueden consumir la misma cola sin repetir trabajos.
+
+    Returns:
+        list[TrabajoPDF]: Trabajos marcados como 'procesando'
+    """
+    with transaction.atomic():
+        ids = list(
+            TrabajoPDF.objects.select_for_update(skip_locked=True)
+            .filter(estado='pendiente')
+            .order_by('fecha_creacion')
+            .values_list('id', flat=True)[:cantidad]
+        )
+        TrabajoPDF.objects.filter(id__in=ids).update(
+            estado='procesando',
+            worker=worker,
+            fecha_inicio=timezone.now(),
+            intentos=F('intentos') + 1,
+        )
+    return list(TrabajoPDF.objects.filter(id__in=ids).order_by('fecha_creacion'))
+
+
+def procesar_trabajo(trabajo, worker=None):
+    """
+    Renderiza el PDF de un trabajo y registra el resultado.
+
+    Args:
+        trabajo (TrabajoPDF): Trabajo a procesar
+        worker (str): Identificador del worker (opcional)
+
+    Returns:
+        TrabajoPDF: El trabajo con estado 'completado', 'pendiente' (reintento) o 'error'
+    """
+    config = _config(trabajo.tipo_documento)
+    if worker:
+        trabajo.worker = worker
+    if trabajo.estado == 'pendiente':
+        # Procesamiento sincrónico (sin pasar por tomar_trabajos)
+        trabajo.fecha_inicio = timezone.now()
+        trabajo.intentos += 1
+
+    try:
+        documento = obtener_documento(trabajo)
+        campo_pdf = config['campo_pdf']
+        if campo_pdf:
+            documento.generar_pdf()
+            nombre = getattr(documento, campo_pdf).name
+            # Guardar solo el archivo, sin disparar la lógica de save() del documento
+            type(documento).objects.filter(pk=documento.pk).update(**{campo_pdf: nombre})
+            trabajo.archivo.name = nombre
+        else:
+            buffer = documento.generar_pdf()
+            trabajo.archivo.save(
+                f'{trabajo.tipo_documento}_{trabajo.huella[:16]}.pdf',
+                ContentFile(buffer.getvalue()),
+                save=False
+            )
+    except Exception as e:
+        logger.exception("Error generando PDF %s #%s", trabajo.tipo_documento, trabajo.objeto_id)
+        trabajo.error = str(e)
+        trabajo.estado = 'error' if trabajo.intentos >= MAX_INTENTOS else 'pendiente'
+    else:
+        trabajo.error = None
+        trabajo.estado = 'completado'
+
+    trabajo.fecha_fin = timezone.now()
+    trabajo.save()
+    return trabajo
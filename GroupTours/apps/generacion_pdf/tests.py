@@ -0,0 +1,123 @@
+"""
+Tests de la cola de generación de PDFs (TrabajoPDF)
+
+Ejecutar tests:
+    python manage.py test apps.generacion_pdf.tests
+"""
+
+import shutil
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.arqueo_caja.models import AperturaCaja, Caja, CierreCaja
+from apps.empleado.models import Empleado
+from apps.facturacion.models import Empresa, Establecimiento, PuntoExpedicion
+from apps.generacion_pdf.models import TrabajoPDF
+from apps.nacionalidad.models import Nacionalidad
+from apps.persona.models import PersonaFisica
+from apps.puesto.models import Puesto
+from apps.tipo_documento.models import TipoDocumento
+from apps.tipo_remuneracion.models import TipoRemuneracion
+
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL, PDF_GENERACION_ASINCRONA=True)
+class GeneracionPdfCierreTestCase(TestCase):
+    """Descarga del PDF de un cierre de caja a través de la cola"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def setUp(self):
+        empresa = Empresa.objects.create(ruc='80000000-1', nombre='Test Tours SA')
+        establecimiento = Establecimiento.objects.create(empresa=empresa, codigo='001', nombre='Central')
+        punto_expedicion = PuntoExpedicion.objects.create(
+            establecimiento=establecimiento, codigo='001', nombre='Caja 1'
+        )
+        persona = PersonaFisica.objects.create(
+            tipo_documento=TipoDocumento.objects.create(nombre='CI'),
+            documento='1000',
+            email='cajero@test.com',
+            telefono='0981000000',
+            nombre='Cajero',
+            apellido='Test',
+            nacionalidad=Nacionalidad.objects.create(nombre='Paraguay', codigo_alpha2='PY')
+        )
+        empleado = Empleado.objects.create(
+            persona=persona,
+            puesto=Puesto.objects.create(nombre='Cajero'),
+            tipo_remuneracion=TipoRemuneracion.objects.create(nombre='Fijo'),
+            salario=1
+        )
+        caja = Caja.objects.create(punto_expedicion=punto_expedicion, nombre='Caja Principal')
+        apertura = AperturaCaja.objects.create(caja=caja, responsable=empleado, monto_inicial=Decimal('0'))
+        self.cierre = CierreCaja.objects.create(apertura_caja=apertura, saldo_real_efectivo=Decimal('0'))
+        self.url = f'/api/arqueo-caja/cierres/{self.cierre.pk}/pdf/'
+
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='pdf'))
+
+    def _procesar_cola(self):
+        call_command('procesar_trabajos_pdf', '--una-vez', '--hilos', '1', stdout=StringIO())
+
+    def test_pendiente_responde_202_y_luego_el_pdf(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['descarga_url'], self.url)
+        estado = self.client.get(response.data['poll_url']).data['estado']
+        self.assertEqual(estado, 'pendiente')
+
+        self._procesar_cola()
+
+        self.assertEqual(self.client.get(response.data['poll_url']).data['estado'], 'completado')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    def test_documento_sin_cambios_no_se_vuelve_a_renderizar(self):
+        self.client.get(self.url)
+        self._procesar_cola()
+        archivo = TrabajoPDF.objects.get().archivo.name
+
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(TrabajoPDF.objects.count(), 1)
+        self.assertEqual(TrabajoPDF.objects.get().archivo.name, archivo)
+
+    def test_cambio_de_datos_o_regenerar_encola_de_nuevo(self):
+        self.client.get(self.url)
+        self._procesar_cola()
+
+        CierreCaja.objects.filter(pk=self.cierre.pk).update(observaciones_cierre='Faltante revisado')
+        self.assertEqual(self.client.get(self.url).status_code, 202)
+        self.assertEqual(TrabajoPDF.objects.count(), 2)
+
+        self._procesar_cola()
+        self.assertEqual(self.client.get(f'{self.url}?regenerar=true').status_code, 202)
+        self.assertEqual(TrabajoPDF.objects.filter(estado='pendiente').count(), 1)
+
+    @override_settings(PDF_GENERACION_ASINCRONA=False)
+    def test_modo_sincronico(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    @override_settings(PDF_GENERACION_ASINCRONA=False)
+    def test_solo_encolar_no_renderiza_y_la_descarga_si(self):
+        from apps.generacion_pdf.services import solicitar_pdf
+
+        trabajo = solicitar_pdf('cierre_caja', self.cierre, solo_encolar=True)
+        self.assertEqual(trabajo.estado, 'pendiente')
+
+        # Sin worker, la descarga renderiza el trabajo ya encolado
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(TrabajoPDF.objects.get().estado, 'completado')
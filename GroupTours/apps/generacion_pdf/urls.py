@@ -0,0 +1,9 @@
+# apps/generacion_pdf/urls.py
+from rest_framework.routers import DefaultRouter
+from .views import TrabajoPDFViewSet
+
+router = DefaultRouter()
+
+router.register(r'trabajos', TrabajoPDFViewSet, basename='trabajo-pdf')
+
+urlpatterns = router.urls
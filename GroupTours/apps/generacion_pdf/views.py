@@ -0,0 +1,85 @@
+# apps/generacion_pdf/views.py
+from urllib.parse import urlencode
+
+from django.http import FileResponse
+from rest_framework import mixins, status, viewsets
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from .models import TrabajoPDF
+from .serializers import TrabajoPDFSerializer
+from .services import solicitar_pdf, trabajo_listo
+
+
+PARAMETROS_REGENERAR = ('regenerar', 'regenerar_pdf')
+
+
+def _url_descarga(request):
+    """URL del endpoint de descarga actual, sin los parámetros de regeneración."""
+    parametros = [
+        (clave, valor)
+        for clave, valores in request.GET.lists()
+        if clave not in PARAMETROS_REGENERAR
+        for valor in valores
+    ]
+    return request.path + (f'?{urlencode(parametros)}' if parametros else '')
+
+
+def respuesta_pdf(request, tipo_documento, documento, nombre_archivo, regenerar=False):
+    """
+    Respuesta estándar de los endpoints de descarga de PDF.
+
+    - PDF vigente (misma huella de datos): retorna el archivo.
+    - Generación pendiente: retorna 202 con la URL para consultar el trabajo
+      (poll_url) y la URL a la que volver cuando esté completado (descarga_url).
+    - Error en la generación: retorna 500 con el detalle.
+
+    Args:
+        request: Request de DRF
+        tipo_documento (str): Clave de DOCUMENTOS_PDF (ver services.py)
+        documento: Instancia del documento
+        nombre_archivo (str): Nombre del archivo descargado
+        regenerar (bool): Fuerza un nuevo renderizado
+
+    Returns:
+        FileResponse | Response
+    """
+    trabajo = solicitar_pdf(tipo_documento, documento, regenerar=regenerar)
+
+    if trabajo.estado == 'completado' and trabajo_listo(trabajo, documento):
+        response = FileResponse(trabajo.archivo.open('rb'), content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="{nombre_archivo}"'
+        return response
+
+    if trabajo.estado == 'error':
+        return Response(
+            {'error': f'Error al generar PDF: {trabajo.error}', 'trabajo_id': trabajo.id},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    poll_url = f'/api/documentos-pdf/trabajos/{trabajo.id}/'
+    response = Response({
+        'mensaje': 'El PDF se está generando. Consulte poll_url y vuelva a descarga_url cuando esté completado.',
+        'trabajo_id': trabajo.id,
+        'estado': trabajo.estado,
+        'poll_url': poll_url,
+        'descarga_url': _url_descarga(request),
+    }, status=status.HTTP_202_ACCEPTED)
+    response['Location'] = poll_url
+    response['Retry-After'] = '2'
+    return response
+
+
+class TrabajoPDFViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Estado de los trabajos de generación de PDF.
+
+    Endpoints disponibles:
+    - GET /api/documentos-pdf/trabajos/{id}/ - Consultar estado (poll_url de las descargas)
+
+    Solo expone el estado del trabajo; el archivo se descarga desde el
+    endpoint original del documento, que aplica sus propios permisos.
+    """
+    queryset = TrabajoPDF.objects.all()
+    serializer_class = TrabajoPDFSerializer
+    permission_classes = [AllowAny]
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MonedaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.moneda'
+
+    def ready(self):
+        import apps.moneda.signals
@@ -92,7 +92,8 @@ class CotizacionMoneda(models.Model):
         Si no se proporciona fecha, usa la fecha actual.
 
         La cotización vigente es la más reciente cuya fecha_vigencia
-        sea menor o igual a la fecha consultada.
+        sea menor o igual a la fecha consultada. Se resuelve desde la caché
+        de cotizaciones del proceso (apps.moneda.services).
 
         Args:
             moneda: Moneda - Moneda a consultar
@@ -102,15 +103,9 @@ class CotizacionMoneda(models.Model):
         Returns:
             CotizacionMoneda o None si no hay cotización disponible
         """
-        from django.utils import timezone
-
-        if fecha is None:
-            fecha = timezone.now().date()
+        from .services import obtener_cotizacion_vigente
 
-        return cls.objects.filter(
-            moneda=moneda,
-            fecha_vigencia__lte=fecha  # Menor o igual a la fecha consultada
-        ).order_by('-fecha_vigencia').first()  # La más reciente
+        return obtener_cotizacion_vigente(moneda, fecha)
 
     @classmethod
     def convertir_a_guaranies(cls, monto, moneda, fecha=None):
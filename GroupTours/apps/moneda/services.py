@@ -0,0 +1,157 @@
+# apps/moneda/services.py
+"""
+Caché de cotizaciones en memoria del proceso.
+
+Las cotizaciones de cada moneda se cargan una sola vez (una consulta) y se
+mantienen como una lista de fechas ordenada; la cotización vigente para una
+fecha se resuelve con búsqueda binaria (bisect) sin volver a la base de datos.
+
+La caché se invalida al confirmar la transacción en que cambian cotizaciones
+o monedas (señales post_save/post_delete, ver signals.py). Como la caché es
+por proceso, además expira luego de TTL_CACHE_SEGUNDOS para que otros workers
+tomen cotizaciones nuevas.
+"""
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.utils import timezone
+
+
+# Tiempo máximo (segundos) que una tabla de cotizaciones se considera vigente
+TTL_CACHE_SEGUNDOS = 300
+
+_lock = threading.Lock()
+_tablas = {}    # moneda_id -> (cargada_en, [fechas], [cotizaciones])
+_monedas = {}   # codigo -> Moneda
+
+
+def invalidar_cache_cotizaciones(moneda_id=None):
+    """
+    Descarta la tabla de cotizaciones de una moneda (o de todas).
+
+    Args:
+        moneda_id: ID de la moneda a invalidar. Si es None, invalida todas.
+    """
+    with _lock:
+        if moneda_id is None:
+            _tablas.clear()
+        else:
+            _tablas.pop(moneda_id, None)
+
+
+def invalidar_cache_monedas():
+    """Descarta la caché de monedas por código."""
+    with _lock:
+        _monedas.clear()
+
+
+def obtener_moneda(codigo):
+    """
+    Obtiene una Moneda por código usando la caché del proceso.
+
+    Args:
+        codigo: Código de la moneda (ej: 'USD', 'PYG')
+
+    Returns:
+        Moneda
+
+    Raises:
+        Moneda.DoesNotExist si no existe
+    """
+    from .models import Moneda
+
+    moneda = _monedas.get(codigo)
+    if moneda is None:
+        moneda = Moneda.objects.get(codigo=codigo)
+        with _lock:
+            _monedas[codigo] = moneda
+    return moneda
+
+
+def _obtener_tabla(moneda_id):
+    """Retorna (fechas, cotizaciones) de la moneda, cargándolas si es necesario."""
+    from .models import CotizacionMoneda
+
+    tabla = _tablas.get(moneda_id)
+    if tabla is not None and time.monotonic() - tabla[0] < TTL_CACHE_SEGUNDOS:
+        return tabla[1], tabla[2]
+
+    cotizaciones = list(
+        CotizacionMoneda.objects.filter(moneda_id=moneda_id).order_by('fecha_vigencia')
+    )
+    fechas = [c.fecha_vigencia for c in cotizaciones]
+
+    with _lock:
+        _tablas[moneda_id] = (time.monotonic(), fechas, cotizaciones)
+    return fechas, cotizaciones
+
+
+def _normalizar_fecha(fecha):
+    if fecha is None:
+        return timezone.now().date()
+    if isinstance(fecha, datetime):
+        return fecha.date()
+    return fecha
+
+
+def obtener_cotizacion_vigente(moneda, fecha=None):
+    """
+    Cotización vigente para una moneda en una fecha: la más reciente cuya
+    fecha_vigencia sea menor o igual a la fecha consultada.
+
+    Args:
+        moneda: Moneda (o su ID)
+        fecha: date (opcional). Si es None, usa la fecha actual.
+
+    Returns:
+        CotizacionMoneda o None si no hay cotización disponible
+    """
+    moneda_id = getattr(moneda, 'pk', moneda)
+    fechas, cotizaciones = _obtener_tabla(moneda_id)
+
+    posicion = bisect_right(fechas, _normalizar_fecha(fecha))
+    return cotizaciones[posicion - 1] if posicion else None
+
+
+def convertir_lote(montos, moneda, fechas=None):
+    """
+    Convierte una lista de montos de una moneda a guaraníes con una sola
+    carga de cotizaciones.
+
+    Args:
+        montos: Iterable de montos (Decimal/int/float/str/None)
+        moneda: Moneda de origen de los montos
+        fechas: None (fecha actual para todos), una fecha para todos,
+                o una lista de fechas de igual longitud que montos
+
+    Returns:
+        list[Decimal | None]: Montos en guaraníes, en el mismo orden. Los montos
+        None y los que no tienen cotización vigente para su fecha quedan en None.
+    """
+    montos = list(montos)
+
+    if fechas is None or isinstance(fechas, (date, datetime)):
+        fechas = [fechas] * len(montos)
+    else:
+        fechas = list(fechas)
+        if len(fechas) != len(montos):
+            raise ValueError("La cantidad de fechas debe coincidir con la cantidad de montos")
+
+    if moneda.codigo == 'PYG':
+        return [Decimal(str(monto)) if monto is not None else None for monto in montos]
+
+    tabla_fechas, cotizaciones = _obtener_tabla(moneda.pk)
+
+    resultado = []
+    for monto, fecha in zip(montos, fechas):
+        posicion = bisect_right(tabla_fechas, _normalizar_fecha(fecha))
+        if monto is None or not posicion:
+            resultado.append(None)
+            continue
+        valor = Decimal(str(cotizaciones[posicion - 1].valor_en_guaranies))
+        resultado.append(Decimal(str(monto)) * valor)
+
+    return resultado
@@ -0,0 +1,36 @@
+# apps/moneda/signals.py
+"""
+Invalidación de la caché de cotizaciones (ver services.py) cuando cambian
+cotizaciones o monedas.
+
+La caché se descarta al confirmar la transacción: si se invalidara en el
+post_save, otra request podría recargarla antes del commit con los datos
+anteriores y dejarlos en caché hasta que expire el TTL.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Moneda, CotizacionMoneda
+from .services import invalidar_cache_cotizaciones, invalidar_cache_monedas
+
+
+@receiver(post_save, sender=CotizacionMoneda)
+@receiver(post_delete, sender=CotizacionMoneda)
+def invalidar_cotizaciones_moneda(sender, instance, using=None, **kwargs):
+    """Descarta la tabla de cotizaciones de la moneda modificada."""
+    moneda_id = instance.moneda_id
+    transaction.on_commit(lambda: invalidar_cache_cotizaciones(moneda_id), using=using)
+
+
+@receiver(post_save, sender=Moneda)
+@receiver(post_delete, sender=Moneda)
+def invalidar_moneda(sender, instance, using=None, **kwargs):
+    """Descarta la caché de monedas y las cotizaciones de la moneda modificada."""
+    moneda_id = instance.pk
+
+    def invalidar():
+        invalidar_cache_monedas()
+        invalidar_cache_cotizaciones(moneda_id)
+
+    transaction.on_commit(invalidar, using=using)
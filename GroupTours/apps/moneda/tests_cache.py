@@ -0,0 +1,132 @@
+"""
+Tests de la caché de cotizaciones (apps/moneda/services.py):
+- Cotización vigente por búsqueda binaria y conversión en lote
+- Expiración por TTL_CACHE_SEGUNDOS
+- Invalidación al confirmar la transacción (apps/moneda/signals.py)
+
+Ejecutar tests:
+    python manage.py test apps.moneda.tests_cache
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.moneda import services
+from apps.moneda.models import CotizacionMoneda, Moneda
+from apps.moneda.services import (
+    TTL_CACHE_SEGUNDOS,
+    convertir_lote,
+    invalidar_cache_cotizaciones,
+    invalidar_cache_monedas,
+    obtener_cotizacion_vigente,
+    obtener_moneda,
+)
+
+
+class CacheCotizacionesTestCase(TestCase):
+    """Cotizaciones de USD vigentes desde el 1/1, el 1/3 y el 1/6 de 2025"""
+
+    def setUp(self):
+        invalidar_cache_cotizaciones()
+        invalidar_cache_monedas()
+        self.moneda = Moneda.objects.create(nombre='Dólar', codigo='USD', simbolo='$')
+        self.pyg = Moneda.objects.create(nombre='Guaraní', codigo='PYG', simbolo='Gs')
+        for fecha, valor in ((date(2025, 1, 1), '7000'), (date(2025, 3, 1), '7300'), (date(2025, 6, 1), '7500')):
+            self._cotizacion(fecha, valor)
+
+    def _cotizacion(self, fecha, valor):
+        return CotizacionMoneda.objects.create(
+            moneda=self.moneda, fecha_vigencia=fecha, valor_en_guaranies=Decimal(valor)
+        )
+
+    def _valor(self, fecha):
+        cotizacion = obtener_cotizacion_vigente(self.moneda, fecha)
+        return cotizacion.valor_en_guaranies if cotizacion else None
+
+    def test_busqueda_binaria(self):
+        self.assertIsNone(self._valor(date(2024, 12, 31)))
+        self.assertEqual(self._valor(date(2025, 1, 1)), Decimal('7000'))
+        self.assertEqual(self._valor(date(2025, 2, 28)), Decimal('7000'))
+        self.assertEqual(self._valor(date(2025, 3, 1)), Decimal('7300'))
+        self.assertEqual(self._valor(datetime(2025, 5, 31, 23, 59)), Decimal('7300'))
+        self.assertEqual(self._valor(date(2030, 1, 1)), Decimal('7500'))
+
+    def test_una_consulta_por_moneda(self):
+        with self.assertNumQueries(1):
+            for mes in range(1, 13):
+                self._valor(date(2025, mes, 15))
+            obtener_cotizacion_vigente(self.moneda.pk, date(2025, 4, 1))
+
+    def test_convertir_lote(self):
+        self.assertEqual(
+            convertir_lote(
+                ['10', None, 2, '1.5'], self.moneda,
+                [date(2025, 2, 1), date(2025, 2, 1), date(2024, 1, 1), date(2025, 7, 1)]
+            ),
+            [Decimal('70000'), None, None, Decimal('11250')]
+        )
+        self.assertEqual(convertir_lote([3], self.moneda, date(2025, 3, 1)), [Decimal('21900')])
+        # PYG no consulta cotizaciones
+        with self.assertNumQueries(0):
+            self.assertEqual(convertir_lote([100, None], self.pyg), [Decimal('100'), None])
+
+        with self.assertRaises(ValueError):
+            convertir_lote([1, 2], self.moneda, [date(2025, 1, 1)])
+
+    def test_expira_por_ttl(self):
+        ahora = services.time.monotonic()
+        with mock.patch.object(services.time, 'monotonic', return_value=ahora):
+            self._valor(date(2025, 7, 1))
+        # Cambio sin señales (ej: otro worker): la tabla en caché sigue vigente
+        CotizacionMoneda.objects.filter(fecha_vigencia=date(2025, 6, 1)).update(valor_en_guaranies=Decimal('8000'))
+
+        with mock.patch.object(services.time, 'monotonic', return_value=ahora + TTL_CACHE_SEGUNDOS - 1):
+            with self.assertNumQueries(0):
+                self.assertEqual(self._valor(date(2025, 7, 1)), Decimal('7500'))
+
+        with mock.patch.object(services.time, 'monotonic', return_value=ahora + TTL_CACHE_SEGUNDOS):
+            with self.assertNumQueries(1):
+                self.assertEqual(self._valor(date(2025, 7, 1)), Decimal('8000'))
+
+    def test_invalidacion_al_confirmar(self):
+        self._valor(date(2025, 7, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cotizacion = self._cotizacion(date(2025, 7, 1), '7600')
+            # Antes del commit la tabla en caché no cambia
+            with self.assertNumQueries(0):
+                self.assertEqual(self._valor(date(2025, 7, 1)), Decimal('7500'))
+        self.assertEqual(self._valor(date(2025, 7, 1)), Decimal('7600'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cotizacion.delete()
+        self.assertEqual(self._valor(date(2025, 7, 1)), Decimal('7500'))
+
+    def test_cambios_revertidos_no_invalidan(self):
+        self._valor(date(2025, 7, 1))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self._cotizacion(date(2025, 7, 1), '7600')
+        # Sin commit (ej: la transacción se revierte) la caché se conserva
+        with self.assertNumQueries(0):
+            self._valor(date(2025, 7, 1))
+
+        for callback in callbacks:
+            callback()
+        with self.assertNumQueries(1):
+            self._valor(date(2025, 7, 1))
+
+    def test_invalidacion_de_moneda(self):
+        self.assertEqual(obtener_moneda('USD'), self.moneda)
+        self._valor(date(2025, 7, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.moneda.simbolo = 'US$'
+            self.moneda.save()
+
+        with self.assertNumQueries(2):
+            self.assertEqual(obtener_moneda('USD').simbolo, 'US$')
+            self._valor(date(2025, 7, 1))
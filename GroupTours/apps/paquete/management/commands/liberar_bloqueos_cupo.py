@@ -0,0 +1,24 @@
+"""
+Comando de Django para devolver a las salidas el cupo retenido por bloqueos
+(BloqueoCupo) vencidos. Pensado para ejecutarse periódicamente (cron); además
+los bloqueos vencidos de una salida se liberan al quedarse sin cupo.
+
+Uso:
+    python manage.py liberar_bloqueos_cupo
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.paquete.services import liberar_bloqueos_vencidos
+
+
+class Command(BaseCommand):
+    help = 'Libera los bloqueos de cupo vencidos y devuelve el cupo a las salidas'
+
+    def handle(self, *args, **options):
+        liberados = liberar_bloqueos_vencidos()
+
+        if liberados:
+            self.stdout.write(self.style.SUCCESS(f'[OK] Bloqueos de cupo vencidos liberados: {liberados}'))
+        else:
+            self.stdout.write('No hay bloqueos de cupo vencidos.')
@@ -0,0 +1,122 @@
+"""
+Comando de Django para reconstruir los contadores de ocupación de las salidas
+(SalidaPaquete.cupos_ocupados y reservas_activas) desde las reservas y
+reportar diferencias.
+
+Uso:
+    python manage.py recalcular_ocupacion_salidas
+
+Opciones:
+    --dry-run : Solo reporta las diferencias sin corregirlas
+    --salida CODIGO : Solo procesar una salida (ej: SAL-2026-0001)
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from apps.paquete.models import SalidaPaquete
+from apps.reserva.models import Reserva
+
+
+CAMPOS_OCUPACION = ['cupos_ocupados', 'reservas_activas']
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye los contadores de ocupación de las salidas y reporta diferencias (drift)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo reporta las diferencias sin aplicar cambios a la base de datos',
+        )
+        parser.add_argument(
+            '--salida',
+            type=str,
+            help='Código de salida a procesar (ej: SAL-2026-0001)',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        codigo_salida = options.get('salida')
+
+        # Banner
+        self.stdout.write(self.style.MIGRATE_HEADING('\n' + '='*70))
+        self.stdout.write(self.style.MIGRATE_HEADING('  RECALCULO DE OCUPACION DE SALIDAS'))
+        self.stdout.write(self.style.MIGRATE_HEADING('='*70 + '\n'))
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('[!] MODO DRY-RUN: No se aplicaran cambios\n'))
+
+        salidas = SalidaPaquete.objects.only('id', 'codigo', *CAMPOS_OCUPACION).order_by('id')
+        if codigo_salida:
+            salidas = salidas.filter(codigo=codigo_salida)
+            self.stdout.write(f'Filtrando por salida: {codigo_salida}\n')
+
+        # Valores esperados: una agregación sobre las reservas activas no canceladas
+        esperados = {
+            fila['salida_id']: fila
+            for fila in Reserva.objects.filter(
+                salida__in=salidas.values('pk'),
+                activo=True,
+            ).exclude(
+                estado='cancelada'
+            ).values('salida_id').annotate(
+                cupos_ocupados=Sum('cantidad_pasajeros'),
+                reservas_activas=Count('id'),
+            ).order_by()
+        }
+
+        with transaction.atomic():
+            salidas = list(salidas.select_for_update()) if not dry_run else list(salidas)
+            total = len(salidas)
+            self.stdout.write(f'Total de salidas a procesar: {total}\n')
+
+            a_actualizar = []
+            for salida in salidas:
+                esperado = esperados.get(salida.pk, {})
+                diferencias = [
+                    (campo, getattr(salida, campo), esperado.get(campo) or 0)
+                    for campo in CAMPOS_OCUPACION
+                    if getattr(salida, campo) != (esperado.get(campo) or 0)
+                ]
+                if not diferencias:
+                    continue
+
+                self.stdout.write(self.style.WARNING(f'Salida {salida.codigo} (ID: {salida.pk}):'))
+                for campo, actual, correcto in diferencias:
+                    self.stdout.write(f'    {campo}: {actual} -> {correcto}')
+                    setattr(salida, campo, correcto)
+                a_actualizar.append(salida)
+
+            if not dry_run:
+                SalidaPaquete.objects.bulk_update(a_actualizar, CAMPOS_OCUPACION, batch_size=500)
+
+        # Resumen final
+        self.stdout.write('\n' + '='*70)
+        self.stdout.write(self.style.MIGRATE_HEADING('  RESUMEN'))
+        self.stdout.write('='*70 + '\n')
+
+        self.stdout.write(f'Total procesadas: {total}')
+        if a_actualizar:
+            self.stdout.write(self.style.ERROR(f'[DRIFT] Con diferencias: {len(a_actualizar)}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('[OK] Sin diferencias'))
+        self.stdout.write(f'  Sin cambios: {total - len(a_actualizar)}')
+
+        if dry_run and a_actualizar:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'\n[!] {len(a_actualizar)} salida(s) necesitan actualizacion. '
+                    'Ejecuta sin --dry-run para aplicar los cambios.'
+                )
+            )
+        elif a_actualizar:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'\n[OK] {len(a_actualizar)} salida(s) corregidas correctamente.'
+                )
+            )
+
+        self.stdout.write('')
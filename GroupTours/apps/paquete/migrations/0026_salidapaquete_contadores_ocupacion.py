@@ -0,0 +1,53 @@
+# Generated by Django 4.2 on 2026-10-17 12:05
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def calcular_contadores(apps, schema_editor):
+    SalidaPaquete = apps.get_model("paquete", "SalidaPaquete")
+    Reserva = apps.get_model("reserva", "Reserva")
+
+    totales = Reserva.objects.filter(
+        salida__isnull=False, activo=True
+    ).exclude(
+        estado="cancelada"
+    ).values("salida_id").annotate(
+        pasajeros=Sum("cantidad_pasajeros"),
+        reservas=Count("id"),
+    ).order_by()
+
+    actualizadas = 0
+    for fila in totales:
+        actualizadas += SalidaPaquete.objects.filter(pk=fila["salida_id"]).update(
+            cupos_ocupados=fila["pasajeros"] or 0,
+            reservas_activas=fila["reservas"],
+        )
+
+    print(f"\n  [0026] Salidas con contadores de ocupación: {actualizadas}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('paquete', '0025_remove_modalidad_habitacion_fija'),
+        ('reserva', '0021_pasajeroledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salidapaquete',
+            name='cupos_ocupados',
+            field=models.PositiveIntegerField(default=0, help_text='Pasajeros (cantidad_pasajeros) de las reservas activas no canceladas de la salida.'),
+        ),
+        migrations.AddField(
+            model_name='salidapaquete',
+            name='reservas_activas',
+            field=models.PositiveIntegerField(default=0, help_text='Cantidad de reservas activas no canceladas de la salida.'),
+        ),
+        migrations.AddIndex(
+            model_name='salidapaquete',
+            index=models.Index(fields=['activo', 'fecha_salida'], name='salida_activo_fecha_idx'),
+        ),
+        migrations.RunPython(calcular_contadores, migrations.RunPython.noop),
+    ]
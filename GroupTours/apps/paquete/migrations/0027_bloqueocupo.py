@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-17 12:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotel', '0016_alter_habitacion_moneda_nullable'),
+        ('paquete', '0026_salidapaquete_contadores_ocupacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BloqueoCupo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(editable=False, help_text='Identificador del bloqueo que se envía al crear la reserva', unique=True)),
+                ('habitaciones', models.PositiveIntegerField(default=1, help_text='Habitaciones retenidas (descontadas de CupoHabitacionSalida)')),
+                ('pasajeros', models.PositiveIntegerField(default=0, help_text='Asientos retenidos (descontados de SalidaPaquete.cupo)')),
+                ('estado', models.CharField(choices=[('activo', 'Activo'), ('consumido', 'Consumido por una reserva'), ('liberado', 'Liberado'), ('vencido', 'Vencido')], default='activo', max_length=20)),
+                ('fecha_expiracion', models.DateTimeField(help_text='Pasada esta fecha el cupo retenido se devuelve a la salida')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('habitacion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bloqueos_cupo', to='hotel.habitacion')),
+                ('salida', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bloqueos_cupo', to='paquete.salidapaquete')),
+            ],
+            options={
+                'verbose_name': 'Bloqueo de Cupo',
+                'verbose_name_plural': 'Bloqueos de Cupo',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='bloqueocupo',
+            index=models.Index(fields=['estado', 'fecha_expiracion'], name='bloqueocupo_estado_exp_idx'),
+        ),
+    ]
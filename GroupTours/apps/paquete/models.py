@@ -27,6 +27,47 @@ def _to_decimal(value):
 # ---------------------------------------------------------------------
 # PAQUETE
 # ---------------------------------------------------------------------
+class PaqueteQuerySet(models.QuerySet):
+    """QuerySet de Paquete con anotaciones reutilizables para listados."""
+
+    def with_resumen_salidas(self):
+        """
+        Anota el resumen de las salidas activas de cada paquete con subconsultas,
+        para serializar una página de paquetes con una cantidad fija de consultas.
+
+        Anotaciones agregadas:
+            _fecha_inicio: menor fecha_salida
+            _fecha_fin: mayor fecha_regreso
+            _precio_desde: menor costo_base_desde
+            _precio_venta_desde: menor precio_venta_sugerido_min
+            _senia_proxima: seña de la primera salida (por fecha_salida)
+
+        Returns:
+            QuerySet[Paquete]: Queryset anotado
+        """
+        from django.db.models import DateField, DecimalField, Max, Min, OuterRef, Subquery
+
+        activas = SalidaPaquete.objects.filter(paquete=OuterRef("pk"), activo=True).order_by()
+        decimal_field = DecimalField(max_digits=12, decimal_places=2)
+
+        def _agregar(funcion, campo, output_field):
+            return Subquery(
+                activas.values("paquete").annotate(valor=funcion(campo)).values("valor"),
+                output_field=output_field,
+            )
+
+        return self.annotate(
+            _fecha_inicio=_agregar(Min, "fecha_salida", DateField()),
+            _fecha_fin=_agregar(Max, "fecha_regreso", DateField()),
+            _precio_desde=_agregar(Min, "costo_base_desde", decimal_field),
+            _precio_venta_desde=_agregar(Min, "precio_venta_sugerido_min", decimal_field),
+            _senia_proxima=Subquery(
+                activas.order_by("fecha_salida", "id").values("senia")[:1],
+                output_field=decimal_field,
+            ),
+        )
+
+
 class Paquete(models.Model):
     """
     Paquete turístico genérico:
@@ -77,6 +118,8 @@ class Paquete(models.Model):
 
     imagen = models.ImageField(upload_to="paquetes/", blank=True, null=True)
 
+    objects = PaqueteQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Paquete"
         verbose_name_plural = "Paquetes"
@@ -274,6 +317,18 @@ class SalidaPaquete(models.Model):
 
     senia = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
 
+    # Contadores de ocupación (reservas activas no canceladas), mantenidos por
+    # Reserva.save() con actualizaciones atómicas. Se reconstruyen con el
+    # comando `recalcular_ocupacion_salidas`.
+    cupos_ocupados = models.PositiveIntegerField(
+        default=0,
+        help_text="Pasajeros (cantidad_pasajeros) de las reservas activas no canceladas de la salida."
+    )
+    reservas_activas = models.PositiveIntegerField(
+        default=0,
+        help_text="Cantidad de reservas activas no canceladas de la salida."
+    )
+
     activo = models.BooleanField(default=True)
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_modificacion = models.DateTimeField(auto_now=True)
@@ -282,20 +337,43 @@ class SalidaPaquete(models.Model):
         verbose_name = "Salida de Paquete"
         verbose_name_plural = "Salidas de Paquete"
         ordering = ["fecha_salida"]
+        indexes = [
+            models.Index(fields=["activo", "fecha_salida"], name="salida_activo_fecha_idx"),
+        ]
 
     def __str__(self):
         return f"{self.paquete.nombre} - {self.fecha_salida}"
 
     def save(self, *args, **kwargs):
         if not self.codigo:
-            from django.utils.timezone import now as tz_now
-            year = tz_now().year
-            last_num = SalidaPaquete.objects.filter(
-                fecha_creacion__year=year
-            ).count() + 1
-            self.codigo = f"SAL-{year}-{last_num:04d}"
+            from apps.secuencia.services import generar_codigo
+            self.codigo = generar_codigo('SAL')
         super().save(*args, **kwargs)
 
+    @property
+    def cupo_total(self):
+        """Cupo original = cupo disponible + pasajeros de reservas activas no canceladas."""
+        return (self.cupo or 0) + self.cupos_ocupados
+
+    @staticmethod
+    def ajustar_ocupacion(salida_id, pasajeros, reservas):
+        """
+        Suma (o resta, con valores negativos) a los contadores de ocupación de
+        una salida con una actualización atómica (F()), sin leer la fila.
+
+        Args:
+            salida_id (int): ID de la salida
+            pasajeros (int): Variación de cupos_ocupados
+            reservas (int): Variación de reservas_activas
+        """
+        from django.db.models import F, Value
+        from django.db.models.functions import Greatest
+
+        SalidaPaquete.objects.filter(pk=salida_id).update(
+            cupos_ocupados=Greatest(F("cupos_ocupados") + pasajeros, Value(0)),
+            reservas_activas=Greatest(F("reservas_activas") + reservas, Value(0)),
+        )
+
     # -----------------------------
     # ÍTEMS DE COSTO OPERATIVO
     # -----------------------------
@@ -474,6 +552,7 @@ class SalidaPaquete(models.Model):
             ValidationError: Si no existe cotización vigente
         """
         from apps.moneda.models import Moneda, CotizacionMoneda
+        from apps.moneda.services import obtener_moneda
         from .utils import convertir_entre_monedas
 
         fecha_referencia = fecha or self.fecha_salida
@@ -481,16 +560,16 @@ class SalidaPaquete(models.Model):
         # Determinar moneda alternativa
         if self.moneda.codigo == 'PYG':
             # Salida en PYG, mostrar en USD
-            moneda_alternativa = Moneda.objects.get(codigo='USD')
+            moneda_alternativa = obtener_moneda('USD')
         elif self.moneda.codigo == 'USD':
             # Salida en USD, mostrar en PYG
-            moneda_alternativa = Moneda.objects.get(codigo='PYG')
+            moneda_alternativa = obtener_moneda('PYG')
         else:
             raise ValidationError(f"Moneda no soportada: {self.moneda.codigo}")
 
         # Obtener cotización
         if self.moneda.codigo == 'USD' or moneda_alternativa.codigo == 'USD':
-            moneda_usd = Moneda.objects.get(codigo='USD')
+            moneda_usd = obtener_moneda('USD')
             cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd, fecha_referencia)
 
             if not cotizacion:
@@ -599,6 +678,70 @@ class CupoHabitacionSalida(models.Model):
         return f"{self.salida} - {self.habitacion} ({self.cupo} disponibles)"
 
 
+# ---------------------------------------------------------------------
+# BLOQUEO TEMPORAL DE CUPO (checkout en curso)
+# ---------------------------------------------------------------------
+class BloqueoCupo(models.Model):
+    """
+    Retención temporal de cupo mientras se completa una reserva.
+
+    Al crearse descuenta el cupo de la habitación y de la salida (igual que
+    una reserva). Si la reserva se crea con el token antes de la expiración,
+    el bloqueo se consume y la reserva no vuelve a descontar cupo; si vence,
+    el cupo se devuelve (ver apps/paquete/services.py).
+    """
+
+    ESTADOS = [
+        ("activo", "Activo"),
+        ("consumido", "Consumido por una reserva"),
+        ("liberado", "Liberado"),
+        ("vencido", "Vencido"),
+    ]
+
+    token = models.UUIDField(
+        unique=True,
+        editable=False,
+        help_text="Identificador del bloqueo que se envía al crear la reserva"
+    )
+    salida = models.ForeignKey(
+        SalidaPaquete,
+        on_delete=models.CASCADE,
+        related_name="bloqueos_cupo"
+    )
+    habitacion = models.ForeignKey(
+        Habitacion,
+        on_delete=models.CASCADE,
+        related_name="bloqueos_cupo"
+    )
+    habitaciones = models.PositiveIntegerField(
+        default=1,
+        help_text="Habitaciones retenidas (descontadas de CupoHabitacionSalida)"
+    )
+    pasajeros = models.PositiveIntegerField(
+        default=0,
+        help_text="Asientos retenidos (descontados de SalidaPaquete.cupo)"
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=ESTADOS,
+        default="activo"
+    )
+    fecha_expiracion = models.DateTimeField(
+        help_text="Pasada esta fecha el cupo retenido se devuelve a la salida"
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Bloqueo de Cupo"
+        verbose_name_plural = "Bloqueos de Cupo"
+        indexes = [
+            models.Index(fields=["estado", "fecha_expiracion"], name="bloqueocupo_estado_exp_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.salida} - {self.habitacion} ({self.estado} hasta {self.fecha_expiracion})"
+
+
 # ---------------------------------------------------------------------
 # ITEM DE COSTO POR SALIDA (override)
 # ---------------------------------------------------------------------
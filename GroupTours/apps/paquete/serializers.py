@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import (
+    BloqueoCupo,
     CupoHabitacionSalida,
     ItemCostoPaquete,
     ItemCostoSalida,
@@ -105,6 +106,30 @@ class CupoHabitacionSalidaSerializer(serializers.ModelSerializer):
         }
 
 
+# ---------------------------------------------------------------------
+# BloqueoCupo Serializer
+# ---------------------------------------------------------------------
+class BloqueoCupoSerializer(serializers.ModelSerializer):
+    habitacion_id = serializers.PrimaryKeyRelatedField(
+        queryset=Habitacion.objects.select_related("tipo_habitacion"),
+        source="habitacion"
+    )
+    minutos = serializers.IntegerField(
+        write_only=True,
+        required=False,
+        min_value=1,
+        max_value=60,
+        help_text="Duración del bloqueo en minutos (default: 15)"
+    )
+
+    class Meta:
+        model = BloqueoCupo
+        fields = ["token", "salida", "habitacion_id", "habitaciones", "pasajeros",
+                  "estado", "fecha_expiracion", "minutos"]
+        read_only_fields = ["token", "salida", "habitaciones", "pasajeros",
+                            "estado", "fecha_expiracion"]
+
+
 # ---------------------------------------------------------------------
 # PrecioCatalogoHotel Serializer
 # ---------------------------------------------------------------------
@@ -365,12 +390,20 @@ class SalidaPaqueteSerializer(serializers.ModelSerializer):
         resultado = []
         cupo = obj.cupo or 1
 
-        for item_default in obj.paquete.items_costo_default.filter(activo=True).select_related("tipo_costo"):
+        # Usar los ítems precargados (listado de paquetes) si existen
+        paquete = obj.paquete
+        if "items_costo_default" in getattr(paquete, "_prefetched_objects_cache", {}):
+            items_default = [item for item in paquete.items_costo_default.all() if item.activo]
+        else:
+            items_default = paquete.items_costo_default.filter(activo=True).select_related("tipo_costo")
+        overrides = {item.tipo_costo_id: item for item in obj.items_costo.all() if item.activo}
+
+        for item_default in items_default:
             tipo_costo = item_default.tipo_costo
             if not tipo_costo.activo:
                 continue
 
-            override = obj.items_costo.filter(tipo_costo=tipo_costo, activo=True).first()
+            override = overrides.get(tipo_costo.id)
 
             if override:
                 monto = override.monto
@@ -777,15 +810,10 @@ class SalidaPaqueteListSerializer(serializers.ModelSerializer):
 
     def get_cupo_total(self, obj):
         """Cupo original = cupo disponible + pasajeros de reservas activas no canceladas."""
-        cupo_disponible = obj.cupo or 0
-        cupo_ocupado = sum(
-            r.cantidad_pasajeros or 0
-            for r in obj.reservas.filter(activo=True).exclude(estado="cancelada")
-        )
-        return cupo_disponible + cupo_ocupado
+        return obj.cupo_total
 
     def get_total_reservas(self, obj):
-        return obj.reservas.filter(activo=True).exclude(estado="cancelada").count()
+        return obj.reservas_activas
 
     def get_dias_hasta_salida(self, obj):
         if not obj.fecha_salida:
@@ -850,10 +878,8 @@ class ReservaDetalleEnSalidaSerializer(serializers.Serializer):
         }
 
     def get_pasajeros(self, obj):
-        pasajeros = obj.pasajeros.select_related(
-            "persona", "persona__tipo_documento"
-        ).all()
-        return ReservaPasajeroDetalleSerializer(pasajeros, many=True).data
+        # Pasajeros precargados por SalidaPaqueteDetalleSerializer.get_reservas
+        return ReservaPasajeroDetalleSerializer(obj.pasajeros.all(), many=True).data
 
 
 class SalidaPaqueteDetalleSerializer(SalidaPaqueteSerializer):
@@ -872,7 +898,9 @@ class SalidaPaqueteDetalleSerializer(SalidaPaqueteSerializer):
         ).select_related(
             "titular", "habitacion", "habitacion__tipo_habitacion"
         ).prefetch_related(
-            "pasajeros__persona__tipo_documento"
+            "pasajeros__persona__tipo_documento",
+            "pasajeros__ledger",
+            "servicios_adicionales",
         ).order_by("fecha_reserva")
         return ReservaDetalleEnSalidaSerializer(reservas_activas, many=True).data
 
@@ -1145,14 +1173,45 @@ class PaqueteSerializer(serializers.ModelSerializer):
             return obj.codigo
         return f"PAQ-2024-{obj.id:04d}"
     
+    def _resumen_salidas(self, obj):
+        """
+        Resumen de las salidas activas del paquete.
+
+        Usa las anotaciones de Paquete.objects.with_resumen_salidas() (listado y
+        detalle). Sin anotaciones (ej: respuesta de create/update) lo calcula
+        desde obj.salidas.all(), que aprovecha el prefetch si existe.
+        """
+        if hasattr(obj, "_fecha_inicio"):
+            return {
+                "fecha_inicio": obj._fecha_inicio,
+                "fecha_fin": obj._fecha_fin,
+                "precio_desde": obj._precio_desde,
+                "precio_venta_desde": obj._precio_venta_desde,
+                "senia": obj._senia_proxima,
+            }
+
+        activas = sorted(
+            (s for s in obj.salidas.all() if s.activo),
+            key=lambda s: (s.fecha_salida, s.id)
+        )
+
+        def _minimo(valores):
+            valores = [v for v in valores if v is not None]
+            return min(valores) if valores else None
+
+        return {
+            "fecha_inicio": activas[0].fecha_salida if activas else None,
+            "fecha_fin": max((s.fecha_regreso for s in activas if s.fecha_regreso), default=None),
+            "precio_desde": _minimo(s.costo_base_desde for s in activas),
+            "precio_venta_desde": _minimo(s.precio_venta_sugerido_min for s in activas),
+            "senia": activas[0].senia if activas else None,
+        }
+
     def get_fecha_inicio(self, obj):
-        salida = obj.salidas.filter(activo=True).order_by("fecha_salida").first()
-        return salida.fecha_salida if salida else None
+        return self._resumen_salidas(obj)["fecha_inicio"]
 
     def get_fecha_fin(self, obj):
-        salida = obj.salidas.filter(activo=True).order_by("-fecha_regreso").first()
-        return salida.fecha_regreso if salida else None
-
+        return self._resumen_salidas(obj)["fecha_fin"]
 
     def get_precio(self, obj):
         """
@@ -1161,12 +1220,7 @@ class PaqueteSerializer(serializers.ModelSerializer):
         costo_base_desde ya es el precio de catálogo completo (sin sumar servicios),
         tanto para propios como para distribuidoras.
         """
-        salidas = obj.salidas.filter(activo=True)
-        if not salidas.exists():
-            return Decimal("0")
-
-        precios_actual = [s.costo_base_desde for s in salidas if s.costo_base_desde is not None]
-        return min(precios_actual) if precios_actual else Decimal("0")
+        return self._resumen_salidas(obj)["precio_desde"] or Decimal("0")
 
     def get_precio_venta_desde(self, obj):
         """
@@ -1175,20 +1229,10 @@ class PaqueteSerializer(serializers.ModelSerializer):
         o precio_catalogo + comision% para distribuidoras.
         No se suman servicios aquí para evitar doble conteo.
         """
-        salidas = obj.salidas.filter(activo=True)
-        if not salidas.exists():
-            return Decimal("0")
-
-        precios = [
-            s.precio_venta_sugerido_min
-            for s in salidas
-            if s.precio_venta_sugerido_min is not None
-        ]
-        return min(precios) if precios else Decimal("0")
+        return self._resumen_salidas(obj)["precio_venta_desde"] or Decimal("0")
 
     def get_senia(self, obj):
-        salida = obj.salidas.filter(activo=True).order_by("fecha_salida").first()
-        return getattr(salida, "senia", None)
+        return self._resumen_salidas(obj)["senia"]
 
     def get_imagen_url(self, obj):
         request = self.context.get("request")
@@ -1888,4 +1932,8 @@ class PaqueteSerializer(serializers.ModelSerializer):
                     salida.activo = False
                     salida.save(update_fields=['activo'])
 
+        # Las salidas pueden haber cambiado: descartar el resumen anotado por
+        # Paquete.objects.with_resumen_salidas() para recalcularlo en la respuesta
+        instance.__dict__.pop("_fecha_inicio", None)
+
         return instance
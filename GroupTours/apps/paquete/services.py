@@ -0,0 +1,273 @@
+# apps/paquete/services.py
+"""
+Asignación de cupos de salidas (paquetes propios) y resolución de precios de
+catálogo.
+
+El cupo se descuenta con un UPDATE condicional (`cupo = cupo - n WHERE
+cupo >= n`): la base de datos serializa las reservas concurrentes sobre la
+misma fila, por lo que dos reservas simultáneas nunca pueden tomar el mismo
+último lugar. Si el UPDATE no afecta filas no hay cupo suficiente.
+
+Los bloqueos temporales (BloqueoCupo) retienen cupo durante el checkout y lo
+devuelven al vencer.
+"""
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import CharField, F, Value
+from django.utils import timezone
+
+from apps.hotel.models import Habitacion
+
+from .models import (
+    BloqueoCupo,
+    CupoHabitacionSalida,
+    PrecioCatalogoHabitacion,
+    PrecioCatalogoHotel,
+    SalidaPaquete,
+)
+
+
+# Duración por defecto de un bloqueo de cupo durante el checkout
+MINUTOS_BLOQUEO_CUPO = 15
+
+
+def _descontar(salida_id, habitacion_id, habitaciones, pasajeros):
+    """Descuenta cupo de habitación y de salida (todo o nada). Ver descontar_cupos()."""
+    with transaction.atomic():
+        descontadas = CupoHabitacionSalida.objects.filter(
+            salida_id=salida_id,
+            habitacion_id=habitacion_id,
+            cupo__gte=habitaciones,
+        ).update(cupo=F("cupo") - habitaciones)
+
+        if not descontadas:
+            cupo_habitacion = CupoHabitacionSalida.objects.filter(
+                salida_id=salida_id, habitacion_id=habitacion_id
+            ).select_related("habitacion__tipo_habitacion").first()
+            if cupo_habitacion is None:
+                habitacion = Habitacion.objects.select_related("tipo_habitacion").get(pk=habitacion_id)
+                raise ValueError(
+                    f"No se encontró configuración de cupo para la habitación "
+                    f"'{habitacion.tipo_habitacion.nombre}' en la salida seleccionada."
+                )
+            raise ValueError(
+                f"No hay suficiente cupo disponible para la habitación "
+                f"'{cupo_habitacion.habitacion.tipo_habitacion.nombre}'. "
+                f"Disponibles: {cupo_habitacion.cupo}, Solicitadas: {habitaciones}"
+            )
+
+        if pasajeros:
+            descontadas = SalidaPaquete.objects.filter(
+                pk=salida_id,
+                cupo__gte=pasajeros,
+            ).update(cupo=F("cupo") - pasajeros)
+
+            if not descontadas:
+                disponibles = SalidaPaquete.objects.filter(pk=salida_id).values_list("cupo", flat=True).first()
+                # SalidaPaquete.cupo NULL: la salida no controla asientos
+                if disponibles is not None:
+                    # La excepción revierte también el descuento de habitación
+                    raise ValueError(
+                        f"No hay suficiente cupo de pasajeros en la salida. "
+                        f"Disponibles: {disponibles}, Solicitados: {pasajeros}"
+                    )
+
+
+def descontar_cupos(salida_id, habitacion_id, habitaciones=1, pasajeros=0):
+    """
+    Descuenta atómicamente el cupo de una habitación y los asientos de una salida.
+
+    Si no hay cupo suficiente se liberan los bloqueos vencidos de la salida
+    (que pueden estar reteniendo cupo) y se reintenta una vez.
+
+    Args:
+        salida_id (int): ID de la salida
+        habitacion_id (int): ID de la habitación
+        habitaciones (int): Habitaciones a descontar de CupoHabitacionSalida
+        pasajeros (int): Asientos a descontar de SalidaPaquete.cupo
+
+    Raises:
+        ValueError: Si no hay cupo suficiente (con disponibles y solicitados)
+                    o la habitación no tiene cupo configurado en la salida
+    """
+    try:
+        _descontar(salida_id, habitacion_id, habitaciones, pasajeros)
+    except ValueError:
+        if not liberar_bloqueos_vencidos(salida_id=salida_id):
+            raise
+        _descontar(salida_id, habitacion_id, habitaciones, pasajeros)
+
+
+def devolver_cupos(salida_id, habitacion_id, habitaciones=1, pasajeros=0):
+    """
+    Devuelve cupo de habitación y asientos de una salida (incrementos atómicos).
+
+    Args:
+        salida_id (int): ID de la salida
+        habitacion_id (int): ID de la habitación
+        habitaciones (int): Habitaciones a devolver
+        pasajeros (int): Asientos a devolver (solo si la salida controla cupo)
+    """
+    with transaction.atomic():
+        if habitaciones:
+            CupoHabitacionSalida.objects.filter(
+                salida_id=salida_id, habitacion_id=habitacion_id
+            ).update(cupo=F("cupo") + habitaciones)
+        if pasajeros:
+            SalidaPaquete.objects.filter(
+                pk=salida_id, cupo__isnull=False
+            ).update(cupo=F("cupo") + pasajeros)
+
+
+def crear_bloqueo_cupo(salida, habitacion, minutos=MINUTOS_BLOQUEO_CUPO):
+    """
+    Retiene el cupo de una habitación (y sus asientos) durante el checkout.
+
+    Args:
+        salida (SalidaPaquete): Salida a bloquear
+        habitacion (Habitacion): Habitación a bloquear
+        minutos (int): Duración del bloqueo
+
+    Returns:
+        BloqueoCupo: Bloqueo activo (usar su token al crear la reserva)
+
+    Raises:
+        ValueError: Si no hay cupo suficiente
+    """
+    pasajeros = habitacion.tipo_habitacion.capacidad or 0
+
+    with transaction.atomic():
+        descontar_cupos(salida.pk, habitacion.pk, habitaciones=1, pasajeros=pasajeros)
+        return BloqueoCupo.objects.create(
+            token=uuid.uuid4(),
+            salida=salida,
+            habitacion=habitacion,
+            habitaciones=1,
+            pasajeros=pasajeros,
+            fecha_expiracion=timezone.now() + timedelta(minutes=minutos),
+        )
+
+
+def _cerrar_bloqueo(bloqueo_id, estado):
+    """Marca un bloqueo activo con `estado` y devuelve su cupo. Retorna False si ya no estaba activo."""
+    with transaction.atomic():
+        bloqueo = BloqueoCupo.objects.select_for_update().filter(
+            pk=bloqueo_id, estado="activo"
+        ).first()
+        if bloqueo is None:
+            return False
+        bloqueo.estado = estado
+        bloqueo.save(update_fields=["estado"])
+        devolver_cupos(bloqueo.salida_id, bloqueo.habitacion_id, bloqueo.habitaciones, bloqueo.pasajeros)
+    return True
+
+
+def liberar_bloqueo_cupo(token):
+    """
+    Libera un bloqueo activo (checkout abandonado) y devuelve su cupo.
+
+    Returns:
+        bool: True si el bloqueo estaba activo y se liberó
+    """
+    bloqueo_id = BloqueoCupo.objects.filter(token=token).values_list("id", flat=True).first()
+    return bool(bloqueo_id) and _cerrar_bloqueo(bloqueo_id, "liberado")
+
+
+def liberar_bloqueos_vencidos(salida_id=None):
+    """
+    Devuelve el cupo de los bloqueos activos cuya fecha de expiración pasó.
+
+    Args:
+        salida_id (int): Limitar a una salida (opcional)
+
+    Returns:
+        int: Cantidad de bloqueos liberados
+    """
+    vencidos = BloqueoCupo.objects.filter(estado="activo", fecha_expiracion__lte=timezone.now())
+    if salida_id:
+        vencidos = vencidos.filter(salida_id=salida_id)
+    return sum(_cerrar_bloqueo(bloqueo_id, "vencido") for bloqueo_id in vencidos.values_list("id", flat=True))
+
+
+def consumir_bloqueo_cupo(token, salida_id, habitacion_id):
+    """
+    Consume un bloqueo al crear la reserva correspondiente.
+
+    Un bloqueo vencido que todavía no fue liberado sigue reteniendo el cupo,
+    por lo que también se puede consumir.
+
+    Args:
+        token (UUID | str): Token del bloqueo
+        salida_id (int): Salida de la reserva
+        habitacion_id (int): Habitación de la reserva
+
+    Returns:
+        bool: True si se consumió (el cupo ya estaba descontado); False si el
+              bloqueo no existe, no coincide o ya no está activo
+    """
+    return bool(
+        BloqueoCupo.objects.filter(
+            token=token,
+            salida_id=salida_id,
+            habitacion_id=habitacion_id,
+            estado="activo",
+        ).update(estado="consumido")
+    )
+
+
+# Precio de catálogo resuelto para un par (salida, habitación).
+# fuente: "habitacion" (PrecioCatalogoHabitacion), "hotel" (PrecioCatalogoHotel)
+# o "sin_catalogo" (precio 0, moneda None)
+PrecioResuelto = namedtuple("PrecioResuelto", ["precio", "fuente", "moneda_id"])
+
+SIN_PRECIO_CATALOGO = PrecioResuelto(Decimal("0"), "sin_catalogo", None)
+
+
+def resolver_precios_catalogo(pares):
+    """
+    Resuelve el precio de catálogo de muchos pares (salida, habitación) con
+    una sola consulta (UNION de precios por habitación y por hotel).
+
+    Misma prioridad que Reserva.calcular_precio_unitario(): el precio de la
+    habitación prevalece sobre el del hotel; sin ninguno el precio es 0.
+
+    Args:
+        pares (iterable): Tuplas (salida_id, habitacion_id)
+
+    Returns:
+        dict: {(salida_id, habitacion_id): PrecioResuelto} para todos los pares
+    """
+    pares = {(salida_id, habitacion_id) for salida_id, habitacion_id in pares if salida_id and habitacion_id}
+    if not pares:
+        return {}
+
+    salidas = {salida_id for salida_id, _ in pares}
+    habitaciones = {habitacion_id for _, habitacion_id in pares}
+    columnas = ("salida_id", "habitacion_ref", "precio_catalogo", "salida__moneda_id", "fuente")
+
+    por_habitacion = PrecioCatalogoHabitacion.objects.filter(
+        salida_id__in=salidas, habitacion_id__in=habitaciones
+    ).annotate(
+        habitacion_ref=F("habitacion_id"),
+        fuente=Value("habitacion", output_field=CharField()),
+    ).values_list(*columnas).order_by()
+    por_hotel = PrecioCatalogoHotel.objects.filter(
+        salida_id__in=salidas, hotel__habitaciones__id__in=habitaciones
+    ).annotate(
+        habitacion_ref=F("hotel__habitaciones__id"),
+        fuente=Value("hotel", output_field=CharField()),
+    ).values_list(*columnas).order_by()
+
+    resueltos = {}
+    for salida_id, habitacion_id, precio, moneda_id, fuente in por_habitacion.union(por_hotel, all=True):
+        clave = (salida_id, habitacion_id)
+        if clave not in pares:
+            continue
+        if fuente == "habitacion" or clave not in resueltos:
+            resueltos[clave] = PrecioResuelto(precio, fuente, moneda_id)
+
+    return {clave: resueltos.get(clave, SIN_PRECIO_CATALOGO) for clave in pares}
@@ -0,0 +1,175 @@
+"""
+Datos de prueba compartidos por los tests que necesitan una salida de paquete
+con cupo de habitaciones y un titular para reservar.
+
+Uso:
+    from apps.paquete.tests_datos import DatosSalidaMixin
+
+    class MiTestCase(DatosSalidaMixin, TestCase):
+        CUPO_HABITACIONES = 1
+
+DatosReservasMixin agrega reservas con pasajeros y un cliente de la API
+(tests de presupuesto de consultas de los endpoints).
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.ciudad.models import Ciudad
+from apps.destino.models import Destino
+from apps.hotel.models import Habitacion, Hotel, TipoHabitacion
+from apps.moneda.models import CotizacionMoneda, Moneda
+from apps.moneda.services import invalidar_cache_cotizaciones, invalidar_cache_monedas
+from apps.nacionalidad.models import Nacionalidad
+from apps.paquete.models import (
+    CupoHabitacionSalida,
+    Paquete,
+    PrecioCatalogoHabitacion,
+    SalidaPaquete,
+)
+from apps.persona.models import PersonaFisica
+from apps.reserva.models import Pasajero, Reserva
+from apps.tipo_documento.models import TipoDocumento
+from apps.tipo_paquete.models import TipoPaquete
+
+
+class DatosSalidaMixin:
+    """
+    Salida de paquete propio (en dólares) con un tipo de habitación y su cupo,
+    y un titular con documento '1000'.
+
+    Las clases de test ajustan los datos con los atributos de clase.
+    """
+
+    COSTO_BASE = Decimal('1000')
+    SENIA = None
+    CUPO_ASIENTOS = 40
+    TIPO_HABITACION = ('Doble', 2)
+    CUPO_HABITACIONES = 10
+
+    def setUp(self):
+        # La caché de cotizaciones es del proceso: no arrastrar tablas de otros tests
+        invalidar_cache_cotizaciones()
+        invalidar_cache_monedas()
+        self.nacionalidad = Nacionalidad.objects.create(nombre='Paraguay', codigo_alpha2='PY')
+        self.tipo_documento = TipoDocumento.objects.create(nombre='CI')
+        self.ciudad = Ciudad.objects.create(nombre='Asunción', pais=self.nacionalidad)
+        self.moneda = Moneda.objects.create(nombre='Dólar', codigo='USD', simbolo='$')
+        self.paquete = Paquete.objects.create(
+            nombre='Paquete Test',
+            tipo_paquete=TipoPaquete.objects.create(nombre='Terrestre'),
+            destino=Destino.objects.create(ciudad=self.ciudad),
+            moneda=self.moneda,
+            propio=True
+        )
+        self.salida = SalidaPaquete.objects.create(
+            paquete=self.paquete,
+            fecha_salida=timezone.now().date() + timedelta(days=60),
+            moneda=self.moneda,
+            costo_base_desde=self.COSTO_BASE,
+            senia=self.SENIA,
+            cupo=self.CUPO_ASIENTOS
+        )
+        self.hotel = Hotel.objects.create(nombre='Hotel Test', ciudad=self.ciudad)
+        nombre, capacidad = self.TIPO_HABITACION
+        self.habitacion = Habitacion.objects.create(
+            hotel=self.hotel,
+            tipo_habitacion=TipoHabitacion.objects.create(nombre=nombre, capacidad=capacidad)
+        )
+        CupoHabitacionSalida.objects.create(
+            salida=self.salida, habitacion=self.habitacion, cupo=self.CUPO_HABITACIONES
+        )
+        self.titular = self._persona('1000', email='titular@test.com', nombre='Titular')
+
+    def _persona(self, documento, **datos):
+        """Persona física con documento CI y nacionalidad paraguaya"""
+        valores = {
+            'email': f'{documento}@test.com',
+            'telefono': '0981000000',
+            'nombre': f'Persona {documento}',
+            'apellido': 'Test',
+        }
+        valores.update(datos)
+        return PersonaFisica.objects.create(
+            tipo_documento=self.tipo_documento,
+            documento=documento,
+            nacionalidad=self.nacionalidad,
+            **valores
+        )
+
+    def _crear_reserva(self, cantidad, **datos):
+        """Reserva del titular en la salida y habitación de prueba"""
+        valores = {
+            'titular': self.titular,
+            'paquete': self.paquete,
+            'salida': self.salida,
+            'habitacion': self.habitacion,
+            'cantidad_pasajeros': cantidad,
+            'precio_unitario': self.COSTO_BASE,
+        }
+        valores.update(datos)
+        return Reserva.objects.create(**valores)
+
+    def _cupos(self):
+        """(habitaciones disponibles, asientos disponibles)"""
+        self.salida.refresh_from_db()
+        return (
+            CupoHabitacionSalida.objects.get(salida=self.salida, habitacion=self.habitacion).cupo,
+            self.salida.cupo,
+        )
+
+
+class DatosReservasMixin(DatosSalidaMixin):
+    """
+    DatosSalidaMixin con cotización del dólar, precio de catálogo, una reserva
+    (con todos sus pasajeros cargados) por cada valor de CANTIDAD_PASAJEROS y
+    un APIClient autenticado.
+
+    self.reservas sigue el orden de CANTIDAD_PASAJEROS; self.reserva es la última.
+    """
+
+    SENIA = Decimal('300')
+    CANTIDAD_PASAJEROS = (1, 2, 2, 3, 4)
+
+    def setUp(self):
+        super().setUp()
+        CotizacionMoneda.objects.create(
+            moneda=self.moneda,
+            fecha_vigencia=timezone.now().date(),
+            valor_en_guaranies=Decimal('7300')
+        )
+        self.salida.hoteles.add(self.hotel)
+        PrecioCatalogoHabitacion.objects.create(
+            salida=self.salida, habitacion=self.habitacion, precio_catalogo=self.COSTO_BASE
+        )
+
+        self.reservas = [self._crear_reserva_con_pasajeros(cantidad) for cantidad in self.CANTIDAD_PASAJEROS]
+        self.reserva = self.reservas[-1]
+
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='test'))
+
+    def _nueva_persona(self):
+        """Persona con un documento todavía no usado"""
+        return self._persona(str(2000 + PersonaFisica.objects.count()))
+
+    def _crear_reserva_con_pasajeros(self, cantidad):
+        """Reserva de un titular nuevo con sus `cantidad` pasajeros (el titular primero)"""
+        titular = self._nueva_persona()
+        reserva = self._crear_reserva(cantidad, titular=titular)
+        for indice in range(cantidad):
+            Pasajero.objects.create(
+                reserva=reserva,
+                persona=titular if indice == 0 else self._nueva_persona(),
+                es_titular=(indice == 0)
+            )
+        return reserva
+
+    def _get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
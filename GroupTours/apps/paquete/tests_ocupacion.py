@@ -0,0 +1,145 @@
+"""
+Tests de ocupación de salidas:
+- Contadores de SalidaPaquete (cupos_ocupados y reservas_activas) mantenidos por Reserva
+- Descuento atómico de cupo y bloqueos temporales (apps/paquete/services.py)
+
+Ejecutar tests:
+    python manage.py test apps.paquete.tests_ocupacion
+"""
+
+import threading
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.utils import timezone
+
+from apps.paquete.models import BloqueoCupo, SalidaPaquete
+from apps.paquete.serializers import SalidaPaqueteListSerializer
+from apps.paquete.services import crear_bloqueo_cupo, liberar_bloqueos_vencidos
+from apps.paquete.tests_datos import DatosSalidaMixin
+from apps.reserva.models import Reserva
+
+
+class OcupacionSalidaTestCase(DatosSalidaMixin, TestCase):
+    """Los contadores de ocupación siguen el ciclo de vida de las reservas"""
+
+    def _contadores(self):
+        self.salida.refresh_from_db()
+        return self.salida.cupos_ocupados, self.salida.reservas_activas
+
+    def test_ciclo_de_vida_de_reservas(self):
+        primera = self._crear_reserva(2)
+        segunda = self._crear_reserva(3)
+        self.assertEqual(self._contadores(), (5, 2))
+
+        segunda.cantidad_pasajeros = 1
+        segunda.save(update_fields=['cantidad_pasajeros'])
+        self.assertEqual(self._contadores(), (3, 2))
+
+        primera.marcar_cancelada()
+        self.assertEqual(self._contadores(), (1, 1))
+
+        segunda.activo = False
+        segunda.save(update_fields=['activo', 'fecha_modificacion'])
+        self.assertEqual(self._contadores(), (0, 0))
+
+        segunda.activo = True
+        segunda.save(update_fields=['activo', 'fecha_modificacion'])
+        self.assertEqual(self._contadores(), (1, 1))
+
+        # Cupo original = disponible (40 - 2 - 2 + 2 liberados) + ocupados
+        datos = SalidaPaqueteListSerializer(self.salida).data
+        self.assertEqual(datos['cupo_total'], 38 + 1)
+        self.assertEqual(datos['total_reservas'], 1)
+
+    def test_comando_reconstruye_contadores(self):
+        self._crear_reserva(2)
+        SalidaPaquete.objects.filter(pk=self.salida.pk).update(cupos_ocupados=7, reservas_activas=0)
+
+        call_command('recalcular_ocupacion_salidas', '--dry-run', stdout=StringIO())
+        self.assertEqual(self._contadores(), (7, 0))
+
+        call_command('recalcular_ocupacion_salidas', stdout=StringIO())
+        self.assertEqual(self._contadores(), (2, 1))
+
+
+class BloqueoCupoTestCase(DatosSalidaMixin, TestCase):
+    """Descuento condicional de cupo y bloqueos temporales durante el checkout"""
+
+    CUPO_HABITACIONES = 1
+
+    def test_sin_cupo_no_crea_la_reserva(self):
+        self._crear_reserva(2)
+
+        with self.assertRaisesMessage(ValueError, 'Disponibles: 0, Solicitadas: 1'):
+            self._crear_reserva(2)
+        self.assertEqual(Reserva.objects.count(), 1)
+        self.assertEqual(self._cupos(), (0, 38))
+
+    def test_reserva_consume_el_bloqueo(self):
+        bloqueo = crear_bloqueo_cupo(self.salida, self.habitacion)
+        self.assertEqual(self._cupos(), (0, 38))
+
+        reserva = Reserva(
+            titular=self.titular,
+            paquete=self.paquete,
+            salida=self.salida,
+            habitacion=self.habitacion,
+            cantidad_pasajeros=2,
+        )
+        reserva.bloqueo_cupo_token = bloqueo.token
+        reserva.save()
+
+        bloqueo.refresh_from_db()
+        self.assertEqual(bloqueo.estado, 'consumido')
+        self.assertEqual(self._cupos(), (0, 38))
+
+    def test_bloqueo_vencido_devuelve_el_cupo(self):
+        bloqueo = crear_bloqueo_cupo(self.salida, self.habitacion)
+        BloqueoCupo.objects.filter(pk=bloqueo.pk).update(fecha_expiracion=timezone.now())
+
+        # Sin cupo libre, la reserva libera los bloqueos vencidos y reintenta
+        self._crear_reserva(2)
+        bloqueo.refresh_from_db()
+        self.assertEqual(bloqueo.estado, 'vencido')
+        self.assertEqual(self._cupos(), (0, 38))
+        self.assertEqual(liberar_bloqueos_vencidos(), 0)
+
+
+class AsignacionCupoConcurrenteTestCase(DatosSalidaMixin, TransactionTestCase):
+    """Reservas simultáneas sobre las últimas habitaciones no generan sobreventa"""
+
+    CUPO_HABITACIONES = 3
+    RESERVAS_SIMULTANEAS = 8
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_reservas_concurrentes_sin_sobreventa(self):
+        barrera = threading.Barrier(self.RESERVAS_SIMULTANEAS)
+        resultados = []
+
+        def reservar():
+            try:
+                barrera.wait()
+                self._crear_reserva(2)
+                resultados.append('ok')
+            except ValueError:
+                resultados.append('sin_cupo')
+            except Exception as e:
+                # Cualquier otro error queda registrado y hace fallar el test
+                resultados.append(e)
+            finally:
+                connections.close_all()
+
+        hilos = [threading.Thread(target=reservar) for _ in range(self.RESERVAS_SIMULTANEAS)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual([r for r in resultados if isinstance(r, Exception)], [])
+        self.assertEqual(resultados.count('ok'), self.CUPO_HABITACIONES)
+        self.assertEqual(resultados.count('sin_cupo'), self.RESERVAS_SIMULTANEAS - self.CUPO_HABITACIONES)
+        self.assertEqual(Reserva.objects.count(), self.CUPO_HABITACIONES)
+        self.assertEqual(self._cupos(), (0, 40 - 2 * self.CUPO_HABITACIONES))
@@ -0,0 +1,99 @@
+"""
+Tests del presupuesto de consultas de los endpoints de paquetes y salidas
+(query_budget de PaqueteViewSet y SalidaPaqueteViewSet).
+
+Ejecutar tests:
+    python manage.py test apps.paquete.tests_perf
+
+Si un cambio hace que un endpoint supere su query_budget, el test
+correspondiente falla con PresupuestoConsultasExcedido.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.moneda.models import Moneda
+from apps.paquete.models import CupoHabitacionSalida, SalidaPaquete
+from apps.paquete.tests_datos import DatosReservasMixin
+
+
+@override_settings(PERF_PRESUPUESTO_ESTRICTO=True)
+class PresupuestoConsultasPaquetesTestCase(DatosReservasMixin, TestCase):
+    """Los endpoints de paquetes y salidas no deben superar su presupuesto de consultas"""
+
+    def test_presupuesto_paquetes(self):
+        self._get('/api/paquete/')
+        self._get(f'/api/paquete/{self.paquete.pk}/')
+
+    def test_presupuesto_salidas(self):
+        self._get('/api/paquete/salidas/')
+        self._get(f'/api/paquete/salidas/{self.salida.pk}/')
+
+    def test_listado_paquetes_consultas_constantes(self):
+        """/api/paquete/ ejecuta las mismas consultas sin importar la cantidad de salidas"""
+        # Moneda alternativa de las salidas en USD (sin ella cada salida la vuelve a buscar)
+        Moneda.objects.create(nombre='Guaraní', codigo='PYG', simbolo='Gs')
+        self._get('/api/paquete/')   # carga cotizaciones
+
+        with CaptureQueriesContext(connection) as antes:
+            response = self._get('/api/paquete/')
+        self.assertEqual(response.data['results'][0]['fecha_inicio'], self.salida.fecha_salida)
+
+        for dias in (30, 90, 120):
+            salida = SalidaPaquete.objects.create(
+                paquete=self.paquete,
+                fecha_salida=timezone.now().date() + timedelta(days=dias),
+                moneda=self.salida.moneda,
+                costo_base_desde=Decimal('900'),
+                senia=Decimal('100'),
+                cupo=20
+            )
+            CupoHabitacionSalida.objects.create(salida=salida, habitacion=self.habitacion, cupo=5)
+
+        with CaptureQueriesContext(connection) as despues:
+            response = self._get('/api/paquete/')
+        self.assertEqual(len(antes), len(despues))
+
+        paquete = response.data['results'][0]
+        self.assertEqual(paquete['fecha_inicio'], timezone.now().date() + timedelta(days=30))
+        self.assertEqual(paquete['precio'], Decimal('900'))
+        self.assertEqual(paquete['senia'], Decimal('100'))
+
+    def test_detalle_salida_consultas_constantes(self):
+        """El detalle de una salida no ejecuta consultas por reserva ni por pasajero"""
+        url = f'/api/paquete/salidas/{self.salida.pk}/'
+        self._get(url)
+
+        with CaptureQueriesContext(connection) as antes:
+            self._get(url)
+
+        self._crear_reserva_con_pasajeros(3)
+
+        with CaptureQueriesContext(connection) as despues:
+            response = self._get(url)
+        self.assertEqual(len(antes), len(despues))
+        self.assertEqual(len(response.data['reservas']), len(self.CANTIDAD_PASAJEROS) + 1)
+
+    def test_manifiesto_pasajeros_consultas_constantes(self):
+        """El manifiesto de una salida no ejecuta consultas por pasajero"""
+        url = f'/api/paquete/salidas/{self.salida.pk}/pasajeros/'
+        self._get(url)
+
+        with CaptureQueriesContext(connection) as antes:
+            response = self._get(url)
+        self.assertEqual(response.data['total_pasajeros'], sum(self.CANTIDAD_PASAJEROS))
+
+        self._crear_reserva_con_pasajeros(3)
+        self._get(url)
+
+        with CaptureQueriesContext(connection) as despues:
+            self._get(url)
+        self.assertEqual(len(antes), len(despues))
+
+        response = self._get(f'{url}exportar-excel/')
+        self.assertTrue(response['Content-Disposition'].endswith('.xlsx"'))
@@ -20,6 +20,8 @@ urlpatterns = [
     path('salidas/<int:pk>/actualizar-fechas/', SalidaPaqueteViewSet.as_view({'patch': 'actualizar_fechas'}), name='salida-paquete-actualizar-fechas'),
     path('salidas/<int:pk>/pasajeros/', SalidaPaqueteViewSet.as_view({'get': 'pasajeros'}), name='salida-paquete-pasajeros'),
     path('salidas/<int:pk>/pasajeros/exportar-excel/', SalidaPaqueteViewSet.as_view({'get': 'pasajeros_exportar_excel'}), name='salida-paquete-pasajeros-excel'),
+    path('salidas/<int:pk>/bloqueos-cupo/', SalidaPaqueteViewSet.as_view({'post': 'bloquear_cupo'}), name='salida-paquete-bloquear-cupo'),
+    path('salidas/bloqueos-cupo/<uuid:token>/', SalidaPaqueteViewSet.as_view({'delete': 'liberar_bloqueo_cupo'}), name='salida-paquete-liberar-bloqueo'),
 ]
 
 urlpatterns = format_suffix_patterns(urlpatterns)
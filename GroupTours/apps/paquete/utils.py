@@ -7,6 +7,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.utils import get_column_letter
 
 
 def _to_decimal(value):
@@ -55,7 +56,8 @@ def convertir_entre_monedas(monto, moneda_origen, moneda_destino, fecha=None):
         >>> convertir_entre_monedas(730000, pyg, usd)  # 730000 PYG → USD
         Decimal('100.00')
     """
-    from apps.moneda.models import Moneda, CotizacionMoneda
+    from apps.moneda.models import CotizacionMoneda
+    from apps.moneda.services import obtener_moneda
 
     # Si las monedas son iguales, retornar el mismo monto
     if moneda_origen == moneda_destino:
@@ -83,7 +85,7 @@ def convertir_entre_monedas(monto, moneda_origen, moneda_destino, fecha=None):
     # ========== CASO 2: Convertir de PYG a USD ==========
     if moneda_origen.codigo == 'PYG' and moneda_destino.codigo == 'USD':
         # Necesitamos la cotización de USD (cuántos guaraníes vale 1 dólar)
-        moneda_usd = Moneda.objects.get(codigo='USD')
+        moneda_usd = obtener_moneda('USD')
         cotizacion = CotizacionMoneda.obtener_cotizacion_vigente(moneda_usd, fecha)
 
         if not cotizacion:
@@ -102,47 +104,137 @@ def convertir_entre_monedas(monto, moneda_origen, moneda_destino, fecha=None):
     )
 
 
+def iterar_manifiesto_salida(salida):
+    """
+    Genera el manifiesto de pasajeros de una salida (reservas activas no canceladas).
+
+    Los montos de cada pasajero se leen de su ledger (PasajeroLedger), que se
+    crea junto con el pasajero, por lo que el manifiesto es de solo lectura.
+    El estado de pago de las reservas confirmadas se obtiene con una sola
+    consulta anotada, por lo que la cantidad de consultas no depende de la
+    cantidad de pasajeros.
+
+    Args:
+        salida: instancia de SalidaPaquete
+
+    Yields:
+        dict: Datos del pasajero (estructura del endpoint /pasajeros/)
+    """
+    from apps.reserva.models import Pasajero, Reserva
+    from apps.reserva.services import (
+        anotar_predicados_estado,
+        calcular_predicados_estado,
+    )
+
+    reservas = Reserva.objects.filter(salida=salida, activo=True).exclude(estado="cancelada")
+
+    # Solo las reservas confirmadas necesitan el estado de pago para estado_display
+    totalmente_pagadas = {
+        reserva.pk: calcular_predicados_estado(reserva)["totalmente_pagada"]
+        for reserva in anotar_predicados_estado(
+            reservas.filter(estado="confirmada").select_related("salida")
+        )
+    }
+
+    pasajeros_qs = Pasajero.objects.filter(
+        reserva__in=reservas,
+    ).select_related(
+        "persona__tipo_documento",
+        "reserva",
+        "ledger",
+    ).order_by("reserva__codigo", "es_titular")
+
+    senia = salida.senia or Decimal("0")
+
+    for p in pasajeros_qs:
+        # Mismos cálculos que Pasajero.saldo_pendiente / tiene_sena_pagada /
+        # esta_totalmente_pagado, evaluando monto_pagado una sola vez
+        monto_pagado = p.monto_pagado
+        saldo_pendiente = p.precio_asignado - monto_pagado if p.precio_asignado else Decimal("0")
+
+        yield {
+            "id": p.id,
+            "reserva_codigo": p.reserva.codigo,
+            "reserva_estado": p.reserva.estado,
+            "reserva_estado_display": p.reserva.describir_estado(
+                totalmente_pagada=totalmente_pagadas.get(p.reserva_id)
+            ),
+            "es_titular": p.es_titular,
+            "por_asignar": p.por_asignar,
+            "nombre": p.persona.nombre,
+            "apellido": p.persona.apellido,
+            "documento": p.persona.documento,
+            "tipo_documento": p.persona.tipo_documento.nombre if p.persona.tipo_documento else None,
+            "fecha_nacimiento": p.persona.fecha_nacimiento,
+            "edad": p.persona.edad,
+            "precio_asignado": p.precio_asignado,
+            "monto_pagado": monto_pagado,
+            "saldo_pendiente": saldo_pendiente,
+            "tiene_sena_pagada": monto_pagado >= senia,
+            "esta_totalmente_pagado": saldo_pendiente <= 0,
+            "ticket_numero": p.ticket_numero,
+            "voucher_codigo": p.voucher_codigo,
+        }
+
+
 def generar_excel_pasajeros_salida(salida, pasajeros):
     """
     Genera un Excel con el listado de pasajeros de una salida.
 
+    Usa el modo write-only de openpyxl: las filas se escriben a medida que se
+    recorre `pasajeros` sin mantener la hoja completa en memoria. Por eso los
+    anchos de columna son fijos en lugar de calcularse desde el contenido.
+
     Args:
         salida: instancia de SalidaPaquete
-        pasajeros: lista de dicts con datos de pasajeros (misma estructura que el endpoint)
+        pasajeros: iterable de dicts con datos de pasajeros (ver iterar_manifiesto_salida)
 
     Returns:
         BytesIO con el archivo Excel
     """
+    from openpyxl.cell import WriteOnlyCell
+
     buffer = BytesIO()
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Pasajeros"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Pasajeros")
+
+    # ----- Columnas (el ancho debe definirse antes de escribir filas) -----
+    columnas = [
+        ("N°", 6), ("Reserva", 16), ("Estado Reserva", 24), ("Titular", 9),
+        ("Nombre", 22), ("Apellido", 22), ("Tipo Doc.", 12), ("Documento", 16),
+        ("Fecha Nac.", 13), ("Edad", 8), ("Precio Asignado", 17), ("Monto Pagado", 17),
+        ("Saldo Pendiente", 17), ("Voucher", 18),
+    ]
+    for numero, (_, ancho) in enumerate(columnas, 1):
+        ws.column_dimensions[get_column_letter(numero)].width = ancho
+    ultima_columna = get_column_letter(len(columnas))
 
-    # ----- Encabezado de la salida -----
-    ws["A1"] = f"Pasajeros - {salida.paquete.nombre}"
-    ws["A1"].font = Font(size=14, bold=True)
-    ws.merge_cells("A1:N1")
+    def _celda(valor, **estilos):
+        celda = WriteOnlyCell(ws, value=valor)
+        for atributo, estilo in estilos.items():
+            setattr(celda, atributo, estilo)
+        return celda
 
-    ws["A2"] = f"Salida: {salida.codigo}  |  Fecha: {salida.fecha_salida}"
-    ws["A2"].font = Font(italic=True)
-    ws.merge_cells("A2:N2")
+    # ----- Encabezado de la salida -----
+    ws.append([_celda(f"Pasajeros - {salida.paquete.nombre}", font=Font(size=14, bold=True))])
+    ws.append([_celda(f"Salida: {salida.codigo}  |  Fecha: {salida.fecha_salida}", font=Font(italic=True))])
+    ws.merged_cells.add(f"A1:{ultima_columna}1")
+    ws.merged_cells.add(f"A2:{ultima_columna}2")
 
     # ----- Headers -----
-    headers = [
-        "N°", "Reserva", "Estado Reserva", "Titular",
-        "Nombre", "Apellido", "Tipo Doc.", "Documento",
-        "Fecha Nac.", "Edad", "Precio Asignado", "Monto Pagado",
-        "Saldo Pendiente", "Voucher",
-    ]
     ws.append([])  # fila 3 vacía
-    ws.append(headers)  # fila 4
-
     header_fill = PatternFill(start_color="2980B9", end_color="2980B9", fill_type="solid")
     header_font = Font(color="FFFFFF", bold=True)
-    for cell in ws[4]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+    header_alignment = Alignment(horizontal="center", vertical="center")
+    ws.append([
+        _celda(titulo, fill=header_fill, font=header_font, alignment=header_alignment)
+        for titulo, _ in columnas
+    ])  # fila 4
+
+    def _monto(valor):
+        if valor is None:
+            return ""
+        return _celda(float(valor), number_format="#,##0.00")
 
     # ----- Datos -----
     for idx, p in enumerate(pasajeros, 1):
@@ -157,32 +249,13 @@ def generar_excel_pasajeros_salida(salida, pasajeros):
             "Por asignar" if p.get("por_asignar") else (p.get("documento", "") or ""),
             p["fecha_nacimiento"].strftime("%d/%m/%Y") if p.get("fecha_nacimiento") else "",
             p.get("edad", "") if p.get("edad") is not None else "",
-            float(p["precio_asignado"]) if p.get("precio_asignado") is not None else "",
-            float(p["monto_pagado"]) if p.get("monto_pagado") is not None else "",
-            float(p["saldo_pendiente"]) if p.get("saldo_pendiente") is not None else "",
+            _monto(p.get("precio_asignado")),
+            _monto(p.get("monto_pagado")),
+            _monto(p.get("saldo_pendiente")),
             p.get("voucher_codigo", "") or "",
         ])
 
-    # Formato montos
-    for row in ws.iter_rows(min_row=5, min_col=11, max_col=13):
-        for cell in row:
-            if cell.value != "":
-                cell.number_format = "#,##0.00"
-
-    # Auto-ajustar ancho de columnas (omitir MergedCell que no tienen column_letter)
-    # Se omiten las filas 1-3 (títulos fusionados) para que no inflen el ancho de columna A
-    from openpyxl.cell.cell import MergedCell
-    for col in ws.columns:
-        anchor = next((cell for cell in col if not isinstance(cell, MergedCell)), None)
-        if anchor is None:
-            continue
-        max_len = max(
-            (len(str(cell.value or "")) for cell in col if not isinstance(cell, MergedCell) and cell.row >= 4),
-            default=0,
-        )
-        ws.column_dimensions[anchor.column_letter].width = min(max_len + 3, 40)
-
-    ws.auto_filter.ref = f"A4:{ws.cell(row=4, column=len(headers)).coordinate}"
+    ws.auto_filter.ref = f"A4:{ultima_columna}4"
 
     wb.save(buffer)
     buffer.seek(0)
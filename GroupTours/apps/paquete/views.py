@@ -4,10 +4,19 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from django.db.models import Prefetch
 from django.http import HttpResponse
 
-from .models import Paquete, SalidaPaquete, TipoCostoSalida
+from .models import (
+    CupoHabitacionSalida,
+    Paquete,
+    PrecioCatalogoHabitacion,
+    PrecioCatalogoHotel,
+    SalidaPaquete,
+    TipoCostoSalida,
+)
 from .serializers import (
+    BloqueoCupoSerializer,
     PaqueteSerializer,
     SalidaPaqueteSerializer,
     SalidaPaqueteActualizarFechasSerializer,
@@ -17,6 +26,7 @@ from .serializers import (
     TipoCostoSalidaSerializer,
 )
 from .filters import PaqueteFilter, SalidaFilter
+from apps.dashboard.perf import MonitorConsultasMixin
 
 
 # -------------------- PAGINACIÓN --------------------
@@ -59,7 +69,7 @@ class TipoCostoSalidaViewSet(viewsets.ModelViewSet):
 
 
 # -------------------- VIEWSET --------------------
-class PaqueteViewSet(viewsets.ModelViewSet):
+class PaqueteViewSet(MonitorConsultasMixin, viewsets.ModelViewSet):
     """
     ViewSet para Paquete con soporte de:
     - Subida de imagen (MultiPartParser / FormData)
@@ -68,10 +78,14 @@ class PaqueteViewSet(viewsets.ModelViewSet):
     - Endpoints extra: resumen y todos
     """
 
+    # Presupuesto de consultas calibrado con apps/paquete/tests_perf.py (solo debe bajar)
+    query_budget = {'list': 14, 'retrieve': 14}
+
     parser_classes = (MultiPartParser, FormParser, JSONParser)
 
     queryset = (
-        Paquete.objects.select_related(
+        Paquete.objects.with_resumen_salidas()
+        .select_related(
             "tipo_paquete",
             "destino",
             "destino__ciudad__pais__zona_geografica",  # ✅ acceso optimizado
@@ -80,8 +94,27 @@ class PaqueteViewSet(viewsets.ModelViewSet):
         )
         .prefetch_related(
             "paquete_servicios__servicio",
+            "items_costo_default__tipo_costo",
             "salidas__moneda",
+            "salidas__temporada",
             "salidas__hoteles",
+            "salidas__items_costo",
+            Prefetch(
+                "salidas__cupos_habitaciones",
+                queryset=CupoHabitacionSalida.objects.select_related(
+                    "habitacion__tipo_habitacion", "habitacion__hotel"
+                ),
+            ),
+            Prefetch(
+                "salidas__precios_catalogo_hoteles",
+                queryset=PrecioCatalogoHotel.objects.select_related("hotel"),
+            ),
+            Prefetch(
+                "salidas__precios_catalogo_habitaciones",
+                queryset=PrecioCatalogoHabitacion.objects.select_related(
+                    "habitacion__tipo_habitacion", "habitacion__hotel"
+                ),
+            ),
         )
         .order_by("-fecha_creacion")
     )
@@ -154,7 +187,7 @@ class SalidaPaginacion(PageNumberPagination):
 
 
 # -------------------- VIEWSET SALIDA PAQUETE --------------------
-class SalidaPaqueteViewSet(viewsets.ModelViewSet):
+class SalidaPaqueteViewSet(MonitorConsultasMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar las Salidas de Paquete.
 
@@ -167,6 +200,8 @@ class SalidaPaqueteViewSet(viewsets.ModelViewSet):
     - DELETE /api/paquete/salidas/{id}/                   → Soft delete
     - GET  /api/paquete/salidas/{id}/pasajeros/           → Todos los pasajeros de la salida
     - GET  /api/paquete/salidas/resumen/                  → Estadísticas globales
+    - POST /api/paquete/salidas/{id}/bloqueos-cupo/       → Bloquear cupo durante el checkout
+    - DELETE /api/paquete/salidas/bloqueos-cupo/{token}/  → Liberar un bloqueo de cupo
 
     Filtros disponibles (query params):
     - paquete_id, paquete (nombre), activo
@@ -175,6 +210,9 @@ class SalidaPaqueteViewSet(viewsets.ModelViewSet):
     - busqueda (nombre de paquete, código de salida o reserva)
     """
 
+    # Presupuesto de consultas calibrado con apps/paquete/tests_perf.py (solo debe bajar)
+    query_budget = {'list': 12, 'retrieve': 30, 'pasajeros': 5, 'pasajeros_exportar_excel': 5}
+
     serializer_class = SalidaPaqueteSerializer
     permission_classes = []
     filter_backends = [DjangoFilterBackend]
@@ -182,6 +220,10 @@ class SalidaPaqueteViewSet(viewsets.ModelViewSet):
     pagination_class = SalidaPaginacion
 
     def get_queryset(self):
+        # El manifiesto de pasajeros y el bloqueo de cupo solo usan los datos básicos de la salida
+        if self.action in ("pasajeros", "pasajeros_exportar_excel", "bloquear_cupo"):
+            return SalidaPaquete.objects.select_related("paquete")
+
         base_qs = SalidaPaquete.objects.select_related(
             "paquete",
             "paquete__destino__ciudad__pais",
@@ -220,42 +262,10 @@ class SalidaPaqueteViewSet(viewsets.ModelViewSet):
         Retorna todos los pasajeros de reservas activas (no canceladas) de la salida.
         Incluye nombre, documento, datos de pago, ticket y voucher.
         """
+        from .utils import iterar_manifiesto_salida
+
         salida = self.get_object()
-        from apps.reserva.models import Pasajero
-
-        pasajeros_qs = Pasajero.objects.filter(
-            reserva__salida=salida,
-            reserva__activo=True,
-        ).exclude(
-            reserva__estado="cancelada"
-        ).select_related(
-            "persona__tipo_documento",
-            "reserva",
-        ).order_by("reserva__codigo", "es_titular")
-
-        data = []
-        for p in pasajeros_qs:
-            data.append({
-                "id": p.id,
-                "reserva_codigo": p.reserva.codigo,
-                "reserva_estado": p.reserva.estado,
-                "reserva_estado_display": p.reserva.estado_display,
-                "es_titular": p.es_titular,
-                "por_asignar": p.por_asignar,
-                "nombre": p.persona.nombre,
-                "apellido": p.persona.apellido,
-                "documento": p.persona.documento,
-                "tipo_documento": p.persona.tipo_documento.nombre if p.persona.tipo_documento else None,
-                "fecha_nacimiento": p.persona.fecha_nacimiento,
-                "edad": p.persona.edad,
-                "precio_asignado": p.precio_asignado,
-                "monto_pagado": p.monto_pagado,
-                "saldo_pendiente": p.saldo_pendiente,
-                "tiene_sena_pagada": p.tiene_sena_pagada,
-                "esta_totalmente_pagado": p.esta_totalmente_pagado,
-                "ticket_numero": p.ticket_numero,
-                "voucher_codigo": p.voucher_codigo,
-            })
+        data = list(iterar_manifiesto_salida(salida))
 
         return Response({
             "salida_id": salida.id,
@@ -274,46 +284,10 @@ class SalidaPaqueteViewSet(viewsets.ModelViewSet):
 
         Descarga un Excel con el listado de pasajeros de la salida.
         """
-        from apps.reserva.models import Pasajero
-        from .utils import generar_excel_pasajeros_salida
+        from .utils import generar_excel_pasajeros_salida, iterar_manifiesto_salida
 
         salida = self.get_object()
-
-        pasajeros_qs = Pasajero.objects.filter(
-            reserva__salida=salida,
-            reserva__activo=True,
-        ).exclude(
-            reserva__estado="cancelada"
-        ).select_related(
-            "persona__tipo_documento",
-            "reserva",
-        ).order_by("reserva__codigo", "es_titular")
-
-        data = []
-        for p in pasajeros_qs:
-            data.append({
-                "id": p.id,
-                "reserva_codigo": p.reserva.codigo,
-                "reserva_estado": p.reserva.estado,
-                "reserva_estado_display": p.reserva.estado_display,
-                "es_titular": p.es_titular,
-                "por_asignar": p.por_asignar,
-                "nombre": p.persona.nombre,
-                "apellido": p.persona.apellido,
-                "documento": p.persona.documento,
-                "tipo_documento": p.persona.tipo_documento.nombre if p.persona.tipo_documento else None,
-                "fecha_nacimiento": p.persona.fecha_nacimiento,
-                "edad": p.persona.edad,
-                "precio_asignado": p.precio_asignado,
-                "monto_pagado": p.monto_pagado,
-                "saldo_pendiente": p.saldo_pendiente,
-                "tiene_sena_pagada": p.tiene_sena_pagada,
-                "esta_totalmente_pagado": p.esta_totalmente_pagado,
-                "ticket_numero": p.ticket_numero,
-                "voucher_codigo": p.voucher_codigo,
-            })
-
-        excel_buffer = generar_excel_pasajeros_salida(salida, data)
+        excel_buffer = generar_excel_pasajeros_salida(salida, iterar_manifiesto_salida(salida))
         filename = f"pasajeros_{salida.codigo}.xlsx"
 
         response = HttpResponse(
@@ -323,6 +297,53 @@ class SalidaPaqueteViewSet(viewsets.ModelViewSet):
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
         return response
 
+    # ----- ACTION: bloquear cupo (checkout) -----
+    @action(detail=True, methods=["post"], url_path="bloqueos-cupo")
+    def bloquear_cupo(self, request, pk=None):
+        """
+        POST /api/paquete/salidas/{id}/bloqueos-cupo/
+
+        Retiene temporalmente 1 habitación (y sus asientos) mientras se completa
+        la reserva. El token devuelto se envía como `bloqueo_cupo_token` al
+        crear la reserva; si vence sin usarse, el cupo vuelve a la salida.
+
+        Body: {"habitacion_id": 5, "minutos": 15}
+        Errores: 409 si no hay cupo disponible.
+        """
+        from .services import MINUTOS_BLOQUEO_CUPO, crear_bloqueo_cupo
+
+        salida = self.get_object()
+        serializer = BloqueoCupoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            bloqueo = crear_bloqueo_cupo(
+                salida,
+                serializer.validated_data["habitacion"],
+                minutos=serializer.validated_data.get("minutos", MINUTOS_BLOQUEO_CUPO),
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+
+        return Response(BloqueoCupoSerializer(bloqueo).data, status=status.HTTP_201_CREATED)
+
+    # ----- ACTION: liberar bloqueo de cupo -----
+    @action(detail=False, methods=["delete"], url_path=r"bloqueos-cupo/(?P<token>[0-9a-f-]+)")
+    def liberar_bloqueo_cupo(self, request, token=None):
+        """
+        DELETE /api/paquete/salidas/bloqueos-cupo/{token}/
+
+        Libera un bloqueo activo (checkout abandonado) y devuelve el cupo.
+        """
+        from .services import liberar_bloqueo_cupo
+
+        if not liberar_bloqueo_cupo(token):
+            return Response(
+                {"error": "El bloqueo no existe o ya no está activo."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({"mensaje": "Bloqueo liberado correctamente"}, status=status.HTTP_200_OK)
+
     # ----- ACTION: resumen -----
     @action(detail=False, methods=["get"], url_path="resumen")
     def resumen(self, request):
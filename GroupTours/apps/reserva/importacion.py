@@ -0,0 +1,430 @@
+"""
+Importación en bloque de la lista de pasajeros de una reserva (manifiesto de grupo).
+
+    POST /api/reservas/{id}/importar-pasajeros/   (multipart, campo "archivo": .csv o .xlsx)
+
+Columnas (la primera fila es el encabezado; no distingue mayúsculas ni acentos):
+- documento, nombre: obligatorias
+- apellido, email, telefono, fecha_nacimiento, sexo, tipo_documento, nacionalidad: opcionales
+  (tipo_documento por nombre; nacionalidad por nombre o código alpha-2). Si faltan en
+  una persona nueva se usan los datos del titular, igual que en los pasajeros "Por Asignar".
+
+Por cada fila válida:
+- La persona se busca por documento (una consulta IN para todo el archivo): si existe
+  se actualiza con los datos informados, si no se crea (crear_personas_fisicas_en_bloque).
+- Si ya es pasajero de la reserva no cambia; si no, reemplaza al siguiente pasajero
+  "Por Asignar" (conserva sus pagos) o se agrega mientras haya lugar en cantidad_pasajeros.
+
+La asignación de lugares y las escrituras se hacen con la reserva bloqueada
+(select_for_update). Las escrituras son en bloque y sin señales; el estado de la
+reserva y los vouchers se revisan una sola vez al confirmar la transacción. La
+respuesta informa el resultado de cada fila.
+"""
+import csv
+import io
+import unicodedata
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+
+FORMATOS_IMPORTACION = ('csv', 'xlsx')
+
+# Límite de filas por archivo
+MAX_FILAS = 1000
+
+# Nombres alternativos de columnas -> campo
+ALIAS_COLUMNAS = {
+    'ci': 'documento',
+    'cedula': 'documento',
+    'nro_documento': 'documento',
+    'numero_documento': 'documento',
+    'nombres': 'nombre',
+    'apellidos': 'apellido',
+    'correo': 'email',
+    'celular': 'telefono',
+    'fecha_de_nacimiento': 'fecha_nacimiento',
+    'genero': 'sexo',
+    'pais': 'nacionalidad',
+}
+
+CAMPOS_PERSONA = [
+    'nombre', 'apellido', 'email', 'telefono', 'fecha_nacimiento', 'sexo',
+    'tipo_documento_id', 'nacionalidad_id',
+]
+
+
+def _normalizar_columna(valor):
+    """'Fecha de Nacimiento' -> 'fecha_de_nacimiento'"""
+    texto = unicodedata.normalize('NFKD', str(valor or '')).encode('ascii', 'ignore').decode()
+    columna = '_'.join(texto.strip().lower().split())
+    return ALIAS_COLUMNAS.get(columna, columna)
+
+
+def _normalizar_valor(valor):
+    """Valor de una celda: texto sin espacios, números enteros sin '.0' y fechas sin hora."""
+    if valor is None:
+        return ''
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor).strip()
+
+
+def _leer_csv(archivo):
+    contenido = archivo.read()
+    try:
+        texto = contenido.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        texto = contenido.decode('latin-1')
+    try:
+        dialecto = csv.Sniffer().sniff(texto[:4096], delimiters=',;\t')
+    except csv.Error:
+        dialecto = csv.excel
+    return csv.reader(io.StringIO(texto), dialecto)
+
+
+def _leer_xlsx(archivo):
+    from openpyxl import load_workbook
+
+    try:
+        libro = load_workbook(archivo, read_only=True, data_only=True)
+    except Exception:
+        raise ValueError('No se pudo leer el archivo Excel')
+    return libro.worksheets[0].iter_rows(values_only=True)
+
+
+def leer_filas_archivo(archivo):
+    """
+    Lee las filas de un archivo CSV o XLSX de pasajeros.
+
+    Args:
+        archivo: Archivo subido (UploadedFile)
+
+    Returns:
+        list[tuple[int, dict]]: (número de fila en el archivo, {campo: valor}) de cada
+        fila no vacía; solo incluye las celdas con valor
+
+    Raises:
+        ValueError: Si el formato no es soportado, faltan columnas obligatorias o
+            se supera MAX_FILAS
+    """
+    extension = (archivo.name or '').rsplit('.', 1)[-1].lower()
+    if extension not in FORMATOS_IMPORTACION:
+        raise ValueError(
+            f"Formato '{extension}' no soportado. Opciones: {', '.join(FORMATOS_IMPORTACION)}"
+        )
+
+    lector = _leer_csv(archivo) if extension == 'csv' else _leer_xlsx(archivo)
+
+    encabezado = [_normalizar_columna(valor) for valor in next(iter(lector), [])]
+    faltantes = [columna for columna in ('documento', 'nombre') if columna not in encabezado]
+    if faltantes:
+        raise ValueError(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+
+    filas = []
+    for numero, valores in enumerate(lector, start=2):
+        fila = {}
+        for columna, valor in zip(encabezado, valores):
+            valor = _normalizar_valor(valor)
+            if columna and valor != '':
+                fila[columna] = valor
+        if not fila:
+            continue
+        if len(filas) == MAX_FILAS:
+            raise ValueError(f'El archivo supera el máximo de {MAX_FILAS} filas')
+        filas.append((numero, fila))
+    return filas
+
+
+def _resolver_catalogo(modelo, campos, valores):
+    """
+    {valor en minúsculas: pk} de un catálogo (TipoDocumento, Nacionalidad) buscando
+    por los campos indicados. Una consulta, solo si hay valores a resolver.
+    """
+    if not valores:
+        return {}
+    indice = {}
+    for fila in modelo.objects.values('pk', *campos):
+        for campo in campos:
+            if fila[campo]:
+                indice.setdefault(fila[campo].lower(), fila['pk'])
+    return indice
+
+
+def _crear_personas_nuevas(personas, batch_size):
+    """
+    Inserta en bloque las personas nuevas de la importación.
+
+    Si otra transacción creó alguno de los documentos después de buscarlos, el
+    INSERT en bloque falla por Persona.documento único: se reintenta fila por
+    fila (cada una en su savepoint) y se omiten las que ya existen.
+
+    Returns:
+        set[str]: Documentos que no se pudieron crear por estar ya registrados
+    """
+    from .services import crear_personas_fisicas_en_bloque
+
+    try:
+        with transaction.atomic():
+            crear_personas_fisicas_en_bloque(personas, batch_size=batch_size)
+        return set()
+    except IntegrityError:
+        pass
+
+    duplicados = set()
+    for persona in personas:
+        persona.pk = persona.persona_ptr_id = None
+        persona._state.adding = True
+        try:
+            with transaction.atomic():
+                crear_personas_fisicas_en_bloque([persona])
+        except IntegrityError:
+            duplicados.add(persona.documento)
+    return duplicados
+
+
+def importar_pasajeros(reserva, filas, batch_size=500):
+    """
+    Importa en bloque los pasajeros de una reserva.
+
+    Args:
+        reserva (Reserva): Reserva destino
+        filas (list[tuple[int, dict]]): Filas leídas con leer_filas_archivo()
+        batch_size (int): Tamaño de lote de los INSERT/UPDATE
+
+    Returns:
+        dict: {'resumen': {...}, 'filas': [...]} con el resultado de cada fila:
+            - estado: 'ok' o 'error'
+            - persona: 'creada' | 'actualizada' | 'sin_cambios'
+            - pasajero: 'asignado' (reemplaza un "Por Asignar") | 'agregado' | 'existente'
+            - pasajero_id, errores
+    """
+    from apps.comprobante.signals import generar_vouchers_pasajeros
+    from apps.nacionalidad.models import Nacionalidad
+    from apps.persona.models import Persona, PersonaFisica
+    from apps.tipo_documento.models import TipoDocumento
+    from .models import Pasajero, Reserva
+    from .serializers import PasajeroImportacionSerializer
+
+    # 1. Validar las filas (una sola instancia del serializer para todo el archivo)
+    validador = PasajeroImportacionSerializer()
+    reporte = []
+    validas = []
+    documentos_archivo = set()
+    for numero, fila in filas:
+        resultado = {
+            'fila': numero,
+            'documento': fila.get('documento'),
+            'estado': 'error',
+            'persona': None,
+            'pasajero': None,
+            'pasajero_id': None,
+            'errores': [],
+        }
+        reporte.append(resultado)
+
+        try:
+            datos = dict(validador.run_validation(fila))
+        except serializers.ValidationError as e:
+            resultado['errores'] = [
+                f'{campo}: {mensaje}' for campo, mensajes in e.detail.items() for mensaje in mensajes
+            ]
+            continue
+
+        if datos['documento'] in documentos_archivo:
+            resultado['errores'].append('Documento repetido en el archivo')
+            continue
+        documentos_archivo.add(datos['documento'])
+        validas.append((resultado, datos))
+
+    # 2. Resolver catálogos (una consulta por catálogo usado)
+    tipos_documento = _resolver_catalogo(
+        TipoDocumento, ['nombre'], [d['tipo_documento'] for _, d in validas if 'tipo_documento' in d]
+    )
+    nacionalidades = _resolver_catalogo(
+        Nacionalidad, ['nombre', 'codigo_alpha2'], [d['nacionalidad'] for _, d in validas if 'nacionalidad' in d]
+    )
+    pendientes_catalogo = validas
+    validas = []
+    for resultado, datos in pendientes_catalogo:
+        for campo, indice in (('tipo_documento', tipos_documento), ('nacionalidad', nacionalidades)):
+            if campo in datos:
+                pk = indice.get(datos.pop(campo).lower())
+                if pk is None:
+                    resultado['errores'].append(f'{campo}: no existe')
+                else:
+                    datos[f'{campo}_id'] = pk
+        if not resultado['errores']:
+            validas.append((resultado, datos))
+
+    # 3-5. Asignar lugares y escribir con la reserva bloqueada: dos importaciones
+    # simultáneas (o una edición de pasajeros) no pueden tomar el mismo "Por Asignar"
+    # ni superar cantidad_pasajeros
+    with transaction.atomic():
+        reserva = Reserva.objects.select_for_update().get(pk=reserva.pk)
+
+        # 3. Deduplicar contra Persona.documento (una consulta IN)
+        documentos = [datos['documento'] for _, datos in validas]
+        existentes = PersonaFisica.objects.in_bulk(documentos, field_name='documento')
+        no_fisicas = set()
+        if len(existentes) < len(documentos):
+            no_fisicas = set(Persona.objects.filter(
+                documento__in=[d for d in documentos if d not in existentes]
+            ).values_list('documento', flat=True))
+
+        # 4. Asignar un lugar en la reserva a cada fila
+        titular = reserva.titular
+        pasajeros = list(reserva.pasajeros.select_related('persona').order_by('id'))
+        por_persona = {p.persona_id: p for p in pasajeros}
+        por_asignar = [p for p in pasajeros if p.por_asignar and '_PEND' in p.persona.documento]
+        lugares_libres = max((reserva.cantidad_pasajeros or 0) - len(pasajeros), 0)
+
+        filas_ok = []
+        for resultado, datos in validas:
+            documento = datos['documento']
+            if documento in no_fisicas:
+                resultado['errores'].append('El documento pertenece a una persona jurídica')
+                continue
+
+            persona = existentes.get(documento)
+            if persona is None and titular is None and not (
+                'tipo_documento_id' in datos and 'nacionalidad_id' in datos
+            ):
+                resultado['errores'].append('Faltan tipo_documento y nacionalidad (la reserva no tiene titular)')
+                continue
+
+            pasajero = por_persona.get(persona.pk) if persona else None
+            if pasajero:
+                resultado['pasajero'] = 'existente'
+            elif por_asignar:
+                pasajero = por_asignar.pop(0)
+                resultado['pasajero'] = 'asignado'
+            elif lugares_libres:
+                lugares_libres -= 1
+                resultado['pasajero'] = 'agregado'
+            else:
+                resultado['errores'].append(
+                    f'La reserva ya tiene sus {reserva.cantidad_pasajeros} pasajeros cargados'
+                )
+                continue
+            filas_ok.append((resultado, datos, persona, pasajero))
+
+        # 5. Escribir en bloque
+        precio = reserva.precio_unitario or reserva.precio_base_paquete or 0
+        ahora = timezone.now()
+
+        # Personas: nuevas con los datos del titular como respaldo, existentes solo si cambiaron
+        personas = {}
+        nuevas = []
+        a_actualizar = []
+        campos_actualizados = set()
+        for resultado, datos, persona, _ in filas_ok:
+            if persona is None:
+                persona = PersonaFisica(
+                    documento=datos['documento'],
+                    nombre=datos['nombre'],
+                    apellido=datos.get('apellido', ''),
+                    email=datos.get('email', titular.email if titular else ''),
+                    telefono=datos.get('telefono', titular.telefono if titular else ''),
+                    tipo_documento_id=datos.get('tipo_documento_id') or titular.tipo_documento_id,
+                    nacionalidad_id=datos.get('nacionalidad_id') or titular.nacionalidad_id,
+                    fecha_nacimiento=datos.get('fecha_nacimiento'),
+                    sexo=datos.get('sexo', PersonaFisica.FEMENINO),
+                )
+                nuevas.append(persona)
+                resultado['persona'] = 'creada'
+            else:
+                cambios = [
+                    campo for campo in CAMPOS_PERSONA
+                    if campo in datos and getattr(persona, campo) != datos[campo]
+                ]
+                for campo in cambios:
+                    setattr(persona, campo, datos[campo])
+                if cambios:
+                    persona.fecha_modificacion = ahora
+                    campos_actualizados.update(cambios)
+                    a_actualizar.append(persona)
+                resultado['persona'] = 'actualizada' if cambios else 'sin_cambios'
+            personas[datos['documento']] = persona
+
+        duplicados = _crear_personas_nuevas(nuevas, batch_size)
+        if duplicados:
+            # Documento registrado por otra operación después del paso 3: la fila no se importa
+            pendientes_escritura = filas_ok
+            filas_ok = []
+            for resultado, datos, persona, pasajero in pendientes_escritura:
+                if datos['documento'] in duplicados:
+                    resultado['persona'] = None
+                    resultado['pasajero'] = None
+                    resultado['errores'].append(
+                        'El documento fue registrado por otra operación; vuelva a importar la fila'
+                    )
+                else:
+                    filas_ok.append((resultado, datos, persona, pasajero))
+
+        if a_actualizar:
+            PersonaFisica.objects.bulk_update(
+                a_actualizar, [*campos_actualizados, 'fecha_modificacion'], batch_size=batch_size
+            )
+
+        # Pasajeros: reemplazar los "Por Asignar" y agregar los que entren en cantidad_pasajeros
+        asignados = []
+        agregados = []
+        importados = []
+        for resultado, datos, _, pasajero in filas_ok:
+            persona = personas[datos['documento']]
+            if resultado['pasajero'] == 'asignado':
+                pasajero.persona = persona
+                pasajero.por_asignar = False
+                asignados.append(pasajero)
+            elif resultado['pasajero'] == 'agregado':
+                pasajero = Pasajero(
+                    reserva=reserva,
+                    persona=persona,
+                    es_titular=False,
+                    precio_asignado=precio,
+                )
+                agregados.append(pasajero)
+            importados.append((resultado, pasajero))
+
+        Pasajero.objects.bulk_update(asignados, ['persona', 'por_asignar'], batch_size=batch_size)
+        Pasajero.objects.bulk_create(agregados, batch_size=batch_size)  # crea también los ledgers
+
+        for resultado, pasajero in importados:
+            resultado['estado'] = 'ok'
+            resultado['pasajero_id'] = pasajero.pk
+
+        # Una sola pasada al confirmar (en lugar de las señales de cada save):
+        # estado de la reserva y vouchers de los pasajeros asignados o agregados
+        ids_revisar = [p.pk for p in asignados + agregados]
+
+        def revisar_reserva():
+            try:
+                Reserva.objects.get(pk=reserva.pk).actualizar_estado()
+            except ValidationError as e:
+                # Ej: confirmable pero sin modalidad de facturación; se resuelve al registrar el pago
+                print(f"[WARN] Reserva {reserva.pk}: estado no actualizado tras importar pasajeros: {e}")
+            # Sin PDFs: cada uno se genera al descargar su voucher
+            generar_vouchers_pasajeros(ids_revisar, encolar_pdf=False)
+
+        if ids_revisar or a_actualizar:
+            transaction.on_commit(revisar_reserva)
+
+    return {
+        'resumen': {
+            'filas': len(reporte),
+            'importadas': sum(1 for r in reporte if r['estado'] == 'ok'),
+            'con_error': sum(1 for r in reporte if r['estado'] == 'error'),
+            'personas_creadas': sum(1 for r in reporte if r['estado'] == 'ok' and r['persona'] == 'creada'),
+            'pasajeros_asignados': len(asignados),
+            'pasajeros_agregados': len(agregados),
+        },
+        'filas': reporte,
+    }
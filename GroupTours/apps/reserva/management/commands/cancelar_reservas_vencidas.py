@@ -4,6 +4,10 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from apps.reserva.models import Reserva
+from apps.reserva.services import (
+    anotar_predicados_estado,
+    calcular_predicados_estado,
+)
 
 
 class Command(BaseCommand):
@@ -28,21 +32,19 @@ class Command(BaseCommand):
             estado__in=['pendiente', 'confirmada'],
             salida__isnull=False,
             salida__fecha_salida__isnull=False,
+            salida__fecha_salida__lt=limite,
             activo=True
         ).select_related('salida', 'paquete', 'habitacion')
 
+        # Evaluar el pago total en bloque (agregados anotados) en lugar de reserva por reserva
+        queryset = anotar_predicados_estado(queryset)
+
         canceladas = 0
 
         for reserva in queryset:
             dias_restantes = reserva.dias_hasta_salida
 
-            if dias_restantes is None:
-                continue
-
-            if dias_restantes >= 15:
-                continue
-
-            if reserva.esta_totalmente_pagada():
+            if calcular_predicados_estado(reserva)['totalmente_pagada']:
                 continue
 
             mensaje = (
@@ -0,0 +1,112 @@
+"""
+Comando de Django para crear los pasajeros "Por Asignar N" que les faltan a las
+reservas existentes (menos pasajeros registrados que cantidad_pasajeros).
+
+Antes estos pasajeros se creaban uno por uno al consultar el detalle de la
+reserva; ahora se crean en bloque al crear la reserva o al cambiar su cantidad
+de pasajeros. Este comando completa las reservas previas a ese cambio.
+
+Uso:
+    python manage.py completar_pasajeros_pendientes
+
+Opciones:
+    --dry-run : Solo reporta las reservas incompletas sin crear pasajeros
+    --reserva CODIGO : Solo procesar una reserva
+    --batch-size N : Cantidad de reservas por lote (default 500)
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F
+
+from apps.reserva.models import Reserva
+from apps.reserva.services import completar_pasajeros_pendientes
+
+
+class Command(BaseCommand):
+    help = 'Crea en bloque los pasajeros "Por Asignar" faltantes de las reservas existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo reporta las reservas incompletas sin aplicar cambios a la base de datos',
+        )
+        parser.add_argument(
+            '--reserva',
+            type=str,
+            help='Código de reserva a procesar (ej: RSV-2025-0001)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Cantidad de reservas a procesar por lote',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        codigo_reserva = options.get('reserva')
+        batch_size = options['batch_size']
+
+        # Banner
+        self.stdout.write(self.style.MIGRATE_HEADING('\n' + '='*70))
+        self.stdout.write(self.style.MIGRATE_HEADING('  COMPLETAR PASAJEROS PENDIENTES'))
+        self.stdout.write(self.style.MIGRATE_HEADING('='*70 + '\n'))
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('[!] MODO DRY-RUN: No se aplicaran cambios\n'))
+
+        queryset = Reserva.objects.filter(titular__isnull=False, cantidad_pasajeros__gt=0)
+        if codigo_reserva:
+            queryset = queryset.filter(codigo=codigo_reserva)
+            self.stdout.write(f'Filtrando por reserva: {codigo_reserva}\n')
+
+        incompletas = list(
+            queryset.annotate(total_pasajeros=Count('pasajeros'))
+            .filter(cantidad_pasajeros__gt=F('total_pasajeros'))
+            .order_by('id')
+            .values_list('id', 'codigo', 'cantidad_pasajeros', 'total_pasajeros')
+        )
+        total = len(incompletas)
+        faltantes = sum(cantidad - registrados for _, _, cantidad, registrados in incompletas)
+        self.stdout.write(f'Reservas incompletas: {total}\n')
+
+        if total == 0:
+            self.stdout.write(self.style.SUCCESS('[OK] Todas las reservas tienen sus pasajeros completos.'))
+            return
+
+        if dry_run:
+            for _, codigo, cantidad, registrados in incompletas:
+                self.stdout.write(f'  {codigo}: {registrados}/{cantidad} pasajeros')
+
+        creados = 0
+        if not dry_run:
+            for inicio in range(0, total, batch_size):
+                ids_lote = [reserva_id for reserva_id, _, _, _ in incompletas[inicio:inicio + batch_size]]
+                creados += completar_pasajeros_pendientes(
+                    Reserva.objects.filter(id__in=ids_lote),
+                    batch_size=batch_size
+                )
+                self.stdout.write(f'  Lote {inicio // batch_size + 1}: {len(ids_lote)} reservas')
+
+        # Resumen final
+        self.stdout.write('\n' + '='*70)
+        self.stdout.write(self.style.MIGRATE_HEADING('  RESUMEN'))
+        self.stdout.write('='*70 + '\n')
+
+        self.stdout.write(f'Reservas incompletas: {total}')
+        self.stdout.write(f'  Pasajeros faltantes: {faltantes}')
+
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'\n[!] {faltantes} pasajero(s) pendiente(s) por crear. '
+                    'Ejecuta sin --dry-run para aplicar los cambios.'
+                )
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f'\n[OK] {creados} pasajero(s) "Por Asignar" creados correctamente.')
+            )
+
+        self.stdout.write('')
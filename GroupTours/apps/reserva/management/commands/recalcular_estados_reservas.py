@@ -7,11 +7,14 @@ Uso:
 Opciones:
     --dry-run : Muestra los cambios sin aplicarlos
     --estado ESTADO : Solo procesar reservas con estado específico
+
+La evaluación se realiza en bloque con evaluar_estados_reservas(), que replica
+la lógica de Reserva.actualizar_estado() usando agregados anotados.
 """
 
 from django.core.management.base import BaseCommand
-from django.db.models import Q
 from apps.reserva.models import Reserva
+from apps.reserva.services import evaluar_estados_reservas
 
 
 class Command(BaseCommand):
@@ -42,7 +45,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('[!] MODO DRY-RUN: No se aplicaran cambios\n'))
 
         # Construir queryset
-        queryset = Reserva.objects.select_related('salida', 'habitacion', 'paquete').prefetch_related('pasajeros')
+        queryset = Reserva.objects.all()
 
         if estado_filtro:
             queryset = queryset.filter(estado=estado_filtro)
@@ -72,52 +75,47 @@ class Command(BaseCommand):
         self.stdout.write('Procesando reservas...\n')
         self.stdout.write('-'*70 + '\n')
 
-        for i, reserva in enumerate(queryset, 1):
-            try:
-                estado_anterior = reserva.estado
-
-                # Calcular el nuevo estado SIN guardar
-                # Simulamos la lógica de actualizar_estado() manualmente
-                nuevo_estado = self._calcular_nuevo_estado(reserva)
-
-                # Comparar
-                if estado_anterior != nuevo_estado:
-                    cambios += 1
-
-                    # Mostrar información del cambio
-                    info = (
-                        f'[{i}/{total}] Reserva {reserva.codigo} '
-                        f'({estado_anterior} -> {nuevo_estado})'
-                    )
-
-                    # Detalles adicionales
-                    detalles = []
-                    detalles.append(f'Monto pagado: ${reserva.monto_pagado}')
-                    detalles.append(f'Seña total: ${reserva.seña_total}')
-                    detalles.append(f'Costo total: ${reserva.costo_total_estimado}')
-                    detalles.append(f'Pasajeros: {reserva.pasajeros_cargados}/{reserva.cantidad_pasajeros}')
-
-                    self.stdout.write(self.style.WARNING(info))
-                    for detalle in detalles:
-                        self.stdout.write(f'    {detalle}')
-                    self.stdout.write('')
-
-                    # Aplicar cambio si no es dry-run
-                    if not dry_run:
-                        reserva.estado = nuevo_estado
-                        reserva.datos_completos = not reserva.faltan_datos_pasajeros
-                        reserva.save(update_fields=['estado', 'datos_completos'])
-
-                    estadisticas[nuevo_estado] += 1
-                else:
-                    sin_cambios += 1
-
-            except Exception as e:
+        # Evaluación en bloque (agregados anotados + bulk_update)
+        resultados = evaluar_estados_reservas(queryset.order_by('id'), aplicar=not dry_run)
+
+        for i, resultado in enumerate(resultados, 1):
+            reserva = resultado['reserva']
+            estado_anterior = resultado['estado_anterior']
+            nuevo_estado = resultado['estado_nuevo']
+            predicados = resultado['predicados']
+
+            if resultado['error']:
                 errores += 1
                 self.stdout.write(
-                    self.style.ERROR(f'[{i}/{total}] Error en reserva {reserva.codigo}: {str(e)}')
+                    self.style.ERROR(f'[{i}/{total}] Error en reserva {reserva.codigo}: {resultado["error"]}')
                 )
 
+            # Comparar
+            if estado_anterior != nuevo_estado:
+                cambios += 1
+
+                # Mostrar información del cambio
+                info = (
+                    f'[{i}/{total}] Reserva {reserva.codigo} '
+                    f'({estado_anterior} -> {nuevo_estado})'
+                )
+
+                # Detalles adicionales
+                detalles = []
+                detalles.append(f'Monto pagado: ${predicados["monto_pagado"]}')
+                detalles.append(f'Seña total: ${predicados["seña_total"]}')
+                detalles.append(f'Costo total: ${predicados["costo_total"]}')
+                detalles.append(f'Pasajeros: {predicados["pasajeros_cargados"]}/{reserva.cantidad_pasajeros}')
+
+                self.stdout.write(self.style.WARNING(info))
+                for detalle in detalles:
+                    self.stdout.write(f'    {detalle}')
+                self.stdout.write('')
+
+                estadisticas[nuevo_estado] += 1
+            elif not resultado['error']:
+                sin_cambios += 1
+
         # Resumen final
         self.stdout.write('\n' + '='*70)
         self.stdout.write(self.style.MIGRATE_HEADING('  RESUMEN'))
@@ -151,22 +149,3 @@ class Command(BaseCommand):
             )
 
         self.stdout.write('')
-
-    def _calcular_nuevo_estado(self, reserva):
-        """
-        Replica la lógica de actualizar_estado() sin modificar la base de datos.
-        """
-        if reserva.estado == "cancelada":
-            return "cancelada"
-
-        # Si pago total (100%) + datos completos → Finalizada
-        if reserva.esta_totalmente_pagada() and not reserva.faltan_datos_pasajeros:
-            return "finalizada"
-
-        # Si se pagó la seña mínima (o más, pero no el 100%) → Confirmada
-        elif reserva.puede_confirmarse():
-            return "confirmada"
-
-        # Sin pago suficiente para la seña → Pendiente
-        else:
-            return "pendiente"
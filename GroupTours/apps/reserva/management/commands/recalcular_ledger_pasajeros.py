@@ -0,0 +1,144 @@
+"""
+Comando de Django para reconstruir el ledger de pagos de los pasajeros (PasajeroLedger)
+y verificar diferencias contra los datos de origen.
+
+Uso:
+    python manage.py recalcular_ledger_pasajeros
+
+Opciones:
+    --dry-run : Solo reporta las diferencias sin corregirlas
+    --reserva CODIGO : Solo procesar los pasajeros de una reserva
+    --batch-size N : Cantidad de pasajeros por lote (default 500)
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.reserva.models import Pasajero, PasajeroLedger
+from apps.reserva.services import construir_ledgers_desde_origen
+
+
+CAMPOS_LEDGER = ['monto_pagado', 'monto_acreditado', 'monto_reembolsado', 'saldo_pendiente']
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el ledger de pagos por pasajero y reporta diferencias (drift)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo reporta las diferencias sin aplicar cambios a la base de datos',
+        )
+        parser.add_argument(
+            '--reserva',
+            type=str,
+            help='Código de reserva a procesar (ej: RSV-2025-0001)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Cantidad de pasajeros a procesar por lote',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        codigo_reserva = options.get('reserva')
+        batch_size = options['batch_size']
+
+        # Banner
+        self.stdout.write(self.style.MIGRATE_HEADING('\n' + '='*70))
+        self.stdout.write(self.style.MIGRATE_HEADING('  RECALCULO DE LEDGER DE PASAJEROS'))
+        self.stdout.write(self.style.MIGRATE_HEADING('='*70 + '\n'))
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('[!] MODO DRY-RUN: No se aplicaran cambios\n'))
+
+        queryset = Pasajero.objects.select_related('reserva').order_by('id')
+        if codigo_reserva:
+            queryset = queryset.filter(reserva__codigo=codigo_reserva)
+            self.stdout.write(f'Filtrando por reserva: {codigo_reserva}\n')
+
+        pasajero_ids = list(queryset.values_list('id', flat=True))
+        total = len(pasajero_ids)
+        self.stdout.write(f'Total de pasajeros a procesar: {total}\n')
+
+        if total == 0:
+            self.stdout.write(self.style.WARNING('No hay pasajeros para procesar.'))
+            return
+
+        creados = 0
+        con_diferencias = 0
+        sin_cambios = 0
+
+        for inicio in range(0, total, batch_size):
+            ids_lote = pasajero_ids[inicio:inicio + batch_size]
+            pasajeros = {p.pk: p for p in queryset.filter(id__in=ids_lote)}
+            esperados = construir_ledgers_desde_origen(pasajeros.values())
+            ledgers = PasajeroLedger.objects.in_bulk(ids_lote, field_name='pasajero_id')
+
+            nuevos = []
+            a_actualizar = []
+
+            for pasajero_id in ids_lote:
+                pasajero = pasajeros[pasajero_id]
+                esperado = esperados[pasajero_id]
+
+                ledger = ledgers.get(pasajero_id)
+                if ledger is None:
+                    creados += 1
+                    nuevos.append(esperado)
+                    continue
+
+                diferencias = [
+                    (campo, getattr(ledger, campo), getattr(esperado, campo))
+                    for campo in CAMPOS_LEDGER
+                    if getattr(ledger, campo) != getattr(esperado, campo)
+                ]
+                if not diferencias:
+                    sin_cambios += 1
+                    continue
+
+                con_diferencias += 1
+                self.stdout.write(self.style.WARNING(
+                    f'Pasajero {pasajero_id} (Reserva {pasajero.reserva.codigo}):'
+                ))
+                for campo, actual, correcto in diferencias:
+                    self.stdout.write(f'    {campo}: {actual} -> {correcto}')
+                    setattr(ledger, campo, correcto)
+                a_actualizar.append(ledger)
+
+            if not dry_run:
+                with transaction.atomic():
+                    PasajeroLedger.objects.bulk_create(nuevos, batch_size=batch_size)
+                    PasajeroLedger.objects.bulk_update(a_actualizar, CAMPOS_LEDGER, batch_size=batch_size)
+
+        # Resumen final
+        self.stdout.write('\n' + '='*70)
+        self.stdout.write(self.style.MIGRATE_HEADING('  RESUMEN'))
+        self.stdout.write('='*70 + '\n')
+
+        self.stdout.write(f'Total procesados: {total}')
+        self.stdout.write(f'  Ledgers inexistentes: {creados}')
+        if con_diferencias:
+            self.stdout.write(self.style.ERROR(f'[DRIFT] Con diferencias: {con_diferencias}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('[OK] Sin diferencias'))
+        self.stdout.write(f'  Sin cambios: {sin_cambios}')
+
+        if dry_run and (creados or con_diferencias):
+            self.stdout.write(
+                self.style.WARNING(
+                    f'\n[!] {creados + con_diferencias} ledger(s) necesitan actualizacion. '
+                    'Ejecuta sin --dry-run para aplicar los cambios.'
+                )
+            )
+        elif creados or con_diferencias:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'\n[OK] {creados + con_diferencias} ledger(s) reconstruidos correctamente.'
+                )
+            )
+
+        self.stdout.write('')
@@ -0,0 +1,127 @@
+"""
+Comando de Django para resolver el precio de catálogo de las reservas
+(Reserva.precio_resuelto, precio_resuelto_fuente y precio_resuelto_moneda)
+en lote, con resolver_precios_catalogo().
+
+Uso:
+    python manage.py resolver_precios_reservas
+
+Opciones:
+    --dry-run : Solo reporta los cambios sin aplicarlos
+    --recalcular : Vuelve a resolver también las reservas que ya tienen precio
+                   resuelto (ej: después de corregir el catálogo de una salida)
+    --salida CODIGO : Solo procesar las reservas de una salida (ej: SAL-2026-0001)
+    --batch-size N : Tamaño del lote de actualización (default: 500)
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.paquete.services import SIN_PRECIO_CATALOGO, resolver_precios_catalogo
+from apps.reserva.models import Reserva
+
+
+class Command(BaseCommand):
+    help = 'Resuelve en lote el precio de catálogo de las reservas (precio_resuelto)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo reporta los cambios sin aplicarlos a la base de datos',
+        )
+        parser.add_argument(
+            '--recalcular',
+            action='store_true',
+            help='Volver a resolver también las reservas con precio ya resuelto',
+        )
+        parser.add_argument(
+            '--salida',
+            type=str,
+            help='Código de salida a procesar (ej: SAL-2026-0001)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Tamaño del lote de actualización (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        recalcular = options['recalcular']
+        codigo_salida = options.get('salida')
+        batch_size = options['batch_size']
+
+        # Banner
+        self.stdout.write(self.style.MIGRATE_HEADING('\n' + '='*70))
+        self.stdout.write(self.style.MIGRATE_HEADING('  RESOLUCION DE PRECIOS DE CATALOGO DE RESERVAS'))
+        self.stdout.write(self.style.MIGRATE_HEADING('='*70 + '\n'))
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('[!] MODO DRY-RUN: No se aplicaran cambios\n'))
+
+        reservas = Reserva.objects.only(
+            'id', 'codigo', 'salida_id', 'habitacion_id', *Reserva.CAMPOS_PRECIO_RESUELTO
+        ).order_by('id')
+        if not recalcular:
+            reservas = reservas.filter(precio_resuelto_fuente__isnull=True)
+        if codigo_salida:
+            reservas = reservas.filter(salida__codigo=codigo_salida)
+            self.stdout.write(f'Filtrando por salida: {codigo_salida}\n')
+
+        reservas = list(reservas)
+        total = len(reservas)
+        self.stdout.write(f'Total de reservas a procesar: {total}\n')
+
+        # Una consulta para todos los pares (salida, habitación)
+        precios = resolver_precios_catalogo(
+            (reserva.salida_id, reserva.habitacion_id) for reserva in reservas
+        )
+
+        a_actualizar = []
+        for reserva in reservas:
+            resuelto = precios.get((reserva.salida_id, reserva.habitacion_id), SIN_PRECIO_CATALOGO)
+            anterior = (reserva.precio_resuelto, reserva.precio_resuelto_fuente, reserva.precio_resuelto_moneda_id)
+            if anterior == tuple(resuelto):
+                continue
+
+            if reserva.precio_resuelto_fuente:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f'Reserva {reserva.codigo}: {reserva.precio_resuelto} ({reserva.precio_resuelto_fuente}) '
+                        f'-> {resuelto.precio} ({resuelto.fuente})'
+                    )
+                )
+            reserva.asignar_precio_resuelto(resuelto)
+            a_actualizar.append(reserva)
+
+        if not dry_run and a_actualizar:
+            with transaction.atomic():
+                Reserva.objects.bulk_update(a_actualizar, Reserva.CAMPOS_PRECIO_RESUELTO, batch_size=batch_size)
+
+        # Resumen final
+        self.stdout.write('\n' + '='*70)
+        self.stdout.write(self.style.MIGRATE_HEADING('  RESUMEN'))
+        self.stdout.write('='*70 + '\n')
+
+        self.stdout.write(f'Total procesadas: {total}')
+        self.stdout.write(f'  Pares salida/habitacion: {len(precios)}')
+        self.stdout.write(f'  Con cambios: {len(a_actualizar)}')
+        self.stdout.write(f'  Sin cambios: {total - len(a_actualizar)}')
+
+        if dry_run and a_actualizar:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'\n[!] {len(a_actualizar)} reserva(s) necesitan actualizacion. '
+                    'Ejecuta sin --dry-run para aplicar los cambios.'
+                )
+            )
+        elif a_actualizar:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'\n[OK] {len(a_actualizar)} reserva(s) actualizadas correctamente.'
+                )
+            )
+
+        self.stdout.write('')
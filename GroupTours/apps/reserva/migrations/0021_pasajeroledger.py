@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-17 09:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reserva', '0020_remove_reserva_motivo_cancelacion_codigo_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PasajeroLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('monto_pagado', models.DecimalField(decimal_places=2, default=0, help_text='Suma de distribuciones positivas de comprobantes activos', max_digits=12)),
+                ('monto_acreditado', models.DecimalField(decimal_places=2, default=0, help_text='Notas de crédito activas sin comprobante de devolución asociado', max_digits=12)),
+                ('monto_reembolsado', models.DecimalField(decimal_places=2, default=0, help_text='Suma (en positivo) de distribuciones de devolución de comprobantes activos', max_digits=12)),
+                ('saldo_pendiente', models.DecimalField(decimal_places=2, default=0, help_text='Precio asignado menos el monto neto pagado', max_digits=12)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+                ('pasajero', models.OneToOneField(help_text='Pasajero al que pertenece este estado de cuenta', on_delete=django.db.models.deletion.CASCADE, related_name='ledger', to='reserva.pasajero')),
+            ],
+            options={
+                'verbose_name': 'Ledger de Pasajero',
+                'verbose_name_plural': 'Ledgers de Pasajeros',
+                'db_table': 'PasajeroLedger',
+            },
+        ),
+    ]
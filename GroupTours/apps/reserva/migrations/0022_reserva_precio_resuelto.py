@@ -0,0 +1,87 @@
+# Generated by Django 4.2 on 2026-10-17 13:10
+
+from decimal import Decimal
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def resolver_precios(apps, schema_editor):
+    Reserva = apps.get_model("reserva", "Reserva")
+    PrecioCatalogoHabitacion = apps.get_model("paquete", "PrecioCatalogoHabitacion")
+    PrecioCatalogoHotel = apps.get_model("paquete", "PrecioCatalogoHotel")
+    SalidaPaquete = apps.get_model("paquete", "SalidaPaquete")
+    Habitacion = apps.get_model("hotel", "Habitacion")
+
+    pares = set(
+        Reserva.objects.filter(
+            salida__isnull=False, habitacion__isnull=False
+        ).values_list("salida_id", "habitacion_id").distinct()
+    )
+    salidas = {salida_id for salida_id, _ in pares}
+    habitaciones = {habitacion_id for _, habitacion_id in pares}
+
+    monedas = dict(SalidaPaquete.objects.filter(pk__in=salidas).values_list("id", "moneda_id"))
+    hoteles = dict(Habitacion.objects.filter(pk__in=habitaciones).values_list("id", "hotel_id"))
+    por_habitacion = {
+        (salida_id, habitacion_id): precio
+        for salida_id, habitacion_id, precio in PrecioCatalogoHabitacion.objects.filter(
+            salida_id__in=salidas, habitacion_id__in=habitaciones
+        ).values_list("salida_id", "habitacion_id", "precio_catalogo")
+    }
+    por_hotel = {
+        (salida_id, hotel_id): precio
+        for salida_id, hotel_id, precio in PrecioCatalogoHotel.objects.filter(
+            salida_id__in=salidas, hotel_id__in=set(hoteles.values())
+        ).values_list("salida_id", "hotel_id", "precio_catalogo")
+    }
+
+    for salida_id, habitacion_id in pares:
+        if (salida_id, habitacion_id) in por_habitacion:
+            precio, fuente = por_habitacion[(salida_id, habitacion_id)], "habitacion"
+        elif (salida_id, hoteles.get(habitacion_id)) in por_hotel:
+            precio, fuente = por_hotel[(salida_id, hoteles[habitacion_id])], "hotel"
+        else:
+            precio, fuente = Decimal("0"), "sin_catalogo"
+        Reserva.objects.filter(salida_id=salida_id, habitacion_id=habitacion_id).update(
+            precio_resuelto=precio,
+            precio_resuelto_fuente=fuente,
+            precio_resuelto_moneda_id=monedas.get(salida_id) if fuente != "sin_catalogo" else None,
+        )
+
+    # Reservas sin salida o sin habitación: no tienen precio de catálogo
+    sin_par = Reserva.objects.filter(precio_resuelto_fuente__isnull=True).update(
+        precio_resuelto=Decimal("0"),
+        precio_resuelto_fuente="sin_catalogo",
+    )
+
+    print(f"\n  [0022] Pares salida/habitación resueltos: {len(pares)} (reservas sin salida/habitación: {sin_par})")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotel', '0016_alter_habitacion_moneda_nullable'),
+        ('moneda', '0002_cotizacionmoneda_and_more'),
+        ('paquete', '0027_bloqueocupo'),
+        ('reserva', '0021_pasajeroledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reserva',
+            name='precio_resuelto',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Precio de catálogo por pasajero resuelto al reservar (salida + habitación). Se usa cuando no hay precio_unitario', max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='reserva',
+            name='precio_resuelto_fuente',
+            field=models.CharField(blank=True, choices=[('habitacion', 'Precio de catálogo de la habitación'), ('hotel', 'Precio de catálogo del hotel'), ('sin_catalogo', 'Sin precio de catálogo')], help_text='Origen de precio_resuelto. NULL = todavía no resuelto', max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='reserva',
+            name='precio_resuelto_moneda',
+            field=models.ForeignKey(blank=True, help_text='Moneda de precio_resuelto (la de la salida)', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='moneda.moneda'),
+        ),
+        migrations.RunPython(resolver_precios, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-17 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reserva', '0022_reserva_precio_resuelto'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['fecha_reserva', 'id'], name='reserva_fecha_id_idx'),
+        ),
+    ]
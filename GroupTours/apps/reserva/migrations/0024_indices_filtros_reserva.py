@@ -0,0 +1,64 @@
+# Generated by Django 4.2 on 2026-10-17 04:33
+
+from django.db import migrations, models
+
+
+# Búsquedas icontains (ReservaFilter.filter_busqueda). Django las traduce a
+# UPPER(col::text) LIKE UPPER('%texto%'), que un btree no puede resolver:
+# índices GIN de trigramas (pg_trgm) sobre esa misma expresión.
+INDICES_TRIGRAM = [
+    ("reserva", "Reserva", "codigo"),
+    ("reserva", "Reserva", "observacion"),
+    ("persona", "Persona", "documento"),
+    ("persona", "PersonaFisica", "nombre"),
+    ("persona", "PersonaFisica", "apellido"),
+    ("paquete", "Paquete", "nombre"),
+]
+
+
+def _indices_trigram(apps):
+    for app_label, modelo, campo in INDICES_TRIGRAM:
+        model = apps.get_model(app_label, modelo)
+        tabla = model._meta.db_table
+        columna = model._meta.get_field(campo).column
+        yield f"{tabla}_{columna}_trgm".lower(), tabla, columna
+
+
+def crear_indices_trigram(apps, schema_editor):
+    # Solo PostgreSQL (en otros motores las búsquedas quedan como estaban)
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    q = schema_editor.quote_name
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for nombre, tabla, columna in _indices_trigram(apps):
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {q(nombre)} ON {q(tabla)} USING gin (UPPER({q(columna)}::text) gin_trgm_ops)"
+        )
+
+
+def eliminar_indices_trigram(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for nombre, _, _ in _indices_trigram(apps):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(nombre)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persona', '0005_alter_personafisica_options_and_more'),
+        ('paquete', '0027_bloqueocupo'),
+        ('reserva', '0023_reserva_fecha_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['estado', 'fecha_reserva'], name='reserva_activa_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['salida', 'estado'], name='reserva_salida_activa_idx'),
+        ),
+        migrations.RunPython(crear_indices_trigram, eliminar_indices_trigram),
+    ]
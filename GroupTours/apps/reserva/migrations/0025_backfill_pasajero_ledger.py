@@ -0,0 +1,103 @@
+# Generated by Django 4.2 on 2026-10-17 18:20
+
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Exists, OuterRef, Q, Sum, Value
+from django.db.models.functions import Concat
+
+
+LOTE = 500
+
+
+def crear_ledgers_faltantes(apps, schema_editor):
+    """
+    Crea el PasajeroLedger de los pasajeros que aún no lo tienen, calculado
+    desde el origen (distribuciones, facturas y notas de crédito).
+
+    Replica calcular_ledger_desde_origen() con los modelos históricos, para
+    que la migración no dependa del código vigente de apps.reserva.services.
+    """
+    Pasajero = apps.get_model('reserva', 'Pasajero')
+    PasajeroLedger = apps.get_model('reserva', 'PasajeroLedger')
+    ComprobantePago = apps.get_model('comprobante', 'ComprobantePago')
+    ComprobantePagoDistribucion = apps.get_model('comprobante', 'ComprobantePagoDistribucion')
+    NotaCreditoElectronica = apps.get_model('facturacion', 'NotaCreditoElectronica')
+
+    faltantes = list(
+        Pasajero.objects.filter(ledger__isnull=True).values_list('id', 'precio_asignado')
+    )
+    creados = 0
+
+    for inicio in range(0, len(faltantes), LOTE):
+        lote = dict(faltantes[inicio:inicio + LOTE])
+        totales = {
+            pid: {
+                'monto_pagado': Decimal('0'),
+                'monto_reembolsado': Decimal('0'),
+                'monto_acreditado': Decimal('0'),
+            }
+            for pid in lote
+        }
+
+        # 1. Distribuciones de comprobantes activos (las devoluciones son negativas)
+        distribuciones = ComprobantePagoDistribucion.objects.filter(
+            pasajero_id__in=lote,
+            comprobante__activo=True
+        ).values('pasajero_id').annotate(
+            pagado=Sum('monto', filter=Q(monto__gt=0)),
+            reembolsado=Sum('monto', filter=Q(monto__lt=0)),
+        )
+        for fila in distribuciones:
+            totales[fila['pasajero_id']]['monto_pagado'] = fila['pagado'] or Decimal('0')
+            totales[fila['pasajero_id']]['monto_reembolsado'] = -(fila['reembolsado'] or Decimal('0'))
+
+        # 2. NC activas de facturas activas del pasajero SIN comprobante de devolución
+        devolucion_nc = ComprobantePago.objects.filter(
+            reserva_id=OuterRef('factura_afectada__pasajero__reserva_id'),
+            tipo='devolucion',
+            activo=True,
+            referencia=Concat(Value('NC: '), OuterRef('numero_nota_credito')),
+        )
+        creditos = NotaCreditoElectronica.objects.filter(
+            factura_afectada__pasajero_id__in=lote,
+            factura_afectada__activo=True,
+            activo=True,
+        ).exclude(
+            Exists(devolucion_nc)
+        ).values('factura_afectada__pasajero_id').annotate(
+            acreditado=Sum('total_general')
+        )
+        for fila in creditos:
+            totales[fila['factura_afectada__pasajero_id']]['monto_acreditado'] = fila['acreditado'] or Decimal('0')
+
+        ledgers = []
+        for pid, precio_asignado in lote.items():
+            montos = totales[pid]
+            neto = max(
+                montos['monto_pagado'] - montos['monto_reembolsado'] - montos['monto_acreditado'],
+                Decimal('0')
+            )
+            ledgers.append(PasajeroLedger(
+                pasajero_id=pid,
+                saldo_pendiente=precio_asignado - neto if precio_asignado else Decimal('0'),
+                **montos
+            ))
+        PasajeroLedger.objects.bulk_create(ledgers)
+        creados += len(ledgers)
+
+    if creados:
+        print(f"[MIGRACIÓN] Se crearon {creados} ledgers de pasajeros.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reserva', '0024_indices_filtros_reserva'),
+        ('comprobante', '0004_comprobantepago_reserva_tipo_idx'),
+        ('facturacion', '0023_indices_filtros_facturacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_ledgers_faltantes, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from decimal import Decimal
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.core.exceptions import ValidationError
 from django.utils.timezone import now
 from apps.paquete.models import CupoHabitacionSalida, Paquete, SalidaPaquete
@@ -9,6 +10,50 @@ from apps.servicio.models import Servicio
 from apps.hotel.models import Hotel, Habitacion
 
 
+class ReservaQuerySet(models.QuerySet):
+    """QuerySet de Reserva con anotaciones reutilizables para listados."""
+
+    def with_financials(self):
+        """
+        Anota los montos financieros de cada reserva con subconsultas, para
+        serializar una página de reservas con una cantidad fija de consultas.
+
+        Anotaciones agregadas (además de las de anotar_predicados_estado()):
+            _monto_sena: suma de comprobantes activos de tipo seña
+            _monto_pagos_adicionales: suma de comprobantes activos pago_parcial/pago_total
+            _monto_devoluciones: suma de comprobantes activos de tipo devolución
+
+        Los valores reflejan la base de datos al momento de la consulta: no
+        usar instancias anotadas para operaciones que luego modifiquen pagos.
+
+        Returns:
+            QuerySet[Reserva]: Queryset anotado (con select_related de la salida)
+        """
+        from django.db.models import DecimalField, OuterRef, Subquery, Sum, Value
+        from django.db.models.functions import Coalesce
+        from apps.comprobante.models import ComprobantePago
+        from .services import anotar_predicados_estado
+
+        decimal_field = DecimalField(max_digits=14, decimal_places=2)
+        cero = Value(Decimal('0'), output_field=decimal_field)
+        comprobantes = ComprobantePago.objects.filter(reserva=OuterRef('pk'), activo=True)
+
+        def _sumar(qs):
+            return Coalesce(
+                Subquery(
+                    qs.order_by().values('reserva').annotate(t=Sum('monto')).values('t'),
+                    output_field=decimal_field
+                ),
+                cero
+            )
+
+        return anotar_predicados_estado(self.select_related('salida')).annotate(
+            _monto_sena=_sumar(comprobantes.filter(tipo='sena')),
+            _monto_pagos_adicionales=_sumar(comprobantes.filter(tipo__in=['pago_parcial', 'pago_total'])),
+            _monto_devoluciones=_sumar(comprobantes.filter(tipo='devolucion')),
+        )
+
+
 class Reserva(models.Model):
     """
     Representa una reserva de cupos en un paquete turístico.
@@ -32,6 +77,12 @@ class Reserva(models.Model):
         ("credito", "Crédito"),
     ]
 
+    FUENTES_PRECIO = [
+        ("habitacion", "Precio de catálogo de la habitación"),
+        ("hotel", "Precio de catálogo del hotel"),
+        ("sin_catalogo", "Sin precio de catálogo"),
+    ]
+
     MOTIVOS_CANCELACION = [
         ('1', 'Cancelación voluntaria del cliente'),
         ('2', 'Cambio de planes del cliente'),
@@ -105,6 +156,28 @@ class Reserva(models.Model):
         blank=True,
         help_text="Precio acordado por pasajero al momento de la reserva (incluye habitación + ganancia/comisión + servicios base del paquete)"
     )
+    precio_resuelto = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Precio de catálogo por pasajero resuelto al reservar (salida + habitación). Se usa cuando no hay precio_unitario"
+    )
+    precio_resuelto_fuente = models.CharField(
+        max_length=20,
+        choices=FUENTES_PRECIO,
+        null=True,
+        blank=True,
+        help_text="Origen de precio_resuelto. NULL = todavía no resuelto"
+    )
+    precio_resuelto_moneda = models.ForeignKey(
+        "moneda.Moneda",
+        on_delete=models.PROTECT,
+        related_name="+",
+        null=True,
+        blank=True,
+        help_text="Moneda de precio_resuelto (la de la salida)"
+    )
     estado = models.CharField(
         max_length=20,
         choices=ESTADOS,
@@ -151,16 +224,160 @@ class Reserva(models.Model):
         help_text="Indica si los cupos asociados a la reserva ya fueron liberados"
     )
 
+    objects = ReservaQuerySet.as_manager()
+
+    # Campos que determinan el aporte de la reserva a los contadores de
+    # ocupación de su salida (SalidaPaquete.cupos_ocupados / reservas_activas)
+    CAMPOS_OCUPACION = ("salida", "activo", "estado", "cantidad_pasajeros")
+
+    # Campos del precio de catálogo resuelto (se recalculan si cambia la salida o la habitación)
+    CAMPOS_PRECIO_RESUELTO = ("precio_resuelto", "precio_resuelto_fuente", "precio_resuelto_moneda")
+
     class Meta:
         verbose_name = "Reserva"
         verbose_name_plural = "Reservas"
         db_table = "Reserva"
+        indexes = [
+            # Ordenamiento y paginación por cursor (fecha_reserva, id)
+            models.Index(fields=["fecha_reserva", "id"], name="reserva_fecha_id_idx"),
+            # Listados y reportes: activo=True + estado, ordenados por fecha
+            models.Index(
+                fields=["estado", "fecha_reserva"],
+                name="reserva_activa_estado_idx",
+                condition=models.Q(activo=True),
+            ),
+            # Ocupación de salidas: salida + activo=True + estado
+            models.Index(
+                fields=["salida", "estado"],
+                name="reserva_salida_activa_idx",
+                condition=models.Q(activo=True),
+            ),
+        ]
 
     def __str__(self):
         return f"Reserva {self.codigo} - Titular: {self.titular} ({self.paquete.nombre})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._ocupacion_guardada = instance._valores_ocupacion()
+        instance._clave_precio_guardada = instance._clave_precio()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        # Los valores guardados se vuelven a leer en el próximo save() que los necesite
+        self._ocupacion_guardada = None
+        self._clave_precio_guardada = self._clave_precio()
+
+    def _valores_ocupacion(self):
+        """Valores actuales de CAMPOS_OCUPACION (None si alguno está diferido)."""
+        diferidos = self.get_deferred_fields()
+        campos = [self._meta.get_field(nombre) for nombre in self.CAMPOS_OCUPACION]
+        if any(campo.attname in diferidos for campo in campos):
+            return None
+        return {campo.name: getattr(self, campo.attname) for campo in campos}
+
+    @staticmethod
+    def _aporte_ocupacion(valores):
+        """(salida_id, pasajeros) que la reserva suma a su salida, o None si no suma."""
+        if not valores or not valores["salida"]:
+            return None
+        if not valores["activo"] or valores["estado"] == "cancelada":
+            return None
+        return valores["salida"], valores["cantidad_pasajeros"] or 0
+
+    def _afecta_ocupacion(self, update_fields):
+        return update_fields is None or bool(set(update_fields) & set(self.CAMPOS_OCUPACION))
+
+    def _ocupacion_previa(self):
+        """Valores de CAMPOS_OCUPACION guardados en la base de datos (antes de guardar)."""
+        previa = getattr(self, "_ocupacion_guardada", None)
+        if previa is None:
+            previa = Reserva.objects.filter(pk=self.pk).values(*self.CAMPOS_OCUPACION).first()
+        return previa
+
+    def _sincronizar_ocupacion(self, anteriores, update_fields=None):
+        """
+        Ajusta los contadores de ocupación de la(s) salida(s) afectada(s) por
+        un guardado, comparando el aporte anterior de la reserva con el nuevo.
+
+        Args:
+            anteriores (dict): Valores de CAMPOS_OCUPACION antes de guardar (None si es nueva)
+            update_fields (iterable): update_fields del guardado
+        """
+        actuales = self._valores_ocupacion()
+        if actuales is None:
+            # Algún campo diferido: tomar los valores recién guardados
+            actuales = Reserva.objects.filter(pk=self.pk).values(*self.CAMPOS_OCUPACION).first()
+        elif update_fields is not None and anteriores:
+            # Solo cambian en la base de datos los campos incluidos en update_fields
+            actuales = {
+                campo: actuales[campo] if campo in update_fields else anteriores[campo]
+                for campo in self.CAMPOS_OCUPACION
+            }
+
+        aporte_anterior = self._aporte_ocupacion(anteriores)
+        aporte_actual = self._aporte_ocupacion(actuales)
+        if aporte_anterior != aporte_actual:
+            if aporte_anterior:
+                SalidaPaquete.ajustar_ocupacion(aporte_anterior[0], -aporte_anterior[1], -1)
+            if aporte_actual:
+                SalidaPaquete.ajustar_ocupacion(aporte_actual[0], aporte_actual[1], 1)
+
+        self._ocupacion_guardada = actuales
+
+    def _clave_precio(self):
+        """(salida_id, habitacion_id) que determinan el precio resuelto (None si están diferidos)."""
+        if {"salida_id", "habitacion_id"} & self.get_deferred_fields():
+            return None
+        return self.salida_id, self.habitacion_id
+
+    def _debe_resolver_precio(self, es_nueva, update_fields):
+        """Indica si el guardado debe (re)resolver el precio de catálogo."""
+        if update_fields is not None and not {"salida", "habitacion"} & set(update_fields):
+            return False
+        clave = self._clave_precio()
+        if clave is None or "precio_resuelto_fuente" in self.get_deferred_fields():
+            return False
+        if es_nueva or self.precio_resuelto_fuente is None:
+            return True
+        return clave != getattr(self, "_clave_precio_guardada", clave)
+
+    def asignar_precio_resuelto(self, resuelto=None):
+        """
+        Asigna precio_resuelto, su fuente y su moneda (sin guardar).
+
+        Args:
+            resuelto (PrecioResuelto): Precio ya resuelto (ej: por
+                resolver_precios_catalogo() en lote). Si es None se resuelve
+                para la salida y habitación actuales.
+        """
+        from apps.paquete.services import SIN_PRECIO_CATALOGO, resolver_precios_catalogo
+
+        if resuelto is None:
+            clave = (self.salida_id, self.habitacion_id)
+            resuelto = resolver_precios_catalogo([clave]).get(clave, SIN_PRECIO_CATALOGO)
+
+        self.precio_resuelto = resuelto.precio
+        self.precio_resuelto_fuente = resuelto.fuente
+        self.precio_resuelto_moneda_id = resuelto.moneda_id
+        self._clave_precio_guardada = self._clave_precio()
+
     def save(self, *args, **kwargs):
         es_nueva = self._state.adding  # True si la reserva aún no fue guardada
+        update_fields = kwargs.get('update_fields')
+
+        # Precio de catálogo resuelto al reservar (o al cambiar salida/habitación)
+        if self._debe_resolver_precio(es_nueva, update_fields):
+            self.asignar_precio_resuelto()
+            if update_fields is not None:
+                update_fields = kwargs['update_fields'] = set(update_fields) | set(self.CAMPOS_PRECIO_RESUELTO)
+
+        sincronizar_ocupacion = self._afecta_ocupacion(update_fields)
+        ocupacion_previa = None
+        if sincronizar_ocupacion and not es_nueva:
+            ocupacion_previa = self._ocupacion_previa()
 
         # Auto-completar cantidad_pasajeros si no se especificó
         if self.cantidad_pasajeros is None and self.habitacion:
@@ -168,53 +385,60 @@ class Reserva(models.Model):
 
         # Generar código único si no existe
         if not self.codigo:
-            year = now().year
-            last_id = Reserva.objects.filter(fecha_reserva__year=year).count() + 1
-            self.codigo = f"RSV-{year}-{last_id:04d}"
+            from apps.secuencia.services import generar_codigo
+            self.codigo = generar_codigo('RSV')
 
-        # DESCUENTO DE CUPOS - SOLO PARA PAQUETES PROPIOS
-        # Para paquetes de distribuidora, los cupos están sujetos a verificación externa
-        if es_nueva and self.salida and self.habitacion and self.paquete.propio:
-            # 1. Determinar cantidad de habitaciones (siempre 1 por reserva)
-            cantidad_habitaciones = 1
+        with transaction.atomic():
+            # DESCUENTO DE CUPOS - SOLO PARA PAQUETES PROPIOS
+            # Para paquetes de distribuidora, los cupos están sujetos a verificación externa
+            if es_nueva and self.salida and self.habitacion and self.paquete.propio:
+                self._asignar_cupos()
 
-            # 2. Determinar capacidad de pasajeros (de la habitación)
-            capacidad_pasajeros = self.habitacion.tipo_habitacion.capacidad
+            super().save(*args, **kwargs)
 
-            # 3. Actualizar CupoHabitacionSalida (descontar habitaciones disponibles)
-            cupo_hab_salida = CupoHabitacionSalida.objects.filter(
-                salida=self.salida,
-                habitacion=self.habitacion
-            ).first()
+            if sincronizar_ocupacion:
+                self._sincronizar_ocupacion(ocupacion_previa, update_fields)
 
-            if cupo_hab_salida:
-                # Verificar que hay cupo suficiente de habitaciones
-                if cupo_hab_salida.cupo < cantidad_habitaciones:
-                    raise ValueError(
-                        f"No hay suficiente cupo disponible para la habitación '{self.habitacion.tipo_habitacion.nombre}'. "
-                        f"Disponibles: {cupo_hab_salida.cupo}, Solicitadas: {cantidad_habitaciones}"
-                    )
-                # Decrementar el cupo de la habitación
-                cupo_hab_salida.cupo -= cantidad_habitaciones
-                cupo_hab_salida.save(update_fields=['cupo'])
-            else:
-                raise ValueError(
-                    f"No se encontró configuración de cupo para la habitación '{self.habitacion.tipo_habitacion.nombre}' "
-                    f"en la salida seleccionada."
-                )
+    def _asignar_cupos(self):
+        """
+        Descuenta 1 habitación (CupoHabitacionSalida) y la capacidad de la
+        habitación en asientos (SalidaPaquete.cupo) con UPDATE condicionales,
+        dentro de la transacción del guardado de la reserva.
 
-            # 4. Actualizar SalidaPaquete.cupo (descontar capacidad de pasajeros)
-            if self.salida.cupo is not None:
-                if self.salida.cupo < capacidad_pasajeros:
-                    raise ValueError(
-                        f"No hay suficiente cupo de pasajeros en la salida. "
-                        f"Disponibles: {self.salida.cupo}, Solicitados: {capacidad_pasajeros}"
-                    )
-                self.salida.cupo -= capacidad_pasajeros
-                self.salida.save(update_fields=['cupo'])
+        Si la reserva trae `bloqueo_cupo_token` de un BloqueoCupo activo para
+        la misma salida y habitación, el cupo ya fue descontado al crear el
+        bloqueo y solo se consume.
 
+        Raises:
+            ValueError: Si no hay cupo suficiente (ver apps/paquete/services.py)
+        """
+        from apps.paquete.services import consumir_bloqueo_cupo, descontar_cupos
 
-        super().save(*args, **kwargs)
+        capacidad_pasajeros = self.habitacion.tipo_habitacion.capacidad
+
+        token = getattr(self, 'bloqueo_cupo_token', None)
+        if token and consumir_bloqueo_cupo(token, self.salida_id, self.habitacion_id):
+            return
+
+        descontar_cupos(
+            self.salida_id,
+            self.habitacion_id,
+            habitaciones=1,
+            pasajeros=capacidad_pasajeros,
+        )
+
+        # Mantener la instancia en memoria alineada con el descuento
+        if self.salida.cupo is not None:
+            self.salida.cupo -= capacidad_pasajeros
+
+    def delete(self, *args, **kwargs):
+        aporte = self._aporte_ocupacion(
+            Reserva.objects.filter(pk=self.pk).values(*self.CAMPOS_OCUPACION).first()
+        )
+        resultado = super().delete(*args, **kwargs)
+        if aporte:
+            SalidaPaquete.ajustar_ocupacion(aporte[0], -aporte[1], -1)
+        return resultado
 
 
     @property
@@ -358,15 +582,15 @@ class Reserva(models.Model):
             ).first()
 
             if cupo_hab_salida:
-                cupo_hab_salida.cupo += 1
-                cupo_hab_salida.save(update_fields=['cupo'])
+                # Incrementos atómicos: otra reserva puede estar modificando el mismo cupo
+                CupoHabitacionSalida.objects.filter(pk=cupo_hab_salida.pk).update(cupo=F('cupo') + 1)
                 cupo_actualizado = True
 
             if self.salida.cupo is not None:
                 capacidad = self.habitacion.tipo_habitacion.capacidad or self.cantidad_pasajeros or 0
                 if capacidad > 0:
-                    self.salida.cupo += capacidad
-                    self.salida.save(update_fields=['cupo'])
+                    SalidaPaquete.objects.filter(pk=self.salida_id).update(cupo=F('cupo') + capacidad)
+                    self.salida.refresh_from_db(fields=['cupo'])
                     cupo_actualizado = True
 
         if cupo_actualizado:
@@ -549,6 +773,20 @@ class Reserva(models.Model):
         - "Confirmado Completo": Pago total completo (100%) + Todos los pasajeros cargados
         - "Confirmado Incompleto": Cualquier otro caso (pago parcial, faltan pasajeros, o ambos)
         """
+        return self.describir_estado()
+
+    def describir_estado(self, totalmente_pagada=None):
+        """
+        Texto descriptivo del estado (ver estado_display).
+
+        Args:
+            totalmente_pagada (bool): Resultado ya conocido de esta_totalmente_pagada()
+                                      (ej: desde Reserva.objects.with_financials()).
+                                      Si es None, se calcula solo cuando hace falta.
+
+        Returns:
+            str: Texto del estado
+        """
         estados_base = {
             "pendiente": "Pendiente de seña",
             "confirmada": "Confirmado",
@@ -561,7 +799,9 @@ class Reserva(models.Model):
         # Agregar información de completitud si está confirmada
         if self.estado == "confirmada":
             # "Completo" solo si: pago total completo (100%) Y todos los pasajeros cargados
-            if self.esta_totalmente_pagada() and self.datos_completos:
+            if totalmente_pagada is None:
+                totalmente_pagada = self.esta_totalmente_pagada()
+            if totalmente_pagada and self.datos_completos:
                 return f"{estado_texto} Completo"
             else:
                 # "Incompleto" si: falta pago O faltan pasajeros O ambos
@@ -579,9 +819,9 @@ class Reserva(models.Model):
         Retorna Decimal con el precio total por pasajero.
         """
         from decimal import Decimal
-        from apps.paquete.models import PrecioCatalogoHabitacion, PrecioCatalogoHotel
+        from apps.paquete.services import SIN_PRECIO_CATALOGO, resolver_precios_catalogo
 
-        if not self.salida or not self.habitacion:
+        if not self.salida_id or not self.habitacion_id:
             return Decimal("0")
 
         # === PROPIOS Y DISTRIBUIDORAS — precio desde catálogo ===
@@ -634,29 +874,11 @@ class Reserva(models.Model):
         #     return (costo_habitacion + total_servicios + total_items_costo) * factor
         # ───────────────────────────────────────────────────────────────────────────────
 
-        # 1. Buscar precio específico de la habitación (prioridad)
-        precio_catalogo_hab = PrecioCatalogoHabitacion.objects.filter(
-            salida=self.salida,
-            habitacion=self.habitacion
-        ).first()
-
-        if precio_catalogo_hab:
-            precio_base = precio_catalogo_hab.precio_catalogo
-        else:
-            # 2. Buscar precio a nivel de hotel
-            precio_catalogo_hotel = PrecioCatalogoHotel.objects.filter(
-                salida=self.salida,
-                hotel=self.habitacion.hotel
-            ).first()
-
-            if precio_catalogo_hotel:
-                precio_base = precio_catalogo_hotel.precio_catalogo
-            else:
-                return Decimal("0")
-
+        # Precio específico de la habitación (prioridad) o, en su defecto, del hotel.
         # El precio de catálogo es el precio final — sin aplicar ningún factor.
         # ganancia% y comision% son informativos y no afectan el precio unitario.
-        return precio_base
+        clave = (self.salida_id, self.habitacion_id)
+        return resolver_precios_catalogo([clave]).get(clave, SIN_PRECIO_CATALOGO).precio
 
     def clean(self):
         """
@@ -689,22 +911,28 @@ class Reserva(models.Model):
     def costo_servicios_adicionales(self):
         """Suma total de todos los servicios adicionales activos"""
         from decimal import Decimal
-        total = sum(
-            sa.subtotal
-            for sa in self.servicios_adicionales.filter(activo=True)
-        )
+        # Usar los servicios precargados (listados y detalles) si existen
+        if "servicios_adicionales" in getattr(self, "_prefetched_objects_cache", {}):
+            servicios = [sa for sa in self.servicios_adicionales.all() if sa.activo]
+        else:
+            servicios = self.servicios_adicionales.filter(activo=True)
+        total = sum(sa.subtotal for sa in servicios)
         return Decimal(str(total)) if total else Decimal("0")
 
     @property
     def precio_base_paquete(self):
         """
         Obtiene el precio unitario acordado por pasajero.
-        Si no está definido, lo calcula dinámicamente basado en la habitación seleccionada.
+        Si no está definido, usa el precio de catálogo resuelto al reservar
+        (precio_resuelto); solo lo calcula si la reserva todavía no lo tiene.
         """
         if self.precio_unitario:
             return self.precio_unitario
 
-        # Si no hay precio_unitario guardado, calcularlo dinámicamente
+        if self.precio_resuelto_fuente:
+            return self.precio_resuelto or Decimal("0")
+
+        # Reserva sin precio resuelto (ver comando resolver_precios_reservas)
         return self.calcular_precio_unitario()
 
     @property
@@ -769,6 +997,29 @@ class Reserva(models.Model):
         )
 
 
+class PasajeroQuerySet(models.QuerySet):
+    """QuerySet de Pasajero: la creación en bloque también crea sus ledgers."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Inserta los pasajeros en bloque y crea, también en bloque, el
+        PasajeroLedger de cada uno (igual que Pasajero.save al crear).
+
+        Un pasajero recién creado no tiene distribuciones ni notas de crédito,
+        por lo que su ledger arranca en cero con saldo = precio asignado.
+        """
+        objs = super().bulk_create(objs, *args, **kwargs)
+        PasajeroLedger.objects.using(self.db).bulk_create(
+            [
+                PasajeroLedger(pasajero=pasajero, saldo_pendiente=pasajero.precio_asignado or 0)
+                for pasajero in objs
+                if pasajero.pk is not None
+            ],
+            batch_size=kwargs.get('batch_size')
+        )
+        return objs
+
+
 class Pasajero(models.Model):
     """
     Representa a un pasajero de una reserva.
@@ -814,6 +1065,8 @@ class Pasajero(models.Model):
     )
     fecha_registro = models.DateTimeField(auto_now_add=True)
 
+    objects = PasajeroQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Pasajero"
         verbose_name_plural = "Pasajeros"
@@ -834,10 +1087,41 @@ class Pasajero(models.Model):
                 # Fallback: usar precio_base_paquete (que calcula dinámicamente si es necesario)
                 self.precio_asignado = self.reserva.precio_base_paquete or Decimal("0")
 
+        es_nuevo = self._state.adding
         super().save(*args, **kwargs)
 
+        if es_nuevo:
+            # Todo pasajero nace con su ledger (aún sin pagos ni créditos)
+            PasajeroLedger.objects.create(pasajero=self, saldo_pendiente=self.precio_asignado or 0)
+            return
+
+        # Mantener el saldo del ledger alineado con el precio asignado
+        PasajeroLedger.objects.filter(pasajero_id=self.pk).update(
+            saldo_pendiente=PasajeroLedger.expresion_saldo(self.precio_asignado)
+        )
+        ledger = Pasajero.ledger.related.get_cached_value(self, default=None)
+        if ledger is not None:
+            ledger.refresh_from_db()
+
     @property
     def monto_pagado(self):
+        """
+        Monto efectivamente pagado por el pasajero.
+
+        Se lee del ledger materializado (PasajeroLedger), que se mantiene
+        incrementalmente al registrar distribuciones, anular comprobantes y
+        emitir notas de crédito. El ledger se crea junto con el pasajero; si
+        aun así no existe, se calcula desde el origen.
+
+        PROTECCIÓN: El monto pagado nunca será menor a 0, para evitar errores
+        cuando hay facturas mal generadas con NC incorrectas.
+        """
+        try:
+            return self.ledger.monto_neto
+        except PasajeroLedger.DoesNotExist:
+            return self.calcular_monto_pagado_desde_origen()
+
+    def calcular_monto_pagado_desde_origen(self):
         """
         Suma de todas las distribuciones de pago asociadas a este pasajero,
         menos las notas de crédito que NO tienen distribución de devolución.
@@ -851,45 +1135,18 @@ class Pasajero(models.Model):
 
         NOTA: Las NC reducen el monto efectivamente pagado por el pasajero,
         ya que representan devoluciones o acreditaciones de dinero.
-
-        PROTECCIÓN: El monto pagado nunca será menor a 0, para evitar errores
-        cuando hay facturas mal generadas con NC incorrectas.
         """
-        from decimal import Decimal
-        from apps.comprobante.models import ComprobantePago
+        from .services import calcular_ledger_desde_origen
+
+        totales = calcular_ledger_desde_origen([self.pk]).get(self.pk)
+        if not totales:
+            return Decimal("0")
 
-        # 1. Suma de TODAS las distribuciones (incluyendo devoluciones con monto negativo)
-        total_pagos = sum(
-            d.monto
-            for d in self.distribuciones_pago.filter(comprobante__activo=True)
+        monto_final = (
+            totales['monto_pagado']
+            - totales['monto_reembolsado']
+            - totales['monto_acreditado']
         )
-        
-        # Convertir a Decimal si sum retornó un int (lista vacía)
-        total_pagos_decimal = Decimal(str(total_pagos)) if total_pagos else Decimal("0")
-
-        # 2. Restar las NC que NO tienen comprobante de devolución asociado
-        from apps.facturacion.models import NotaCreditoElectronica
-        total_nc_sin_distribucion = Decimal("0")
-
-        for factura in self.facturas.filter(activo=True):
-            for nc in factura.notas_credito.filter(activo=True):
-                # Verificar si esta NC ya tiene un comprobante de devolución
-                tiene_comprobante_devolucion = ComprobantePago.objects.filter(
-                    reserva=self.reserva,
-                    tipo='devolucion',
-                    referencia=f"NC: {nc.numero_nota_credito}",
-                    activo=True
-                ).exists()
-
-                # Si NO tiene comprobante de devolución, restar la NC manualmente
-                if not tiene_comprobante_devolucion:
-                    total_nc_sin_distribucion += nc.total_general
-
-        # Monto pagado efectivo = distribuciones (con devoluciones negativas) - NC sin distribución
-        monto_final = total_pagos_decimal - total_nc_sin_distribucion
-
-        # PROTECCIÓN: El monto pagado no puede ser negativo
-        # Esto previene errores cuando hay facturas mal generadas con NC incorrectas
         return max(monto_final, Decimal("0"))
 
     @property
@@ -946,6 +1203,94 @@ class Pasajero(models.Model):
         return self.saldo_pendiente <= 0
 
 
+class PasajeroLedger(models.Model):
+    """
+    Estado de cuenta materializado de un pasajero.
+
+    Evita recalcular Pasajero.monto_pagado (distribuciones + facturas + NC)
+    en cada acceso. Se actualiza dentro de la misma transacción que el
+    movimiento que lo afecta:
+    - ComprobantePagoDistribucion: suma/resta en monto_pagado o monto_reembolsado
+    - Anulación de ComprobantePago: revierte sus distribuciones
+    - NotaCreditoElectronica: recalcula monto_acreditado
+
+    El comando `recalcular_ledger_pasajeros` lo reconstruye desde el origen
+    y reporta diferencias.
+    """
+
+    pasajero = models.OneToOneField(
+        Pasajero,
+        on_delete=models.CASCADE,
+        related_name="ledger",
+        help_text="Pasajero al que pertenece este estado de cuenta"
+    )
+    monto_pagado = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        help_text="Suma de distribuciones positivas de comprobantes activos"
+    )
+    monto_acreditado = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        help_text="Notas de crédito activas sin comprobante de devolución asociado"
+    )
+    monto_reembolsado = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        help_text="Suma (en positivo) de distribuciones de devolución de comprobantes activos"
+    )
+    saldo_pendiente = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        help_text="Precio asignado menos el monto neto pagado"
+    )
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Ledger de Pasajero"
+        verbose_name_plural = "Ledgers de Pasajeros"
+        db_table = "PasajeroLedger"
+
+    def __str__(self):
+        return f"Ledger pasajero {self.pasajero_id} - Neto: {self.monto_neto}"
+
+    @property
+    def monto_neto(self):
+        """Monto efectivamente pagado (nunca menor a 0)"""
+        neto = self.monto_pagado - self.monto_reembolsado - self.monto_acreditado
+        return max(neto, Decimal("0"))
+
+    @staticmethod
+    def expresion_saldo(precio_asignado):
+        """
+        Expresión SQL del saldo pendiente a partir de las columnas del ledger.
+        Replica Pasajero.saldo_pendiente: sin precio asignado el saldo es 0.
+        """
+        from django.db.models import ExpressionWrapper, F, Value
+        from django.db.models.functions import Greatest
+
+        decimal_field = models.DecimalField(max_digits=12, decimal_places=2)
+        if not precio_asignado:
+            return Value(Decimal("0"), output_field=decimal_field)
+
+        neto = Greatest(
+            ExpressionWrapper(
+                F('monto_pagado') - F('monto_reembolsado') - F('monto_acreditado'),
+                output_field=decimal_field
+            ),
+            Value(Decimal("0"), output_field=decimal_field),
+            output_field=decimal_field
+        )
+        return ExpressionWrapper(
+            Value(precio_asignado, output_field=decimal_field) - neto,
+            output_field=decimal_field
+        )
+
+
 class ReservaServiciosAdicionales(models.Model):
     """
     Representa servicios adicionales contratados para una reserva,
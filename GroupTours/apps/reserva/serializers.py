@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Reserva, Pasajero, ReservaServiciosAdicionales
+from .services import completar_pasajeros_pendientes
 from apps.persona.models import PersonaFisica
 from apps.paquete.models import SalidaPaquete
 from apps.paquete.serializers import PaqueteSerializer
@@ -137,6 +138,37 @@ class PasajeroSerializer(serializers.ModelSerializer):
             "esta_totalmente_pagado",
         ]
 
+    def _snapshot_reserva(self, obj):
+        """
+        ReservaFinancialSnapshot de la reserva del pasajero, si se está
+        serializando dentro del detalle de la reserva (ReservaDetalleSerializer).
+        """
+        return self.context.get('snapshots_financieros', {}).get(obj.reserva_id)
+
+    def _factura_individual(self, obj):
+        """Factura individual activa del pasajero (del snapshot si está disponible)."""
+        snapshot = self._snapshot_reserva(obj)
+        if snapshot is not None:
+            return snapshot.facturas_individuales.get(obj.pk)
+
+        return obj.facturas.filter(
+            tipo_facturacion='por_pasajero',
+            activo=True
+        ).first()
+
+    def _nota_credito_individual(self, obj, factura):
+        """Nota de crédito activa más reciente de la factura individual del pasajero."""
+        from apps.facturacion.models import NotaCreditoElectronica
+
+        snapshot = self._snapshot_reserva(obj)
+        if snapshot is not None:
+            return snapshot.nota_credito_activa(factura)
+
+        return NotaCreditoElectronica.objects.filter(
+            factura_afectada=factura,
+            activo=True
+        ).order_by('-fecha_emision').first()
+
     def get_voucher_id(self, obj):
         """
         Obtiene el ID del voucher asociado al pasajero.
@@ -193,10 +225,7 @@ class PasajeroSerializer(serializers.ModelSerializer):
             return None
 
         # Buscar factura individual activa
-        factura = obj.facturas.filter(
-            tipo_facturacion='por_pasajero',
-            activo=True
-        ).first()
+        factura = self._factura_individual(obj)
 
         return factura.id if factura else None
 
@@ -212,18 +241,13 @@ class PasajeroSerializer(serializers.ModelSerializer):
             return False
 
         # Verificar si existe factura individual activa
-        return obj.facturas.filter(
-            tipo_facturacion='por_pasajero',
-            activo=True
-        ).exists()
+        return self._factura_individual(obj) is not None
 
     def get_nota_credito_individual_ya_generada(self, obj):
         """
         Indica si la factura individual del pasajero ya tiene nota de crédito generada.
         Retorna True si existe al menos una NC activa, False en caso contrario.
         """
-        from apps.facturacion.models import NotaCreditoElectronica
-
         reserva = obj.reserva
 
         # Solo aplica si es modalidad individual
@@ -231,27 +255,19 @@ class PasajeroSerializer(serializers.ModelSerializer):
             return False
 
         # Buscar factura individual activa del pasajero
-        factura = obj.facturas.filter(
-            tipo_facturacion='por_pasajero',
-            activo=True
-        ).first()
+        factura = self._factura_individual(obj)
 
         if not factura:
             return False
 
         # Verificar si la factura tiene al menos una nota de crédito activa
-        return NotaCreditoElectronica.objects.filter(
-            factura_afectada=factura,
-            activo=True
-        ).exists()
+        return self._nota_credito_individual(obj, factura) is not None
 
     def get_nota_credito_individual_id(self, obj):
         """
         Obtiene el ID de la primera nota de crédito activa de la factura individual del pasajero.
         Retorna None si no existe NC o no aplica.
         """
-        from apps.facturacion.models import NotaCreditoElectronica
-
         reserva = obj.reserva
 
         # Solo aplica si es modalidad individual
@@ -259,19 +275,13 @@ class PasajeroSerializer(serializers.ModelSerializer):
             return None
 
         # Buscar factura individual activa del pasajero
-        factura = obj.facturas.filter(
-            tipo_facturacion='por_pasajero',
-            activo=True
-        ).first()
+        factura = self._factura_individual(obj)
 
         if not factura:
             return None
 
         # Obtener la primera nota de crédito activa (ordenada por fecha de emisión desc)
-        nota_credito = NotaCreditoElectronica.objects.filter(
-            factura_afectada=factura,
-            activo=True
-        ).order_by('-fecha_emision').first()
+        nota_credito = self._nota_credito_individual(obj, factura)
 
         return nota_credito.id if nota_credito else None
 
@@ -290,6 +300,39 @@ class PasajeroCreateSerializer(serializers.Serializer):
         return value
 
 
+class PasajeroImportacionSerializer(serializers.Serializer):
+    """
+    Valida una fila del archivo de importación de pasajeros (ver importacion.py).
+    tipo_documento y nacionalidad vienen por nombre (o código alpha-2) y se
+    resuelven en bloque al importar.
+    """
+    documento = serializers.CharField(max_length=50)
+    nombre = serializers.CharField(max_length=100)
+    apellido = serializers.CharField(max_length=100, required=False)
+    email = serializers.EmailField(required=False)
+    telefono = serializers.CharField(max_length=30, required=False)
+    fecha_nacimiento = serializers.DateField(
+        required=False,
+        input_formats=['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y']
+    )
+    sexo = serializers.CharField(required=False)
+    tipo_documento = serializers.CharField(required=False)
+    nacionalidad = serializers.CharField(required=False)
+
+    def validate_documento(self, value):
+        """Los documentos _PEND están reservados para los pasajeros "Por Asignar" """
+        if '_PEND' in value.upper():
+            raise serializers.ValidationError("El documento no puede contener '_PEND'")
+        return value
+
+    def validate_sexo(self, value):
+        """Acepta F/M o Femenino/Masculino"""
+        sexo = value.strip().upper()[:1]
+        if sexo not in dict(PersonaFisica.GENEROS):
+            raise serializers.ValidationError("Sexo inválido (usar F o M)")
+        return sexo
+
+
 class ReservaSerializer(serializers.ModelSerializer):
     titular = PersonaFisicaSimpleSerializer(read_only=True)
     pasajeros = PasajeroSerializer(many=True, read_only=True)
@@ -336,6 +379,14 @@ class ReservaSerializer(serializers.ModelSerializer):
         help_text="Si es True, el titular se agrega automáticamente como pasajero. Default: True"
     )
     
+    # Token de un bloqueo de cupo (POST /api/paquete/salidas/{id}/bloqueos-cupo/)
+    bloqueo_cupo_token = serializers.UUIDField(
+        write_only=True,
+        required=False,
+        allow_null=True,
+        help_text="Token de un bloqueo de cupo activo: la reserva usa el cupo retenido en lugar de descontarlo"
+    )
+
     # Bandera para forzar recálculo de precio en actualizaciones
     recalcular_precio = serializers.BooleanField(
         write_only=True,
@@ -458,6 +509,7 @@ class ReservaSerializer(serializers.ModelSerializer):
             "pasajeros",
             "pasajeros_data",
             "titular_como_pasajero",
+            "bloqueo_cupo_token",
             "recalcular_precio",
             "activo",
             "fecha_modificacion",
@@ -671,12 +723,22 @@ class ReservaSerializer(serializers.ModelSerializer):
         # Extraer la bandera recalcular_precio (no es parte del modelo, solo del serializer)
         validated_data.pop("recalcular_precio", None)
 
+        bloqueo_cupo_token = validated_data.pop("bloqueo_cupo_token", None)
+
         estado_manual = validated_data.get("estado", None)
-        instance = super().create(validated_data)
 
-        # Calcular precio_unitario automáticamente si no se proporcionó
-        if not instance.precio_unitario and instance.salida and instance.habitacion:
-            instance.precio_unitario = instance.calcular_precio_unitario()
+        # El descuento de cupo ocurre en Reserva.save(): si no hay cupo se
+        # informa como error de validación (sin reserva creada)
+        instance = Reserva(**validated_data)
+        instance.bloqueo_cupo_token = bloqueo_cupo_token
+        try:
+            instance.save(force_insert=True)
+        except ValueError as e:
+            raise serializers.ValidationError({'cupo': str(e)})
+
+        # Usar el precio de catálogo resuelto al guardar si no se proporcionó precio_unitario
+        if not instance.precio_unitario and instance.salida_id and instance.habitacion_id:
+            instance.precio_unitario = instance.precio_resuelto
             instance.save(update_fields=["precio_unitario"])
 
         # Si se especificó titular_id Y la bandera titular_como_pasajero es True, agregarlo como pasajero
@@ -701,6 +763,9 @@ class ReservaSerializer(serializers.ModelSerializer):
                 es_titular=False
             )
 
+        # Completar con pasajeros "Por Asignar N" hasta cantidad_pasajeros (en bloque)
+        completar_pasajeros_pendientes(Reserva.objects.filter(pk=instance.pk))
+
         if not estado_manual:  # si no se pasó manualmente
             instance.actualizar_estado()
 
@@ -709,6 +774,7 @@ class ReservaSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         # Extraer pasajeros_data si existe (para updates, no se actualizan pasajeros aquí)
         validated_data.pop("pasajeros_data", None)
+        validated_data.pop("bloqueo_cupo_token", None)
         
         # Extraer bandera de recálculo antes de actualizar
         recalcular_precio_solicitado = validated_data.pop("recalcular_precio", False)
@@ -721,14 +787,22 @@ class ReservaSerializer(serializers.ModelSerializer):
         ])
 
         estado_manual = validated_data.get("estado", None)
+        cantidad_anterior = instance.cantidad_pasajeros
+        titular_anterior = instance.titular_id
         instance = super().update(instance, validated_data)
+
+        # Si cambió la cantidad de pasajeros (o el titular), crear los "Por Asignar N" que falten
+        if (instance.cantidad_pasajeros, instance.titular_id) != (cantidad_anterior, titular_anterior):
+            completar_pasajeros_pendientes(Reserva.objects.filter(pk=instance.pk))
         
         # Recalcular precio si se solicita explícitamente O si cambiaron campos relevantes
-        if (recalcular_precio_solicitado or campos_precio_cambiaron) and instance.salida and instance.habitacion:
-            precio_recalculado = instance.calcular_precio_unitario()
-            if precio_recalculado:
-                instance.precio_unitario = precio_recalculado
-                instance.save(update_fields=['precio_unitario'])
+        # (al cambiar salida/habitación, save() ya volvió a resolver precio_resuelto)
+        if (recalcular_precio_solicitado or campos_precio_cambiaron) and instance.salida_id and instance.habitacion_id:
+            if recalcular_precio_solicitado:
+                instance.asignar_precio_resuelto()
+            if instance.precio_resuelto:
+                instance.precio_unitario = instance.precio_resuelto
+                instance.save(update_fields=['precio_unitario', *Reserva.CAMPOS_PRECIO_RESUELTO])
         
         if not estado_manual:  # si no se pasó manualmente
             instance.actualizar_estado()
@@ -745,11 +819,14 @@ class ReservaSerializer(serializers.ModelSerializer):
         """
         representation = super().to_representation(instance)
 
-        # Obtener los pasajeros ordenados
-        pasajeros_ordenados = instance.pasajeros.order_by(
-            '-es_titular',      # Primero el titular (True antes que False)
-            'por_asignar',      # Luego los reales (False antes que True)
-            'id'                # En caso de empate, ordenar por ID
+        # Ordenar en memoria para aprovechar los pasajeros precargados
+        pasajeros_ordenados = sorted(
+            instance.pasajeros.all(),
+            key=lambda p: (
+                not p.es_titular,   # Primero el titular (True antes que False)
+                p.por_asignar,      # Luego los reales (False antes que True)
+                p.id                # En caso de empate, ordenar por ID
+            )
         )
 
         # Serializar los pasajeros ordenados
@@ -1010,10 +1087,60 @@ class PasajeroEstadoCuentaSerializer(serializers.ModelSerializer):
         return historial
 
 
+class ReservaListadoListSerializer(serializers.ListSerializer):
+    """
+    Serializa una página de reservas convirtiendo a guaraníes todos los montos
+    de la página en lote (convertir_lote, una carga de cotizaciones por moneda)
+    en lugar de consultar la cotización fila por fila.
+    """
+    CAMPOS_EN_GUARANIES = {
+        'precio_unitario': 'precio_unitario_en_guaranies',
+        'costo_total_estimado': 'costo_total_estimado_en_guaranies',
+    }
+
+    def to_representation(self, data):
+        from collections import defaultdict
+        from decimal import Decimal
+        from apps.moneda.services import convertir_lote
+
+        reservas = list(data.all() if hasattr(data, 'all') else data)
+
+        self.child._conversion_en_lote = True
+        try:
+            representaciones = super().to_representation(reservas)
+        finally:
+            self.child._conversion_en_lote = False
+
+        # Agrupar montos por moneda: [(representacion, campo_origen, monto)]
+        pendientes = defaultdict(list)
+        monedas = {}
+        for reserva, representacion in zip(reservas, representaciones):
+            moneda = reserva.paquete.moneda if reserva.paquete else None
+            for origen, destino in self.CAMPOS_EN_GUARANIES.items():
+                monto = representacion.get(origen)
+                monto = Decimal(str(monto)) if monto is not None else None
+                if not monto or moneda is None:
+                    representacion[destino] = None
+                    continue
+                monedas[moneda.pk] = moneda
+                pendientes[moneda.pk].append((representacion, destino, monto))
+
+        for moneda_id, items in pendientes.items():
+            convertidos = convertir_lote([monto for _, _, monto in items], monedas[moneda_id])
+            for (representacion, destino, _), convertido in zip(items, convertidos):
+                representacion[destino] = convertido
+
+        return representaciones
+
+
 class ReservaListadoSerializer(serializers.ModelSerializer):
     """
     Serializer optimizado para listar reservas con información mínima necesaria.
     Ideal para listados, tablas y vistas de resumen.
+
+    Con reservas obtenidas de Reserva.objects.with_financials() los montos y
+    el estado se leen de las anotaciones (sin consultas por fila); con
+    cualquier otra reserva se calculan con las propiedades del modelo.
     """
     # Titular
     titular_nombre = serializers.SerializerMethodField()
@@ -1030,17 +1157,18 @@ class ReservaListadoSerializer(serializers.ModelSerializer):
 
     # Campos calculados
     precio_unitario = serializers.DecimalField(
-        source='precio_base_paquete',
+        source='_financieros_listado.precio_unitario',
         max_digits=12,
         decimal_places=2,
         read_only=True
     )
     costo_total_estimado = serializers.DecimalField(
+        source='_financieros_listado.costo_total_estimado',
         max_digits=12,
         decimal_places=2,
         read_only=True
     )
-    estado_display = serializers.CharField(read_only=True)
+    estado_display = serializers.SerializerMethodField()
 
     # Condición de pago
     condicion_pago_display = serializers.CharField(
@@ -1083,6 +1211,32 @@ class ReservaListadoSerializer(serializers.ModelSerializer):
             'motivo_cancelacion',
             'monto_reembolsable',
         ]
+        list_serializer_class = ReservaListadoListSerializer
+
+    def to_representation(self, instance):
+        instance._financieros_listado = self.obtener_financieros(instance)
+        return super().to_representation(instance)
+
+    @staticmethod
+    def obtener_financieros(obj):
+        """
+        Montos del listado: desde las anotaciones de with_financials() si están
+        presentes; si no, desde el modelo (totalmente_pagada queda en None y
+        se calcula solo si el estado lo requiere).
+        """
+        if hasattr(obj, '_monto_devoluciones'):
+            from .services import calcular_financieros_listado
+            return calcular_financieros_listado(obj)
+
+        return {
+            'precio_unitario': obj.precio_base_paquete,
+            'costo_total_estimado': obj.costo_total_estimado,
+            'monto_reembolsable': obj.calcular_montos_cancelacion()['monto_reembolsable'],
+            'totalmente_pagada': None,
+        }
+
+    def get_estado_display(self, obj):
+        return obj.describir_estado(obj._financieros_listado['totalmente_pagada'])
 
     def get_titular_nombre(self, obj):
         """Nombre completo del titular"""
@@ -1128,11 +1282,15 @@ class ReservaListadoSerializer(serializers.ModelSerializer):
         Si ya está en guaraníes, retorna el mismo valor.
         Si no hay cotización vigente, retorna None.
         """
+        # En listados la conversión se hace en lote (ReservaListadoListSerializer)
+        if getattr(self, '_conversion_en_lote', False):
+            return None
+
         from apps.moneda.models import CotizacionMoneda
         from django.core.exceptions import ValidationError
         from decimal import Decimal
 
-        precio_unitario = obj.precio_base_paquete
+        precio_unitario = obj._financieros_listado['precio_unitario']
         if not precio_unitario or precio_unitario == Decimal("0"):
             return None
 
@@ -1157,11 +1315,15 @@ class ReservaListadoSerializer(serializers.ModelSerializer):
         Si ya está en guaraníes, retorna el mismo valor.
         Si no hay cotización vigente, retorna None.
         """
+        # En listados la conversión se hace en lote (ReservaListadoListSerializer)
+        if getattr(self, '_conversion_en_lote', False):
+            return None
+
         from apps.moneda.models import CotizacionMoneda
         from django.core.exceptions import ValidationError
         from decimal import Decimal
 
-        costo_total = obj.costo_total_estimado
+        costo_total = obj._financieros_listado['costo_total_estimado']
         if not costo_total or costo_total == Decimal("0"):
             return None
 
@@ -1184,7 +1346,7 @@ class ReservaListadoSerializer(serializers.ModelSerializer):
         return obj.dias_hasta_salida
 
     def get_monto_reembolsable(self, obj):
-        return obj.calcular_montos_cancelacion()['monto_reembolsable']
+        return obj._financieros_listado['monto_reembolsable']
 
 
 class ReservaDetalleSerializer(serializers.ModelSerializer):
@@ -1217,19 +1379,12 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
     # Comprobantes de pago
     comprobantes = serializers.SerializerMethodField()
 
-    # Campos calculados de costos
-    precio_base_paquete = serializers.DecimalField(
-        max_digits=12, decimal_places=2, read_only=True
-    )
-    costo_servicios_adicionales = serializers.DecimalField(
-        max_digits=12, decimal_places=2, read_only=True
-    )
-    costo_total_estimado = serializers.DecimalField(
-        max_digits=12, decimal_places=2, read_only=True
-    )
-    seña_total = serializers.DecimalField(
-        max_digits=12, decimal_places=2, read_only=True
-    )
+    # Campos calculados de costos (del snapshot financiero de la reserva)
+    precio_base_paquete = serializers.SerializerMethodField()
+    costo_servicios_adicionales = serializers.SerializerMethodField()
+    costo_total_estimado = serializers.SerializerMethodField()
+    seña_total = serializers.SerializerMethodField()
+    monto_pagado = serializers.SerializerMethodField()
     saldo_pendiente = serializers.SerializerMethodField()
     dias_hasta_salida = serializers.SerializerMethodField()
     monto_reembolsable = serializers.SerializerMethodField()
@@ -1357,6 +1512,24 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
             'comprobantes',
         ]
 
+    def _snapshot(self, obj):
+        """
+        ReservaFinancialSnapshot de la reserva, calculado una sola vez por
+        serialización y guardado en el contexto (también lo leen los
+        pasajeros anidados).
+        """
+        from .services import ReservaFinancialSnapshot
+
+        snapshots = self.context.setdefault('snapshots_financieros', {})
+        if obj.pk not in snapshots:
+            snapshots[obj.pk] = ReservaFinancialSnapshot(obj)
+        return snapshots[obj.pk]
+
+    def to_representation(self, instance):
+        # Calcular el snapshot antes de serializar los pasajeros anidados
+        self._snapshot(instance)
+        return super().to_representation(instance)
+
     def get_paquete(self, obj):
         """Información completa del paquete"""
         if not obj.paquete:
@@ -1497,7 +1670,7 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
 
     def get_comprobantes(self, obj):
         """Historial de los últimos 3 comprobantes de pago"""
-        comprobantes = obj.comprobantes.filter(activo=True).order_by('-fecha_pago')[:3]
+        comprobantes = self._snapshot(obj).comprobantes_activos[:3]
 
         resultado = []
         for comp in comprobantes:
@@ -1555,15 +1728,30 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
 
         return resultado
 
+    def get_precio_base_paquete(self, obj):
+        return self._snapshot(obj).precio_base_paquete
+
+    def get_costo_servicios_adicionales(self, obj):
+        return self._snapshot(obj).costo_servicios_adicionales
+
+    def get_costo_total_estimado(self, obj):
+        return self._snapshot(obj).costo_total_estimado
+
+    def get_seña_total(self, obj):
+        return self._snapshot(obj).seña_total
+
+    def get_monto_pagado(self, obj):
+        return self._snapshot(obj).monto_pagado
+
     def get_saldo_pendiente(self, obj):
         """Saldo pendiente de pago"""
-        return obj.costo_total_estimado - obj.monto_pagado
+        return self._snapshot(obj).saldo_pendiente
 
     def get_dias_hasta_salida(self, obj):
         return obj.dias_hasta_salida
 
     def get_monto_reembolsable(self, obj):
-        return obj.calcular_montos_cancelacion()['monto_reembolsable']
+        return self._snapshot(obj).montos_cancelacion['monto_reembolsable']
 
     def get_puede_cancelar(self, obj):
         """Indica si la reserva puede ser cancelada"""
@@ -1616,7 +1804,7 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
         # CLAVE: Verificar que NO esté pagada al 100%
         # Si ya pagó todo, no tiene sentido cancelar automáticamente
         # PERO: Siempre puede cancelarse manualmente (ver puede_cancelar)
-        if obj.esta_totalmente_pagada():
+        if self._snapshot(obj).totalmente_pagada:
             return False
         
         # Si llegó aquí, cumple todos los criterios para cancelación automática
@@ -1639,19 +1827,20 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
                 'motivo': obj.get_motivo_cancelacion_id_display() if obj.motivo_cancelacion_id else None
             }
         
+        snapshot = self._snapshot(obj)
+
         # Contar TODOS los pasajeros (incluidos los pendientes) - para cancelación total
-        pasajeros_count = obj.pasajeros.count()
-        
+        pasajeros_count = len(snapshot.pasajeros)
+
         # Verificar si tiene facturas activas
-        from apps.facturacion.models import FacturaElectronica
-        facturas_activas = FacturaElectronica.objects.filter(reserva=obj, activo=True)
-        facturas_count = facturas_activas.count()
+        facturas_activas = snapshot.facturas_activas
+        facturas_count = len(facturas_activas)
         tiene_factura = facturas_count > 0
-        
+
         # Obtener primera factura si existe
         factura_info = None
         if tiene_factura:
-            primera_factura = facturas_activas.first()
+            primera_factura = facturas_activas[0]
             factura_info = {
                 'id': primera_factura.id,
                 'numero': primera_factura.numero_factura,
@@ -1661,8 +1850,8 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
         
         # Calcular montos
         dias_restantes = obj.dias_hasta_salida
-        montos = obj.calcular_montos_cancelacion()
-        monto_total_pagado = float(obj.monto_pagado or 0)
+        montos = snapshot.montos_cancelacion
+        monto_total_pagado = float(snapshot.monto_pagado or 0)
         monto_sena = float(montos['monto_sena'])
         monto_nc = float(montos['monto_reembolsable'])  # Ya excluye la seña
         
@@ -1736,11 +1925,11 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
 
     def get_puede_confirmarse(self, obj):
         """Si la reserva puede confirmarse"""
-        return obj.puede_confirmarse()
+        return self._snapshot(obj).puede_confirmarse
 
     def get_esta_totalmente_pagada(self, obj):
         """Si la reserva está totalmente pagada"""
-        return obj.esta_totalmente_pagada()
+        return self._snapshot(obj).totalmente_pagada
 
     def get_puede_descargar_factura_global(self, obj):
         """
@@ -1776,7 +1965,7 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
             # CONTADO: Requiere estado finalizada y pago completo
             if obj.estado != 'finalizada':
                 return False
-            if not obj.esta_totalmente_pagada():
+            if not self._snapshot(obj).totalmente_pagada:
                 return False
         elif obj.condicion_pago == 'credito':
             # CRÉDITO: Solo requiere estado confirmada o finalizada (NO requiere pago completo)
@@ -1796,10 +1985,7 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
             return None
 
         # Buscar factura global activa
-        factura = obj.facturas.filter(
-            tipo_facturacion='total',
-            activo=True
-        ).first()
+        factura = self._snapshot(obj).factura_global
 
         return factura.id if factura else None
 
@@ -1813,62 +1999,45 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
             return False
 
         # Verificar si existe factura global activa
-        return obj.facturas.filter(
-            tipo_facturacion='total',
-            activo=True
-        ).exists()
+        return self._snapshot(obj).factura_global is not None
 
     def get_nota_credito_global_ya_generada(self, obj):
         """
         Indica si la factura global ya tiene nota de crédito generada.
         Retorna True si existe al menos una NC activa, False en caso contrario.
         """
-        from apps.facturacion.models import NotaCreditoElectronica
-
         # Solo aplica si es modalidad global
         if obj.modalidad_facturacion != 'global':
             return False
 
         # Buscar factura global activa
-        factura = obj.facturas.filter(
-            tipo_facturacion='total',
-            activo=True
-        ).first()
+        snapshot = self._snapshot(obj)
+        factura = snapshot.factura_global
 
         if not factura:
             return False
 
         # Verificar si la factura tiene al menos una nota de crédito activa
-        return NotaCreditoElectronica.objects.filter(
-            factura_afectada=factura,
-            activo=True
-        ).exists()
+        return snapshot.nota_credito_activa(factura) is not None
 
     def get_nota_credito_global_id(self, obj):
         """
         Obtiene el ID de la primera nota de crédito activa de la factura global.
         Retorna None si no existe NC o no aplica.
         """
-        from apps.facturacion.models import NotaCreditoElectronica
-
         # Solo aplica si es modalidad global
         if obj.modalidad_facturacion != 'global':
             return None
 
         # Buscar factura global activa
-        factura = obj.facturas.filter(
-            tipo_facturacion='total',
-            activo=True
-        ).first()
+        snapshot = self._snapshot(obj)
+        factura = snapshot.factura_global
 
         if not factura:
             return None
 
         # Obtener la primera nota de crédito activa (ordenada por fecha de emisión desc)
-        nota_credito = NotaCreditoElectronica.objects.filter(
-            factura_afectada=factura,
-            activo=True
-        ).order_by('-fecha_emision').first()
+        nota_credito = snapshot.nota_credito_activa(factura)
 
         return nota_credito.id if nota_credito else None
 
@@ -1907,25 +2076,24 @@ class ReservaDetalleSerializer(serializers.ModelSerializer):
 
     def get_precio_base_paquete_en_guaranies(self, obj):
         """Convierte el precio base del paquete a guaraníes"""
-        return self._convertir_a_guaranies(obj.precio_base_paquete, obj)
+        return self._convertir_a_guaranies(self._snapshot(obj).precio_base_paquete, obj)
 
     def get_costo_servicios_adicionales_en_guaranies(self, obj):
         """Convierte el costo de servicios adicionales a guaraníes"""
-        return self._convertir_a_guaranies(obj.costo_servicios_adicionales, obj)
+        return self._convertir_a_guaranies(self._snapshot(obj).costo_servicios_adicionales, obj)
 
     def get_costo_total_estimado_en_guaranies(self, obj):
         """Convierte el costo total estimado a guaraníes"""
-        return self._convertir_a_guaranies(obj.costo_total_estimado, obj)
+        return self._convertir_a_guaranies(self._snapshot(obj).costo_total_estimado, obj)
 
     def get_senia_total_en_guaranies(self, obj):
         """Convierte la seña total a guaraníes"""
-        return self._convertir_a_guaranies(obj.seña_total, obj)
+        return self._convertir_a_guaranies(self._snapshot(obj).seña_total, obj)
 
     def get_monto_pagado_en_guaranies(self, obj):
         """Convierte el monto pagado a guaraníes"""
-        return self._convertir_a_guaranies(obj.monto_pagado, obj)
+        return self._convertir_a_guaranies(self._snapshot(obj).monto_pagado, obj)
 
     def get_saldo_pendiente_en_guaranies(self, obj):
         """Convierte el saldo pendiente a guaraníes"""
-        saldo = self.get_saldo_pendiente(obj)
-        return self._convertir_a_guaranies(saldo, obj)
+        return self._convertir_a_guaranies(self._snapshot(obj).saldo_pendiente, obj)
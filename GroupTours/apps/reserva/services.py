@@ -8,6 +8,116 @@ from django.core.exceptions import ObjectDoesNotExist
 from .models import Reserva
 
 
+def precargar_detalle_reserva(queryset):
+    """
+    Agrega al queryset las relaciones que usa el detalle de una reserva
+    (ReservaDetalleSerializer y ReservaFinancialSnapshot), para serializarla
+    con una cantidad fija de consultas sin importar cuántos pasajeros,
+    comprobantes o facturas tenga.
+
+    Args:
+        queryset (QuerySet[Reserva]): Reservas a precargar
+
+    Returns:
+        QuerySet[Reserva]: Queryset con select_related/prefetch_related
+    """
+    return queryset.select_related(
+        # Relaciones directas
+        'titular',
+        'titular__tipo_documento',
+        'titular__nacionalidad',
+        'paquete',
+        'salida',
+        'habitacion',
+        # Relaciones del paquete
+        'paquete__tipo_paquete',
+        'paquete__destino',
+        'paquete__destino__ciudad',
+        'paquete__destino__ciudad__pais',
+        'paquete__moneda',
+        'paquete__distribuidora',
+        # Relaciones de la salida
+        'salida__temporada',
+        'salida__moneda',
+        # Relaciones de la habitación
+        'habitacion__tipo_habitacion',
+        'habitacion__moneda',
+        'habitacion__hotel',
+        'habitacion__hotel__cadena',
+        'habitacion__hotel__ciudad',
+    ).prefetch_related(
+        # Pasajeros y su estado de cuenta (el monto pagado se lee del ledger)
+        'pasajeros',
+        'pasajeros__persona',
+        'pasajeros__persona__tipo_documento',
+        'pasajeros__persona__nacionalidad',
+        'pasajeros__ledger',
+        'pasajeros__voucher',
+        # Facturas individuales de los pasajeros y sus notas de crédito
+        'pasajeros__facturas',
+        'pasajeros__facturas__notas_credito',
+        # Servicios adicionales
+        'servicios_adicionales',
+        'servicios_adicionales__servicio',
+        # Comprobantes de pago
+        'comprobantes',
+        'comprobantes__distribuciones',
+        'comprobantes__distribuciones__pasajero',
+        'comprobantes__distribuciones__pasajero__persona',
+        'comprobantes__empleado',
+        'comprobantes__empleado__persona',
+        'comprobantes__empleado__persona__personafisica',
+        # Facturas de la reserva y sus notas de crédito
+        'facturas',
+        'facturas__notas_credito',
+        # Servicios base del paquete
+        'paquete__paquete_servicios',
+        'paquete__paquete_servicios__servicio',
+    )
+
+
+def precargar_listado_reserva(queryset):
+    """
+    Agrega al queryset las relaciones que usa el listado de reservas
+    (ReservaSerializer, con el paquete anidado), para que las consultas de
+    una página no dependan de la cantidad de pasajeros ni de salidas del paquete.
+
+    Args:
+        queryset (QuerySet[Reserva]): Reservas a precargar
+
+    Returns:
+        QuerySet[Reserva]: Queryset con select_related/prefetch_related
+    """
+    from django.db.models import Prefetch
+    from apps.paquete.models import (
+        CupoHabitacionSalida,
+        PrecioCatalogoHabitacion,
+        PrecioCatalogoHotel,
+    )
+
+    habitacion_relacionada = ("habitacion__tipo_habitacion", "habitacion__hotel")
+    return precargar_detalle_reserva(queryset).prefetch_related(
+        # Paquete anidado (PaqueteSerializer): mismas relaciones que el listado de paquetes
+        'paquete__items_costo_default__tipo_costo',
+        'paquete__salidas__moneda',
+        'paquete__salidas__temporada',
+        'paquete__salidas__hoteles',
+        'paquete__salidas__items_costo',
+        Prefetch(
+            'paquete__salidas__cupos_habitaciones',
+            queryset=CupoHabitacionSalida.objects.select_related(*habitacion_relacionada),
+        ),
+        Prefetch(
+            'paquete__salidas__precios_catalogo_hoteles',
+            queryset=PrecioCatalogoHotel.objects.select_related('hotel'),
+        ),
+        Prefetch(
+            'paquete__salidas__precios_catalogo_habitaciones',
+            queryset=PrecioCatalogoHabitacion.objects.select_related(*habitacion_relacionada),
+        ),
+    )
+
+
 def obtener_detalle_reserva(reserva_id):
     """
     Obtiene toda la información detallada de una reserva por su ID.
@@ -402,3 +512,735 @@ def distribuir_devolucion_en_pasajeros(reserva, comprobante, monto_a_devolver):
         )
 
     return total_distribuido
+
+
+# ---------------------------------------------------------------------
+# LEDGER DE PAGOS POR PASAJERO
+# ---------------------------------------------------------------------
+def calcular_ledger_desde_origen(pasajero_ids):
+    """
+    Calcula los totales del ledger directamente desde las tablas de origen
+    (distribuciones, facturas y notas de crédito) para varios pasajeros a la vez.
+
+    Utiliza una agregación por tabla en lugar de recorrer facturas y NC
+    pasajero por pasajero.
+
+    Args:
+        pasajero_ids (iterable): IDs de los pasajeros a calcular
+
+    Returns:
+        dict: {pasajero_id: {'monto_pagado', 'monto_reembolsado', 'monto_acreditado'}}
+    """
+    from django.db.models import Exists, OuterRef, Q, Sum, Value
+    from django.db.models.functions import Concat
+    from apps.comprobante.models import ComprobantePago, ComprobantePagoDistribucion
+    from apps.facturacion.models import NotaCreditoElectronica
+
+    pasajero_ids = list(pasajero_ids)
+    totales = {
+        pid: {
+            'monto_pagado': Decimal('0'),
+            'monto_reembolsado': Decimal('0'),
+            'monto_acreditado': Decimal('0'),
+        }
+        for pid in pasajero_ids
+    }
+    if not pasajero_ids:
+        return totales
+
+    # 1. Distribuciones de comprobantes activos (las devoluciones son negativas)
+    distribuciones = ComprobantePagoDistribucion.objects.filter(
+        pasajero_id__in=pasajero_ids,
+        comprobante__activo=True
+    ).values('pasajero_id').annotate(
+        pagado=Sum('monto', filter=Q(monto__gt=0)),
+        reembolsado=Sum('monto', filter=Q(monto__lt=0)),
+    )
+    for fila in distribuciones:
+        totales[fila['pasajero_id']]['monto_pagado'] = fila['pagado'] or Decimal('0')
+        totales[fila['pasajero_id']]['monto_reembolsado'] = -(fila['reembolsado'] or Decimal('0'))
+
+    # 2. NC activas de facturas activas del pasajero SIN comprobante de devolución
+    devolucion_nc = ComprobantePago.objects.filter(
+        reserva_id=OuterRef('factura_afectada__pasajero__reserva_id'),
+        tipo='devolucion',
+        activo=True,
+        referencia=Concat(Value('NC: '), OuterRef('numero_nota_credito')),
+    )
+    creditos = NotaCreditoElectronica.objects.filter(
+        factura_afectada__pasajero_id__in=pasajero_ids,
+        factura_afectada__activo=True,
+        activo=True,
+    ).exclude(
+        Exists(devolucion_nc)
+    ).values('factura_afectada__pasajero_id').annotate(
+        acreditado=Sum('total_general')
+    )
+    for fila in creditos:
+        totales[fila['factura_afectada__pasajero_id']]['monto_acreditado'] = fila['acreditado'] or Decimal('0')
+
+    return totales
+
+
+def construir_ledgers_desde_origen(pasajeros):
+    """
+    Construye (sin guardar) el ledger esperado de cada pasajero desde el origen.
+
+    Args:
+        pasajeros (iterable[Pasajero]): Pasajeros a procesar (se usa precio_asignado)
+
+    Returns:
+        dict: {pasajero_id: PasajeroLedger} con instancias no persistidas
+    """
+    from .models import PasajeroLedger
+
+    pasajeros = list(pasajeros)
+    totales = calcular_ledger_desde_origen(p.pk for p in pasajeros)
+
+    ledgers = {}
+    for pasajero in pasajeros:
+        ledger = PasajeroLedger(pasajero=pasajero, **totales[pasajero.pk])
+        ledger.saldo_pendiente = (
+            pasajero.precio_asignado - ledger.monto_neto
+            if pasajero.precio_asignado else Decimal('0')
+        )
+        ledgers[pasajero.pk] = ledger
+    return ledgers
+
+
+def crear_personas_fisicas_en_bloque(personas, batch_size=500):
+    """
+    Inserta en bloque personas físicas nuevas.
+
+    PersonaFisica hereda de Persona (multi-tabla) y bulk_create no la admite:
+    se insertan en bloque las filas padre (Persona) y luego las hijas con su
+    persona_ptr, un INSERT por tabla y lote.
+
+    Args:
+        personas (iterable[PersonaFisica]): Instancias sin guardar
+        batch_size (int): Tamaño de lote de los INSERT
+
+    Returns:
+        list[PersonaFisica]: Las mismas instancias, con pk asignado
+    """
+    from django.db import router
+    from apps.persona.models import Persona, PersonaFisica
+
+    personas = list(personas)
+    if not personas:
+        return personas
+
+    campos_padre = [f.attname for f in Persona._meta.concrete_fields if not f.primary_key]
+    padres = Persona.objects.bulk_create(
+        [Persona(**{campo: getattr(p, campo) for campo in campos_padre}) for p in personas],
+        batch_size=batch_size
+    )
+    for padre, persona in zip(padres, personas):
+        persona.persona_ptr_id = persona.pk = padre.pk
+        persona.fecha_creacion = padre.fecha_creacion
+        persona.fecha_modificacion = padre.fecha_modificacion
+        persona._state.adding = False
+
+    db = router.db_for_write(PersonaFisica)
+    for inicio in range(0, len(personas), batch_size):
+        PersonaFisica._base_manager._insert(
+            personas[inicio:inicio + batch_size],
+            fields=PersonaFisica._meta.local_concrete_fields,
+            using=db,
+        )
+    return personas
+
+
+def completar_pasajeros_pendientes(reservas, batch_size=500):
+    """
+    Crea en bloque los pasajeros "Por Asignar N" que faltan para que cada reserva
+    tenga tantos pasajeros como su cantidad_pasajeros.
+
+    Mismo criterio que obtener_o_crear_pasajero_pendiente(): documento
+    {documento_titular}_PEND_{N}, nombre "Por Asignar N" y datos de contacto del
+    titular. Las personas _PEND que ya existen (ej: de otra reserva del mismo
+    titular) se reutilizan; las demás se insertan de una sola vez.
+
+    Args:
+        reservas (QuerySet[Reserva]): Reservas a completar (se ignoran las que no
+            tienen titular o ya tienen todos sus pasajeros)
+        batch_size (int): Tamaño de lote de los INSERT
+
+    Returns:
+        int: Cantidad de pasajeros pendientes creados
+    """
+    from django.db import transaction
+    from django.db.models import Count, F
+    from apps.persona.models import PersonaFisica
+    from .models import Pasajero
+
+    incompletas = list(
+        reservas.filter(titular__isnull=False, cantidad_pasajeros__gt=0)
+        .annotate(total_pasajeros=Count('pasajeros'))
+        .filter(cantidad_pasajeros__gt=F('total_pasajeros'))
+        .select_related('titular')
+        .order_by('id')
+    )
+    if not incompletas:
+        return 0
+
+    # Documentos _PEND ya usados en cada reserva (no se repiten dentro de una reserva)
+    usados = {}
+    for reserva_id, documento in Pasajero.objects.filter(
+        reserva__in=[r.pk for r in incompletas],
+        persona__documento__contains='_PEND'
+    ).values_list('reserva_id', 'persona__documento'):
+        usados.setdefault(reserva_id, set()).add(documento)
+
+    # (reserva, documento, nombre) de cada pasajero a crear
+    pendientes = []
+    for reserva in incompletas:
+        documentos_reserva = usados.get(reserva.pk, set())
+        faltantes = reserva.cantidad_pasajeros - reserva.total_pasajeros
+        sufijo = reserva.total_pasajeros
+        while faltantes:
+            sufijo += 1
+            documento = f'{reserva.titular.documento}_PEND_{sufijo}'
+            if documento in documentos_reserva:
+                continue
+            pendientes.append((reserva, documento, f'Por Asignar {sufijo}'))
+            faltantes -= 1
+
+    with transaction.atomic():
+        personas = dict(PersonaFisica.objects.filter(
+            documento__in=[documento for _, documento, _ in pendientes]
+        ).values_list('documento', 'pk'))
+
+        nuevas = {}
+        for reserva, documento, nombre in pendientes:
+            if documento in personas or documento in nuevas:
+                continue
+            titular = reserva.titular
+            nuevas[documento] = PersonaFisica(
+                documento=documento,
+                nombre=nombre,
+                apellido='',
+                email=titular.email,  # Email del titular para comunicaciones
+                telefono=titular.telefono,  # Teléfono del titular
+                tipo_documento_id=titular.tipo_documento_id,
+                nacionalidad_id=titular.nacionalidad_id,
+                fecha_nacimiento=titular.fecha_nacimiento,
+                sexo=titular.sexo,
+            )
+
+        for persona in crear_personas_fisicas_en_bloque(nuevas.values(), batch_size=batch_size):
+            personas[persona.documento] = persona.pk
+
+        Pasajero.objects.bulk_create([
+            Pasajero(
+                reserva=reserva,
+                persona_id=personas[documento],
+                es_titular=False,
+                por_asignar=True,  # Marcar como pendiente de asignación
+                precio_asignado=reserva.precio_unitario or 0,
+            )
+            for reserva, documento, _ in pendientes
+        ], batch_size=batch_size)  # PasajeroQuerySet.bulk_create crea también los ledgers
+
+    return len(pendientes)
+
+
+def recalcular_ledger_pasajero(pasajero):
+    """
+    Reconstruye el ledger de un pasajero desde el origen (crea la fila si no existe).
+
+    Args:
+        pasajero (Pasajero): Pasajero a recalcular
+
+    Returns:
+        PasajeroLedger: Ledger actualizado
+    """
+    from django.db import transaction
+    from .models import PasajeroLedger
+
+    esperado = construir_ledgers_desde_origen([pasajero])[pasajero.pk]
+    campos = ['monto_pagado', 'monto_acreditado', 'monto_reembolsado', 'saldo_pendiente']
+
+    with transaction.atomic():
+        ledger, _ = PasajeroLedger.objects.select_for_update().get_or_create(
+            pasajero=pasajero,
+            defaults={campo: getattr(esperado, campo) for campo in campos}
+        )
+        for campo in campos:
+            setattr(ledger, campo, getattr(esperado, campo))
+        ledger.save()
+
+    # El pasajero puede tener cacheado un ledger anterior (ej: select_related)
+    pasajero.ledger = ledger
+    return ledger
+
+
+def aplicar_distribucion_en_ledger(distribucion, signo=1):
+    """
+    Aplica incrementalmente una distribución de pago sobre el ledger del pasajero.
+
+    Los montos positivos suman en monto_pagado y los negativos (devoluciones)
+    en monto_reembolsado. Con signo=-1 se revierte la distribución
+    (ej: anulación del comprobante o eliminación de la distribución).
+
+    Args:
+        distribucion (ComprobantePagoDistribucion): Distribución a aplicar
+        signo (int): 1 para aplicar, -1 para revertir
+    """
+    from django.db import transaction
+    from django.db.models import F
+    from .models import Pasajero, PasajeroLedger
+
+    monto = Decimal(distribucion.monto) * signo
+    if distribucion.monto >= 0:
+        cambios = {'monto_pagado': F('monto_pagado') + monto}
+    else:
+        cambios = {'monto_reembolsado': F('monto_reembolsado') - monto}
+
+    with transaction.atomic():
+        ledger_qs = PasajeroLedger.objects.filter(pasajero_id=distribucion.pasajero_id)
+        if not ledger_qs.update(**cambios):
+            # Sin ledger previo: se construye completo desde el origen
+            recalcular_ledger_pasajero(distribucion.pasajero)
+            return
+
+        precio_asignado = Pasajero.objects.filter(
+            pk=distribucion.pasajero_id
+        ).values_list('precio_asignado', flat=True).first()
+        ledger_qs.update(saldo_pendiente=PasajeroLedger.expresion_saldo(precio_asignado))
+
+    # Los update() con F() no tocan el ledger que el pasajero de la distribución
+    # tenga en memoria: se refresca para que monto_pagado refleje el cambio
+    pasajero = type(distribucion).pasajero.field.get_cached_value(distribucion, default=None)
+    ledger = Pasajero.ledger.related.get_cached_value(pasajero, default=None) if pasajero else None
+    if ledger is not None:
+        ledger.refresh_from_db()
+
+
+def recalcular_creditos_ledger_reserva(reserva_id):
+    """
+    Recalcula monto_acreditado (NC sin devolución) de los pasajeros de una reserva.
+
+    Se invoca al emitir/modificar notas de crédito y al registrar o anular
+    comprobantes de devolución, ya que ambos cambian qué NC se descuentan.
+
+    Args:
+        reserva_id (int): ID de la reserva
+    """
+    from django.db import transaction
+    from .models import Pasajero, PasajeroLedger
+
+    pasajeros = list(Pasajero.objects.filter(reserva_id=reserva_id).only('id', 'precio_asignado'))
+    if not pasajeros:
+        return
+
+    totales = calcular_ledger_desde_origen(p.pk for p in pasajeros)
+
+    with transaction.atomic():
+        existentes = set(
+            PasajeroLedger.objects.select_for_update().filter(
+                pasajero__in=pasajeros
+            ).values_list('pasajero_id', flat=True)
+        )
+        for pasajero in pasajeros:
+            if pasajero.pk not in existentes:
+                recalcular_ledger_pasajero(pasajero)
+                continue
+            ledger_qs = PasajeroLedger.objects.filter(pasajero_id=pasajero.pk)
+            ledger_qs.update(monto_acreditado=totales[pasajero.pk]['monto_acreditado'])
+            ledger_qs.update(saldo_pendiente=PasajeroLedger.expresion_saldo(pasajero.precio_asignado))
+
+
+# ---------------------------------------------------------------------
+# EVALUACIÓN MASIVA DE ESTADOS DE RESERVAS
+# ---------------------------------------------------------------------
+def anotar_predicados_estado(queryset):
+    """
+    Anota sobre un queryset de reservas los agregados necesarios para evaluar
+    puede_confirmarse() y esta_totalmente_pagada() sin recorrer pasajeros.
+
+    Anotaciones agregadas:
+        _pasajeros_reales: pasajeros sin documento '_PEND'
+        _monto_pagado: suma del monto neto (ledger) de todos los pasajeros
+        _reales_sin_sena: pasajeros reales con monto neto menor a la seña de la salida
+        _reales_con_saldo: pasajeros reales con saldo pendiente mayor a 0
+        _costo_servicios: suma de servicios adicionales activos
+        _precio_catalogo: precio de catálogo resuelto de la reserva (precio_resuelto; si
+                          todavía no se resolvió, el de la habitación o, en su defecto, del hotel)
+
+    Los montos se leen de PasajeroLedger, que se crea junto con cada pasajero.
+
+    Args:
+        queryset (QuerySet[Reserva]): Reservas a anotar
+
+    Returns:
+        QuerySet[Reserva]: Queryset anotado
+    """
+    from django.db.models import (
+        Count, DecimalField, ExpressionWrapper, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+    )
+    from django.db.models.functions import Coalesce, Greatest
+    from apps.paquete.models import PrecioCatalogoHabitacion, PrecioCatalogoHotel
+    from .models import Pasajero, ReservaServiciosAdicionales
+
+    decimal_field = DecimalField(max_digits=14, decimal_places=2)
+    cero = Value(Decimal('0'), output_field=decimal_field)
+
+    pasajeros = Pasajero.objects.filter(reserva=OuterRef('pk')).annotate(
+        _neto=Greatest(
+            ExpressionWrapper(
+                Coalesce(F('ledger__monto_pagado'), cero)
+                - Coalesce(F('ledger__monto_reembolsado'), cero)
+                - Coalesce(F('ledger__monto_acreditado'), cero),
+                output_field=decimal_field
+            ),
+            cero,
+            output_field=decimal_field
+        )
+    )
+    reales = pasajeros.exclude(persona__documento__contains='_PEND')
+
+    def _contar(qs):
+        return Coalesce(
+            Subquery(
+                qs.order_by().values('reserva').annotate(c=Count('id')).values('c'),
+                output_field=IntegerField()
+            ),
+            0
+        )
+
+    def _sumar(qs, expresion):
+        return Coalesce(
+            Subquery(
+                qs.order_by().values('reserva').annotate(t=Sum(expresion)).values('t'),
+                output_field=decimal_field
+            ),
+            cero
+        )
+
+    # Seña por pasajero: monto fijo de la salida (0 si no tiene)
+    sin_sena = reales.filter(
+        _neto__lt=Coalesce(OuterRef('salida__senia'), cero)
+    )
+    # Saldo pendiente: solo aplica a pasajeros con precio asignado distinto de 0
+    con_saldo = reales.filter(
+        precio_asignado__isnull=False
+    ).exclude(
+        precio_asignado=0
+    ).filter(
+        precio_asignado__gt=F('_neto')
+    )
+
+    servicios = ReservaServiciosAdicionales.objects.filter(reserva=OuterRef('pk'), activo=True)
+
+    precio_habitacion = PrecioCatalogoHabitacion.objects.filter(
+        salida=OuterRef('salida'),
+        habitacion=OuterRef('habitacion')
+    ).values('precio_catalogo')[:1]
+    precio_hotel = PrecioCatalogoHotel.objects.filter(
+        salida=OuterRef('salida'),
+        hotel=OuterRef('habitacion__hotel')
+    ).values('precio_catalogo')[:1]
+
+    return queryset.annotate(
+        _pasajeros_reales=_contar(reales),
+        _monto_pagado=_sumar(pasajeros, '_neto'),
+        _reales_sin_sena=_contar(sin_sena),
+        _reales_con_saldo=_contar(con_saldo),
+        _costo_servicios=_sumar(servicios, F('precio_unitario') * F('cantidad')),
+        _precio_catalogo=Coalesce(
+            F('precio_resuelto'),
+            Subquery(precio_habitacion, output_field=decimal_field),
+            Subquery(precio_hotel, output_field=decimal_field),
+            cero
+        ),
+    )
+
+
+def calcular_predicados_estado(reserva):
+    """
+    Calcula los predicados de estado a partir de una reserva anotada con
+    anotar_predicados_estado(), replicando exactamente:
+    - faltan_datos_pasajeros
+    - puede_confirmarse()
+    - esta_totalmente_pagada()
+
+    Args:
+        reserva (Reserva): Reserva anotada
+
+    Returns:
+        dict: faltan_datos, puede_confirmarse, totalmente_pagada, monto_pagado,
+              seña_total, costo_total, pasajeros_cargados
+    """
+    cantidad = reserva.cantidad_pasajeros or 0
+    faltan_datos = reserva._pasajeros_reales < cantidad
+    monto_pagado = reserva._monto_pagado
+
+    senia = reserva.salida.senia if reserva.salida_id else None
+    seña_total = senia * cantidad if senia and cantidad else Decimal('0')
+
+    precio_base = reserva.precio_unitario or reserva._precio_catalogo
+    if cantidad:
+        costo_total = precio_base * cantidad + reserva._costo_servicios
+    else:
+        costo_total = reserva._costo_servicios
+
+    if faltan_datos:
+        puede_confirmarse = cantidad > 0 and monto_pagado >= seña_total
+        totalmente_pagada = monto_pagado >= costo_total
+    else:
+        hay_reales = reserva._pasajeros_reales > 0
+        puede_confirmarse = hay_reales and reserva._reales_sin_sena == 0
+        totalmente_pagada = hay_reales and reserva._reales_con_saldo == 0
+
+    return {
+        'faltan_datos': faltan_datos,
+        'puede_confirmarse': puede_confirmarse,
+        'totalmente_pagada': totalmente_pagada,
+        'monto_pagado': monto_pagado,
+        'seña_total': seña_total,
+        'costo_total': costo_total,
+        'pasajeros_cargados': reserva._pasajeros_reales,
+    }
+
+
+def calcular_financieros_listado(reserva):
+    """
+    Montos que muestra el listado de reservas, a partir de una reserva obtenida
+    con Reserva.objects.with_financials() (sin consultas adicionales).
+
+    Equivale a precio_base_paquete, costo_total_estimado,
+    calcular_montos_cancelacion()['monto_reembolsable'] y
+    esta_totalmente_pagada() de la reserva.
+
+    Args:
+        reserva (Reserva): Reserva anotada
+
+    Returns:
+        dict: precio_unitario, costo_total_estimado, monto_reembolsable, totalmente_pagada
+    """
+    predicados = calcular_predicados_estado(reserva)
+    monto_reembolsable = max(
+        reserva._monto_pagos_adicionales - reserva._monto_devoluciones,
+        Decimal('0')
+    )
+    return {
+        'precio_unitario': reserva.precio_unitario or reserva._precio_catalogo,
+        'costo_total_estimado': predicados['costo_total'],
+        'monto_reembolsable': monto_reembolsable,
+        'totalmente_pagada': predicados['totalmente_pagada'],
+    }
+
+
+class ReservaFinancialSnapshot:
+    """
+    Montos y predicados financieros de una reserva, calculados una sola vez
+    a partir de sus relaciones precargadas con precargar_detalle_reserva().
+
+    Replica exactamente a monto_pagado, costo_servicios_adicionales,
+    costo_total_estimado, saldo_pendiente, faltan_datos_pasajeros,
+    puede_confirmarse(), esta_totalmente_pagada() y
+    calcular_montos_cancelacion() de la reserva, que consultan la base en
+    cada invocación. Con la reserva precargada no hace consultas (salvo
+    precio_base_paquete en reservas sin precio resuelto).
+
+    Los valores reflejan la base de datos al momento de la consulta: no
+    reutilizar el snapshot después de modificar pagos de la reserva.
+    """
+
+    def __init__(self, reserva):
+        """
+        Args:
+            reserva (Reserva): Reserva obtenida con precargar_detalle_reserva()
+        """
+        self.reserva = reserva
+        self.pasajeros = list(reserva.pasajeros.all())
+        self.pasajeros_reales = [
+            pasajero for pasajero in self.pasajeros
+            if '_PEND' not in pasajero.persona.documento
+        ]
+
+        cantidad = reserva.cantidad_pasajeros
+        self.monto_pagado = sum(pasajero.monto_pagado for pasajero in self.pasajeros) or Decimal('0')
+        self.costo_servicios_adicionales = sum(
+            (sa.subtotal for sa in reserva.servicios_adicionales.all() if sa.activo),
+            Decimal('0')
+        )
+        self.precio_base_paquete = reserva.precio_base_paquete
+        self.seña_total = reserva.seña_total
+        if cantidad:
+            self.costo_total_estimado = self.precio_base_paquete * cantidad + self.costo_servicios_adicionales
+        else:
+            self.costo_total_estimado = self.costo_servicios_adicionales
+        self.saldo_pendiente = self.costo_total_estimado - self.monto_pagado
+
+        self.faltan_datos_pasajeros = len(self.pasajeros_reales) < cantidad
+        if self.faltan_datos_pasajeros:
+            self.puede_confirmarse = cantidad > 0 and self.monto_pagado >= self.seña_total
+            self.totalmente_pagada = self.monto_pagado >= self.costo_total_estimado
+        else:
+            hay_reales = bool(self.pasajeros_reales)
+            self.puede_confirmarse = hay_reales and all(p.tiene_sena_pagada for p in self.pasajeros_reales)
+            self.totalmente_pagada = hay_reales and all(p.esta_totalmente_pagado for p in self.pasajeros_reales)
+
+        # Comprobantes activos, del más reciente al más antiguo (ordenamiento del modelo)
+        self.comprobantes_activos = [
+            comprobante for comprobante in reserva.comprobantes.all() if comprobante.activo
+        ]
+
+        def _sumar(tipos):
+            return sum(
+                (c.monto for c in self.comprobantes_activos if c.tipo in tipos),
+                Decimal('0')
+            )
+
+        monto_pagos_adicionales = _sumar(('pago_parcial', 'pago_total'))
+        self.montos_cancelacion = {
+            'monto_sena': _sumar(('sena',)),
+            'monto_pagos_adicionales': monto_pagos_adicionales,
+            'monto_reembolsable': max(monto_pagos_adicionales - _sumar(('devolucion',)), Decimal('0')),
+        }
+
+        # Facturas activas en orden de creación (equivale a .filter(activo=True).first())
+        self.facturas_activas = sorted(
+            (factura for factura in reserva.facturas.all() if factura.activo),
+            key=lambda factura: factura.pk
+        )
+        self.factura_global = next(
+            (factura for factura in self.facturas_activas if factura.tipo_facturacion == 'total'),
+            None
+        )
+        self.facturas_individuales = {}
+        for pasajero in self.pasajeros:
+            self.facturas_individuales[pasajero.pk] = min(
+                (
+                    factura for factura in pasajero.facturas.all()
+                    if factura.activo and factura.tipo_facturacion == 'por_pasajero'
+                ),
+                key=lambda factura: factura.pk,
+                default=None
+            )
+
+    @staticmethod
+    def nota_credito_activa(factura):
+        """
+        Nota de crédito activa más reciente de una factura precargada.
+
+        Args:
+            factura (FacturaElectronica): Factura con notas_credito precargadas (o None)
+
+        Returns:
+            NotaCreditoElectronica o None
+        """
+        if factura is None:
+            return None
+        # notas_credito respeta el ordenamiento del modelo (-fecha_emision)
+        return next((nc for nc in factura.notas_credito.all() if nc.activo), None)
+
+
+def calcular_transicion_estado(reserva, predicados):
+    """
+    Replica una invocación de Reserva.actualizar_estado() sin parámetros
+    (usa la modalidad y condición ya definidas en la reserva).
+
+    Args:
+        reserva (Reserva): Reserva a evaluar
+        predicados (dict): Resultado de calcular_predicados_estado()
+
+    Returns:
+        str: Nuevo estado
+
+    Raises:
+        ValidationError: En los mismos casos que actualizar_estado() al confirmar
+                         (modalidad/condición faltante o combinación inválida)
+    """
+    from django.core.exceptions import ValidationError
+
+    estado = reserva.estado
+
+    if estado == 'pendiente':
+        if predicados['puede_confirmarse']:
+            if reserva.modalidad_facturacion not in ['global', 'individual']:
+                raise ValidationError("Debe seleccionar la modalidad de facturación al confirmar la reserva.")
+            if reserva.condicion_pago not in ['contado', 'credito']:
+                raise ValidationError("Debe seleccionar la condición de pago al confirmar la reserva.")
+            if reserva.modalidad_facturacion == 'individual' and reserva.condicion_pago == 'credito':
+                raise ValidationError(
+                    "Las facturas a crédito solo están disponibles para facturación global."
+                )
+            return 'confirmada'
+
+    elif estado == 'confirmada':
+        if not predicados['puede_confirmarse']:
+            return 'pendiente'
+        if predicados['totalmente_pagada'] and not predicados['faltan_datos']:
+            return 'finalizada'
+
+    elif estado == 'finalizada':
+        if not predicados['totalmente_pagada']:
+            return 'confirmada' if predicados['puede_confirmarse'] else 'pendiente'
+
+    return estado
+
+
+def evaluar_estados_reservas(queryset, aplicar=True, batch_size=500):
+    """
+    Evalúa y (opcionalmente) aplica en bloque las transiciones de estado de muchas reservas.
+
+    Equivale a invocar Reserva.actualizar_estado() una vez por reserva: aplica
+    un solo paso de transición (ej: una reserva pendiente totalmente pagada
+    pasa a 'confirmada'; la siguiente evaluación la lleva a 'finalizada').
+    Las reservas canceladas no se modifican. Con aplicar=False no escribe
+    nada en la base de datos.
+
+    Args:
+        queryset (QuerySet[Reserva]): Reservas a evaluar
+        aplicar (bool): Si es False no escribe en la base de datos (dry-run)
+        batch_size (int): Tamaño de lote para bulk_update
+
+    Returns:
+        list[dict]: Un elemento por reserva con reserva, estado_anterior, estado_nuevo,
+                    datos_completos, predicados y error (None si no hubo)
+    """
+    from django.core.exceptions import ValidationError
+    from .models import Reserva
+
+    queryset = queryset.exclude(estado='cancelada')
+    reservas = anotar_predicados_estado(queryset.select_related('salida'))
+
+    resultados = []
+    modificadas = []
+
+    for reserva in reservas:
+        predicados = calcular_predicados_estado(reserva)
+        estado_anterior = reserva.estado
+        datos_completos = not predicados['faltan_datos']
+        error = None
+
+        nuevo_estado = estado_anterior
+        try:
+            nuevo_estado = calcular_transicion_estado(reserva, predicados)
+        except ValidationError as e:
+            error = ' '.join(e.messages)
+        reserva.estado = nuevo_estado
+
+        # actualizar_estado() no guarda nada si falla la validación desde 'pendiente'
+        if error is None or nuevo_estado != estado_anterior:
+            cambio = nuevo_estado != estado_anterior or reserva.datos_completos != datos_completos
+            reserva.datos_completos = datos_completos
+            if cambio:
+                modificadas.append(reserva)
+
+        resultados.append({
+            'reserva': reserva,
+            'estado_anterior': estado_anterior,
+            'estado_nuevo': nuevo_estado,
+            'datos_completos': datos_completos,
+            'predicados': predicados,
+            'error': error,
+        })
+
+    if aplicar and modificadas:
+        Reserva.objects.bulk_update(modificadas, ['estado', 'datos_completos'], batch_size=batch_size)
+
+    return resultados
@@ -0,0 +1,123 @@
+"""
+Tests de la evaluación en bloque de estados de reservas
+(apps/reserva/services.evaluar_estados_reservas).
+
+Ejecutar tests:
+    python manage.py test apps.reserva.tests_estados
+"""
+
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.paquete.tests_datos import DatosSalidaMixin
+from apps.reserva.models import Pasajero, PasajeroLedger, Reserva
+from apps.reserva.services import evaluar_estados_reservas
+
+
+# (estado, modalidad, condición, pagos de los pasajeros reales, cantidad_pasajeros)
+CASOS = {
+    'pendiente_sin_pago': ('pendiente', None, None, [0, 0], 2),
+    'pendiente_con_sena': ('pendiente', 'individual', 'contado', [100, 100], 2),
+    'pendiente_pagada': ('pendiente', 'global', 'contado', [1000, 1000], 2),
+    'pendiente_sin_modalidad': ('pendiente', None, None, [100, 100], 2),
+    'pendiente_individual_credito': ('pendiente', 'individual', 'credito', [1000, 1000], 2),
+    'pendiente_faltan_datos_con_sena': ('pendiente', 'global', 'contado', [200], 2),
+    'confirmada_pierde_sena': ('confirmada', 'global', 'contado', [50, 100], 2),
+    'confirmada_pago_parcial': ('confirmada', 'global', 'contado', [500, 1000], 2),
+    'confirmada_pagada': ('confirmada', 'global', 'contado', [1000, 1000], 2),
+    'confirmada_faltan_datos': ('confirmada', 'global', 'contado', [1000], 2),
+    'finalizada_pagada': ('finalizada', 'global', 'contado', [1000, 1000], 2),
+    'finalizada_pago_parcial': ('finalizada', 'global', 'contado', [500, 500], 2),
+    'finalizada_sin_sena': ('finalizada', 'global', 'contado', [0, 0], 2),
+    'cancelada': ('cancelada', 'global', 'contado', [1000, 1000], 2),
+}
+
+
+class EvaluarEstadosReservasTestCase(DatosSalidaMixin, TestCase):
+    """La evaluación en bloque equivale a actualizar_estado() reserva por reserva"""
+
+    SENIA = Decimal('100')
+    CUPO_ASIENTOS = 100
+    CUPO_HABITACIONES = 20
+
+    def setUp(self):
+        super().setUp()
+        self.reservas = {}
+        for numero, (caso, (estado, modalidad, condicion, pagos, cantidad)) in enumerate(CASOS.items()):
+            reserva = self._crear_reserva(cantidad)
+            for orden, pago in enumerate(pagos):
+                pasajero = Pasajero.objects.create(
+                    reserva=reserva,
+                    persona=self._persona(f'{numero + 2}{orden:03d}'),
+                    es_titular=orden == 0
+                )
+                PasajeroLedger.objects.filter(pasajero=pasajero).update(monto_pagado=Decimal(pago))
+            Reserva.objects.filter(pk=reserva.pk).update(
+                estado=estado, modalidad_facturacion=modalidad, condicion_pago=condicion
+            )
+            self.reservas[caso] = reserva.pk
+
+    def _estados(self):
+        return dict(Reserva.objects.values_list('pk', 'estado'))
+
+    def test_dry_run_no_escribe(self):
+        antes = self._estados()
+
+        with CaptureQueriesContext(connection) as contexto:
+            evaluar_estados_reservas(Reserva.objects.all(), aplicar=False)
+
+        escrituras = [
+            q['sql'] for q in contexto.captured_queries
+            if q['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))
+        ]
+        self.assertEqual(escrituras, [])
+        self.assertEqual(self._estados(), antes)
+
+    def test_equivale_a_actualizar_estado(self):
+        resultados = {
+            r['reserva'].pk: r
+            for r in evaluar_estados_reservas(Reserva.objects.all(), aplicar=False)
+        }
+        self.assertNotIn(self.reservas['cancelada'], resultados)
+
+        for caso, pk in self.reservas.items():
+            reserva = Reserva.objects.get(pk=pk)
+            error = None
+            try:
+                reserva.actualizar_estado()
+            except ValidationError as e:
+                error = e
+            reserva.refresh_from_db()
+
+            if caso == 'cancelada':
+                self.assertEqual(reserva.estado, 'cancelada')
+                continue
+            with self.subTest(caso=caso):
+                resultado = resultados[pk]
+                self.assertEqual(resultado['estado_nuevo'], reserva.estado)
+                self.assertEqual(resultado['error'] is not None, error is not None)
+                if error is None:
+                    self.assertEqual(resultado['datos_completos'], reserva.datos_completos)
+
+        # Los casos cubren todas las transiciones de un paso
+        estados = {caso: resultados[pk]['estado_nuevo'] for caso, pk in self.reservas.items() if pk in resultados}
+        self.assertEqual(estados['pendiente_con_sena'], 'confirmada')
+        self.assertEqual(estados['pendiente_pagada'], 'confirmada')
+        self.assertEqual(estados['confirmada_pierde_sena'], 'pendiente')
+        self.assertEqual(estados['confirmada_pagada'], 'finalizada')
+        self.assertEqual(estados['finalizada_pago_parcial'], 'confirmada')
+        self.assertEqual(estados['finalizada_sin_sena'], 'pendiente')
+
+    def test_aplicar_un_paso_por_evaluacion(self):
+        pk = self.reservas['pendiente_con_sena']
+        PasajeroLedger.objects.filter(pasajero__reserva_id=pk).update(monto_pagado=Decimal('1000'))
+
+        evaluar_estados_reservas(Reserva.objects.filter(pk=pk))
+        self.assertEqual(Reserva.objects.get(pk=pk).estado, 'confirmada')
+
+        evaluar_estados_reservas(Reserva.objects.filter(pk=pk))
+        self.assertEqual(Reserva.objects.get(pk=pk).estado, 'finalizada')
@@ -0,0 +1,214 @@
+"""
+Tests de la importación en bloque de pasajeros desde CSV/XLSX
+(POST /api/reservas/{id}/importar-pasajeros/, apps/reserva/importacion.py).
+
+Ejecutar tests:
+    python manage.py test apps.reserva.tests_importacion_pasajeros
+"""
+
+import threading
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+
+from apps.nacionalidad.models import Nacionalidad
+from apps.paquete.tests_datos import DatosSalidaMixin
+from apps.persona.models import PersonaFisica
+from apps.reserva.importacion import _crear_personas_nuevas as crear_personas_nuevas, importar_pasajeros
+from apps.reserva.models import Pasajero, PasajeroLedger, Reserva
+from apps.reserva.services import completar_pasajeros_pendientes
+
+
+class ImportacionPasajerosTestCase(DatosSalidaMixin, TestCase):
+    """El manifiesto se importa en bloque y reemplaza a los pasajeros "Por Asignar" """
+
+    SENIA = Decimal('100')
+    CUPO_ASIENTOS = 500
+    TIPO_HABITACION = ('Grupal', 4)
+    CUPO_HABITACIONES = 500
+
+    def setUp(self):
+        super().setUp()
+        Nacionalidad.objects.create(nombre='Argentina', codigo_alpha2='AR')
+        self.client = APIClient()
+
+    def _reserva(self, cantidad_pasajeros):
+        reserva = self._crear_reserva(cantidad_pasajeros)
+        Pasajero.objects.create(reserva=reserva, persona=self.titular, es_titular=True)
+        completar_pasajeros_pendientes(Reserva.objects.filter(pk=reserva.pk))
+        return reserva
+
+    def _importar(self, reserva, nombre, contenido):
+        return self.client.post(
+            f'/api/reservas/{reserva.pk}/importar-pasajeros/',
+            {'archivo': SimpleUploadedFile(nombre, contenido)},
+            format='multipart'
+        )
+
+    def _csv(self, cantidad, inicio=2000):
+        lineas = ['Documento;Nombres;Apellido;Fecha de nacimiento;Sexo;Pais']
+        lineas += [f'{inicio + i};Pasajero {i};Test;15/03/1990;M;AR' for i in range(cantidad)]
+        return '\n'.join(lineas).encode('utf-8')
+
+    def test_reporte_por_fila_y_reemplazo_de_pendientes(self):
+        reserva = self._reserva(4)
+        existente = PersonaFisica.objects.create(
+            tipo_documento=self.tipo_documento,
+            documento='3000',
+            email='viejo@test.com',
+            telefono='0981000001',
+            nombre='Existente',
+            nacionalidad=self.nacionalidad
+        )
+        contenido = '\n'.join([
+            'documento,nombre,email,nacionalidad',
+            '3000,Existente,nuevo@test.com,',
+            '4000,Nuevo,,Argentina',
+            '4000,Repetido,,',
+            '5000,,,',
+            '1000,Titular,,',
+            '6000,Sin Lugar,,XX',
+            '7000,Sin Lugar,,',
+        ]).encode('utf-8')
+
+        # El estado de la reserva y los vouchers se revisan al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            respuesta = self._importar(reserva, 'pasajeros.csv', contenido)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(len(callbacks), 1)
+        filas = {fila['fila']: fila for fila in respuesta.data['filas']}
+
+        self.assertEqual((filas[2]['persona'], filas[2]['pasajero']), ('actualizada', 'asignado'))
+        self.assertEqual((filas[3]['persona'], filas[3]['pasajero']), ('creada', 'asignado'))
+        self.assertEqual(filas[4]['errores'], ['Documento repetido en el archivo'])
+        self.assertEqual(filas[5]['estado'], 'error')
+        self.assertEqual((filas[6]['persona'], filas[6]['pasajero']), ('sin_cambios', 'existente'))
+        self.assertEqual(filas[7]['errores'], ['nacionalidad: no existe'])
+        self.assertEqual((filas[8]['estado'], filas[8]['pasajero']), ('ok', 'asignado'))
+        self.assertEqual(respuesta.data['resumen']['importadas'], 4)
+
+        existente.refresh_from_db()
+        self.assertEqual(existente.email, 'nuevo@test.com')
+        nuevo = PersonaFisica.objects.get(documento='4000')
+        self.assertEqual((nuevo.email, nuevo.nacionalidad.nombre), ('titular@test.com', 'Argentina'))
+
+        # Los 3 pasajeros "Por Asignar" conservan su fila (y su ledger) con la persona real
+        self.assertEqual(reserva.pasajeros.count(), 4)
+        self.assertFalse(reserva.pasajeros.filter(por_asignar=True).exists())
+        self.assertEqual(
+            sorted(reserva.pasajeros.values_list('persona__documento', flat=True)),
+            ['1000', '3000', '4000', '7000']
+        )
+        self.assertEqual(PasajeroLedger.objects.filter(pasajero__reserva=reserva).count(), 4)
+
+        reserva.refresh_from_db()
+        self.assertTrue(reserva.datos_completos)
+
+    def test_consultas_constantes_e_xlsx(self):
+        libro = Workbook()
+        hoja = libro.active
+        hoja.append(['CI', 'Nombre', 'Fecha de Nacimiento'])
+        hoja.append([2001.0, 'Excel', date(1990, 3, 15)])
+        archivo = BytesIO()
+        libro.save(archivo)
+
+        reserva = self._reserva(3)
+        respuesta = self._importar(reserva, 'pasajeros.xlsx', archivo.getvalue())
+        self.assertEqual(respuesta.data['filas'][0]['estado'], 'ok')
+        self.assertEqual(PersonaFisica.objects.get(documento='2001').fecha_nacimiento, date(1990, 3, 15))
+
+        consultas = []
+        for cantidad, inicio in ((5, 10000), (100, 20000)):
+            reserva = self._reserva(cantidad + 1)
+            with CaptureQueriesContext(connection) as contexto:
+                respuesta = self._importar(reserva, 'pasajeros.csv', self._csv(cantidad, inicio))
+            self.assertEqual(respuesta.data['resumen']['importadas'], cantidad)
+            consultas.append(len(contexto))
+
+        self.assertEqual(consultas[0], consultas[1])
+
+    def test_documento_creado_por_otra_operacion(self):
+        """Un documento insertado por otra transacción se informa en su fila, sin error 500"""
+        reserva = self._reserva(3)
+
+        def crear_con_conflicto(personas, batch_size):
+            # Otra operación registra el documento después de la búsqueda del paso 3
+            self._persona('2001')
+            return crear_personas_nuevas(personas, batch_size)
+
+        with mock.patch(
+            'apps.reserva.importacion._crear_personas_nuevas', side_effect=crear_con_conflicto
+        ):
+            respuesta = self._importar(reserva, 'pasajeros.csv', self._csv(2))
+
+        self.assertEqual(respuesta.status_code, 200)
+        filas = respuesta.data['filas']
+        self.assertEqual(filas[0]['estado'], 'ok')
+        self.assertEqual(filas[1]['estado'], 'error')
+        self.assertEqual(
+            filas[1]['errores'], ['El documento fue registrado por otra operación; vuelva a importar la fila']
+        )
+        self.assertEqual(respuesta.data['resumen']['personas_creadas'], 1)
+        # El lugar de la fila rechazada sigue "Por Asignar"
+        self.assertEqual(
+            sorted(reserva.pasajeros.filter(por_asignar=False).values_list('persona__documento', flat=True)),
+            ['1000', '2000']
+        )
+        self.assertEqual(reserva.pasajeros.filter(por_asignar=True).count(), 1)
+
+
+class ImportacionPasajerosConcurrenteTestCase(DatosSalidaMixin, TransactionTestCase):
+    """Importaciones simultáneas sobre la misma reserva no reparten dos veces un lugar"""
+
+    SENIA = Decimal('100')
+    TIPO_HABITACION = ('Grupal', 4)
+    IMPORTACIONES_SIMULTANEAS = 4
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_importaciones_concurrentes(self):
+        reserva = self._crear_reserva(3)
+        Pasajero.objects.create(reserva=reserva, persona=self.titular, es_titular=True)
+        completar_pasajeros_pendientes(Reserva.objects.filter(pk=reserva.pk))
+        barrera = threading.Barrier(self.IMPORTACIONES_SIMULTANEAS)
+        resultados = []
+
+        def importar(indice):
+            try:
+                barrera.wait()
+                # Un documento común a todos los archivos y uno propio de cada uno
+                filas = [
+                    (2, {'documento': '9000', 'nombre': 'Comun'}),
+                    (3, {'documento': str(9100 + indice), 'nombre': f'Propio {indice}'}),
+                ]
+                resultados.append(importar_pasajeros(Reserva.objects.get(pk=reserva.pk), filas))
+            except Exception as e:
+                # Cualquier error queda registrado y hace fallar el test
+                resultados.append(e)
+            finally:
+                connections.close_all()
+
+        hilos = [
+            threading.Thread(target=importar, args=(indice,))
+            for indice in range(self.IMPORTACIONES_SIMULTANEAS)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual([r for r in resultados if isinstance(r, Exception)], [])
+        pasajeros = Pasajero.objects.filter(reserva=reserva)
+        self.assertEqual(pasajeros.count(), 3)
+        self.assertFalse(pasajeros.filter(por_asignar=True).exists())
+        self.assertEqual(len(set(pasajeros.values_list('persona_id', flat=True))), 3)
+        self.assertEqual(
+            sum(r['resumen']['pasajeros_asignados'] + r['resumen']['pasajeros_agregados'] for r in resultados), 2
+        )
@@ -0,0 +1,128 @@
+"""
+Tests del ledger de pagos por pasajero (PasajeroLedger):
+- Creación junto con el pasajero (save y bulk_create) y backfill de la migración 0025
+- Actualización incremental desde distribuciones y anulaciones de comprobantes
+- Reconstrucción desde el origen (recalcular_ledger_pasajero)
+
+Ejecutar tests:
+    python manage.py test apps.reserva.tests_ledger
+"""
+
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps as django_apps
+from django.test import TestCase
+
+from apps.comprobante.models import ComprobantePago, ComprobantePagoDistribucion
+from apps.empleado.models import Empleado
+from apps.paquete.tests_datos import DatosSalidaMixin
+from apps.puesto.models import Puesto
+from apps.reserva.models import Pasajero, PasajeroLedger
+from apps.reserva.services import calcular_ledger_desde_origen, recalcular_ledger_pasajero
+from apps.tipo_remuneracion.models import TipoRemuneracion
+
+
+class PasajeroLedgerTestCase(DatosSalidaMixin, TestCase):
+    """El ledger existe desde la creación del pasajero y coincide con el origen"""
+
+    def setUp(self):
+        super().setUp()
+        # Con modalidad y condición elegidas, los pagos pueden confirmar la reserva
+        self.reserva = self._crear_reserva(2, modalidad_facturacion='individual', condicion_pago='contado')
+        self.pasajero = Pasajero.objects.create(
+            reserva=self.reserva, persona=self.titular, es_titular=True
+        )
+        self.empleado = Empleado.objects.create(
+            persona=self._persona('3000'),
+            puesto=Puesto.objects.create(nombre='Cajero'),
+            tipo_remuneracion=TipoRemuneracion.objects.create(nombre='Fijo'),
+            salario=1
+        )
+
+    def _comprobante(self, monto, tipo='pago_parcial'):
+        # bulk_create: sin caja abierta ni movimientos, solo interesan las distribuciones
+        return ComprobantePago.objects.bulk_create([
+            ComprobantePago(
+                reserva=self.reserva, tipo=tipo, monto=monto, metodo_pago='transferencia',
+                numero_comprobante=f'CPG-TEST-{ComprobantePago.objects.count()}', empleado=self.empleado
+            )
+        ])[0]
+
+    def _assert_igual_al_origen(self, pasajero):
+        ledger = PasajeroLedger.objects.get(pasajero=pasajero)
+        totales = calcular_ledger_desde_origen([pasajero.pk])[pasajero.pk]
+        self.assertEqual(
+            (ledger.monto_pagado, ledger.monto_reembolsado, ledger.monto_acreditado),
+            (totales['monto_pagado'], totales['monto_reembolsado'], totales['monto_acreditado'])
+        )
+        self.assertEqual(ledger.saldo_pendiente, pasajero.precio_asignado - ledger.monto_neto)
+
+    def test_se_crea_con_el_pasajero(self):
+        ledger = PasajeroLedger.objects.get(pasajero=self.pasajero)
+        self.assertEqual(ledger.monto_neto, Decimal('0'))
+        self.assertEqual(ledger.saldo_pendiente, Decimal('1000'))
+
+        # En bloque: un solo INSERT de pasajeros y otro de ledgers
+        personas = [self._persona(str(4000 + i)) for i in range(3)]
+        with self.assertNumQueries(2):
+            nuevos = Pasajero.objects.bulk_create([
+                Pasajero(reserva=self.reserva, persona=persona, precio_asignado=Decimal('700'))
+                for persona in personas
+            ])
+        self.assertEqual(
+            list(PasajeroLedger.objects.filter(pasajero__in=nuevos).values_list('saldo_pendiente', flat=True)),
+            [Decimal('700')] * 3
+        )
+
+    def test_distribuciones_y_anulacion_actualizan_el_ledger(self):
+        pasajero = Pasajero.objects.select_related('ledger').get(pk=self.pasajero.pk)
+        self.assertEqual(pasajero.monto_pagado, Decimal('0'))
+
+        pago = self._comprobante(Decimal('600'))
+        ComprobantePagoDistribucion.objects.create(comprobante=pago, pasajero=pasajero, monto=Decimal('600'))
+        # El ledger que el pasajero tenía en memoria refleja el pago sin recargarlo
+        self.assertEqual(pasajero.monto_pagado, Decimal('600'))
+        self._assert_igual_al_origen(pasajero)
+
+        devolucion = self._comprobante(Decimal('100'), tipo='devolucion')
+        ComprobantePagoDistribucion.objects.create(comprobante=devolucion, pasajero=pasajero, monto=Decimal('-100'))
+        self.assertEqual(pasajero.monto_pagado, Decimal('500'))
+        self._assert_igual_al_origen(pasajero)
+
+        pago.anular('Prueba')
+        self.assertEqual(PasajeroLedger.objects.get(pasajero=pasajero).monto_neto, Decimal('0'))
+        self._assert_igual_al_origen(pasajero)
+
+        # Un cambio de precio mantiene el saldo alineado
+        pasajero.precio_asignado = Decimal('800')
+        pasajero.save()
+        self.assertEqual(pasajero.ledger.saldo_pendiente, Decimal('800'))
+
+    def test_recalcular_corrige_el_ledger_y_la_instancia(self):
+        ComprobantePagoDistribucion.objects.bulk_create([
+            ComprobantePagoDistribucion(
+                comprobante=self._comprobante(Decimal('250')), pasajero=self.pasajero, monto=Decimal('250')
+            )
+        ])
+        pasajero = Pasajero.objects.select_related('ledger').get(pk=self.pasajero.pk)
+        self.assertEqual(pasajero.monto_pagado, Decimal('0'))  # bulk_create no pasa por el ledger
+
+        ledger = recalcular_ledger_pasajero(pasajero)
+
+        self.assertEqual(ledger.monto_pagado, Decimal('250'))
+        self.assertEqual(pasajero.monto_pagado, Decimal('250'))
+        self.assertEqual(PasajeroLedger.objects.filter(pasajero=pasajero).count(), 1)
+        self._assert_igual_al_origen(pasajero)
+
+    def test_migracion_crea_los_ledgers_faltantes(self):
+        pago = self._comprobante(Decimal('400'))
+        ComprobantePagoDistribucion.objects.create(comprobante=pago, pasajero=self.pasajero, monto=Decimal('400'))
+        PasajeroLedger.objects.all().delete()
+
+        migracion = import_module('apps.reserva.migrations.0025_backfill_pasajero_ledger')
+        migracion.crear_ledgers_faltantes(django_apps, None)
+
+        ledger = PasajeroLedger.objects.get(pasajero=self.pasajero)
+        self.assertEqual((ledger.monto_pagado, ledger.saldo_pendiente), (Decimal('400'), Decimal('600')))
+        self._assert_igual_al_origen(self.pasajero)
@@ -0,0 +1,75 @@
+"""
+Tests de la creación en bloque de los pasajeros "Por Asignar N"
+(apps/reserva/services.completar_pasajeros_pendientes).
+
+Ejecutar tests:
+    python manage.py test apps.reserva.tests_pasajeros_pendientes
+"""
+
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.paquete.tests_datos import DatosSalidaMixin
+from apps.persona.models import PersonaFisica
+from apps.reserva.models import Pasajero, PasajeroLedger, Reserva
+from apps.reserva.services import completar_pasajeros_pendientes
+
+
+class PasajerosPendientesTestCase(DatosSalidaMixin, TestCase):
+    """Los pasajeros pendientes se crean en bloque y el detalle no escribe"""
+
+    TIPO_HABITACION = ('Cuádruple', 4)
+    CUPO_HABITACIONES = 5
+
+    def _reserva(self):
+        reserva = self._crear_reserva(4)
+        Pasajero.objects.create(reserva=reserva, persona=self.titular, es_titular=True)
+        return reserva
+
+    def test_completa_en_bloque_y_reutiliza_personas(self):
+        # Persona _PEND existente de otra reserva del mismo titular
+        PersonaFisica.objects.create(
+            tipo_documento=self.titular.tipo_documento,
+            documento='1000_PEND_2',
+            email='titular@test.com',
+            telefono='0981000000',
+            nombre='Por Asignar 2',
+            nacionalidad=self.titular.nacionalidad
+        )
+        reserva = self._reserva()
+
+        # Cantidad fija de consultas: lecturas, un INSERT por tabla (ledgers incluidos) y savepoint
+        with self.assertNumQueries(9):
+            creados = completar_pasajeros_pendientes(Reserva.objects.filter(pk=reserva.pk))
+
+        self.assertEqual(creados, 3)
+        pendientes = reserva.pasajeros.filter(por_asignar=True).order_by('persona__documento')
+        self.assertEqual(
+            [p.persona.documento for p in pendientes],
+            ['1000_PEND_2', '1000_PEND_3', '1000_PEND_4']
+        )
+        self.assertEqual(pendientes[1].persona.nombre, 'Por Asignar 3')
+        self.assertEqual(pendientes[1].persona.email, 'titular@test.com')
+        self.assertTrue(all(p.precio_asignado == Decimal('1000') for p in pendientes))
+        self.assertEqual(PasajeroLedger.objects.filter(pasajero__reserva=reserva).count(), 4)
+        self.assertEqual(PersonaFisica.objects.filter(documento__contains='_PEND').count(), 3)
+
+        # Idempotente
+        self.assertEqual(completar_pasajeros_pendientes(Reserva.objects.filter(pk=reserva.pk)), 0)
+
+    def test_detalle_no_crea_pasajeros_y_el_comando_los_completa(self):
+        reserva = self._reserva()
+
+        respuesta = APIClient().get(f'/api/reservas/{reserva.pk}/')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(reserva.pasajeros.count(), 1)
+
+        call_command('completar_pasajeros_pendientes', '--dry-run', stdout=StringIO())
+        self.assertEqual(reserva.pasajeros.count(), 1)
+
+        call_command('completar_pasajeros_pendientes', stdout=StringIO())
+        self.assertEqual(reserva.pasajeros.filter(por_asignar=True).count(), 3)
@@ -0,0 +1,101 @@
+"""
+Tests del presupuesto de consultas de los endpoints de reservas
+(query_budget de ReservaViewSet y ReservaListadoViewSet).
+
+Ejecutar tests:
+    python manage.py test apps.reserva.tests_perf
+
+Si un cambio hace que un endpoint supere su query_budget, el test
+correspondiente falla con PresupuestoConsultasExcedido.
+"""
+
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.paquete.tests_datos import DatosReservasMixin
+from apps.reserva.models import Pasajero
+
+
+@override_settings(PERF_PRESUPUESTO_ESTRICTO=True)
+class PresupuestoConsultasReservasTestCase(DatosReservasMixin, TestCase):
+    """Los endpoints de reservas no deben superar su presupuesto de consultas"""
+
+    def test_presupuesto_reservas(self):
+        # Página completa (page_size=5) del listado
+        self._get('/api/reservas/')
+        self._get(f'/api/reservas/{self.reserva.pk}/')
+
+    def test_presupuesto_reservas_v2(self):
+        self._get('/api/reservas/v2/?page_size=20')
+        self._get(f'/api/reservas/v2/{self.reserva.pk}/')
+
+    def test_listado_reservas_no_consulta_por_pasajero(self):
+        """/api/reservas/ ejecuta las mismas consultas sin importar cuántos pasajeros tiene la página"""
+        url = f'/api/reservas/?page_size={len(self.CANTIDAD_PASAJEROS)}'
+        self._get(url)   # carga cotizaciones
+
+        with CaptureQueriesContext(connection) as antes:
+            self._get(url)
+
+        # Dos pasajeros más en la reserva de un solo pasajero
+        for _ in range(2):
+            Pasajero.objects.create(reserva=self.reservas[0], persona=self._nueva_persona())
+
+        with CaptureQueriesContext(connection) as despues:
+            self._get(url)
+        self.assertEqual(len(antes), len(despues))
+
+    def test_listado_reservas_consultas_constantes(self):
+        """/api/reservas/v2/ ejecuta las mismas consultas sin importar page_size"""
+        self._get('/api/reservas/v2/')   # carga cotizaciones
+
+        consultas = []
+        for page_size in (1, len(self.CANTIDAD_PASAJEROS)):
+            with CaptureQueriesContext(connection) as contexto:
+                self._get(f'/api/reservas/v2/?page_size={page_size}')
+            consultas.append(len(contexto))
+
+        self.assertEqual(consultas[0], consultas[1])
+
+    def test_detalle_reserva_consultas_constantes(self):
+        """El detalle de una reserva no ejecuta consultas por pasajero ni por comprobante"""
+        from apps.comprobante.models import ComprobantePago, ComprobantePagoDistribucion
+        from apps.empleado.models import Empleado
+        from apps.puesto.models import Puesto
+        from apps.tipo_remuneracion.models import TipoRemuneracion
+
+        empleado = Empleado.objects.create(
+            persona=self._nueva_persona(),
+            puesto=Puesto.objects.create(nombre='Cajero'),
+            tipo_remuneracion=TipoRemuneracion.objects.create(nombre='Fijo'),
+            salario=1
+        )
+        # Un comprobante en la reserva menor y tres en la mayor.
+        # bulk_create: sin caja abierta ni movimientos, solo interesa la cantidad de filas
+        menor, mayor = self.reservas[0], self.reservas[-1]
+        comprobantes = ComprobantePago.objects.bulk_create([
+            ComprobantePago(
+                reserva=reserva, tipo='pago_parcial', monto=Decimal('100'), metodo_pago='transferencia',
+                numero_comprobante=f'CPG-TEST-{reserva.pk}-{numero}', empleado=empleado
+            )
+            for reserva, cantidad in ((menor, 1), (mayor, 3))
+            for numero in range(cantidad)
+        ])
+        ComprobantePagoDistribucion.objects.bulk_create([
+            ComprobantePagoDistribucion(comprobante=comprobante, pasajero=pasajero, monto=Decimal('25'))
+            for comprobante in comprobantes
+            for pasajero in comprobante.reserva.pasajeros.all()
+        ])
+
+        for url in ('/api/reservas/{}/', '/api/reservas/v2/{}/'):
+            consultas = []
+            for reserva in (menor, mayor):
+                self._get(url.format(reserva.pk))   # carga cotizaciones
+                with CaptureQueriesContext(connection) as contexto:
+                    self._get(url.format(reserva.pk))
+                consultas.append(len(contexto))
+
+            self.assertEqual(consultas[0], consultas[1], url)
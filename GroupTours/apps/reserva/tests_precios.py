@@ -0,0 +1,78 @@
+"""
+Tests del precio de catálogo resuelto de las reservas (Reserva.precio_resuelto)
+y de su resolución en lote (apps/paquete/services.resolver_precios_catalogo).
+
+Ejecutar tests:
+    python manage.py test apps.reserva.tests_precios
+"""
+
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.hotel.models import Habitacion, TipoHabitacion
+from apps.paquete.models import CupoHabitacionSalida, PrecioCatalogoHabitacion, PrecioCatalogoHotel
+from apps.paquete.services import resolver_precios_catalogo
+from apps.paquete.tests_datos import DatosSalidaMixin
+from apps.reserva.models import Reserva
+
+
+class PrecioResueltoTestCase(DatosSalidaMixin, TestCase):
+    """El precio de catálogo se resuelve al reservar y no se vuelve a consultar"""
+
+    CUPO_HABITACIONES = 5
+
+    def setUp(self):
+        super().setUp()
+        self.doble = self.habitacion
+        self.triple = Habitacion.objects.create(
+            hotel=self.hotel, tipo_habitacion=TipoHabitacion.objects.create(nombre='Triple', capacidad=3)
+        )
+        CupoHabitacionSalida.objects.create(salida=self.salida, habitacion=self.triple, cupo=5)
+        PrecioCatalogoHabitacion.objects.create(
+            salida=self.salida, habitacion=self.doble, precio_catalogo=Decimal('1000')
+        )
+        PrecioCatalogoHotel.objects.create(salida=self.salida, hotel=self.hotel, precio_catalogo=Decimal('800'))
+
+    def test_resolucion_en_lote_con_una_consulta(self):
+        with self.assertNumQueries(1):
+            precios = resolver_precios_catalogo([
+                (self.salida.pk, self.doble.pk),
+                (self.salida.pk, self.triple.pk),
+                (self.salida.pk, 999),
+            ])
+
+        self.assertEqual(precios[(self.salida.pk, self.doble.pk)], (Decimal('1000'), 'habitacion', self.moneda.pk))
+        self.assertEqual(precios[(self.salida.pk, self.triple.pk)], (Decimal('800'), 'hotel', self.moneda.pk))
+        self.assertEqual(precios[(self.salida.pk, 999)], (Decimal('0'), 'sin_catalogo', None))
+
+    def test_reserva_guarda_el_precio_resuelto(self):
+        reserva = Reserva.objects.create(
+            titular=self.titular,
+            paquete=self.paquete,
+            salida=self.salida,
+            habitacion=self.triple,
+            cantidad_pasajeros=3
+        )
+        reserva = Reserva.objects.get(pk=reserva.pk)
+        self.assertEqual(reserva.precio_resuelto_fuente, 'hotel')
+
+        with CaptureQueriesContext(connection) as contexto:
+            self.assertEqual(reserva.precio_base_paquete, Decimal('800'))
+        self.assertEqual(len(contexto), 0)
+
+        # Cambiar de habitación vuelve a resolver el precio
+        reserva.habitacion = self.doble
+        reserva.save(update_fields=['habitacion'])
+        reserva = Reserva.objects.get(pk=reserva.pk)
+        self.assertEqual((reserva.precio_resuelto, reserva.precio_resuelto_fuente), (Decimal('1000'), 'habitacion'))
+
+        # Repricing en lote después de corregir el catálogo
+        PrecioCatalogoHabitacion.objects.update(precio_catalogo=Decimal('1200'))
+        call_command('resolver_precios_reservas', '--recalcular', stdout=StringIO())
+        reserva.refresh_from_db()
+        self.assertEqual(reserva.precio_resuelto, Decimal('1200'))
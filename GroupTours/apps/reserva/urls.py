@@ -1,4 +1,5 @@
 from django.urls import path
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.urlpatterns import format_suffix_patterns
 from .views import (
     ReservaViewSet,
@@ -20,6 +21,11 @@ urlpatterns = [
     # Endpoints de servicios adicionales por reserva
     path('<int:pk>/servicios-adicionales/', ReservaViewSet.as_view({'get': 'servicios_adicionales'}), name='reserva-servicios-adicionales'),
     path('<int:pk>/agregar-servicio/', ReservaViewSet.as_view({'post': 'agregar_servicio'}), name='reserva-agregar-servicio'),
+    path(
+        '<int:pk>/importar-pasajeros/',
+        ReservaViewSet.as_view({'post': 'importar_pasajeros'}, parser_classes=[MultiPartParser, FormParser]),
+        name='reserva-importar-pasajeros'
+    ),
     path('<int:pk>/resumen-costos/', ReservaViewSet.as_view({'get': 'resumen_costos'}), name='reserva-resumen-costos'),
 
     # Endpoints de pagos
@@ -2,6 +2,7 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from django.db import transaction
@@ -17,6 +18,8 @@ from .serializers import (
     ReservaListadoSerializer
 )
 from .filters import ReservaFilter
+from apps.dashboard.paginacion import PaginacionCursorMixin
+from apps.dashboard.perf import MonitorConsultasMixin
 from .services import (
     obtener_detalle_reserva,
     obtener_resumen_reserva,
@@ -24,6 +27,8 @@ from .services import (
     obtener_comprobantes_reserva,
     obtener_servicios_reserva,
     distribuir_devolucion_en_pasajeros,
+    precargar_detalle_reserva,
+    precargar_listado_reserva,
 )
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 
@@ -99,11 +104,13 @@ def obtener_o_crear_pasajero_pendiente(reserva, sufijo=""):
 
     return pasajero_pendiente
 
-class ReservaPagination(PageNumberPagination):
+class ReservaPagination(PaginacionCursorMixin, PageNumberPagination):
     page_size = 5
     page_size_query_param = 'page_size'
 
     def get_paginated_response(self, data):
+        if self.modo_cursor:
+            return self.get_respuesta_cursor(data)
         return Response({
             'totalItems': self.page.paginator.count,
             'pageSize': self.get_page_size(self.request),
@@ -113,7 +120,10 @@ class ReservaPagination(PageNumberPagination):
             'results': data
         })
 
-class ReservaViewSet(viewsets.ModelViewSet):
+class ReservaViewSet(MonitorConsultasMixin, viewsets.ModelViewSet):
+    # Presupuesto de consultas calibrado con apps/reserva/tests_perf.py (solo debe bajar).
+    # El listado ejecuta unas consultas fijas más unas pocas por reserva de la página (page_size=5).
+    query_budget = {'list': 65, 'retrieve': 22}
     queryset = Reserva.objects.select_related("titular", "paquete").prefetch_related("pasajeros").order_by('-fecha_reserva')
     serializer_class = ReservaSerializer
     pagination_class = ReservaPagination
@@ -136,72 +146,24 @@ class ReservaViewSet(viewsets.ModelViewSet):
         """
         queryset = Reserva.objects.select_related("titular", "paquete").prefetch_related("pasajeros").order_by('-fecha_reserva')
 
-        if self.action == 'retrieve':
+        if self.action == 'list':
+            queryset = precargar_listado_reserva(queryset)
+        elif self.action == 'retrieve':
             # Precargar todas las relaciones necesarias para el detalle
-            queryset = queryset.select_related(
-                'titular',
-                'paquete',
-                'paquete__tipo_paquete',
-                'paquete__destino',
-                'paquete__destino__ciudad',
-                'paquete__destino__ciudad__pais',
-                'paquete__moneda',
-                'paquete__distribuidora',
-                'salida',
-                'salida__temporada',
-                'habitacion',
-                'habitacion__hotel',
-                'habitacion__hotel__cadena',
-                'habitacion__hotel__ciudad',
-            ).prefetch_related(
-                'pasajeros',
-                'pasajeros__persona',
-                'pasajeros__distribuciones_pago',
-                'pasajeros__distribuciones_pago__comprobante',
-                'servicios_adicionales',
-                'servicios_adicionales__servicio',
-                'comprobantes',
-                'comprobantes__distribuciones',
-                'comprobantes__distribuciones__pasajero',
-                'comprobantes__empleado',
-                'comprobantes__empleado__persona',
-                'paquete__paquete_servicios',
-                'paquete__paquete_servicios__servicio',
-            )
+            queryset = precargar_detalle_reserva(queryset)
 
         return queryset
 
     def retrieve(self, request, *args, **kwargs):
         """
-        Sobrescribe el método retrieve para crear pasajeros 'Por Asignar' automáticamente
-        cuando la reserva tiene menos pasajeros de los esperados.
-
-        Si la reserva cumple:
-        - Tiene menos pasajeros registrados que cantidad_pasajeros
-        - Tiene titular asignado
-        - Tiene cantidad_pasajeros > 0
+        Detalle de la reserva, de solo lectura.
 
-        Entonces crea automáticamente pasajeros "Por Asignar X" para completar la cantidad faltante.
+        Los pasajeros "Por Asignar N" que completan cantidad_pasajeros se crean en
+        bloque al crear la reserva o al cambiar su cantidad de pasajeros
+        (completar_pasajeros_pendientes); las reservas previas se completan con
+        el comando completar_pasajeros_pendientes.
         """
-        # Obtener la reserva
         instance = self.get_object()
-
-        # Verificar si necesitamos crear pasajeros pendientes
-        # Solo si la cantidad actual de pasajeros es menor a la cantidad esperada
-        if instance.titular and instance.cantidad_pasajeros and instance.cantidad_pasajeros > 0:
-            cantidad_actual = instance.pasajeros.count()
-
-            # Si hay menos pasajeros de los esperados, crear los faltantes
-            if cantidad_actual < instance.cantidad_pasajeros:
-                # Crear pasajeros pendientes para completar la cantidad
-                for i in range(cantidad_actual + 1, instance.cantidad_pasajeros + 1):
-                    sufijo = str(i)
-                    obtener_o_crear_pasajero_pendiente(instance, sufijo)
-
-                # Refrescar la instancia para incluir los pasajeros recién creados
-                instance.refresh_from_db()
-
-        # Serializar y retornar
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
@@ -270,6 +232,56 @@ class ReservaViewSet(viewsets.ModelViewSet):
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    # ----- ENDPOINT: Importar lista de pasajeros (CSV/XLSX) -----
+    @action(
+        detail=True,
+        methods=['post'],
+        url_path='importar-pasajeros',
+        parser_classes=[MultiPartParser, FormParser]
+    )
+    def importar_pasajeros(self, request, pk=None):
+        """
+        POST /api/reservas/{id}/importar-pasajeros/
+        Body (multipart): archivo=<pasajeros.csv | pasajeros.xlsx>
+
+        Carga en bloque los pasajeros de la reserva: crea o actualiza las personas por
+        documento y reemplaza a los pasajeros "Por Asignar". Columnas y reglas en
+        apps/reserva/importacion.py.
+
+        Respuesta:
+        {
+            "resumen": {"filas": 3, "importadas": 2, "con_error": 1, ...},
+            "filas": [
+                {"fila": 2, "documento": "4567890", "estado": "ok", "persona": "creada",
+                 "pasajero": "asignado", "pasajero_id": 31, "errores": []},
+                {"fila": 4, "documento": "123", "estado": "error", ..., "errores": ["nombre: ..."]}
+            ]
+        }
+        """
+        from .importacion import importar_pasajeros, leer_filas_archivo
+
+        reserva = self.get_object()
+
+        if reserva.estado == 'cancelada':
+            return Response(
+                {'error': 'No se pueden importar pasajeros en una reserva cancelada'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        archivo = request.FILES.get('archivo')
+        if archivo is None:
+            return Response(
+                {'error': "Debe enviar el archivo en el campo 'archivo' (.csv o .xlsx)"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            filas = leer_filas_archivo(archivo)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(importar_pasajeros(reserva, filas))
+
     # ----- ENDPOINT: Obtener resumen de costos de una reserva -----
     @action(detail=True, methods=['get'], url_path='resumen-costos')
     def resumen_costos(self, request, pk=None):
@@ -418,7 +430,8 @@ class ReservaViewSet(viewsets.ModelViewSet):
 
         Descarga el PDF del comprobante de pago de una reserva.
         Si no existe comprobante, retorna error 404.
-        Si existe pero no tiene PDF, lo genera automáticamente.
+        Si el PDF no está generado (o cambiaron sus datos) responde 202 con poll_url
+        mientras se genera en segundo plano (ver apps/generacion_pdf).
 
         Query params opcionales:
         - regenerar=true : Fuerza la regeneración del PDF
@@ -427,9 +440,8 @@ class ReservaViewSet(viewsets.ModelViewSet):
         - Content-Type: application/pdf
         - Content-Disposition: attachment; filename="comprobante_CPG-2025-0001.pdf"
         """
-        from django.http import FileResponse
         from apps.comprobante.models import ComprobantePago
-        import os
+        from apps.generacion_pdf.views import respuesta_pdf
 
         reserva = self.get_object()
 
@@ -447,51 +459,13 @@ class ReservaViewSet(viewsets.ModelViewSet):
 
         regenerar = request.query_params.get('regenerar', 'false').lower() == 'true'
 
-        # Si no existe PDF o se solicita regenerar
-        if not comprobante.pdf_generado or regenerar:
-            try:
-                comprobante.generar_pdf()
-                comprobante.save()
-            except Exception as e:
-                return Response(
-                    {'error': f'Error al generar PDF: {str(e)}'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-
-        # Verificar que el archivo físico existe
-        if not comprobante.pdf_generado:
-            return Response(
-                {'error': 'No se pudo generar el PDF'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-        pdf_path = comprobante.pdf_generado.path
-        if not os.path.exists(pdf_path):
-            # Intentar regenerar si el archivo fue eliminado
-            try:
-                comprobante.generar_pdf()
-                comprobante.save()
-                pdf_path = comprobante.pdf_generado.path
-            except Exception as e:
-                return Response(
-                    {'error': f'El archivo PDF no existe y no se pudo regenerar: {str(e)}'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-
-        # Retornar el archivo PDF
-        try:
-            response = FileResponse(
-                open(pdf_path, 'rb'),
-                content_type='application/pdf'
-            )
-            filename = f'comprobante_{comprobante.numero_comprobante}.pdf'
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
-        except Exception as e:
-            return Response(
-                {'error': f'Error al leer el archivo PDF: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return respuesta_pdf(
+            request,
+            'comprobante',
+            comprobante,
+            f'comprobante_{comprobante.numero_comprobante}.pdf',
+            regenerar=regenerar
+        )
 
     # ----- ENDPOINT: Descargar factura global de una reserva -----
     @action(detail=True, methods=['get'], url_path='descargar-factura-global')
@@ -501,6 +475,7 @@ class ReservaViewSet(viewsets.ModelViewSet):
 
         Genera (si no existe) y descarga el PDF de la factura global de una reserva.
         Este endpoint unifica la generación y descarga en un solo paso.
+        Mientras el PDF se genera en segundo plano responde 202 con poll_url.
 
         Query params opcionales:
         - regenerar_pdf=true : Fuerza la regeneración del PDF
@@ -531,9 +506,8 @@ class ReservaViewSet(viewsets.ModelViewSet):
             generar_factura_global,
             validar_factura_global
         )
-        from django.http import FileResponse
         from django.core.exceptions import ValidationError as DjangoValidationError
-        import os
+        from apps.generacion_pdf.views import respuesta_pdf
 
         try:
             reserva = self.get_object()
@@ -581,47 +555,16 @@ class ReservaViewSet(viewsets.ModelViewSet):
                         'detalle': str(e.message) if hasattr(e, 'message') else str(e)
                     }, status=status.HTTP_400_BAD_REQUEST)
 
-            # 3. Verificar/generar PDF
+            # 3. Retornar el PDF (o 202 mientras se genera)
             regenerar_pdf = request.query_params.get('regenerar_pdf', 'false').lower() == 'true'
 
-            if not factura.pdf_generado or regenerar_pdf:
-                try:
-                    factura.generar_pdf()
-                except Exception as e:
-                    return Response({
-                        'error': f'Error al generar PDF: {str(e)}'
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            # 4. Verificar que el archivo físico existe
-            if not factura.pdf_generado:
-                return Response({
-                    'error': 'No se pudo generar el PDF'
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            pdf_path = factura.pdf_generado.path
-            if not os.path.exists(pdf_path):
-                # Intentar regenerar si el archivo fue eliminado
-                try:
-                    factura.generar_pdf()
-                    pdf_path = factura.pdf_generado.path
-                except Exception as e:
-                    return Response({
-                        'error': f'El archivo PDF no existe y no se pudo regenerar: {str(e)}'
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            # 5. Retornar el archivo PDF
-            try:
-                response = FileResponse(
-                    open(pdf_path, 'rb'),
-                    content_type='application/pdf'
-                )
-                filename = f'factura_{factura.numero_factura.replace("-", "_")}.pdf'
-                response['Content-Disposition'] = f'attachment; filename="{filename}"'
-                return response
-            except Exception as e:
-                return Response({
-                    'error': f'Error al leer el archivo PDF: {str(e)}'
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return respuesta_pdf(
+                request,
+                'factura',
+                factura,
+                f'factura_{factura.numero_factura.replace("-", "_")}.pdf',
+                regenerar=regenerar_pdf
+            )
 
         except Exception as e:
             return Response({
@@ -636,6 +579,7 @@ class ReservaViewSet(viewsets.ModelViewSet):
 
         Genera (si no existe) y descarga el PDF de la factura individual de un pasajero.
         Similar a la factura global, pero sólo para un pasajero específico.
+        Mientras el PDF se genera en segundo plano responde 202 con poll_url.
 
         Query params:
         - pasajero_id (requerido)
@@ -663,9 +607,8 @@ class ReservaViewSet(viewsets.ModelViewSet):
             generar_factura_individual,
             validar_factura_individual
         )
-        from django.http import FileResponse
         from django.core.exceptions import ValidationError as DjangoValidationError
-        import os
+        from apps.generacion_pdf.views import respuesta_pdf
 
         try:
             reserva = self.get_object()
@@ -723,25 +666,16 @@ class ReservaViewSet(viewsets.ModelViewSet):
                         'detalle': str(e.message) if hasattr(e, 'message') else str(e)
                     }, status=status.HTTP_400_BAD_REQUEST)
 
-            # 3. Verificar/generar PDF
+            # 3. Retornar el PDF (o 202 mientras se genera)
             regenerar_pdf = request.query_params.get('regenerar_pdf', 'false').lower() == 'true'
-            if not factura.pdf_generado or regenerar_pdf:
-                try:
-                    factura.generar_pdf()
-                except Exception as e:
-                    return Response({
-                        'error': f'Error al generar PDF: {str(e)}'
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-            if not factura.pdf_generado or not os.path.exists(factura.pdf_generado.path):
-                return Response({'error': 'No se pudo generar o encontrar el PDF'},
-                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            # 4. Retornar archivo
-            response = FileResponse(open(factura.pdf_generado.path, 'rb'), content_type='application/pdf')
-            filename = f'factura_{factura.numero_factura.replace("-", "_")}.pdf'
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
+            return respuesta_pdf(
+                request,
+                'factura',
+                factura,
+                f'factura_{factura.numero_factura.replace("-", "_")}.pdf',
+                regenerar=regenerar_pdf
+            )
 
         except Exception as e:
             return Response({
@@ -3342,7 +3276,7 @@ class PasajeroViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ReservaListadoViewSet(viewsets.ReadOnlyModelViewSet):
+class ReservaListadoViewSet(MonitorConsultasMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet optimizado para listar reservas con información mínima.
 
@@ -3369,6 +3303,9 @@ class ReservaListadoViewSet(viewsets.ReadOnlyModelViewSet):
     Paginación:
     - page: número de página (default: 1)
     - page_size: cantidad de items por página (default: 10)
+    - cursor: pagina por (fecha_reserva, id) en lugar de page; vacío para la
+      primera página, luego el nextCursor de la respuesta
+    - conteo: con cursor, ninguno (default), aproximado o exacto
 
     Ejemplo:
     GET /api/reservas_v2/?page=1&page_size=10&activo=true&estado=confirmada
@@ -3378,13 +3315,18 @@ class ReservaListadoViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = []
     filter_backends = [DjangoFilterBackend]
     filterset_class = ReservaFilter
+    # El listado no depende de page_size (calibrado con apps/reserva/tests_perf.py)
+    query_budget = {'list': 4, 'retrieve': 22}
+    # Clave del modo ?cursor= (índice reserva_fecha_id_idx)
+    cursor_ordering = ('-fecha_reserva', '-id')
 
     def get_queryset(self):
         """
         Queryset optimizado con select_related para minimizar consultas a la BD.
-        Solo precarga las relaciones necesarias para el listado.
+        Solo precarga las relaciones necesarias para el listado; los montos y el
+        estado de pago salen de las anotaciones de with_financials().
         """
-        return Reserva.objects.select_related(
+        return Reserva.objects.with_financials().select_related(
             'titular',
             'paquete',
             'paquete__moneda',
@@ -3408,39 +3350,7 @@ class ReservaListadoViewSet(viewsets.ReadOnlyModelViewSet):
         que el endpoint /api/reservas/{id}/ para obtener toda la información.
         """
         # Obtener la instancia con todas las relaciones precargadas
-        instance = Reserva.objects.select_related(
-            'titular',
-            'paquete',
-            'paquete__tipo_paquete',
-            'paquete__destino',
-            'paquete__destino__ciudad',
-            'paquete__destino__ciudad__pais',
-            'paquete__moneda',
-            'paquete__distribuidora',
-            'salida',
-            'salida__temporada',
-            'salida__moneda',
-            'habitacion',
-            'habitacion__hotel',
-            'habitacion__hotel__cadena',
-            'habitacion__hotel__ciudad',
-            'habitacion__moneda',
-        ).prefetch_related(
-            'pasajeros',
-            'pasajeros__persona',
-            'pasajeros__distribuciones_pago',
-            'pasajeros__distribuciones_pago__comprobante',
-            'servicios_adicionales',
-            'servicios_adicionales__servicio',
-            'comprobantes',
-            'comprobantes__distribuciones',
-            'comprobantes__distribuciones__pasajero',
-            'comprobantes__distribuciones__pasajero__persona',
-            'comprobantes__empleado',
-            'comprobantes__empleado__persona',
-            'paquete__paquete_servicios',
-            'paquete__paquete_servicios__servicio',
-        ).get(pk=kwargs['pk'])
+        instance = precargar_detalle_reserva(Reserva.objects.all()).get(pk=kwargs['pk'])
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-17 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SecuenciaCodigo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefijo', models.CharField(help_text='Prefijo del código (ej: RSV, CPG, MOV)', max_length=10)),
+                ('anio', models.PositiveIntegerField(help_text='Año al que corresponde la numeración')),
+                ('ultimo_numero', models.PositiveIntegerField(default=0, help_text='Último número entregado para este prefijo y año')),
+                ('fecha_modificacion', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Secuencia de Código',
+                'verbose_name_plural': 'Secuencias de Códigos',
+                'db_table': 'SecuenciaCodigo',
+                'unique_together': {('prefijo', 'anio')},
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2 on 2026-10-17 09:40
+
+import re
+
+from django.db import migrations
+
+
+# Copia de apps.secuencia.models.FUENTES_CODIGO al momento de esta migración:
+# prefijo → (modelo, campo del código)
+FUENTES_CODIGO = {
+    'RSV': ('reserva.Reserva', 'codigo'),
+    'CPG': ('comprobante.ComprobantePago', 'numero_comprobante'),
+    'MOV': ('arqueo_caja.MovimientoCaja', 'numero_movimiento'),
+    'APR': ('arqueo_caja.AperturaCaja', 'codigo_apertura'),
+    'CIE': ('arqueo_caja.CierreCaja', 'codigo_cierre'),
+    'SAL': ('paquete.SalidaPaquete', 'codigo'),
+}
+
+
+def inicializar_secuencias(apps, schema_editor):
+    """
+    Inicializa los contadores de SecuenciaCodigo con el mayor correlativo
+    existente por (prefijo, año) en cada tabla de origen.
+    """
+    SecuenciaCodigo = apps.get_model('secuencia', 'SecuenciaCodigo')
+
+    for prefijo, (modelo_label, campo) in FUENTES_CODIGO.items():
+        modelo = apps.get_model(modelo_label)
+        patron = re.compile(rf"^{prefijo}-(\d{{4}})-(\d+)$")
+
+        ultimos = {}
+        codigos = modelo.objects.filter(
+            **{f"{campo}__startswith": f"{prefijo}-"}
+        ).values_list(campo, flat=True)
+
+        for codigo in codigos.iterator():
+            coincidencia = patron.match(codigo or '')
+            if not coincidencia:
+                continue
+            anio, numero = int(coincidencia.group(1)), int(coincidencia.group(2))
+            ultimos[anio] = max(ultimos.get(anio, 0), numero)
+
+        for anio, ultimo in ultimos.items():
+            SecuenciaCodigo.objects.update_or_create(
+                prefijo=prefijo,
+                anio=anio,
+                defaults={'ultimo_numero': ultimo}
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('secuencia', '0001_initial'),
+        ('reserva', '0021_pasajeroledger'),
+        ('comprobante', '0003_migrar_vouchers_a_pasajeros'),
+        ('arqueo_caja', '0006_alter_cierrecaja_diferencia_porcentaje'),
+        ('paquete', '0025_remove_modalidad_habitacion_fija'),
+    ]
+
+    operations = [
+        migrations.RunPython(inicializar_secuencias, migrations.RunPython.noop),
+    ]
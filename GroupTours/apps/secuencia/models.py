@@ -0,0 +1,73 @@
+from django.db import models
+
+
+# Origen de cada código secuencial: prefijo → (modelo, campo del código)
+# Se usa para inicializar el contador desde los datos existentes.
+FUENTES_CODIGO = {
+    'RSV': ('reserva.Reserva', 'codigo'),
+    'CPG': ('comprobante.ComprobantePago', 'numero_comprobante'),
+    'MOV': ('arqueo_caja.MovimientoCaja', 'numero_movimiento'),
+    'APR': ('arqueo_caja.AperturaCaja', 'codigo_apertura'),
+    'CIE': ('arqueo_caja.CierreCaja', 'codigo_cierre'),
+    'SAL': ('paquete.SalidaPaquete', 'codigo'),
+}
+
+
+class SecuenciaCodigo(models.Model):
+    """
+    Contador por (prefijo, año) para los códigos correlativos del sistema
+    (RSV-2025-0001, CPG-2025-0001, MOV-..., APR-..., CIE-..., SAL-...).
+
+    Reemplaza el cálculo `filter(año).count() + 1`, que recorría la tabla en cada
+    alta y podía generar códigos duplicados con inserciones concurrentes.
+    La fila se bloquea con select_for_update() al incrementar.
+    """
+
+    prefijo = models.CharField(
+        max_length=10,
+        help_text="Prefijo del código (ej: RSV, CPG, MOV)"
+    )
+    anio = models.PositiveIntegerField(
+        help_text="Año al que corresponde la numeración"
+    )
+    ultimo_numero = models.PositiveIntegerField(
+        default=0,
+        help_text="Último número entregado para este prefijo y año"
+    )
+    fecha_modificacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Secuencia de Código"
+        verbose_name_plural = "Secuencias de Códigos"
+        db_table = "SecuenciaCodigo"
+        unique_together = ("prefijo", "anio")
+
+    def __str__(self):
+        return f"{self.prefijo}-{self.anio}: {self.ultimo_numero}"
+
+
+def obtener_ultimo_numero_existente(modelo, campo, prefijo, anio):
+    """
+    Retorna el mayor correlativo ya usado en `modelo.campo` para el prefijo y año.
+
+    Args:
+        modelo: Clase del modelo (puede ser el modelo histórico de una migración)
+        campo (str): Nombre del campo que contiene el código
+        prefijo (str): Prefijo del código
+        anio (int): Año de la numeración
+
+    Returns:
+        int: Último número encontrado (0 si no hay códigos)
+    """
+    inicio = f"{prefijo}-{anio}-"
+    codigos = modelo.objects.filter(
+        **{f"{campo}__startswith": inicio}
+    ).values_list(campo, flat=True)
+
+    ultimo = 0
+    for codigo in codigos.iterator():
+        try:
+            ultimo = max(ultimo, int(codigo[len(inicio):]))
+        except (TypeError, ValueError):
+            continue
+    return ultimo
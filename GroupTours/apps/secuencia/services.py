@@ -0,0 +1,111 @@
+"""
+Servicio de numeración secuencial compartido.
+
+Entrega códigos correlativos por (prefijo, año) de forma atómica usando una
+fila contador bloqueada con select_for_update(), evitando el conteo completo
+de la tabla y los códigos duplicados en altas concurrentes.
+"""
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.utils.timezone import now
+
+from .models import FUENTES_CODIGO, SecuenciaCodigo, obtener_ultimo_numero_existente
+
+
+def formatear_codigo(prefijo, anio, numero):
+    """
+    Formatea un código correlativo: PREFIJO-AÑO-NNNN (ej: RSV-2025-0001).
+    """
+    return f"{prefijo}-{anio}-{numero:04d}"
+
+
+def _valor_inicial(prefijo, anio):
+    """
+    Valor inicial de un contador nuevo: el mayor correlativo ya existente
+    en la tabla de origen del prefijo (0 si el prefijo no tiene tabla asociada).
+    """
+    fuente = FUENTES_CODIGO.get(prefijo)
+    if not fuente:
+        return 0
+    modelo_label, campo = fuente
+    modelo = django_apps.get_model(modelo_label)
+    return obtener_ultimo_numero_existente(modelo, campo, prefijo, anio)
+
+
+def reservar_bloque(prefijo, cantidad, anio=None):
+    """
+    Reserva un bloque contiguo de números para el prefijo y año indicados.
+
+    Útil para inserciones masivas (bulk_create): se bloquea el contador una
+    sola vez y se entregan `cantidad` números consecutivos.
+
+    Args:
+        prefijo (str): Prefijo del código (ej: 'RSV')
+        cantidad (int): Cantidad de números a reservar (>= 1)
+        anio (int, optional): Año de la numeración. Por defecto el año actual.
+
+    Returns:
+        range: Números reservados (ej: range(15, 20))
+
+    Raises:
+        ValueError: Si la cantidad es menor a 1
+    """
+    if cantidad < 1:
+        raise ValueError("La cantidad de números a reservar debe ser mayor a cero")
+
+    anio = anio or now().year
+
+    with transaction.atomic():
+        if not SecuenciaCodigo.objects.filter(prefijo=prefijo, anio=anio).exists():
+            SecuenciaCodigo.objects.get_or_create(
+                prefijo=prefijo,
+                anio=anio,
+                defaults={'ultimo_numero': _valor_inicial(prefijo, anio)}
+            )
+
+        secuencia = SecuenciaCodigo.objects.select_for_update().get(prefijo=prefijo, anio=anio)
+        inicio = secuencia.ultimo_numero + 1
+        secuencia.ultimo_numero += cantidad
+        secuencia.save(update_fields=['ultimo_numero', 'fecha_modificacion'])
+
+    return range(inicio, inicio + cantidad)
+
+
+def siguiente_numero(prefijo, anio=None):
+    """
+    Retorna el siguiente número correlativo para el prefijo y año indicados.
+    """
+    return reservar_bloque(prefijo, 1, anio=anio)[0]
+
+
+def generar_codigo(prefijo, anio=None):
+    """
+    Genera el siguiente código correlativo completo.
+
+    Args:
+        prefijo (str): Prefijo del código (ej: 'CPG')
+        anio (int, optional): Año de la numeración. Por defecto el año actual.
+
+    Returns:
+        str: Código formateado (ej: 'CPG-2025-0042')
+
+    Example:
+        >>> generar_codigo('RSV')
+        'RSV-2025-0001'
+    """
+    anio = anio or now().year
+    return formatear_codigo(prefijo, anio, siguiente_numero(prefijo, anio=anio))
+
+
+def reservar_codigos(prefijo, cantidad, anio=None):
+    """
+    Reserva un bloque de códigos correlativos completos para inserciones masivas.
+
+    Returns:
+        list[str]: Códigos formateados en orden ascendente
+    """
+    anio = anio or now().year
+    return [
+        formatear_codigo(prefijo, anio, numero)
+        for numero in reservar_bloque(prefijo, cantidad, anio=anio)
+    ]
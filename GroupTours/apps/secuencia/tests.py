@@ -0,0 +1,101 @@
+"""
+Tests del servicio de numeración secuencial (apps/secuencia/services.py)
+y de la inicialización de contadores de la migración 0002.
+
+Ejecutar tests:
+    python manage.py test apps.secuencia.tests
+"""
+
+from datetime import datetime
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps as django_apps
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.paquete.tests_datos import DatosSalidaMixin
+from apps.reserva.models import Reserva
+from apps.secuencia.models import SecuenciaCodigo
+from apps.secuencia.services import generar_codigo, reservar_bloque, reservar_codigos
+
+
+class ReservarBloqueTestCase(TestCase):
+    """Los números se entregan consecutivos por (prefijo, año)"""
+
+    def test_bloques_consecutivos(self):
+        self.assertEqual(reservar_bloque('TST', 3, anio=2025), range(1, 4))
+        self.assertEqual(reservar_bloque('TST', 2, anio=2025), range(4, 6))
+        self.assertEqual(SecuenciaCodigo.objects.get(prefijo='TST', anio=2025).ultimo_numero, 5)
+
+        # Otro prefijo y otro año tienen su propio contador
+        self.assertEqual(reservar_bloque('OTR', 1, anio=2025), range(1, 2))
+        self.assertEqual(reservar_bloque('TST', 1, anio=2026), range(1, 2))
+
+    def test_cantidad_invalida(self):
+        with self.assertRaises(ValueError):
+            reservar_bloque('TST', 0, anio=2025)
+        self.assertFalse(SecuenciaCodigo.objects.exists())
+
+    def test_reservar_codigos(self):
+        generar_codigo('TST', anio=2025)
+
+        self.assertEqual(
+            reservar_codigos('TST', 3, anio=2025),
+            ['TST-2025-0002', 'TST-2025-0003', 'TST-2025-0004']
+        )
+        self.assertEqual(generar_codigo('TST', anio=2025), 'TST-2025-0005')
+
+    def test_cambio_de_anio(self):
+        """Sin año explícito se usa el año actual y la numeración reinicia con el año"""
+        def en_fecha(*fecha):
+            return mock.patch(
+                'apps.secuencia.services.now',
+                return_value=timezone.make_aware(datetime(*fecha))
+            )
+
+        with en_fecha(2025, 12, 31, 23, 59):
+            self.assertEqual(generar_codigo('TST'), 'TST-2025-0001')
+            self.assertEqual(generar_codigo('TST'), 'TST-2025-0002')
+        with en_fecha(2026, 1, 1, 0, 1):
+            self.assertEqual(generar_codigo('TST'), 'TST-2026-0001')
+            self.assertEqual(reservar_codigos('TST', 2), ['TST-2026-0002', 'TST-2026-0003'])
+
+        self.assertEqual(
+            dict(SecuenciaCodigo.objects.filter(prefijo='TST').values_list('anio', 'ultimo_numero')),
+            {2025: 2, 2026: 3}
+        )
+
+
+class InicializacionSecuenciasTestCase(DatosSalidaMixin, TestCase):
+    """Los contadores nuevos continúan desde los códigos ya existentes"""
+
+    def setUp(self):
+        super().setUp()
+        self.reservas = [self._crear_reserva(1) for _ in range(3)]
+
+    def _asignar_codigos(self, *codigos):
+        for reserva, codigo in zip(self.reservas, codigos):
+            Reserva.objects.filter(pk=reserva.pk).update(codigo=codigo)
+        SecuenciaCodigo.objects.filter(prefijo='RSV').delete()
+
+    def test_contador_nuevo_continua_desde_los_datos(self):
+        self._asignar_codigos('RSV-2030-0041', 'RSV-2030-0007', 'RSV-2031-0003')
+
+        self.assertEqual(generar_codigo('RSV', anio=2030), 'RSV-2030-0042')
+        self.assertEqual(generar_codigo('RSV', anio=2031), 'RSV-2031-0004')
+        self.assertEqual(generar_codigo('RSV', anio=2032), 'RSV-2032-0001')
+
+    def test_migracion_inicializa_por_prefijo_y_anio(self):
+        self._asignar_codigos('RSV-2030-0041', 'RSV-2031-0003', 'RSV-2030-X')
+
+        migracion = import_module('apps.secuencia.migrations.0002_inicializar_secuencias')
+        migracion.inicializar_secuencias(django_apps, None)
+
+        self.assertEqual(
+            dict(SecuenciaCodigo.objects.filter(prefijo='RSV').values_list('anio', 'ultimo_numero')),
+            {2030: 41, 2031: 3}
+        )
+        self.assertEqual(generar_codigo('RSV', anio=2030), 'RSV-2030-0042')
+        # La salida creada por DatosSalidaMixin también inicializa su prefijo
+        self.assertTrue(SecuenciaCodigo.objects.filter(prefijo='SAL').exists())